@@ -174,6 +174,7 @@ class AppConfig:
     password_reset_fallback_email_enabled: bool
     password_reset_debug_response_enabled: bool
     flask_settings: Dict[str, Any] = field(default_factory=dict)
+    json_store: Dict[str, Any] = field(default_factory=dict)
 
     @property
     def is_production(self) -> bool:
@@ -318,6 +319,13 @@ def load_config() -> AppConfig:
             # MYSQL_POOL_SIZE is the legacy knob used by this codebase; MYSQL_CONNECTION_LIMIT
             # matches the node backend naming and some hosting panels.
             "connection_limit": _to_int(os.environ.get("MYSQL_POOL_SIZE") or os.environ.get("MYSQL_CONNECTION_LIMIT"), 8),
+            # Pool tuning: connections opened at boot, idle age before a checkout
+            # pings, max connection age before recycling, and how long a checkout
+            # waits on a saturated pool (defaults to min(2, connect timeout)).
+            "pool_min": _to_int(os.environ.get("MYSQL_POOL_MIN"), 1),
+            "pool_validate_idle_seconds": _to_int(os.environ.get("MYSQL_POOL_VALIDATE_IDLE_SECONDS"), 30),
+            "pool_max_lifetime_seconds": _to_int(os.environ.get("MYSQL_POOL_MAX_LIFETIME_SECONDS"), 1800),
+            "pool_wait_seconds": os.environ.get("MYSQL_POOL_WAIT_SECONDS") or None,
             "ssl": os.environ.get("MYSQL_SSL", "").lower() == "true",
             "ssl_require_negotiated": _to_bool(os.environ.get("MYSQL_SSL_ENFORCE"), False),
             "timezone": os.environ.get("MYSQL_TIMEZONE", "Z"),
@@ -357,6 +365,17 @@ def load_config() -> AppConfig:
             os.environ.get("PASSWORD_RESET_DEBUG_RESPONSE_ENABLED"),
             False,
         ),
+        json_store={
+            # Reuse the decoded JSON store contents until the file changes on disk.
+            "cache": _to_bool(os.environ.get("JSON_STORE_CACHE"), True),
+            # Give every read its own copy of the cached value (disable only if
+            # no caller mutates what it reads).
+            "copy_on_read": _to_bool(os.environ.get("JSON_STORE_COPY_ON_READ"), True),
+            # Append changed records to a journal instead of rewriting the whole
+            # file on every write; compacted once the journal passes this size.
+            "journal": _to_bool(os.environ.get("JSON_STORE_JOURNAL"), False),
+            "journal_compact_bytes": _to_int(os.environ.get("JSON_STORE_JOURNAL_COMPACT_BYTES"), 1024 * 1024),
+        },
         flask_settings={
             "JSON_SORT_KEYS": False,
             # Allow larger JSON payloads (e.g., base64 certificate uploads).
@@ -25,5 +25,7 @@ def init_database(config: AppConfig) -> None:
             # Do not block the app from starting if MySQL is unavailable.
             logger.exception("MySQL init failed; continuing with MySQL disabled")
             config.mysql["enabled"] = False
+        else:
+            mysql_client.warm_up()
 
     _CONFIGURED = True
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import re
 import threading
+import time
 from queue import Empty, Queue
 from contextlib import contextmanager
-from typing import Callable, Dict, Iterator, Optional, TypeVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
 import pymysql
 from pymysql.cursors import DictCursor
@@ -15,7 +18,18 @@ _config: Optional[AppConfig] = None
 _pool: Optional[Queue[pymysql.connections.Connection]] = None
 _pool_lock = threading.Lock()
 _pool_total = 0
+# Pooled connection bookkeeping, keyed by id(connection): monotonic
+# [created_at, last_released_at]. Guarded by _pool_lock.
+_connection_meta: Dict[int, List[float]] = {}
+_POOL_COUNTERS = ("checkouts", "waits", "exhausted", "creates", "discards", "recycled", "pings", "pingFailures")
+_pool_metrics: Dict[str, float] = {**{name: 0 for name in _POOL_COUNTERS}, "waitMsTotal": 0.0, "waitMsMax": 0.0}
+_MAX_POOL_LIMIT = 64
 _RetryResult = TypeVar("_RetryResult")
+# Connection pinned by `transaction()` for the current thread; `cursor()` (and so
+# execute/fetch_*) reuse it instead of checking out and committing their own.
+_transaction_state = threading.local()
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_BULK_CHUNK_SIZE = 500
 logger = logging.getLogger(__name__)
 
 
@@ -34,15 +48,43 @@ def configure(config: AppConfig) -> None:
     _config = config
     with _pool_lock:
         _pool_total = 0
+        _connection_meta.clear()
         limit = _pool_limit()
         _pool = Queue(maxsize=limit)
 
+
 def _pool_limit() -> int:
     if not _config:
         raise RuntimeError("MySQL configuration has not been initialised")
     mysql_config = _config.mysql
     limit = int(mysql_config.get("connection_limit", 3) or 3)
-    return max(1, min(limit, 32))
+    return max(1, min(limit, _MAX_POOL_LIMIT))
+
+
+def _pool_setting(key: str, default: float, *, minimum: float, maximum: float) -> float:
+    raw = _config.mysql.get(key, default) if _config else default
+    try:
+        value = float(raw if raw is not None else default)
+    except Exception:
+        value = float(default)
+    return max(minimum, min(value, maximum))
+
+
+def _validate_idle_seconds() -> float:
+    # Only connections idle at least this long are pinged on checkout; a stale
+    # one that slips through fails its first statement and `_run_with_retry`
+    # replays it on a fresh connection.
+    return _pool_setting("pool_validate_idle_seconds", 30, minimum=0, maximum=3600)
+
+
+def _max_lifetime_seconds() -> float:
+    # 0 disables recycling.
+    return _pool_setting("pool_max_lifetime_seconds", 1800, minimum=0, maximum=86400)
+
+
+def _pool_wait_seconds() -> float:
+    connect_timeout = _pool_setting("connect_timeout", 5, minimum=1, maximum=60)
+    return _pool_setting("pool_wait_seconds", min(2.0, connect_timeout), minimum=0.05, maximum=30)
 
 
 def _create_connection() -> pymysql.connections.Connection:
@@ -110,6 +152,11 @@ def _assert_tls_negotiated(connection: pymysql.connections.Connection) -> None:
     )
 
 
+def _count(name: str, amount: float = 1) -> None:
+    with _pool_lock:
+        _pool_metrics[name] = _pool_metrics.get(name, 0) + amount
+
+
 def _discard_connection(connection: Optional[pymysql.connections.Connection]) -> None:
     global _pool_total
     if not connection:
@@ -120,6 +167,58 @@ def _discard_connection(connection: Optional[pymysql.connections.Connection]) ->
         pass
     with _pool_lock:
         _pool_total = max(0, _pool_total - 1)
+        _connection_meta.pop(id(connection), None)
+        _pool_metrics["discards"] += 1
+
+
+def _open_pooled_connection() -> pymysql.connections.Connection:
+    """Create a connection for a pool slot the caller has already reserved."""
+    global _pool_total
+    try:
+        connection = _create_connection()
+    except Exception:
+        with _pool_lock:
+            _pool_total = max(0, _pool_total - 1)
+        raise
+    now = time.monotonic()
+    with _pool_lock:
+        _connection_meta[id(connection)] = [now, now]
+        _pool_metrics["creates"] += 1
+    return connection
+
+
+def _replace_connection(connection: pymysql.connections.Connection) -> pymysql.connections.Connection:
+    global _pool_total
+    _discard_connection(connection)
+    with _pool_lock:
+        _pool_total += 1
+    return _open_pooled_connection()
+
+
+def _expired(meta: Optional[List[float]], now: float) -> bool:
+    lifetime = _max_lifetime_seconds()
+    return bool(meta and lifetime > 0 and now - meta[0] >= lifetime)
+
+
+def _validate_connection(connection: pymysql.connections.Connection) -> pymysql.connections.Connection:
+    now = time.monotonic()
+    with _pool_lock:
+        meta = _connection_meta.get(id(connection))
+    if not connection.open:
+        return _replace_connection(connection)
+    if _expired(meta, now):
+        _count("recycled")
+        return _replace_connection(connection)
+    idle_seconds = now - meta[1] if meta else float("inf")
+    if idle_seconds < _validate_idle_seconds():
+        return connection
+    _count("pings")
+    try:
+        connection.ping(reconnect=False)
+    except pymysql.err.Error:
+        _count("pingFailures")
+        return _replace_connection(connection)
+    return connection
 
 
 def _acquire_connection() -> pymysql.connections.Connection:
@@ -137,37 +236,30 @@ def _acquire_connection() -> pymysql.connections.Connection:
         pass
 
     if connection is None:
+        reserved = False
         with _pool_lock:
-            limit = _pool_limit()
-            if _pool_total < limit:
+            if _pool_total < _pool_limit():
                 _pool_total += 1
-                try:
-                    connection = _create_connection()
-                except Exception:
-                    _pool_total = max(0, _pool_total - 1)
-                    raise
+                reserved = True
+        if reserved:
+            connection = _open_pooled_connection()
 
     if connection is None:
         # Pool saturated; wait briefly for a free slot.
+        started = time.monotonic()
         try:
-            connection = _pool.get(timeout=max(0.25, min(2.0, float(_config.mysql.get("connect_timeout", 5) or 5))))
+            connection = _pool.get(timeout=_pool_wait_seconds())
         except Empty as exc:
+            _count("exhausted")
             raise pymysql.err.OperationalError(1203, "MySQL connection pool exhausted") from exc
-
-    if not connection.open:
-        _discard_connection(connection)
+        waited_ms = (time.monotonic() - started) * 1000.0
         with _pool_lock:
-            _pool_total += 1
-        connection = _create_connection()
-
-    try:
-        connection.ping(reconnect=True)
-    except pymysql.err.Error:
-        _discard_connection(connection)
-        with _pool_lock:
-            _pool_total += 1
-        connection = _create_connection()
+            _pool_metrics["waits"] += 1
+            _pool_metrics["waitMsTotal"] += waited_ms
+            _pool_metrics["waitMsMax"] = max(_pool_metrics["waitMsMax"], waited_ms)
 
+    connection = _validate_connection(connection)
+    _count("checkouts")
     return connection
 
 
@@ -180,14 +272,142 @@ def _release_connection(connection: Optional[pymysql.connections.Connection]) ->
     if _pool is None:
         _discard_connection(connection)
         return
+    now = time.monotonic()
+    with _pool_lock:
+        meta = _connection_meta.get(id(connection))
+        if meta:
+            meta[1] = now
+    if _expired(meta, now):
+        _count("recycled")
+        _discard_connection(connection)
+        return
     try:
         _pool.put_nowait(connection)
     except Exception:
         _discard_connection(connection)
 
 
+def warm_up(min_connections: Optional[int] = None) -> int:
+    """
+    Open pooled connections up to the configured minimum (`pool_min`, capped at
+    the pool limit) so the first requests after boot skip the TCP/TLS handshake.
+    Returns how many were opened; failures are logged, not raised.
+    """
+    global _pool_total
+    if not is_enabled():
+        return 0
+    if _pool is None:
+        configure(_config)
+    assert _pool is not None
+    target = int(min_connections if min_connections is not None else _pool_setting("pool_min", 1, minimum=0, maximum=_MAX_POOL_LIMIT))
+    target = max(0, min(target, _pool_limit()))
+    opened = 0
+    while _pool.qsize() < target:
+        with _pool_lock:
+            if _pool_total >= _pool_limit():
+                break
+            _pool_total += 1
+        try:
+            connection = _open_pooled_connection()
+        except Exception:
+            logger.warning("MySQL pool warm-up failed after %s connection(s)", opened, exc_info=True)
+            break
+        _release_connection(connection)
+        opened += 1
+    return opened
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Pool size, occupancy and lifetime counters for this worker process."""
+    with _pool_lock:
+        snapshot = dict(_pool_metrics)
+        open_connections = _pool_total
+    idle = _pool.qsize() if _pool is not None else 0
+    waits = int(snapshot["waits"])
+    return {
+        "limit": _pool_limit() if _config else None,
+        "open": open_connections,
+        "idle": idle,
+        "inUse": max(0, open_connections - idle),
+        **{name: int(snapshot[name]) for name in _POOL_COUNTERS},
+        "avgWaitMs": round(snapshot["waitMsTotal"] / waits, 2) if waits else None,
+        "maxWaitMs": round(snapshot["waitMsMax"], 2) if waits else None,
+    }
+
+
+def _pinned_connection() -> Optional[pymysql.connections.Connection]:
+    return getattr(_transaction_state, "connection", None)
+
+
+def in_transaction() -> bool:
+    return _pinned_connection() is not None
+
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    """
+    Run every statement issued on this thread inside the block on one pooled
+    connection and commit once at the end (rollback on error).
+
+    Repository helpers need no changes to join: `execute`, `fetch_one`,
+    `fetch_all`, `cursor` and the bulk helpers all use the pinned connection.
+    Nested blocks join the outermost transaction. A no-op without MySQL, so
+    callers can wrap code that also runs against the JSON stores.
+    """
+    if not is_enabled() or in_transaction():
+        yield
+        return
+    connection: Optional[pymysql.connections.Connection] = _acquire_connection()
+    _transaction_state.connection = connection
+    _transaction_state.after_commit = []
+    callbacks: List[Callable[[], None]] = []
+    try:
+        yield
+        connection.commit()
+        callbacks = _transaction_state.after_commit
+    except Exception as exc:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        if isinstance(exc, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+            _discard_connection(connection)
+            connection = None
+        raise
+    finally:
+        _transaction_state.connection = None
+        _transaction_state.after_commit = []
+        _release_connection(connection)
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:
+            logger.warning("MySQL after-commit callback failed", exc_info=True)
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the current transaction has committed, on its own
+    connection, or right away outside a transaction. Best-effort side writes
+    (index rows, dirty marks) go here so a failure in them can neither poison
+    nor hold locks in the caller's transaction. Dropped on rollback.
+    """
+    if in_transaction():
+        _transaction_state.after_commit.append(callback)
+        return
+    callback()
+
+
 @contextmanager
 def cursor() -> Iterator[pymysql.cursors.DictCursor]:
+    pinned = _pinned_connection()
+    if pinned is not None:
+        cur = pinned.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+        return
     connection: Optional[pymysql.connections.Connection] = _acquire_connection()
     cur = connection.cursor()
     try:
@@ -207,6 +427,45 @@ def cursor() -> Iterator[pymysql.cursors.DictCursor]:
         _release_connection(connection)
 
 
+@contextmanager
+def named_lock(name: str, *, timeout_seconds: float = 0) -> Iterator[bool]:
+    """
+    Hold a MySQL `GET_LOCK` for the duration of the block.
+
+    The lock lives on a dedicated, unpooled connection: named locks are bound to
+    the session that took them, and pooled connections are handed to other
+    callers between statements. Yields whether the lock was acquired.
+    """
+    connection = _create_connection()
+    acquired = False
+    try:
+        cur = connection.cursor()
+        try:
+            cur.execute(
+                "SELECT GET_LOCK(%(name)s, %(timeout)s) AS acquired",
+                {"name": name, "timeout": max(0, int(timeout_seconds or 0))},
+            )
+            row = cur.fetchone() or {}
+            acquired = int((row or {}).get("acquired") or 0) == 1
+        finally:
+            cur.close()
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                cur = connection.cursor()
+                try:
+                    cur.execute("SELECT RELEASE_LOCK(%(name)s) AS released", {"name": name})
+                finally:
+                    cur.close()
+            except Exception:
+                pass
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
 def _should_retry(error: Exception) -> bool:
     if isinstance(error, pymysql.err.OperationalError):
         err_code = error.args[0] if error.args else None
@@ -218,6 +477,10 @@ def _should_retry(error: Exception) -> bool:
 
 
 def _run_with_retry(operation: Callable[[], _RetryResult]) -> _RetryResult:
+    if in_transaction():
+        # A lost connection mid-transaction has already dropped the earlier
+        # statements; replaying only the last one would commit a partial write.
+        return operation()
     try:
         return operation()
     except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as error:
@@ -253,3 +516,192 @@ def _fetch_all(query: str, params: Optional[Dict]) -> list[Dict]:
     with cursor() as cur:
         cur.execute(query, params or {})
         return cur.fetchall()
+
+
+def _stream_net_write_timeout() -> int:
+    if not _config:
+        return 600
+    try:
+        value = int(_config.mysql.get("stream_net_write_timeout", 600) or 600)
+    except Exception:
+        value = 600
+    return max(60, min(value, 3600))
+
+
+def iter_rows(query: str, params: Optional[Dict] = None, *, batch_size: int = 500) -> Iterator[Dict]:
+    """
+    Stream a large result set with an unbuffered server-side cursor
+    (`SSDictCursor`), fetching `batch_size` rows at a time, so memory stays
+    flat regardless of the row count.
+
+    The scan runs on its own unpooled connection (like `named_lock`) so a long
+    report or backfill never holds one of the request pool's slots, and the
+    caller may issue other queries while iterating. Close the generator (or
+    exhaust it) to release the connection. Inside `transaction()` the rows are
+    read from the pinned connection instead, so they see the transaction's
+    own writes.
+    """
+    size = max(1, min(int(batch_size or 500), 10_000))
+    if in_transaction():
+        with cursor() as cur:
+            cur.execute(query, params or {})
+            while True:
+                batch = cur.fetchmany(size)
+                if not batch:
+                    return
+                yield from batch
+
+    connection = _create_connection()
+    try:
+        cur = connection.cursor(pymysql.cursors.SSDictCursor)
+        exhausted = False
+        try:
+            # The server waits on the client between batches; give slow
+            # consumers longer than the 60s default before it aborts the send.
+            try:
+                cur.execute(f"SET SESSION net_write_timeout = {_stream_net_write_timeout()}")
+            except pymysql.err.Error:
+                pass
+            cur.execute(query, params or {})
+            while True:
+                batch = cur.fetchmany(size)
+                if not batch:
+                    exhausted = True
+                    break
+                yield from batch
+        finally:
+            # Closing an unbuffered cursor reads the rest of the result set;
+            # when the caller stopped early, dropping the connection is cheaper.
+            if exhausted:
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def execute_many(query: str, params_seq: Iterable[Dict]) -> int:
+    """
+    Run one statement for each parameter dict on a single connection and commit
+    once. PyMySQL folds `INSERT ... VALUES (...)` into multi-row statements.
+    """
+    rows = list(params_seq or [])
+    if not rows:
+        return 0
+    return _run_with_retry(lambda: _execute_many(query, rows))
+
+
+def _execute_many(query: str, rows: List[Dict]) -> int:
+    with cursor() as cur:
+        return int(cur.executemany(query, rows) or 0)
+
+
+def _quote_identifier(name: str) -> str:
+    text = str(name or "")
+    if not _IDENTIFIER_RE.match(text):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return f"`{text}`"
+
+
+def _insert_statement(
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Dict[str, Any]],
+    *,
+    ignore: bool = False,
+    update_columns: Sequence[str] = (),
+) -> Tuple[str, Dict[str, Any]]:
+    params: Dict[str, Any] = {}
+    values: List[str] = []
+    for row_index, row in enumerate(rows):
+        placeholders: List[str] = []
+        for column_index, column in enumerate(columns):
+            key = f"r{row_index}_{column_index}"
+            params[key] = row.get(column)
+            placeholders.append(f"%({key})s")
+        values.append(f"({', '.join(placeholders)})")
+    column_sql = ", ".join(_quote_identifier(column) for column in columns)
+    query = f"INSERT {'IGNORE ' if ignore else ''}INTO {_quote_identifier(table)} ({column_sql}) VALUES {', '.join(values)}"
+    if update_columns:
+        assignments = ", ".join(
+            f"{_quote_identifier(column)} = VALUES({_quote_identifier(column)})" for column in update_columns
+        )
+        query = f"{query} ON DUPLICATE KEY UPDATE {assignments}"
+    return query, params
+
+
+def _bulk_write(
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    columns: Optional[Sequence[str]],
+    chunk_size: int,
+    ignore: bool = False,
+    update_columns: Sequence[str] = (),
+) -> int:
+    iterator = iter(rows or [])
+    first = next(iterator, None)
+    if first is None:
+        return 0
+    size = max(1, min(int(chunk_size or _BULK_CHUNK_SIZE), 5000))
+    written = 0
+    chunk: List[Dict[str, Any]] = []
+    resolved_columns: List[str] = list(columns) if columns else list(first.keys())
+
+    def flush() -> int:
+        query, params = _insert_statement(
+            table,
+            resolved_columns,
+            chunk,
+            ignore=ignore,
+            update_columns=update_columns,
+        )
+        with cursor() as cur:
+            return int(cur.execute(query, params) or 0)
+
+    with transaction():
+        for row in itertools.chain((first,), iterator):
+            chunk.append(row)
+            if len(chunk) >= size:
+                written += flush()
+                chunk = []
+        if chunk:
+            written += flush()
+    return written
+
+
+def bulk_insert(
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: int = _BULK_CHUNK_SIZE,
+    ignore: bool = False,
+) -> int:
+    """
+    Insert `rows` (dicts, consumed lazily) with one multi-row INSERT per
+    `chunk_size` rows, all in one transaction. `columns` defaults to the first
+    row's keys; missing keys insert NULL. Returns the affected row count.
+    """
+    return _bulk_write(table, rows, columns=columns, chunk_size=chunk_size, ignore=ignore)
+
+
+def bulk_upsert(
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    update_columns: Sequence[str],
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: int = _BULK_CHUNK_SIZE,
+) -> int:
+    """
+    `bulk_insert` with `ON DUPLICATE KEY UPDATE` for `update_columns`. The
+    affected count follows MySQL: 1 per inserted row, 2 per updated row.
+    """
+    if not update_columns:
+        raise ValueError("bulk_upsert requires update_columns")
+    return _bulk_write(table, rows, columns=columns, chunk_size=chunk_size, update_columns=update_columns)
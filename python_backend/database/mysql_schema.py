@@ -2,18 +2,26 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
+import os
+from contextlib import ExitStack
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
 
-from . import mysql_client
+from . import mysql_client, schema_catalog
 
+logger = logging.getLogger(__name__)
 
+_SCHEMA_LEDGER_ID = 1
+_SCHEMA_LOCK_NAME = "peppro_schema_migration"
 _NETWORK_PRESENCE_AGREEMENT_BACKFILL_KEY = "migration_network_presence_agreement_backfill_v1"
 
 
-def _backfill_network_presence_agreement_once(*, table_exists=None) -> None:
+def _backfill_network_presence_agreement_once(*, table_exists=None) -> bool:
     exists = table_exists or (lambda _table: True)
     if not exists("settings") or not exists("users"):
-        return
+        return True
     try:
         marker = mysql_client.fetch_one(
             """
@@ -24,7 +32,7 @@ def _backfill_network_presence_agreement_once(*, table_exists=None) -> None:
             {"key": _NETWORK_PRESENCE_AGREEMENT_BACKFILL_KEY},
         )
         if marker:
-            return
+            return True
         affected_rows = mysql_client.execute(
             """
             UPDATE users
@@ -54,7 +62,253 @@ def _backfill_network_presence_agreement_once(*, table_exists=None) -> None:
         )
     except Exception:
         # Best effort; do not fail app startup on one-time backfill issues.
-        pass
+        return False
+    return True
+
+
+_USAGE_TRACKING_EVENTS_BACKFILL_KEY = "migration_usage_tracking_events_backfill_v1"
+_USAGE_TRACKING_EVENTS_BACKFILL_CHUNK = 200
+# A "running" marker whose heartbeat (updated on every committed chunk) is
+# older than this belongs to a worker that died mid-copy.
+_USAGE_TRACKING_EVENTS_BACKFILL_STALE_SECONDS = 15 * 60
+
+
+def _legacy_usage_tracking_instances(value: object) -> list[dict]:
+    payload: object = value
+    if isinstance(value, (str, bytes)):
+        try:
+            payload = json.loads(value or "{}")
+        except Exception:
+            return []
+    if not isinstance(payload, dict):
+        return []
+    instances = payload.get("instances")
+    if isinstance(instances, list):
+        return [dict(item) for item in instances if isinstance(item, dict)]
+    return [dict(payload)] if payload else []
+
+
+def _legacy_usage_tracking_event_row(event: str, instance: dict, fallback_created_at: object) -> dict:
+    who = instance.get("who") if isinstance(instance.get("who"), dict) else {}
+
+    def _text(value: object, limit: int) -> object:
+        text = str(value or "").strip()
+        return text[:limit] or None
+
+    actor_id = str(who.get("id") or "").strip()
+    actor_email = str(who.get("email") or "").strip().lower()
+    actor_key = f"id:{actor_id}" if actor_id else (f"email:{actor_email}" if actor_email else None)
+
+    created_at = None
+    when = str(instance.get("when") or "").strip()
+    if when:
+        try:
+            parsed = datetime.fromisoformat(when[:-1] + "+00:00" if when.endswith("Z") else when)
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            created_at = parsed.strftime("%Y-%m-%d %H:%M:%S")
+        except Exception:
+            created_at = None
+    if created_at is None and isinstance(fallback_created_at, datetime):
+        created_at = fallback_created_at.strftime("%Y-%m-%d %H:%M:%S")
+    if created_at is None:
+        created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    return {
+        "event": str(event or "").strip()[:128],
+        "actor_key": actor_key[:255] if actor_key else None,
+        "actor_user_id": _text(who.get("id"), 64),
+        "actor_name": _text(who.get("name"), 190),
+        "actor_email": _text(who.get("email"), 190),
+        "actor_role": _text(who.get("role"), 32),
+        "details_json": json.dumps(instance, default=str),
+        "created_at": created_at,
+    }
+
+
+def _insert_usage_tracking_event_rows(rows: list[dict]) -> None:
+    if not rows:
+        return
+    params: dict = {}
+    values: list[str] = []
+    columns = (
+        "event",
+        "actor_key",
+        "actor_user_id",
+        "actor_name",
+        "actor_email",
+        "actor_role",
+        "details_json",
+        "created_at",
+    )
+    for index, row in enumerate(rows):
+        placeholders = []
+        for column in columns:
+            key = f"{column}_{index}"
+            params[key] = row.get(column)
+            placeholders.append(f"%({key})s")
+        values.append(f"({', '.join(placeholders)})")
+    mysql_client.execute(
+        f"""
+        INSERT INTO usage_tracking_events ({', '.join(columns)})
+        VALUES {', '.join(values)}
+        """,
+        params,
+    )
+
+
+def _set_usage_tracking_events_backfill_marker(value: dict) -> int:
+    return mysql_client.execute(
+        """
+        UPDATE settings
+        SET value_json = %(value_json)s, updated_at = %(updated_at)s
+        WHERE `key` = %(key)s
+        """,
+        {
+            "key": _USAGE_TRACKING_EVENTS_BACKFILL_KEY,
+            "value_json": json.dumps(value),
+            "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        },
+    )
+
+
+def _marker_is_stale(updated_at: object) -> bool:
+    if isinstance(updated_at, str):
+        try:
+            updated_at = datetime.fromisoformat(updated_at.strip())
+        except Exception:
+            return False
+    if not isinstance(updated_at, datetime):
+        return False
+    if updated_at.tzinfo is not None:
+        updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    age = datetime.now(timezone.utc).replace(tzinfo=None) - updated_at
+    return age.total_seconds() >= _USAGE_TRACKING_EVENTS_BACKFILL_STALE_SECONDS
+
+
+def _backfill_usage_tracking_events_once(*, table_exists=None) -> None:
+    """
+    Explode the legacy one-row-per-event `usage_tracking` JSON blobs into
+    `usage_tracking_events`. The marker row is claimed with INSERT IGNORE so
+    only one booting worker performs the copy. Each chunk is inserted in the
+    same transaction that advances the marker's `lastLegacyId` watermark, so a
+    `failed` run, or a `running` one whose worker died, is re-claimed by a
+    later boot and resumes after the last committed legacy row instead of
+    copying it twice.
+    """
+    exists = table_exists or (lambda _table: True)
+    try:
+        marker = mysql_client.fetch_one(
+            """
+            SELECT value_json, updated_at
+            FROM settings
+            WHERE `key` = %(key)s
+            """,
+            {"key": _USAGE_TRACKING_EVENTS_BACKFILL_KEY},
+        )
+    except Exception:
+        return
+    state: dict = {}
+    if marker:
+        try:
+            loaded = json.loads(marker.get("value_json") or "{}")
+        except Exception:
+            loaded = {}
+        if not isinstance(loaded, dict):
+            return
+        state = loaded
+        status = state.get("status")
+        if status != "failed" and not (status == "running" and _marker_is_stale(marker.get("updated_at"))):
+            return
+    try:
+        if not exists("settings") or not exists("usage_tracking") or not exists("usage_tracking_events"):
+            return
+        if marker:
+            # Re-claim a failed or abandoned run: only the worker whose UPDATE
+            # still sees the exact previous value wins.
+            claimed = mysql_client.execute(
+                """
+                UPDATE settings
+                SET value_json = %(value_json)s, updated_at = %(updated_at)s
+                WHERE `key` = %(key)s AND value_json = %(previous)s
+                """,
+                {
+                    "key": _USAGE_TRACKING_EVENTS_BACKFILL_KEY,
+                    "previous": marker.get("value_json"),
+                    "value_json": json.dumps({**state, "status": "running"}),
+                    "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                },
+            )
+        else:
+            claimed = mysql_client.execute(
+                """
+                INSERT IGNORE INTO settings (`key`, value_json, updated_at)
+                VALUES (%(key)s, %(value_json)s, %(updated_at)s)
+                """,
+                {
+                    "key": _USAGE_TRACKING_EVENTS_BACKFILL_KEY,
+                    "value_json": json.dumps({"status": "running"}),
+                    "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                },
+            )
+        if not claimed:
+            return
+    except Exception:
+        return
+
+    last_legacy_id = int(state.get("lastLegacyId") or 0)
+    inserted = int(state.get("insertedRows") or 0)
+
+    def _commit_chunk(rows: list[dict], through_id: int) -> None:
+        nonlocal inserted, last_legacy_id
+        with mysql_client.transaction():
+            _insert_usage_tracking_event_rows(rows)
+            _set_usage_tracking_events_backfill_marker(
+                {"status": "running", "lastLegacyId": through_id, "insertedRows": inserted + len(rows)}
+            )
+        inserted += len(rows)
+        last_legacy_id = through_id
+
+    try:
+        legacy_rows = mysql_client.fetch_all(
+            """
+            SELECT id, event, details_json, created_at
+            FROM usage_tracking
+            WHERE id > %(after_id)s
+            ORDER BY id ASC
+            """,
+            {"after_id": last_legacy_id},
+        )
+        pending: list[dict] = []
+        pending_through = last_legacy_id
+        for row in legacy_rows or []:
+            event = str((row or {}).get("event") or "").strip()
+            if event:
+                for instance in _legacy_usage_tracking_instances((row or {}).get("details_json")):
+                    pending.append(_legacy_usage_tracking_event_row(event, instance, (row or {}).get("created_at")))
+            pending_through = int((row or {}).get("id") or pending_through)
+            # Flush on legacy-row boundaries so the watermark never splits a row.
+            if len(pending) >= _USAGE_TRACKING_EVENTS_BACKFILL_CHUNK:
+                _commit_chunk(pending, pending_through)
+                pending = []
+        if pending:
+            _commit_chunk(pending, pending_through)
+        _set_usage_tracking_events_backfill_marker(
+            {
+                "status": "complete",
+                "ranAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "insertedRows": inserted,
+                "lastLegacyId": pending_through,
+            }
+        )
+    except Exception:
+        # Best effort; keep the watermark so a later boot resumes the copy.
+        try:
+            _set_usage_tracking_events_backfill_marker(
+                {"status": "failed", "lastLegacyId": last_legacy_id, "insertedRows": inserted}
+            )
+        except Exception:
+            pass
 
 
 CREATE_TABLE_STATEMENTS = [
@@ -418,6 +672,13 @@ CREATE_TABLE_STATEMENTS = [
     ) CHARACTER SET utf8mb4
     """,
     """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        id TINYINT UNSIGNED NOT NULL PRIMARY KEY,
+        fingerprint CHAR(64) NOT NULL,
+        applied_at DATETIME NOT NULL
+    ) CHARACTER SET utf8mb4
+    """,
+    """
     CREATE TABLE IF NOT EXISTS resource_versions (
         resource_name VARCHAR(64) NOT NULL PRIMARY KEY,
         version BIGINT UNSIGNED NOT NULL DEFAULT 0,
@@ -437,6 +698,22 @@ CREATE_TABLE_STATEMENTS = [
     ) CHARACTER SET utf8mb4
     """,
     """
+    CREATE TABLE IF NOT EXISTS usage_tracking_events (
+        id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        event VARCHAR(128) NOT NULL,
+        actor_key VARCHAR(255) NULL,
+        actor_user_id VARCHAR(64) NULL,
+        actor_name VARCHAR(190) NULL,
+        actor_email VARCHAR(190) NULL,
+        actor_role VARCHAR(32) NULL,
+        details_json LONGTEXT NOT NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        KEY idx_usage_tracking_events_event_time (event, created_at),
+        KEY idx_usage_tracking_events_event_actor (event, actor_key),
+        KEY idx_usage_tracking_events_actor_time (actor_key, created_at)
+    ) CHARACTER SET utf8mb4
+    """,
+    """
     CREATE TABLE IF NOT EXISTS physician_product_events (
         id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
         user_id VARCHAR(32) NOT NULL,
@@ -684,10 +961,12 @@ CREATE_TABLE_STATEMENTS = [
         created_at DATETIME NOT NULL,
         sent_at DATETIME NULL,
         error_message LONGTEXT NULL,
+        claim_token VARCHAR(32) NULL,
         KEY idx_email_campaign_recipients_campaign (campaign_id),
         KEY idx_email_campaign_recipients_status (status),
         KEY idx_email_campaign_recipients_email (recipient_email),
-        KEY idx_email_campaign_recipients_pending (status, created_at)
+        KEY idx_email_campaign_recipients_pending (status, created_at),
+        KEY idx_email_campaign_recipients_claim (claim_token)
     ) CHARACTER SET utf8mb4
     """,
     """
@@ -733,11 +1012,249 @@ CREATE_TABLE_STATEMENTS = [
         KEY idx_admin_shadow_sessions_session_expires (session_expires_at),
         KEY idx_admin_shadow_sessions_ended (ended_at)
     ) CHARACTER SET utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sales_rep_order_rollup (
+        order_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        rep_id VARCHAR(64) NOT NULL,
+        day DATE NOT NULL,
+        revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        pricing_mode VARCHAR(16) NOT NULL DEFAULT 'wholesale',
+        updated_at DATETIME NOT NULL,
+        KEY idx_sales_rep_order_rollup_day_rep (day, rep_id)
+    ) CHARACTER SET utf8mb4
+    """,
     """
+    CREATE TABLE IF NOT EXISTS sales_rep_daily_rollup (
+        rep_id VARCHAR(64) NOT NULL,
+        day DATE NOT NULL,
+        order_count INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        wholesale_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        retail_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (rep_id, day),
+        KEY idx_sales_rep_daily_rollup_day (day)
+    ) CHARACTER SET utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sales_rep_rollup_dirty (
+        order_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        queued_at DATETIME(6) NOT NULL,
+        KEY idx_sales_rep_rollup_dirty_queued (queued_at)
+    ) CHARACTER SET utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS order_woo_identifiers (
+        order_id VARCHAR(32) NOT NULL,
+        source VARCHAR(16) NOT NULL,
+        identifier VARCHAR(64) NOT NULL,
+        PRIMARY KEY (order_id, source),
+        KEY idx_order_woo_identifiers_identifier (identifier)
+    ) CHARACTER SET utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS shared_cache_entries (
+        namespace VARCHAR(64) NOT NULL,
+        cache_key VARCHAR(191) NOT NULL,
+        payload LONGTEXT NOT NULL,
+        expires_at_ms BIGINT NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (namespace, cache_key),
+        KEY idx_shared_cache_entries_expires (expires_at_ms)
+    ) CHARACTER SET utf8mb4
+    """,
 ]
 
 
+def schema_fingerprint() -> str:
+    """
+    Hash of the migration set. Any edit to this module (new table, column,
+    backfill) changes the fingerprint and triggers one full verification pass.
+    """
+    digest = hashlib.sha256()
+    try:
+        digest.update(Path(__file__).read_bytes())
+    except Exception:
+        for statement in CREATE_TABLE_STATEMENTS:
+            digest.update(statement.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _force_verify() -> bool:
+    raw = str(os.environ.get("MYSQL_SCHEMA_FORCE_VERIFY", "")).strip().lower()
+    return raw in ("1", "true", "yes", "on")
+
+
+def _lock_timeout_seconds() -> int:
+    raw = str(os.environ.get("MYSQL_SCHEMA_LOCK_TIMEOUT_SECONDS", "120")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 120
+    return max(0, min(value, 15 * 60))
+
+
+def _recorded_fingerprint() -> Optional[str]:
+    try:
+        row = mysql_client.fetch_one(
+            "SELECT fingerprint FROM schema_version WHERE id = %(id)s",
+            {"id": _SCHEMA_LEDGER_ID},
+        )
+    except mysql_client.MySQLTlsRequiredError:
+        raise
+    except Exception:
+        # Ledger table missing (first boot on this database) or unreadable.
+        return None
+    value = str((row or {}).get("fingerprint") or "").strip()
+    return value or None
+
+
+def _record_fingerprint(fingerprint: str) -> None:
+    try:
+        mysql_client.execute(
+            """
+            INSERT INTO schema_version (id, fingerprint, applied_at)
+            VALUES (%(id)s, %(fingerprint)s, UTC_TIMESTAMP())
+            ON DUPLICATE KEY UPDATE
+                fingerprint = VALUES(fingerprint),
+                applied_at = VALUES(applied_at)
+            """,
+            {"id": _SCHEMA_LEDGER_ID, "fingerprint": fingerprint},
+        )
+    except Exception:
+        logger.warning("Failed to record MySQL schema fingerprint", exc_info=True)
+
+
 def ensure_schema() -> None:
+    """
+    Bring the database up to the current migration set.
+
+    A booting worker normally does a ledger read plus one read per pending
+    backfill marker: when the recorded fingerprint matches, the
+    CREATE/ALTER/information_schema pass is skipped. Otherwise one worker runs
+    the full pass under a MySQL named lock and, if every step succeeded,
+    records the new fingerprint; the others wait for it and re-check.
+    """
+    fingerprint = schema_fingerprint()
+    force = _force_verify()
+    if force or _recorded_fingerprint() != fingerprint:
+        _verify_schema(fingerprint, force=force)
+    _run_pending_backfills()
+
+
+def _run_pending_backfills() -> None:
+    """
+    Data copies that must finish even after the fingerprint is recorded. They
+    run on every boot, outside the fingerprint gate, and cost one settings read
+    once their marker says complete.
+    """
+    _backfill_usage_tracking_events_once(table_exists=schema_catalog.has_table)
+
+
+def _verify_schema(fingerprint: str, *, force: bool) -> None:
+    with ExitStack() as stack:
+        try:
+            acquired = stack.enter_context(
+                mysql_client.named_lock(_SCHEMA_LOCK_NAME, timeout_seconds=_lock_timeout_seconds())
+            )
+        except mysql_client.MySQLTlsRequiredError:
+            raise
+        except Exception:
+            logger.warning("MySQL schema lock unavailable; verifying schema without it", exc_info=True)
+            acquired = False
+        if acquired and not force and _recorded_fingerprint() == fingerprint:
+            # Another worker finished the pass while we waited for the lock.
+            return
+        if not acquired:
+            logger.warning("MySQL schema lock not acquired; verifying schema without it")
+        clean = _apply_schema()
+        schema_catalog.invalidate()
+        if clean:
+            _record_fingerprint(fingerprint)
+        else:
+            logger.warning("MySQL schema pass had failed steps; fingerprint not recorded, next boot retries")
+
+
+_ORDER_WOO_IDENTIFIERS_BACKFILL_KEY = "migration_order_woo_identifiers_backfill_v1"
+
+
+def _backfill_order_woo_identifiers_once(*, table_exists=None) -> bool:
+    """
+    Index the Woo id/number of every existing order into `order_woo_identifiers`
+    (new writes keep it current). Claimed through a settings marker like the
+    usage-tracking backfill; the marker is dropped on failure so a later boot
+    retries. Returns False when the copy failed.
+    """
+    exists = table_exists or (lambda _table: True)
+    if not exists("settings") or not exists("orders") or not exists("order_woo_identifiers"):
+        return True
+    try:
+        claimed = mysql_client.execute(
+            """
+            INSERT IGNORE INTO settings (`key`, value_json, updated_at)
+            VALUES (%(key)s, %(value_json)s, %(updated_at)s)
+            """,
+            {
+                "key": _ORDER_WOO_IDENTIFIERS_BACKFILL_KEY,
+                "value_json": json.dumps({"status": "running"}),
+                "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+        if not claimed:
+            return True
+    except Exception:
+        return False
+
+    try:
+        # Imported lazily: the repository owns the identifier extraction and
+        # imports this package at module load.
+        from ..repositories import order_repository
+
+        written = order_repository.backfill_woo_identifiers()
+        mysql_client.execute(
+            """
+            UPDATE settings
+            SET value_json = %(value_json)s, updated_at = %(updated_at)s
+            WHERE `key` = %(key)s
+            """,
+            {
+                "key": _ORDER_WOO_IDENTIFIERS_BACKFILL_KEY,
+                "value_json": json.dumps(
+                    {
+                        "status": "complete",
+                        "ranAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                        "indexedRows": written,
+                    }
+                ),
+                "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+    except Exception:
+        logger.warning("Order Woo identifier backfill failed; will retry on next boot", exc_info=True)
+        try:
+            mysql_client.execute(
+                "DELETE FROM settings WHERE `key` = %(key)s",
+                {"key": _ORDER_WOO_IDENTIFIERS_BACKFILL_KEY},
+            )
+        except Exception:
+            pass
+        return False
+    return True
+
+
+def _apply_schema() -> bool:
+    """
+    Run the full CREATE/ALTER/backfill pass. Steps stay best effort so one bad
+    migration cannot block startup, but every swallowed failure is counted and
+    the pass returns False so the caller does not record the fingerprint.
+    """
+    failed_steps: list[int] = []
+
+    def _step_failed() -> None:
+        failed_steps.append(1)
+        logger.debug("MySQL schema step failed", exc_info=True)
+
     for statement in CREATE_TABLE_STATEMENTS:
         mysql_client.execute(statement)
 
@@ -755,6 +1272,7 @@ def ensure_schema() -> None:
             )
             return int((row or {}).get("cnt") or 0) > 0
         except Exception:
+            _step_failed()
             return False
 
     def _index_exists(table: str, index: str) -> bool:
@@ -771,6 +1289,7 @@ def ensure_schema() -> None:
             )
             return int((row or {}).get("cnt") or 0) > 0
         except Exception:
+            _step_failed()
             return False
 
     def _primary_key_exists(table: str) -> bool:
@@ -787,6 +1306,7 @@ def ensure_schema() -> None:
             )
             return int((row or {}).get("cnt") or 0) > 0
         except Exception:
+            _step_failed()
             return False
 
     def _table_exists(table: str) -> bool:
@@ -802,6 +1322,7 @@ def ensure_schema() -> None:
             )
             return int((row or {}).get("cnt") or 0) > 0
         except Exception:
+            _step_failed()
             return False
 
     def _drop_table_if_exists(table: str) -> None:
@@ -809,21 +1330,21 @@ def ensure_schema() -> None:
             if _table_exists(table):
                 mysql_client.execute(f"DROP TABLE {table}")
         except Exception:
-            pass
+            _step_failed()
 
     def _drop_column_if_exists(table: str, column: str) -> None:
         try:
             if _column_exists(table, column):
                 mysql_client.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
         except Exception:
-            pass
+            _step_failed()
 
     def _drop_index_if_exists(table: str, index: str) -> None:
         try:
             if _index_exists(table, index):
                 mysql_client.execute(f"ALTER TABLE {table} DROP INDEX {index}")
         except Exception:
-            pass
+            _step_failed()
 
     def _create_legal_acceptances_json_table(table: str) -> None:
         mysql_client.execute(
@@ -1023,7 +1544,7 @@ def ensure_schema() -> None:
         except Exception:
             # Best effort; app startup should not fail because an older legal-audit table
             # needs manual review before migration.
-            pass
+            _step_failed()
 
     def _copy_legacy_ciphertext(table: str, base_column: str, legacy_column: str, *, placeholder: Optional[str] = None) -> None:
         if not _column_exists(table, legacy_column) or not _column_exists(table, base_column):
@@ -1044,7 +1565,7 @@ def ensure_schema() -> None:
                 params,
             )
         except Exception:
-            pass
+            _step_failed()
 
     _ensure_legal_acceptances_json_schema()
 
@@ -1061,6 +1582,7 @@ def ensure_schema() -> None:
         "ALTER TABLE email_campaign_recipients ADD COLUMN IF NOT EXISTS created_at DATETIME NOT NULL",
         "ALTER TABLE email_campaign_recipients ADD COLUMN IF NOT EXISTS sent_at DATETIME NULL",
         "ALTER TABLE email_campaign_recipients ADD COLUMN IF NOT EXISTS error_message LONGTEXT NULL",
+        "ALTER TABLE email_campaign_recipients ADD COLUMN IF NOT EXISTS claim_token VARCHAR(32) NULL",
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_image_url LONGTEXT NULL",
         "ALTER TABLE users MODIFY COLUMN profile_image_url LONGTEXT NULL",
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS downloads LONGTEXT NULL",
@@ -1298,7 +1820,7 @@ def ensure_schema() -> None:
         )
     except Exception:
         # Best effort; do not fail app startup on migration issues.
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "email_verified_at"):
@@ -1306,7 +1828,7 @@ def ensure_schema() -> None:
         if not _column_exists("users", "email_verification_sent_at"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN email_verification_sent_at DATETIME NULL")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure existing Email Center installs keep draft schedule metadata.
     try:
@@ -1326,10 +1848,17 @@ def ensure_schema() -> None:
             mysql_client.execute("ALTER TABLE email_campaign_recipients ADD COLUMN sent_at DATETIME NULL")
         if not _column_exists("email_campaign_recipients", "error_message"):
             mysql_client.execute("ALTER TABLE email_campaign_recipients ADD COLUMN error_message LONGTEXT NULL")
+        if not _column_exists("email_campaign_recipients", "claim_token"):
+            mysql_client.execute("ALTER TABLE email_campaign_recipients ADD COLUMN claim_token VARCHAR(32) NULL")
+        if not _index_exists("email_campaign_recipients", "idx_email_campaign_recipients_claim"):
+            mysql_client.execute(
+                "ALTER TABLE email_campaign_recipients ADD INDEX idx_email_campaign_recipients_claim (claim_token)"
+            )
     except Exception:
-        pass
+        _step_failed()
 
-    _backfill_network_presence_agreement_once(table_exists=_table_exists)
+    if not _backfill_network_presence_agreement_once(table_exists=_table_exists):
+        failed_steps.append(1)
 
     # Ensure cross-device session invalidation support is available.
     try:
@@ -1340,7 +1869,7 @@ def ensure_schema() -> None:
         if not _column_exists("users", "session_id"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN session_id VARCHAR(64) NULL")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure presence timestamps exist so "online"/idle can be derived from activity,
     # not a sticky `is_online` flag.
@@ -1350,7 +1879,7 @@ def ensure_schema() -> None:
         if not _column_exists("users", "last_interaction_at"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN last_interaction_at DATETIME NULL")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure user visit tracking exists (used during login/account creation flows).
     try:
@@ -1358,19 +1887,19 @@ def ensure_schema() -> None:
             mysql_client.execute("ALTER TABLE users ADD COLUMN visits INT NOT NULL DEFAULT 0")
         mysql_client.execute("ALTER TABLE users MODIFY COLUMN visits INT NOT NULL DEFAULT 0")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("sales_reps", "is_partner"):
             mysql_client.execute("ALTER TABLE sales_reps ADD COLUMN is_partner TINYINT(1) NOT NULL DEFAULT 0")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("sales_reps", "allowed_retail"):
             mysql_client.execute("ALTER TABLE sales_reps ADD COLUMN allowed_retail TINYINT(1) NOT NULL DEFAULT 0")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure order notes exist (may be missing on older MySQL variants without `ADD COLUMN IF NOT EXISTS`).
     try:
@@ -1378,7 +1907,7 @@ def ensure_schema() -> None:
             mysql_client.execute("ALTER TABLE orders ADD COLUMN notes LONGTEXT NULL")
         mysql_client.execute("ALTER TABLE orders MODIFY COLUMN notes LONGTEXT NULL")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure pickup fulfillment markers exist for checkout persistence/reporting.
     try:
@@ -1465,7 +1994,7 @@ def ensure_schema() -> None:
             """
         )
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure order-level tax exemption snapshots exist for reporting and modal display.
     try:
@@ -1486,7 +2015,7 @@ def ensure_schema() -> None:
                 "ALTER TABLE users ADD COLUMN reseller_permit_approved_by_rep TINYINT(1) NOT NULL DEFAULT 0"
             )
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if _column_exists("orders", "pickup_ready_notice"):
@@ -1494,7 +2023,7 @@ def ensure_schema() -> None:
         if _column_exists("orders", "pickup_location"):
             mysql_client.execute("ALTER TABLE orders DROP COLUMN pickup_location")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure sales prospects office address fields exist (used by manual prospects + contact form pipeline).
     try:
@@ -1515,7 +2044,7 @@ def ensure_schema() -> None:
         if not _column_exists("sales_prospects", "office_country"):
             mysql_client.execute("ALTER TABLE sales_prospects ADD COLUMN office_country VARCHAR(64) NULL")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if _column_exists("sales_prospects", "contact_email"):
@@ -1539,7 +2068,7 @@ def ensure_schema() -> None:
                 """
             )
     except Exception:
-        pass
+        _step_failed()
 
     _drop_column_if_exists("sales_prospects", "contact_email")
     _drop_column_if_exists("sales_prospects", "contact_phone")
@@ -1549,7 +2078,7 @@ def ensure_schema() -> None:
         if not _column_exists("users", "markup_percent"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN markup_percent DECIMAL(6,2) NOT NULL DEFAULT 0")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "receive_patient_link_update_emails"):
@@ -1557,7 +2086,7 @@ def ensure_schema() -> None:
                 "ALTER TABLE users ADD COLUMN receive_patient_link_update_emails TINYINT(1) NOT NULL DEFAULT 1"
             )
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure high-traffic sales tracking queries use indexes instead of full table scans.
     try:
@@ -1574,25 +2103,25 @@ def ensure_schema() -> None:
         if not _index_exists("orders", "idx_orders_user_created_at"):
             mysql_client.execute("ALTER TABLE orders ADD INDEX idx_orders_user_created_at (user_id, created_at)")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "delegate_logo_url"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN delegate_logo_url LONGTEXT NULL")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "delegate_secondary_color"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN delegate_secondary_color VARCHAR(16) NULL")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "delegate_background_url"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN delegate_background_url LONGTEXT NULL")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if _column_exists("users", "delegate_background_image_url") and _column_exists("users", "delegate_background_url"):
@@ -1606,19 +2135,19 @@ def ensure_schema() -> None:
                 """
             )
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "delegate_background_color"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN delegate_background_color VARCHAR(16) NULL")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("users", "cart"):
             mysql_client.execute("ALTER TABLE users ADD COLUMN cart JSON NULL")
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure patient_links snapshot has markup column (best-effort; table may not exist yet on older installs).
     try:
@@ -1758,9 +2287,9 @@ def ensure_schema() -> None:
                 """
             )
         except Exception:
-            pass
+            _step_failed()
     except Exception:
-        pass
+        _step_failed()
 
     # Ensure patient link proposal review fields exist.
     try:
@@ -1773,7 +2302,7 @@ def ensure_schema() -> None:
         if not _column_exists("patient_links", "delegate_review_notes"):
             mysql_client.execute("ALTER TABLE patient_links ADD COLUMN delegate_review_notes LONGTEXT NULL")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("contact_forms", "email_blind_index"):
@@ -1836,7 +2365,7 @@ def ensure_schema() -> None:
         if not _index_exists("contact_forms", "idx_contact_forms_created_at"):
             mysql_client.execute("ALTER TABLE contact_forms ADD INDEX idx_contact_forms_created_at (created_at)")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("bugs_reported", "name"):
@@ -1855,7 +2384,7 @@ def ensure_schema() -> None:
         _drop_column_if_exists("bugs_reported", "email_encrypted")
         _drop_column_if_exists("bugs_reported", "report_encrypted")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _column_exists("tool_requests", "name"):
@@ -1874,19 +2403,19 @@ def ensure_schema() -> None:
         _drop_column_if_exists("tool_requests", "email_encrypted")
         _drop_column_if_exists("tool_requests", "report_encrypted")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _index_exists("patient_links", "idx_patient_links_status"):
             mysql_client.execute("ALTER TABLE patient_links ADD INDEX idx_patient_links_status (status)")
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _index_exists("patient_links", "idx_patient_links_type"):
             mysql_client.execute("ALTER TABLE patient_links ADD INDEX idx_patient_links_type (link_type)")
     except Exception:
-        pass
+        _step_failed()
 
     # Align usage_tracking payload storage with the rest of the schema:
     # JSON payloads are generally stored in LONGTEXT columns in this codebase.
@@ -1898,51 +2427,54 @@ def ensure_schema() -> None:
                         "ALTER TABLE usage_tracking ADD COLUMN id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST"
                     )
                 except Exception:
-                    pass
+                    _step_failed()
             if not _primary_key_exists("usage_tracking") and _column_exists("usage_tracking", "id"):
                 try:
                     mysql_client.execute("ALTER TABLE usage_tracking ADD PRIMARY KEY (id)")
                 except Exception:
-                    pass
+                    _step_failed()
             try:
                 if _column_exists("usage_tracking", "id"):
                     mysql_client.execute(
                         "ALTER TABLE usage_tracking MODIFY COLUMN id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT"
                     )
             except Exception:
-                pass
+                _step_failed()
             if not _column_exists("usage_tracking", "details_json"):
                 mysql_client.execute("ALTER TABLE usage_tracking ADD COLUMN details_json LONGTEXT NOT NULL")
             try:
                 mysql_client.execute("ALTER TABLE usage_tracking MODIFY COLUMN details_json LONGTEXT NOT NULL")
             except Exception:
-                pass
+                _step_failed()
             if not _column_exists("usage_tracking", "created_at"):
                 try:
                     mysql_client.execute(
                         "ALTER TABLE usage_tracking ADD COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP"
                     )
                 except Exception:
-                    pass
+                    _step_failed()
             try:
                 if _column_exists("usage_tracking", "created_at"):
                     mysql_client.execute(
                         "ALTER TABLE usage_tracking MODIFY COLUMN created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP"
                     )
             except Exception:
-                pass
+                _step_failed()
             try:
                 if not _index_exists("usage_tracking", "idx_usage_tracking_event"):
                     mysql_client.execute("ALTER TABLE usage_tracking ADD INDEX idx_usage_tracking_event (event)")
             except Exception:
-                pass
+                _step_failed()
             try:
                 if not _index_exists("usage_tracking", "idx_usage_tracking_created"):
                     mysql_client.execute("ALTER TABLE usage_tracking ADD INDEX idx_usage_tracking_created (created_at)")
             except Exception:
-                pass
+                _step_failed()
     except Exception:
-        pass
+        _step_failed()
+
+    if not _backfill_order_woo_identifiers_once(table_exists=_table_exists):
+        failed_steps.append(1)
 
     try:
         if _table_exists("physician_product_events"):
@@ -1959,7 +2491,7 @@ def ensure_schema() -> None:
                     "ALTER TABLE physician_product_events ADD INDEX idx_physician_product_events_event_time (event_type, occurred_at)"
                 )
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if _table_exists("physician_product_recommendations"):
@@ -1975,7 +2507,7 @@ def ensure_schema() -> None:
                             f"ALTER TABLE physician_product_recommendations MODIFY COLUMN {column_name} {column_type}"
                         )
                 except Exception:
-                    pass
+                    _step_failed()
             if not _index_exists("physician_product_recommendations", "uniq_physician_recs_user_model"):
                 mysql_client.execute(
                     "ALTER TABLE physician_product_recommendations ADD UNIQUE KEY uniq_physician_recs_user_model (user_id, model_version)"
@@ -1985,7 +2517,7 @@ def ensure_schema() -> None:
                     "ALTER TABLE physician_product_recommendations ADD INDEX idx_physician_recs_user_generated (user_id, generated_at)"
                 )
     except Exception:
-        pass
+        _step_failed()
 
     try:
         if not _table_exists("patient_link_audit_events"):
@@ -2022,4 +2554,6 @@ def ensure_schema() -> None:
                 "ALTER TABLE patient_link_audit_events ADD INDEX idx_patient_link_audit_resource_ref (resource_ref)"
             )
     except Exception:
-        pass
+        _step_failed()
+
+    return not failed_steps
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from . import mysql_client
+
+logger = logging.getLogger(__name__)
+
+# Process-wide snapshot of the database's tables, columns and indexes. Loaded
+# with one information_schema query and shared by every repository that needs
+# to feature-detect optional columns, instead of each probing per request.
+_LOCK = threading.Lock()
+_COLUMNS: Optional[Dict[str, FrozenSet[str]]] = None
+_INDEXES: Dict[str, FrozenSet[str]] = {}
+_LOADED_AT = 0.0
+# A failed load is remembered briefly so an outage costs one information_schema
+# query per window, not one per caller queued on the lock.
+_LOAD_ERROR: Optional[Exception] = None
+_FAILED_AT = 0.0
+
+
+def _ttl_seconds() -> float:
+    raw = str(os.environ.get("MYSQL_SCHEMA_CATALOG_TTL_SECONDS", "600")).strip()
+    try:
+        value = float(raw)
+    except Exception:
+        value = 600.0
+    # 0 disables expiry; the catalog is then only refreshed by `invalidate()`.
+    return max(0.0, min(value, 24 * 60 * 60))
+
+
+def _failure_ttl_seconds() -> float:
+    raw = str(os.environ.get("MYSQL_SCHEMA_CATALOG_FAILURE_TTL_SECONDS", "5")).strip()
+    try:
+        value = float(raw)
+    except Exception:
+        value = 5.0
+    return max(0.0, min(value, 60.0))
+
+
+def _load() -> Tuple[Dict[str, FrozenSet[str]], Dict[str, FrozenSet[str]]]:
+    rows = mysql_client.fetch_all(
+        """
+        SELECT 'column' AS kind, TABLE_NAME AS table_name, COLUMN_NAME AS object_name
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        UNION ALL
+        SELECT DISTINCT 'index' AS kind, TABLE_NAME AS table_name, INDEX_NAME AS object_name
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        """,
+    )
+    columns: Dict[str, set[str]] = {}
+    indexes: Dict[str, set[str]] = {}
+    for row in rows or []:
+        table = str((row or {}).get("table_name") or "").strip().lower()
+        name = str((row or {}).get("object_name") or "").strip().lower()
+        if not table or not name:
+            continue
+        kind = str((row or {}).get("kind") or "").strip().lower()
+        bucket = indexes if kind == "index" else columns
+        bucket.setdefault(table, set()).add(name)
+    return (
+        {table: frozenset(names) for table, names in columns.items()},
+        {table: frozenset(names) for table, names in indexes.items()},
+    )
+
+
+def _catalog() -> Tuple[Dict[str, FrozenSet[str]], Dict[str, FrozenSet[str]]]:
+    global _COLUMNS, _INDEXES, _LOADED_AT, _LOAD_ERROR, _FAILED_AT
+    with _LOCK:
+        ttl = _ttl_seconds()
+        fresh = _COLUMNS is not None and (ttl <= 0 or (time.monotonic() - _LOADED_AT) < ttl)
+        if not fresh:
+            if _LOAD_ERROR is not None and (time.monotonic() - _FAILED_AT) < _failure_ttl_seconds():
+                raise RuntimeError("MySQL schema catalog unavailable") from _LOAD_ERROR
+            # Loading under the lock keeps concurrent first requests to one query.
+            try:
+                _COLUMNS, _INDEXES = _load()
+            except Exception as exc:
+                _LOAD_ERROR = exc
+                _FAILED_AT = time.monotonic()
+                raise
+            _LOADED_AT = time.monotonic()
+            _LOAD_ERROR = None
+        return _COLUMNS or {}, _INDEXES
+
+
+def invalidate() -> None:
+    """Drop the cached catalog; call after DDL so the next lookup reloads it."""
+    global _COLUMNS, _INDEXES, _LOADED_AT, _LOAD_ERROR, _FAILED_AT
+    with _LOCK:
+        _COLUMNS = None
+        _INDEXES = {}
+        _LOADED_AT = 0.0
+        _LOAD_ERROR = None
+        _FAILED_AT = 0.0
+
+
+def has_table(table: str) -> bool:
+    columns, _indexes = _catalog()
+    return str(table or "").strip().lower() in columns
+
+
+def columns(table: str) -> FrozenSet[str]:
+    """Lower-cased column names of `table` (empty when the table does not exist)."""
+    catalog, _indexes = _catalog()
+    return catalog.get(str(table or "").strip().lower(), frozenset())
+
+
+def has_column(table: str, column: str) -> bool:
+    return str(column or "").strip().lower() in columns(table)
+
+
+def indexes(table: str) -> FrozenSet[str]:
+    _columns, catalog = _catalog()
+    return catalog.get(str(table or "").strip().lower(), frozenset())
+
+
+def has_index(table: str, index: str) -> bool:
+    return str(index or "").strip().lower() in indexes(table)
@@ -9,6 +9,7 @@ import queue
 import re
 import threading
 import time
+from collections import OrderedDict
 from typing import Dict, Optional, Mapping, Any, List
 from uuid import uuid4
 
@@ -19,6 +20,8 @@ from zoneinfo import ZoneInfo
 
 from ..services import get_config
 from ..brand import with_legacy_meta_keys
+from ..utils import http_client
+from .woo_disk_cache import WooDiskCache
 
 logger = logging.getLogger(__name__)
 
@@ -60,17 +63,121 @@ _WOO_PROXY_DISK_CACHE_WRITE_QUEUE_SIZE = int(
     os.environ.get("WOO_PROXY_DISK_CACHE_WRITE_QUEUE_SIZE", "64").strip() or 64
 )
 _WOO_PROXY_DISK_CACHE_WRITE_QUEUE_SIZE = max(1, min(_WOO_PROXY_DISK_CACHE_WRITE_QUEUE_SIZE, 512))
+_WOO_PROXY_DISK_CACHE_MAX_BYTES = int(
+    os.environ.get("WOO_PROXY_DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024)).strip() or 256 * 1024 * 1024
+)
+_WOO_PROXY_DISK_CACHE_MAX_BYTES = max(4 * 1024 * 1024, _WOO_PROXY_DISK_CACHE_MAX_BYTES)
+_WOO_PROXY_DISK_CACHE_MAX_AGE_MS = int(
+    os.environ.get("WOO_PROXY_DISK_CACHE_MAX_AGE_MS", str(7 * 24 * 60 * 60 * 1000)).strip() or 0
+)
+_WOO_PROXY_DISK_CACHE_MAX_AGE_MS = max(_WOO_PROXY_MAX_STALE_MS, _WOO_PROXY_DISK_CACHE_MAX_AGE_MS)
+
+_WOO_PROXY_MEMORY_CACHE_MAX_BYTES = int(
+    os.environ.get("WOO_PROXY_MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)).strip() or 64 * 1024 * 1024
+)
+_WOO_PROXY_MEMORY_CACHE_MAX_BYTES = max(1024 * 1024, min(_WOO_PROXY_MEMORY_CACHE_MAX_BYTES, 2 * 1024 * 1024 * 1024))
+_MAX_IN_MEMORY_CACHE_KEYS = 2000
+_MAX_PROXY_FAILURE_KEYS = 1000
+_CACHE_ENTRY_OVERHEAD_BYTES = 256
+
+
+class _CatalogMemoryCache:
+    """
+    Byte-budgeted LRU for proxied catalog responses. All access happens under
+    `_catalog_cache_lock`. When over budget (or over `max_keys`) it evicts
+    least-recently-used *expired* entries first, so stale-while-revalidate
+    copies give way before fresh ones, then plain LRU, one entry at a time
+    instead of dropping the whole cache. `lookup` is the counted read used by
+    `fetch_catalog_proxy`; `get` is an uncounted re-check.
+    """
+
+    def __init__(self, *, max_bytes: int, max_keys: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "staleHits": 0, "misses": 0, "evictions": 0, "staleEvictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self._entries.move_to_end(cache_key)
+        return entry
+
+    def lookup(self, cache_key: str, now_ms: int) -> Optional[Dict[str, Any]]:
+        entry = self.get(cache_key)
+        if entry is None or entry.get("data") is None:
+            self._counters["misses"] += 1
+        elif int(entry.get("expiresAt") or 0) > now_ms:
+            self._counters["hits"] += 1
+        else:
+            self._counters["staleHits"] += 1
+        return entry
+
+    def set(self, cache_key: str, data: Any, expires_at_ms: int, size_bytes: int, now_ms: int) -> None:
+        previous = self._entries.pop(cache_key, None)
+        if previous is not None:
+            self._bytes -= previous["size"]
+        if size_bytes > self.max_bytes:
+            # Never let one oversized page flush everything else.
+            return
+        self._entries[cache_key] = {"data": data, "expiresAt": expires_at_ms, "size": size_bytes}
+        self._bytes += size_bytes
+        self._evict(now_ms, keep=cache_key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _over_budget(self) -> bool:
+        return self._bytes > self.max_bytes or len(self._entries) > self.max_keys
+
+    def _drop(self, cache_key: str, *, stale: bool) -> None:
+        entry = self._entries.pop(cache_key)
+        self._bytes -= entry["size"]
+        self._counters["evictions"] += 1
+        if stale:
+            self._counters["staleEvictions"] += 1
+
+    def _evict(self, now_ms: int, *, keep: str) -> None:
+        if not self._over_budget():
+            return
+        expired = [key for key, entry in self._entries.items() if entry["expiresAt"] <= now_ms and key != keep]
+        for cache_key in expired:
+            self._drop(cache_key, stale=True)
+            if not self._over_budget():
+                return
+        while self._over_budget() and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)), stale=False)
+
+    def stats(self, now_ms: int) -> Dict[str, Any]:
+        stale_entries = [entry for entry in self._entries.values() if entry["expiresAt"] <= now_ms]
+        lookups = self._counters["hits"] + self._counters["staleHits"] + self._counters["misses"]
+        return {
+            **self._counters,
+            "hitRate": round((self._counters["hits"] + self._counters["staleHits"]) / lookups, 4) if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "maxBytes": self.max_bytes,
+            "staleEntries": len(stale_entries),
+            "staleBytes": sum(entry["size"] for entry in stale_entries),
+        }
+
 
-_catalog_cache: Dict[str, Dict[str, Any]] = {}
+_catalog_cache = _CatalogMemoryCache(max_bytes=_WOO_PROXY_MEMORY_CACHE_MAX_BYTES, max_keys=_MAX_IN_MEMORY_CACHE_KEYS)
 _catalog_cache_lock = threading.Lock()
 _inflight: Dict[str, Dict[str, Any]] = {}
-_MAX_IN_MEMORY_CACHE_KEYS = 500
 _proxy_failures: Dict[str, Dict[str, Any]] = {}
 _disk_cache_write_queue: "queue.Queue[tuple[str, Dict[str, Any]]]" = queue.Queue(
     maxsize=_WOO_PROXY_DISK_CACHE_WRITE_QUEUE_SIZE
 )
 _disk_cache_writer_lock = threading.Lock()
 _disk_cache_writer_started = False
+_disk_cache_store_instance: Optional[WooDiskCache] = None
+_disk_cache_store_failed = False
 _WOO_PROXY_FAILURE_COOLDOWN_SECONDS = int(os.environ.get("WOO_PROXY_FAILURE_COOLDOWN_SECONDS", "30").strip() or 30)
 _WOO_PROXY_FAILURE_COOLDOWN_SECONDS = max(5, min(_WOO_PROXY_FAILURE_COOLDOWN_SECONDS, 900))
 _WOO_PROXY_FAILURE_MAX_COOLDOWN_SECONDS = int(os.environ.get("WOO_PROXY_FAILURE_MAX_COOLDOWN_SECONDS", "300").strip() or 300)
@@ -413,9 +520,25 @@ def _record_proxy_failure(cache_key: str, *, status: Optional[int]) -> int:
             }
         )
         _proxy_failures[cache_key] = state
+        if len(_proxy_failures) > _MAX_PROXY_FAILURE_KEYS:
+            _prune_proxy_failures(now_ms)
     return cooldown_seconds
 
 
+def _prune_proxy_failures(now_ms: int) -> None:
+    # Drop entries whose cooldown and fail-count window have both lapsed, then
+    # the oldest errors, so per-key failure state cannot grow without bound.
+    reset_ms = _WOO_PROXY_FAILURE_RESET_AFTER_SECONDS * 1000
+    for key, state in list(_proxy_failures.items()):
+        if int(state.get("cooldownUntil") or 0) <= now_ms and now_ms - int(state.get("lastErrorAt") or 0) >= reset_ms:
+            _proxy_failures.pop(key, None)
+    overflow = len(_proxy_failures) - _MAX_PROXY_FAILURE_KEYS
+    if overflow > 0:
+        oldest = sorted(_proxy_failures, key=lambda key: int(_proxy_failures[key].get("lastErrorAt") or 0))
+        for key in oldest[:overflow]:
+            _proxy_failures.pop(key, None)
+
+
 def _clear_proxy_failure(cache_key: str) -> None:
     with _catalog_cache_lock:
         _proxy_failures.pop(cache_key, None)
@@ -476,22 +599,62 @@ def _disk_cache_dir():
 
 
 def _disk_cache_path(cache_key: str) -> str:
+    # Legacy one-file-per-key layout; only read to migrate entries into the store.
     digest = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
     return os.path.join(_disk_cache_dir(), f"{digest}.json")
 
 
+def _disk_cache_store() -> Optional[WooDiskCache]:
+    global _disk_cache_store_instance, _disk_cache_store_failed
+    if _disk_cache_store_instance is not None or _disk_cache_store_failed:
+        return _disk_cache_store_instance
+    with _disk_cache_writer_lock:
+        if _disk_cache_store_instance is None and not _disk_cache_store_failed:
+            try:
+                explicit = str(os.environ.get("WOO_PROXY_DISK_CACHE_PATH") or "").strip()
+                path = explicit or str(get_config().data_dir / "woo-proxy-cache.sqlite3")
+                _disk_cache_store_instance = WooDiskCache(
+                    path,
+                    max_bytes=_WOO_PROXY_DISK_CACHE_MAX_BYTES,
+                    max_age_ms=_WOO_PROXY_DISK_CACHE_MAX_AGE_MS,
+                )
+            except Exception:
+                _disk_cache_store_failed = True
+                logger.warning("Woo proxy disk cache unavailable", exc_info=True)
+    return _disk_cache_store_instance
+
+
+def _read_legacy_disk_cache(cache_key: str) -> Optional[Dict[str, Any]]:
+    path = _disk_cache_path(cache_key)
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            parsed = json.load(fh)
+    except Exception:
+        return None
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    if not isinstance(parsed, dict) or "data" not in parsed:
+        return None
+    _write_disk_cache(cache_key, parsed)
+    return parsed
+
+
 def _read_disk_cache(cache_key: str) -> Optional[Dict[str, Any]]:
     if not _WOO_PROXY_DISK_CACHE_ENABLED:
         return None
+    store = _disk_cache_store()
+    if store is None:
+        return None
     try:
-        path = _disk_cache_path(cache_key)
-        with open(path, "r", encoding="utf-8") as fh:
-            parsed = json.load(fh)
-        if not isinstance(parsed, dict) or "data" not in parsed:
-            return None
-        return parsed
+        cached = store.get(cache_key)
     except Exception:
+        logger.debug("Woo proxy disk cache read failed", exc_info=True, extra={"cacheKey": cache_key})
         return None
+    if cached is not None:
+        return cached
+    return _read_legacy_disk_cache(cache_key)
 
 
 def _ensure_disk_cache_writer() -> None:
@@ -516,13 +679,11 @@ def _disk_cache_writer_loop() -> None:
 def _write_disk_cache_sync(cache_key: str, payload: Dict[str, Any]) -> None:
     if not _WOO_PROXY_DISK_CACHE_ENABLED:
         return
+    store = _disk_cache_store()
+    if store is None:
+        return
     try:
-        os.makedirs(_disk_cache_dir(), exist_ok=True)
-        path = _disk_cache_path(cache_key)
-        tmp = f"{path}.tmp"
-        with open(tmp, "w", encoding="utf-8") as fh:
-            json.dump(payload, fh, ensure_ascii=False)
-        os.replace(tmp, path)
+        store.put(cache_key, payload)
     except Exception:
         logger.debug("Woo proxy disk cache write failed", exc_info=True, extra={"cacheKey": cache_key})
 
@@ -552,6 +713,24 @@ def _build_private_cache_key(prefix: str, payload: Dict[str, Any]) -> str:
     return f"{normalized_prefix}::{json.dumps(payload, sort_keys=True, separators=(',', ':'))}"
 
 
+def _woo_request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    # Pooled keep-alive session per Woo host, sized to the Woo concurrency cap.
+    session = http_client.session_for(url, pool_maxsize=_WOO_HTTP_CONCURRENCY)
+    return http_client.send(session, method, url, **kwargs)
+
+
+def _http_get(url: str, **kwargs: Any) -> requests.Response:
+    return _woo_request("GET", url, **kwargs)
+
+
+def _http_post(url: str, **kwargs: Any) -> requests.Response:
+    return _woo_request("POST", url, **kwargs)
+
+
+def _http_put(url: str, **kwargs: Any) -> requests.Response:
+    return _woo_request("PUT", url, **kwargs)
+
+
 def _fetch_catalog_http(
     endpoint: str,
     params: Optional[Mapping[str, Any]] = None,
@@ -671,7 +850,7 @@ def _catalog_get_with_wall_timeout(
 
     def run_request() -> None:
         try:
-            response = requests.get(url, params=params, auth=auth, timeout=request_timeout)
+            response = _http_get(url, params=params, auth=auth, timeout=request_timeout)
             result = ("response", response)
         except BaseException as exc:  # pragma: no cover - exercised through caller behavior
             result = ("error", exc)
@@ -727,8 +906,9 @@ def fetch_catalog_fresh(
     expires_at = now_ms + ttl_seconds * 1000
 
     event: threading.Event | None = None
+    size_bytes = _estimate_cache_bytes(data)
     with _catalog_cache_lock:
-        _set_in_memory_cache(cache_key, data, expires_at)
+        _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
         inflight = _inflight.get(cache_key)
         if inflight:
             inflight["data"] = data
@@ -781,7 +961,7 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
         event: threading.Event | None = None
         with _catalog_cache_lock:
             cooldown_seconds = _proxy_cooldown_seconds(cache_key, now_ms)
-            cached = _catalog_cache.get(cache_key)
+            cached = _catalog_cache.lookup(cache_key, now_ms)
             if cached and cached.get("data") is not None and allow_stale:
                 if cooldown_seconds <= 0:
                     _start_background_refresh(cache_key, endpoint, params, ttl_seconds)
@@ -811,8 +991,9 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
             data = disk_cached.get("data")
             # Populate a short in-memory TTL to reduce stampedes while the refresh runs.
             expires_at = now_ms + min(ttl_seconds, 30) * 1000
+            size_bytes = _estimate_cache_bytes(data)
             with _catalog_cache_lock:
-                _set_in_memory_cache(cache_key, data, expires_at)
+                _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
             _start_background_refresh(cache_key, endpoint, params, ttl_seconds)
             return data, {"cache": "FORCE_DISK_STALE", "ttlSeconds": ttl_seconds, "noStore": True}
 
@@ -832,8 +1013,9 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
                 _clear_proxy_failure(cache_key)
                 now_ms = _now_ms()
                 expires_at = now_ms + ttl_seconds * 1000
+                size_bytes = _estimate_cache_bytes(data)
                 with _catalog_cache_lock:
-                    _set_in_memory_cache(cache_key, data, expires_at)
+                    _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
                     inflight = _inflight.get(cache_key)
                     if inflight:
                         inflight["data"] = data
@@ -871,7 +1053,7 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
 
     with _catalog_cache_lock:
         cooldown_seconds = _proxy_cooldown_seconds(cache_key, now_ms)
-        cached = _catalog_cache.get(cache_key)
+        cached = _catalog_cache.lookup(cache_key, now_ms)
         if cooldown_seconds > 0 and cached and cached.get("data") is not None:
             return (
                 cached.get("data"),
@@ -939,8 +1121,9 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
         data = disk_cached.get("data")
         expires_at = int(disk_cached.get("expiresAt"))
         if allow_stale or expires_at > now_ms:
+            size_bytes = _estimate_cache_bytes(data)
             with _catalog_cache_lock:
-                _set_in_memory_cache(cache_key, data, expires_at)
+                _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
             if expires_at > now_ms:
                 return data, {"cache": "DISK", "ttlSeconds": ttl_seconds}
             # Serve stale from disk and refresh (deduped).
@@ -956,8 +1139,9 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
             fetched_at = 0
         # Keep a short in-memory TTL to avoid stampedes while refresh is attempted.
         expires_at = now_ms + min(ttl_seconds, 30) * 1000
+        size_bytes = _estimate_cache_bytes(data)
         with _catalog_cache_lock:
-            _set_in_memory_cache(cache_key, data, expires_at)
+            _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
         if cooldown_seconds <= 0:
             _start_background_refresh(cache_key, endpoint, params, ttl_seconds)
         meta: Dict[str, Any] = {"cache": "DISK_VERY_STALE", "ttlSeconds": ttl_seconds}
@@ -989,8 +1173,9 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
             _clear_proxy_failure(cache_key)
             now_ms = _now_ms()
             expires_at = now_ms + ttl_seconds * 1000
+            size_bytes = _estimate_cache_bytes(data)
             with _catalog_cache_lock:
-                _set_in_memory_cache(cache_key, data, expires_at)
+                _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
                 inflight = _inflight.get(cache_key)
                 if inflight:
                     inflight["data"] = data
@@ -1036,10 +1221,30 @@ def fetch_catalog_proxy(endpoint: str, params: Optional[Mapping[str, Any]] = Non
     raise err
 
 
-def _set_in_memory_cache(cache_key: str, data: Any, expires_at_ms: int) -> None:
-    if len(_catalog_cache) >= _MAX_IN_MEMORY_CACHE_KEYS:
-        _catalog_cache.clear()
-    _catalog_cache[cache_key] = {"data": data, "expiresAt": expires_at_ms}
+def _estimate_cache_bytes(data: Any) -> int:
+    # Serialized size as a proxy for memory use; computed outside the cache lock.
+    try:
+        encoded = json.dumps(data, separators=(",", ":"), default=str)
+    except Exception:
+        encoded = repr(data)
+    return len(encoded) + _CACHE_ENTRY_OVERHEAD_BYTES
+
+
+def _set_in_memory_cache(cache_key: str, data: Any, expires_at_ms: int, size_bytes: int) -> None:
+    _catalog_cache.set(cache_key, data, expires_at_ms, size_bytes, _now_ms())
+
+
+def get_catalog_cache_stats() -> Dict[str, Any]:
+    """Catalog proxy cache counters and footprint (memory for this worker, plus the shared disk store)."""
+    with _catalog_cache_lock:
+        stats = _catalog_cache.stats(_now_ms())
+        stats["failureKeys"] = len(_proxy_failures)
+    store = _disk_cache_store() if _WOO_PROXY_DISK_CACHE_ENABLED else None
+    try:
+        stats["disk"] = store.stats() if store is not None else None
+    except Exception:
+        stats["disk"] = None
+    return stats
 
 
 def _start_background_refresh(cache_key: str, endpoint: str, params: Optional[Mapping[str, Any]], ttl_seconds: int) -> None:
@@ -1072,8 +1277,9 @@ def _refresh_proxy_cache(cache_key: str, endpoint: str, params: Optional[Mapping
         _clear_proxy_failure(cache_key)
         now_ms = _now_ms()
         expires_at = now_ms + ttl_seconds * 1000
+        size_bytes = _estimate_cache_bytes(data)
         with _catalog_cache_lock:
-            _set_in_memory_cache(cache_key, data, expires_at)
+            _set_in_memory_cache(cache_key, data, expires_at, size_bytes)
             inflight = _inflight.get(cache_key)
             if inflight:
                 inflight["data"] = data
@@ -1275,7 +1481,7 @@ def _ensure_trufusion_manual_tax_rate_id() -> Optional[int]:
                 setattr(err, "status", 503)
                 raise err
             try:
-                response = requests.post(url, json=payload, auth=auth, timeout=timeout)
+                response = _http_post(url, json=payload, auth=auth, timeout=timeout)
             finally:
                 try:
                     _woo_http_semaphore.release()
@@ -1611,7 +1817,7 @@ def forward_order(order: Dict, customer: Dict) -> Dict:
     timeout_seconds = max(5, min(timeout_seconds, 90))
 
     try:
-        response = requests.post(
+        response = _http_post(
             url,
             json=payload,
             auth=HTTPBasicAuth(
@@ -1718,7 +1924,7 @@ def mark_order_paid(details: Dict[str, Any]) -> Dict[str, Any]:
     else:
         payment_method_title = "Card payment"
     try:
-        response = requests.put(
+        response = _http_put(
             url,
             json={
                 "status": "processing",
@@ -1801,7 +2007,7 @@ def update_order_metadata(details: Dict[str, Any]) -> Dict[str, Any]:
 
     timeout_seconds = get_config().woo_commerce.get("request_timeout_seconds") or 25
     try:
-        response = requests.put(
+        response = _http_put(
             url,
             json=payload,
             auth=HTTPBasicAuth(
@@ -1859,7 +2065,7 @@ def cancel_order(woo_order_id: str, reason: str = "", status_override: Optional[
     timeout_seconds = get_config().woo_commerce.get("request_timeout_seconds") or 25
 
     try:
-        response = requests.put(
+        response = _http_put(
             url,
             json={
                 "status": next_status,
@@ -1928,7 +2134,7 @@ def create_refund(
         payload["meta_data"] = [{"key": k, "value": v} for k, v in metadata.items() if k]
 
     try:
-        response = requests.post(
+        response = _http_post(
             url,
             json=payload,
             auth=HTTPBasicAuth(
@@ -2058,7 +2264,7 @@ def fetch_catalog(endpoint: str, params: Optional[Mapping[str, Any]] = None) ->
             setattr(err, "status", 503)
             raise err
         try:
-            response = requests.get(
+            response = _http_get(
                 url,
                 params=_sanitize_params(params or {}),
                 auth=HTTPBasicAuth(
@@ -2111,7 +2317,7 @@ def find_product_by_sku(sku: Optional[str]) -> Optional[Dict[str, Any]]:
     url = f"{base_url}/wp-json/{api_version}/products"
 
     try:
-        response = requests.get(
+        response = _http_get(
             url,
             params={"sku": sku, "per_page": 1},
             auth=auth,
@@ -2175,7 +2381,7 @@ def add_order_note(woo_order_id: str, note: str, *, customer_note: bool = False)
             setattr(err, "status", 503)
             raise err
 
-        response = requests.post(
+        response = _http_post(
             url,
             json={"note": str(note), "customer_note": bool(customer_note)},
             auth=HTTPBasicAuth(
@@ -2300,7 +2506,7 @@ def apply_shipstation_shipment_update(
             setattr(err, "status", 503)
             raise err
 
-        response = requests.put(
+        response = _http_put(
             url,
             json=payload,
             auth=HTTPBasicAuth(
@@ -2359,7 +2565,7 @@ def update_product_inventory(
     payload = {"manage_stock": True, "stock_quantity": stock_quantity if stock_quantity is not None else None}
 
     try:
-        response = requests.put(endpoint, json=payload, auth=auth, timeout=timeout)
+        response = _http_put(endpoint, json=payload, auth=auth, timeout=timeout)
         response.raise_for_status()
     except requests.RequestException as exc:  # pragma: no cover - defensive logging
         data = None
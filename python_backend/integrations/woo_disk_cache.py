@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Woo proxy responses persisted in one WAL-mode SQLite file that every worker on
+# the host opens. `fetched_at`/`expires_at` are plain indexed columns, so reads
+# are one primary-key lookup and eviction never has to open the payloads. The
+# file is bounded by `max_bytes` of payload (oldest-expiring rows go first) and
+# rows older than `max_age_ms` are dropped outright.
+
+_EVICT_EVERY_WRITES = 32
+
+
+class WooDiskCache:
+    def __init__(self, path: Path, *, max_bytes: int, max_age_ms: int) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_ms = max_age_ms
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def _opened(self) -> bool:
+        return getattr(self._local, "connection", None) is not None and getattr(self._local, "pid", None) == os.getpid()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process; WAL lets readers in every
+        # worker run alongside the single writer thread.
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and getattr(self._local, "pid", None) == os.getpid():
+            return connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS woo_proxy_cache (
+                cache_key TEXT PRIMARY KEY,
+                fetched_at INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_woo_proxy_cache_expires ON woo_proxy_cache (expires_at)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_woo_proxy_cache_fetched ON woo_proxy_cache (fetched_at)")
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if not self._opened() and not self.path.exists():
+            # Reads never create the file; the first write does.
+            return None
+        row = self._connection().execute(
+            "SELECT fetched_at, expires_at, payload FROM woo_proxy_cache WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"data": json.loads(row[2]), "fetchedAt": int(row[0]), "expiresAt": int(row[1])}
+
+    def put(self, cache_key: str, payload: Dict[str, Any]) -> None:
+        encoded = json.dumps(payload.get("data"), ensure_ascii=False, separators=(",", ":"))
+        self._connection().execute(
+            """
+            INSERT INTO woo_proxy_cache (cache_key, fetched_at, expires_at, size, payload)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                fetched_at = excluded.fetched_at,
+                expires_at = excluded.expires_at,
+                size = excluded.size,
+                payload = excluded.payload
+            """,
+            (
+                cache_key,
+                int(payload.get("fetchedAt") or 0),
+                int(payload.get("expiresAt") or 0),
+                len(encoded.encode("utf-8")),
+                encoded,
+            ),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % _EVICT_EVERY_WRITES == 0
+        if due:
+            self.evict()
+
+    def evict(self, *, now_ms: Optional[int] = None) -> int:
+        """Drop rows past `max_age_ms`, then the soonest-expired rows until under `max_bytes`."""
+        connection = self._connection()
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        removed = connection.execute(
+            "DELETE FROM woo_proxy_cache WHERE fetched_at < ?",
+            (now_ms - self.max_age_ms,),
+        ).rowcount
+        total = int(connection.execute("SELECT COALESCE(SUM(size), 0) FROM woo_proxy_cache").fetchone()[0])
+        if total <= self.max_bytes:
+            return removed
+        excess = total - self.max_bytes
+        victims = []
+        for cache_key, size in connection.execute(
+            "SELECT cache_key, size FROM woo_proxy_cache ORDER BY expires_at ASC"
+        ):
+            victims.append((cache_key,))
+            excess -= int(size)
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM woo_proxy_cache WHERE cache_key = ?", victims)
+        return removed + len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        if not self._opened() and not self.path.exists():
+            return {"entries": 0, "bytes": 0, "maxBytes": self.max_bytes}
+        row = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM woo_proxy_cache").fetchone()
+        return {"entries": int(row[0]), "bytes": int(row[1]), "maxBytes": self.max_bytes}
@@ -64,6 +64,9 @@ def init_rate_limit(app: Flask) -> None:
     def _rate_limit() -> None:  # type: ignore[return-value]
         if request.method == "OPTIONS":
             return
+        # Re-checks issued by the async presence server on behalf of parked long-polls.
+        if request.environ.get("trufusion.longpoll_recheck"):
+            return
         if not _is_api_path(request.path) or _is_exempt(request.path):
             return
 
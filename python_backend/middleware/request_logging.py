@@ -15,6 +15,10 @@ _ACTIVE_SEQUENCE = itertools.count(1)
 
 
 def _should_track(path: str) -> bool:
+    # Re-checks issued by the async presence server on behalf of parked
+    # long-polls aren't client requests; the client's own request is logged.
+    if request.environ.get("trufusion.longpoll_recheck"):
+        return False
     return path.startswith("/api")
 
 
@@ -0,0 +1,478 @@
+"""
+Event-loop HTTP server for the presence route set.
+
+`presence_wsgi:app` under gunicorn gthread pins one worker thread to every open
+long-poll, so a few admin tabs can use up `--threads`. This server runs the same
+Flask app (`create_presence_app`) but parks long-polls on a single asyncio loop:
+
+- A long-poll is answered by calling the matching Flask view *without* the
+  client's `etag` (the view then returns its current payload immediately). If
+  the payload etag differs from the client's, that response is sent; otherwise
+  the connection is parked without holding a thread.
+- One watcher thread follows `presence_service.wait_for_change` and fans every
+  revision out to the parked polls. Parked polls with identical requests (path,
+  query and credentials) share one re-check per change, and re-checks are
+  throttled to PRESENCE_LONGPOLL_RECHECK_SECONDS per group.
+- Everything else (presence pings, health, the first call of an SSE request) is
+  passed to the Flask app on a small thread pool (PRESENCE_ASYNC_THREADS).
+- Streaming responses (`/api/events` SSE, whose generator blocks in
+  `resource_version_service.wait_for_change` between events) are relayed from a
+  separate pool of PRESENCE_ASYNC_STREAM_THREADS threads, so open streams can
+  never take the threads pings need. At most that many streams are open at
+  once; further streams are refused with 503 and a Retry-After.
+
+Run with `python -m python_backend.presence_async --bind 0.0.0.0:8001`. Responses
+close the connection (no keep-alive), which nginx handles transparently.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode
+
+logger = logging.getLogger(__name__)
+
+# Long-poll routes and what a poll that times out without a change answers with:
+# "empty" -> 204, "last" -> the latest payload (matches the Flask views).
+LONGPOLL_ROUTES: Dict[str, str] = {
+    "/api/settings/live-users/longpoll": "empty",
+    "/api/settings/live-clients/longpoll": "empty",
+    "/api/settings/user-activity/longpoll": "last",
+}
+# Set on the WSGI environ of server-initiated re-checks so rate limiting and
+# request logging don't count them as client requests.
+RECHECK_ENVIRON_KEY = "trufusion.longpoll_recheck"
+
+_MAX_HEADER_BYTES = 64 * 1024
+_MAX_BODY_BYTES = 1024 * 1024
+_DEFAULT_TIMEOUT_MS = 25000
+
+_Response = Tuple[str, List[Tuple[str, str]], bytes]
+
+
+def _env_float(name: str, default: float, *, low: float, high: float) -> float:
+    try:
+        value = float(os.environ.get(name) or default)
+    except Exception:
+        value = default
+    return max(low, min(value, high))
+
+
+def _longpoll_timeout_seconds(query: List[Tuple[str, str]]) -> float:
+    raw = next((value for key, value in query if key == "timeoutMs"), None)
+    try:
+        timeout_ms = int(raw or _DEFAULT_TIMEOUT_MS)
+    except Exception:
+        timeout_ms = _DEFAULT_TIMEOUT_MS
+    return max(1000, min(timeout_ms, 30000)) / 1000.0
+
+
+def _payload_etag(response: _Response) -> Optional[str]:
+    status, headers, body = response
+    if not status.startswith("200"):
+        return None
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except Exception:
+        return None
+    etag = payload.get("etag") if isinstance(payload, dict) else None
+    if etag is None:
+        return None
+    return str(etag).strip() or None
+
+
+@dataclass
+class _Waiter:
+    client_etag: str
+    future: "asyncio.Future[_Response]"
+
+
+@dataclass
+class _PollGroup:
+    """Parked polls that would get the same answer from the Flask view."""
+
+    environ: Dict[str, Any]
+    waiters: List[_Waiter] = field(default_factory=list)
+    dirty: bool = False
+    checking: bool = False
+    last_check: float = 0.0
+
+
+class PresenceLongPollServer:
+    def __init__(
+        self,
+        app: Callable[..., Any],
+        *,
+        threads: Optional[int] = None,
+        stream_threads: Optional[int] = None,
+        recheck_seconds: Optional[float] = None,
+        revision_source: Any = None,
+    ) -> None:
+        self.app = app
+        self.threads = int(threads or _env_float("PRESENCE_ASYNC_THREADS", 8, low=1, high=64))
+        self.stream_threads = int(stream_threads or _env_float("PRESENCE_ASYNC_STREAM_THREADS", 64, low=1, high=1024))
+        self.recheck_seconds = (
+            float(recheck_seconds)
+            if recheck_seconds is not None
+            else _env_float("PRESENCE_LONGPOLL_RECHECK_SECONDS", 0.25, low=0.0, high=5.0)
+        )
+        if revision_source is None:
+            from .services import presence_service as revision_source
+        self.revisions = revision_source
+        self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="presence-wsgi")
+        self._stream_executor = ThreadPoolExecutor(max_workers=self.stream_threads, thread_name_prefix="presence-stream")
+        self._groups: Dict[Tuple[str, ...], _PollGroup] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = threading.Event()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.parked = 0
+        self.streams = 0
+
+    # Lifecycle --------------------------------------------------------------
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            host,
+            port,
+            limit=_MAX_HEADER_BYTES,
+            backlog=2048,
+        )
+        threading.Thread(target=self._watch_revisions, name="presence-async-watcher", daemon=True).start()
+        return self._server
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._stream_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _watch_revisions(self) -> None:
+        revision = self.revisions.current_revision()
+        while not self._stopping.is_set():
+            try:
+                latest = self.revisions.wait_for_change(revision, timeout_s=1.0)
+            except Exception:
+                logger.warning("Presence revision watch failed", exc_info=True)
+                self._stopping.wait(1.0)
+                continue
+            if latest != revision and self._loop is not None:
+                revision = latest
+                self._loop.call_soon_threadsafe(self._on_revision_change)
+
+    # WSGI bridge ------------------------------------------------------------
+
+    def _call_app(self, environ: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]], Optional[bytes], Optional[Iterator[bytes]]]:
+        """Run the Flask app; buffer sized bodies, hand back an iterator for streams."""
+        captured: Dict[str, Any] = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured["status"] = status
+            captured["headers"] = list(headers)
+            return lambda chunk: None
+
+        result = self.app(environ, start_response)
+        headers = captured.get("headers") or []
+        if any(name.lower() == "content-length" for name, _ in headers) or isinstance(result, (list, tuple)):
+            try:
+                body = b"".join(result)
+            finally:
+                close = getattr(result, "close", None)
+                if close is not None:
+                    close()
+            return captured.get("status") or "500 INTERNAL SERVER ERROR", headers, body, None
+        return captured.get("status") or "500 INTERNAL SERVER ERROR", headers, None, iter(result)
+
+    async def _call(self, environ: Dict[str, Any]) -> _Response:
+        assert self._loop is not None
+        status, headers, body, stream = await self._loop.run_in_executor(self._executor, self._call_app, environ)
+        if body is None and stream is not None:
+            body = await self._loop.run_in_executor(self._executor, b"".join, stream)
+        return status, headers, body or b""
+
+    # Long-polls -------------------------------------------------------------
+
+    async def _longpoll(
+        self,
+        environ: Dict[str, Any],
+        path: str,
+        reader: asyncio.StreamReader,
+    ) -> _Response:
+        query = parse_qsl(environ.get("QUERY_STRING") or "", keep_blank_values=True)
+        client_etag = next((value.strip() for key, value in query if key == "etag"), "")
+        timeout_s = _longpoll_timeout_seconds(query)
+        peek_query = sorted((key, value) for key, value in query if key not in ("etag", "timeoutMs"))
+        peek_environ = dict(environ, QUERY_STRING=urlencode(peek_query))
+
+        response = await self._call(dict(peek_environ, **{"wsgi.input": io.BytesIO(b"")}))
+        etag = _payload_etag(response)
+        if not client_etag or etag is None or etag != client_etag:
+            return response
+
+        key = (
+            path,
+            peek_environ["QUERY_STRING"],
+            str(environ.get("HTTP_AUTHORIZATION") or ""),
+            str(environ.get("HTTP_COOKIE") or ""),
+        )
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _PollGroup(environ=dict(peek_environ, **{RECHECK_ENVIRON_KEY: True}))
+        assert self._loop is not None
+        waiter = _Waiter(client_etag=client_etag, future=self._loop.create_future())
+        group.waiters.append(waiter)
+        self.parked += 1
+        disconnect = asyncio.ensure_future(reader.read(1))
+        try:
+            done, _ = await asyncio.wait({waiter.future, disconnect}, timeout=timeout_s, return_when=asyncio.FIRST_COMPLETED)
+            if waiter.future in done:
+                return waiter.future.result()
+            # Timed out (or the client went away, in which case nobody reads this).
+            if LONGPOLL_ROUTES.get(path) == "last":
+                return response
+            return "204 NO CONTENT", [], b""
+        finally:
+            self.parked -= 1
+            disconnect.cancel()
+            if waiter in group.waiters:
+                group.waiters.remove(waiter)
+            if not group.waiters and self._groups.get(key) is group and not group.checking:
+                self._groups.pop(key, None)
+
+    def _on_revision_change(self) -> None:
+        for group in list(self._groups.values()):
+            group.dirty = True
+            if not group.checking and group.waiters:
+                group.checking = True
+                asyncio.ensure_future(self._recheck(group))
+
+    async def _recheck(self, group: _PollGroup) -> None:
+        assert self._loop is not None
+        try:
+            while group.dirty and group.waiters:
+                wait = group.last_check + self.recheck_seconds - self._loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                group.dirty = False
+                group.last_check = self._loop.time()
+                try:
+                    response = await self._call(dict(group.environ, **{"wsgi.input": io.BytesIO(b"")}))
+                except Exception:
+                    logger.warning("Presence long-poll re-check failed", exc_info=True)
+                    continue
+                etag = _payload_etag(response)
+                for waiter in list(group.waiters):
+                    if etag is None or etag != waiter.client_etag:
+                        group.waiters.remove(waiter)
+                        if not waiter.future.done():
+                            waiter.future.set_result(response)
+        finally:
+            group.checking = False
+            for key, candidate in list(self._groups.items()):
+                if candidate is group and not group.waiters:
+                    self._groups.pop(key, None)
+
+    # HTTP -------------------------------------------------------------------
+
+    def _environ(
+        self,
+        method: str,
+        target: str,
+        version: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        writer: asyncio.StreamWriter,
+    ) -> Dict[str, Any]:
+        path, _, query = target.partition("?")
+        sockname = writer.get_extra_info("sockname") or ("", 0)
+        peername = writer.get_extra_info("peername") or ("", 0)
+        environ: Dict[str, Any] = {
+            "REQUEST_METHOD": method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote(path, encoding="latin-1"),
+            "QUERY_STRING": query,
+            "SERVER_NAME": str(sockname[0] if isinstance(sockname, tuple) else "localhost"),
+            "SERVER_PORT": str(sockname[1] if isinstance(sockname, tuple) and len(sockname) > 1 else ""),
+            "SERVER_PROTOCOL": version,
+            "REMOTE_ADDR": str(peername[0] if isinstance(peername, tuple) else ""),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers:
+            key = name.upper().replace("-", "_")
+            if key == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+            elif key == "CONTENT_LENGTH":
+                environ["CONTENT_LENGTH"] = value
+            else:
+                header_key = f"HTTP_{key}"
+                environ[header_key] = f"{environ[header_key]},{value}" if header_key in environ else value
+        return environ
+
+    async def _read_request(
+        self,
+        reader: asyncio.StreamReader,
+    ) -> Optional[Tuple[str, str, str, List[Tuple[str, str]], bytes]]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers: List[Tuple[str, str]] = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers.append((name.strip(), value.strip()))
+        lowered = {name.lower(): value for name, value in headers}
+        if "chunked" in lowered.get("transfer-encoding", "").lower():
+            raise ValueError("chunked request bodies are not supported")
+        length = int(lowered.get("content-length") or 0)
+        if length < 0 or length > _MAX_BODY_BYTES:
+            raise ValueError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, version.strip(), headers, body
+
+    async def _write_head(self, writer: asyncio.StreamWriter, status: str, headers: List[Tuple[str, str]], *, length: Optional[int]) -> None:
+        lines = [f"HTTP/1.1 {status}"]
+        for name, value in headers:
+            if name.lower() in ("connection", "keep-alive", "transfer-encoding") or (
+                length is not None and name.lower() == "content-length"
+            ):
+                continue
+            lines.append(f"{name}: {value}")
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await self._read_request(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception:
+                reason = HTTPStatus.BAD_REQUEST
+                await self._write_head(writer, f"{reason.value} {reason.phrase}", [], length=0)
+                return
+            method, target, version, headers, body = request
+            environ = self._environ(method, target, version, headers, body, writer)
+            path = environ["PATH_INFO"]
+            if method == "GET" and path in LONGPOLL_ROUTES:
+                status, response_headers, payload = await self._longpoll(environ, path, reader)
+                await self._write_head(writer, status, response_headers, length=len(payload))
+                writer.write(payload)
+                await writer.drain()
+                return
+            await self._serve(environ, method, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception:
+            logger.exception("Presence async server request failed")
+        finally:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def _serve(self, environ: Dict[str, Any], method: str, writer: asyncio.StreamWriter) -> None:
+        assert self._loop is not None
+        status, headers, body, stream = await self._loop.run_in_executor(self._executor, self._call_app, environ)
+        if stream is None:
+            payload = b"" if method == "HEAD" else (body or b"")
+            await self._write_head(writer, status, headers, length=len(body or b""))
+            writer.write(payload)
+            await writer.drain()
+            return
+        close = getattr(stream, "close", None)
+        if self.streams >= self.stream_threads:
+            # Every stream thread is taken; refuse rather than queue behind them.
+            if close is not None:
+                await self._loop.run_in_executor(self._executor, close)
+            reason = HTTPStatus.SERVICE_UNAVAILABLE
+            await self._write_head(writer, f"{reason.value} {reason.phrase}", [("Retry-After", "5")], length=0)
+            return
+        # Streaming response (SSE): relay chunks as the app yields them from the
+        # stream pool; the body ends when the connection closes.
+        self.streams += 1
+        try:
+            await self._write_head(writer, status, headers, length=None)
+            sentinel = object()
+            while True:
+                chunk = await self._loop.run_in_executor(self._stream_executor, next, stream, sentinel)
+                if chunk is sentinel:
+                    break
+                if chunk:
+                    writer.write(chunk)
+                    await writer.drain()
+        finally:
+            try:
+                if close is not None:
+                    await self._loop.run_in_executor(self._stream_executor, close)
+            finally:
+                self.streams -= 1
+
+
+def _parse_bind(value: str) -> Tuple[str, int]:
+    host, _, port = str(value or "").rpartition(":")
+    return host or "0.0.0.0", int(port or 8001)
+
+
+async def _serve_forever(host: str, port: int, threads: Optional[int], stream_threads: Optional[int] = None) -> None:
+    from . import create_presence_app
+
+    server = PresenceLongPollServer(create_presence_app(), threads=threads, stream_threads=stream_threads)
+    listener = await server.start(host, port)
+    logger.info(
+        "Presence async server listening on %s:%s threads=%s stream_threads=%s",
+        host,
+        port,
+        server.threads,
+        server.stream_threads,
+    )
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the presence route set on an asyncio event loop.")
+    parser.add_argument("--bind", default=os.environ.get("PRESENCE_ASYNC_BIND", "0.0.0.0:8001"))
+    parser.add_argument("--threads", type=int, default=None, help="WSGI worker threads (PRESENCE_ASYNC_THREADS)")
+    parser.add_argument(
+        "--stream-threads",
+        type=int,
+        default=None,
+        help="Threads relaying SSE streams, and the open-stream cap (PRESENCE_ASYNC_STREAM_THREADS)",
+    )
+    args = parser.parse_args(argv)
+    host, port = _parse_bind(args.bind)
+    try:
+        asyncio.run(_serve_forever(host, port, args.threads, args.stream_threads))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
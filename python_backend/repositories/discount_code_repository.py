@@ -4,11 +4,9 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from ..database import mysql_client
+from ..database import mysql_client, schema_catalog
 from ..services import get_config
 
-_DISCOUNT_CODE_COLUMNS_CACHE: Optional[set[str]] = None
-
 
 def _using_mysql() -> bool:
     return bool(get_config().mysql.get("enabled"))
@@ -23,28 +21,13 @@ def _now_sql() -> str:
 
 
 def _discount_code_columns() -> set[str]:
-    global _DISCOUNT_CODE_COLUMNS_CACHE
-    if _DISCOUNT_CODE_COLUMNS_CACHE is not None:
-        return _DISCOUNT_CODE_COLUMNS_CACHE
     if not _using_mysql():
-        _DISCOUNT_CODE_COLUMNS_CACHE = set()
-        return _DISCOUNT_CODE_COLUMNS_CACHE
+        return set()
     try:
-        rows = mysql_client.fetch_all(
-            """
-            SELECT COLUMN_NAME
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = 'discount_codes'
-              AND COLUMN_NAME IN ('used_by_json', 'used_by')
-            """,
-        )
-        cols = {str((row or {}).get("COLUMN_NAME") or "").strip() for row in (rows or [])}
-        _DISCOUNT_CODE_COLUMNS_CACHE = {c for c in cols if c}
+        return set(schema_catalog.columns("discount_codes")) & {"used_by_json", "used_by"}
     except Exception:
         # Fall back to legacy expectation.
-        _DISCOUNT_CODE_COLUMNS_CACHE = {"used_by_json"}
-    return _DISCOUNT_CODE_COLUMNS_CACHE
+        return {"used_by_json"}
 
 
 def _used_by_read_column(columns: set[str]) -> Optional[str]:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import threading
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
@@ -11,6 +12,8 @@ from ..services import get_config
 from ._mysql_datetime import to_mysql_datetime
 
 _JSON_LOCK = threading.Lock()
+# Rows per multi-row statement in the worker's bulk reads/writes.
+_BULK_CHUNK = 200
 
 
 def _now_iso() -> str:
@@ -124,86 +127,93 @@ def _normalize_event(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     return result
 
 
+def _prepared_recipients(recipients: Iterable[Dict[str, Any]], created_at: Any) -> Iterable[Dict[str, Any]]:
+    for recipient in recipients:
+        record = dict(recipient)
+        record.setdefault("created_at", created_at)
+        record.setdefault("status", "pending")
+        yield record
+
+
+_RECIPIENT_COLUMNS = (
+    "id",
+    "campaign_id",
+    "recipient_email",
+    "recipient_name",
+    "recipient_type",
+    "status",
+    "variables_json",
+    "created_at",
+    "sent_at",
+    "error_message",
+)
+
+
+def _recipient_row(recipient: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **recipient,
+        "variables_json": _json_dumps(recipient.get("variables_json")),
+        "created_at": to_mysql_datetime(recipient.get("created_at")),
+        "sent_at": to_mysql_datetime(recipient.get("sent_at")),
+    }
+
+
 def create_campaign(campaign: Dict[str, Any], recipients: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Insert a campaign and its recipients. `recipients` may be a generator; it is
+    consumed once, in chunks, so large audiences are never copied in full.
+    In MySQL mode the campaign row and the recipient chunks (one multi-row
+    INSERT each) are written in a single transaction.
+    """
     campaign_record = dict(campaign)
     campaign_record.setdefault("created_at", _now_iso())
     campaign_record["recipient_count"] = int(campaign_record.get("recipient_count") or 0)
-    recipient_records = [dict(recipient) for recipient in recipients]
-    for recipient in recipient_records:
-        recipient.setdefault("created_at", campaign_record["created_at"])
-        recipient.setdefault("status", "pending")
+    recipient_records = _prepared_recipients(recipients, campaign_record["created_at"])
 
     if _using_mysql():
-        mysql_client.execute(
-            """
-            INSERT INTO email_campaigns (
-                id,
-                campaign_type,
-                template_id,
-                subject,
-                created_by_admin_id,
-                status,
-                recipient_count,
-                variables_json,
-                created_at,
-                scheduled_at,
-                sent_at
-            ) VALUES (
-                %(id)s,
-                %(campaign_type)s,
-                %(template_id)s,
-                %(subject)s,
-                %(created_by_admin_id)s,
-                %(status)s,
-                %(recipient_count)s,
-                %(variables_json)s,
-                %(created_at)s,
-                %(scheduled_at)s,
-                %(sent_at)s
-            )
-            """,
-            {
-                **campaign_record,
-                "variables_json": _json_dumps(campaign_record.get("variables_json")),
-                "created_at": to_mysql_datetime(campaign_record.get("created_at")),
-                "scheduled_at": to_mysql_datetime(campaign_record.get("scheduled_at")),
-                "sent_at": to_mysql_datetime(campaign_record.get("sent_at")),
-            },
-        )
-        for recipient in recipient_records:
+        with mysql_client.transaction():
             mysql_client.execute(
                 """
-                INSERT INTO email_campaign_recipients (
+                INSERT INTO email_campaigns (
                     id,
-                    campaign_id,
-                    recipient_email,
-                    recipient_name,
-                    recipient_type,
+                    campaign_type,
+                    template_id,
+                    subject,
+                    created_by_admin_id,
                     status,
+                    recipient_count,
                     variables_json,
                     created_at,
-                    sent_at,
-                    error_message
+                    scheduled_at,
+                    sent_at
                 ) VALUES (
                     %(id)s,
-                    %(campaign_id)s,
-                    %(recipient_email)s,
-                    %(recipient_name)s,
-                    %(recipient_type)s,
+                    %(campaign_type)s,
+                    %(template_id)s,
+                    %(subject)s,
+                    %(created_by_admin_id)s,
                     %(status)s,
+                    %(recipient_count)s,
                     %(variables_json)s,
                     %(created_at)s,
-                    %(sent_at)s,
-                    %(error_message)s
+                    %(scheduled_at)s,
+                    %(sent_at)s
                 )
                 """,
                 {
-                    **recipient,
-                    "variables_json": _json_dumps(recipient.get("variables_json")),
-                    "created_at": to_mysql_datetime(recipient.get("created_at")),
-                    "sent_at": to_mysql_datetime(recipient.get("sent_at")),
+                    **campaign_record,
+                    "variables_json": _json_dumps(campaign_record.get("variables_json")),
+                    "created_at": to_mysql_datetime(campaign_record.get("created_at")),
+                    "scheduled_at": to_mysql_datetime(campaign_record.get("scheduled_at")),
+                    "sent_at": to_mysql_datetime(campaign_record.get("sent_at")),
                 },
             )
+            mysql_client.bulk_insert(
+                "email_campaign_recipients",
+                (_recipient_row(recipient) for recipient in recipient_records),
+                columns=_RECIPIENT_COLUMNS,
+                chunk_size=_BULK_CHUNK,
+            )
         return get_campaign(str(campaign_record["id"])) or campaign_record
 
     with _JSON_LOCK:
@@ -227,16 +237,17 @@ def get_campaign(campaign_id: str) -> Optional[Dict[str, Any]]:
 
 def delete_draft_campaign(campaign_id: str) -> bool:
     if _using_mysql():
-        deleted = mysql_client.execute(
-            "DELETE FROM email_campaigns WHERE id = %(id)s AND status = 'draft'",
-            {"id": campaign_id},
-        )
-        if not deleted:
-            return False
-        mysql_client.execute(
-            "DELETE FROM email_campaign_recipients WHERE campaign_id = %(campaign_id)s",
-            {"campaign_id": campaign_id},
-        )
+        with mysql_client.transaction():
+            deleted = mysql_client.execute(
+                "DELETE FROM email_campaigns WHERE id = %(id)s AND status = 'draft'",
+                {"id": campaign_id},
+            )
+            if not deleted:
+                return False
+            mysql_client.execute(
+                "DELETE FROM email_campaign_recipients WHERE campaign_id = %(campaign_id)s",
+                {"campaign_id": campaign_id},
+            )
         return True
 
     with _JSON_LOCK:
@@ -472,6 +483,75 @@ def update_recipient_status(
         _save_json(store)
 
 
+def _chunks(items: List[Any], size: int = _BULK_CHUNK) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def update_recipient_statuses(updates: Iterable[Dict[str, Any]]) -> int:
+    """
+    Apply many `update_recipient_status` changes at once. Each update is a dict
+    with `id`, `status` and optional `sent_at` / `error_message`. MySQL writes
+    one CASE-per-column UPDATE per chunk; the JSON store is saved once.
+    """
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for update in updates or []:
+        recipient_id = str((update or {}).get("id") or "").strip()
+        if recipient_id and update.get("status"):
+            by_id[recipient_id] = update
+    if not by_id:
+        return 0
+
+    if _using_mysql():
+        updated = 0
+        for chunk in _chunks(list(by_id.items())):
+            params: Dict[str, Any] = {}
+            status_cases: List[str] = []
+            sent_at_cases: List[str] = []
+            error_cases: List[str] = []
+            id_placeholders: List[str] = []
+            for index, (recipient_id, update) in enumerate(chunk):
+                params[f"id_{index}"] = recipient_id
+                params[f"status_{index}"] = update.get("status")
+                params[f"sent_at_{index}"] = to_mysql_datetime(update.get("sent_at"))
+                params[f"error_{index}"] = update.get("error_message")
+                status_cases.append(f"WHEN %(id_{index})s THEN %(status_{index})s")
+                sent_at_cases.append(f"WHEN %(id_{index})s THEN %(sent_at_{index})s")
+                error_cases.append(f"WHEN %(id_{index})s THEN %(error_{index})s")
+                id_placeholders.append(f"%(id_{index})s")
+            updated += int(
+                mysql_client.execute(
+                    f"""
+                    UPDATE email_campaign_recipients
+                    SET status = CASE id {' '.join(status_cases)} END,
+                        sent_at = CASE id {' '.join(sent_at_cases)} END,
+                        error_message = CASE id {' '.join(error_cases)} END,
+                        claim_token = NULL
+                    WHERE id IN ({', '.join(id_placeholders)})
+                    """,
+                    params,
+                )
+                or 0
+            )
+        return updated
+
+    updated = 0
+    with _JSON_LOCK:
+        store = _load_json()
+        for recipient in store["recipients"]:
+            update = by_id.get(str(recipient.get("id") or ""))
+            if update is None:
+                continue
+            sent_at = update.get("sent_at")
+            recipient["status"] = update.get("status")
+            recipient["sent_at"] = _format_datetime(sent_at) if sent_at else None
+            recipient["error_message"] = update.get("error_message")
+            updated += 1
+        if updated:
+            _save_json(store)
+    return updated
+
+
 def update_recipient_status_by_campaign_and_email(
     campaign_id: str,
     recipient_email: str,
@@ -552,6 +632,36 @@ def get_recipient_by_campaign_and_email(campaign_id: str, recipient_email: str)
     return _normalize_recipient(recipient)
 
 
+def get_recipients_by_ids(recipient_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    ids = list(dict.fromkeys(str(value or "").strip() for value in recipient_ids or []))
+    ids = [value for value in ids if value]
+    if not ids:
+        return {}
+    if _using_mysql():
+        found: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(ids):
+            params = {f"id_{index}": value for index, value in enumerate(chunk)}
+            placeholders = ", ".join(f"%({key})s" for key in params)
+            rows = mysql_client.fetch_all(
+                f"SELECT * FROM email_campaign_recipients WHERE id IN ({placeholders})",
+                params,
+            )
+            for row in rows:
+                recipient = _normalize_recipient(row)
+                if recipient:
+                    found[str(recipient.get("id") or "")] = recipient
+        return found
+
+    wanted = set(ids)
+    with _JSON_LOCK:
+        rows = [row for row in _load_json()["recipients"] if str(row.get("id") or "") in wanted]
+    return {
+        str(recipient.get("id") or ""): recipient
+        for recipient in (_normalize_recipient(row) for row in rows)
+        if recipient
+    }
+
+
 def list_recipients_by_status(status: str, *, limit: int = 250) -> List[Dict[str, Any]]:
     normalized_status = str(status or "").strip()
     if not normalized_status:
@@ -591,7 +701,8 @@ def requeue_stale_processing_recipients(cutoff: Any) -> int:
                 UPDATE email_campaign_recipients
                 SET status = 'pending',
                     sent_at = NULL,
-                    error_message = NULL
+                    error_message = NULL,
+                    claim_token = NULL
                 WHERE status = 'processing'
                   AND sent_at IS NOT NULL
                   AND sent_at <= %(cutoff)s
@@ -622,6 +733,32 @@ def list_due_pending_recipients(*, limit: int = 25) -> List[Dict[str, Any]]:
     limit = max(1, min(int(limit or 25), 250))
     now_sql = to_mysql_datetime(_now_iso())
     if _using_mysql():
+        # Claim the batch in one statement: tag up to `limit` due rows with a
+        # fresh token, then read back exactly the rows carrying it. Concurrent
+        # workers never see each other's rows because the UPDATE only touches
+        # rows that are still pending.
+        claim_token = uuid.uuid4().hex
+        claimed_count = mysql_client.execute(
+            """
+            UPDATE email_campaign_recipients
+            SET status = 'processing',
+                sent_at = %(claimed_at)s,
+                error_message = NULL,
+                claim_token = %(claim_token)s
+            WHERE status = 'pending'
+              AND campaign_id IN (
+                  SELECT id
+                  FROM email_campaigns
+                  WHERE status IN ('scheduled', 'sending')
+                    AND (scheduled_at IS NULL OR scheduled_at <= %(now)s)
+              )
+            ORDER BY created_at ASC, id ASC
+            LIMIT %(limit)s
+            """,
+            {"claimed_at": now_sql, "claim_token": claim_token, "now": now_sql, "limit": limit},
+        )
+        if not claimed_count:
+            return []
         rows = mysql_client.fetch_all(
             """
             SELECT
@@ -638,33 +775,16 @@ def list_due_pending_recipients(*, limit: int = 25) -> List[Dict[str, Any]]:
                 c.variables_json AS campaign_variables_json
             FROM email_campaign_recipients r
             INNER JOIN email_campaigns c ON c.id = r.campaign_id
-            WHERE r.status = 'pending'
-              AND c.status IN ('scheduled', 'sending')
-              AND (c.scheduled_at IS NULL OR c.scheduled_at <= %(now)s)
+            WHERE r.claim_token = %(claim_token)s
+              AND r.status = 'processing'
             ORDER BY c.created_at ASC, r.created_at ASC, r.id ASC
-            LIMIT %(limit)s
             """,
-            {"now": now_sql, "limit": limit},
+            {"claim_token": claim_token},
         )
-        claimed: List[Dict[str, Any]] = []
         for row in rows:
-            updated = mysql_client.execute(
-                """
-                UPDATE email_campaign_recipients
-                SET status = 'processing',
-                    sent_at = %(claimed_at)s,
-                    error_message = NULL
-                WHERE id = %(id)s
-                  AND status = 'pending'
-                """,
-                {"id": row.get("recipient_id"), "claimed_at": now_sql},
-            )
-            if not updated:
-                continue
             row["recipient_variables_json"] = _json_loads(row.get("recipient_variables_json"), {})
             row["campaign_variables_json"] = _json_loads(row.get("campaign_variables_json"), {})
-            claimed.append(row)
-        return claimed
+        return rows
 
     now_text = _now_iso()
     with _JSON_LOCK:
@@ -755,6 +875,46 @@ def log_event(
     return record
 
 
+def log_events(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert many `log_event` records (same keyword names) with multi-row INSERTs."""
+    records = [
+        {
+            "id": event.get("event_id"),
+            "campaign_id": event.get("campaign_id"),
+            "recipient_email": event.get("recipient_email"),
+            "event_type": event.get("event_type"),
+            "metadata_json": event.get("metadata") or {},
+            "created_at": event.get("created_at") or _now_iso(),
+        }
+        for event in events or []
+        if event and event.get("event_id") and event.get("event_type")
+    ]
+    if not records:
+        return []
+
+    if _using_mysql():
+        mysql_client.bulk_insert(
+            "email_events",
+            (
+                {
+                    **record,
+                    "metadata_json": _json_dumps(record["metadata_json"]),
+                    "created_at": to_mysql_datetime(record["created_at"]),
+                }
+                for record in records
+            ),
+            columns=("id", "campaign_id", "recipient_email", "event_type", "metadata_json", "created_at"),
+            chunk_size=_BULK_CHUNK,
+        )
+        return records
+
+    with _JSON_LOCK:
+        store = _load_json()
+        store["events"].extend(records)
+        _save_json(store)
+    return records
+
+
 def is_unsubscribed(email: str) -> bool:
     normalized = str(email or "").strip().lower()
     if not normalized:
@@ -769,6 +929,32 @@ def is_unsubscribed(email: str) -> bool:
         return any(str(row.get("recipient_email") or "").strip().lower() == normalized for row in _load_json()["unsubscribes"])
 
 
+def list_unsubscribed_emails(emails: Iterable[str]) -> set[str]:
+    """The subset of `emails` (normalized) that is on the unsubscribe list."""
+    normalized = list(dict.fromkeys(str(email or "").strip().lower() for email in emails or []))
+    normalized = [email for email in normalized if email]
+    if not normalized:
+        return set()
+    if _using_mysql():
+        found: set[str] = set()
+        for chunk in _chunks(normalized):
+            params = {f"email_{index}": value for index, value in enumerate(chunk)}
+            placeholders = ", ".join(f"%({key})s" for key in params)
+            rows = mysql_client.fetch_all(
+                f"SELECT recipient_email FROM email_unsubscribes WHERE recipient_email IN ({placeholders})",
+                params,
+            )
+            found.update(str(row.get("recipient_email") or "").strip().lower() for row in rows)
+        return found
+    wanted = set(normalized)
+    with _JSON_LOCK:
+        return {
+            email
+            for email in (str(row.get("recipient_email") or "").strip().lower() for row in _load_json()["unsubscribes"])
+            if email in wanted
+        }
+
+
 def add_unsubscribe(
     *,
     email: str,
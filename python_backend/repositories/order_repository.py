@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
+import re
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from zoneinfo import ZoneInfo
 
 from ..services import get_config
-from ..database import mysql_client
+from ..database import mysql_client, schema_catalog
 from .. import storage
-from ..utils.crypto_envelope import decrypt_json, encrypt_json
+from . import sales_rep_rollup_repository
+from ..utils.crypto_envelope import decrypt_json, decrypt_many, encrypt_json
+
+logger = logging.getLogger(__name__)
 
 HAND_DELIVERY_SERVICE_LABEL = "Hand Delivered"
-_ORDERS_COLUMNS_CACHE: Optional[set[str]] = None
 
 
 def _normalize_optional_string(value: object) -> Optional[str]:
@@ -424,25 +428,12 @@ def _using_mysql() -> bool:
 
 
 def _orders_columns() -> set[str]:
-    global _ORDERS_COLUMNS_CACHE
-    if _ORDERS_COLUMNS_CACHE is not None:
-        return _ORDERS_COLUMNS_CACHE
     if not _using_mysql():
-        _ORDERS_COLUMNS_CACHE = set()
-        return _ORDERS_COLUMNS_CACHE
+        return set()
     try:
-        rows = mysql_client.fetch_all(
-            """
-            SELECT COLUMN_NAME
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = 'orders'
-            """,
-        )
-        cols = {str((row or {}).get("COLUMN_NAME") or "").strip() for row in (rows or [])}
-        _ORDERS_COLUMNS_CACHE = {c for c in cols if c}
+        return set(schema_catalog.columns("orders"))
     except Exception:
-        _ORDERS_COLUMNS_CACHE = {
+        return {
             "tracking_number",
             "ups_tracking_status",
             "delivery_date",
@@ -450,7 +441,6 @@ def _orders_columns() -> set[str]:
             "expected_shipment_window",
             "updated_at",
         }
-    return _ORDERS_COLUMNS_CACHE
 
 
 def _sync_tracking_fields_after_fallback(params: Dict) -> None:
@@ -506,6 +496,7 @@ def update_items(order_id: str, items: List[Dict]) -> Optional[Dict]:
                 "items": json.dumps(items if isinstance(items, list) else []),
             },
         )
+        _mark_sales_rollup_dirty(normalized_order_id)
         return find_by_id(normalized_order_id)
 
     orders = _load()
@@ -615,7 +606,68 @@ def _parse_json(value, default):
         return default
 
 
+_ENCRYPTED_JSON_FIELDS = ("payload", "shipping_address")
+_DECRYPTED_FIELDS_KEY = "_decrypted_fields"
+
+
+def _decrypt_order_rows(rows: Optional[List[Dict]]) -> List[Dict]:
+    """
+    Batch-decrypt the encrypted JSON columns of a result set up front.
+
+    Decoded values are stashed on each row for `_read_order_json_field`; rows
+    that fail (legacy AAD, plaintext) fall through to the per-row path there.
+    """
+    rows = [row for row in (rows or []) if row]
+    for field in _ENCRYPTED_JSON_FIELDS:
+        pending = [row for row in rows if row.get(field) is not None]
+        if not pending:
+            continue
+        decrypted = decrypt_many(
+            [row.get(field) for row in pending],
+            aads=[_order_field_aad(row.get("id"), field) for row in pending],
+            ignore_errors=True,
+        )
+        for row, text in zip(pending, decrypted):
+            if text is None:
+                continue
+            try:
+                value = json.loads(text)
+            except Exception:
+                continue
+            row.setdefault(_DECRYPTED_FIELDS_KEY, {})[field] = value
+    return rows
+
+
+def _rows_to_orders(rows: Optional[List[Dict]]) -> List[Dict]:
+    return [_row_to_order(row) for row in _decrypt_order_rows(rows)]
+
+
+_STREAM_BATCH_SIZE = 500
+
+
+def _row_batches(query: str, params: Optional[Dict] = None, *, stream: bool, batch_size: int) -> Iterator[List[Dict]]:
+    """
+    Raw order rows in batches: one buffered `fetch_all` batch, or, with
+    `stream=True`, `batch_size` slices of a server-side cursor scan so callers
+    can decrypt and decode a batch at a time with flat memory.
+    """
+    if not stream:
+        yield mysql_client.fetch_all(query, params or {})
+        return
+    batch: List[Dict] = []
+    for row in mysql_client.iter_rows(query, params, batch_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def _read_order_json_field(row: Dict, field: str, default):
+    predecrypted = row.get(_DECRYPTED_FIELDS_KEY)
+    if isinstance(predecrypted, dict) and field in predecrypted:
+        return predecrypted[field]
     try:
         decrypted = decrypt_json(row.get(field), aad=_order_field_aad(row.get("id"), field))
         if decrypted is not None:
@@ -646,6 +698,15 @@ def get_all() -> List[Dict]:
     return _load()
 
 
+def iter_all(*, batch_size: int = _STREAM_BATCH_SIZE) -> Iterator[Dict]:
+    """Stream every order (server-side cursor in MySQL mode) for backfills and full scans."""
+    if not _using_mysql():
+        yield from _get_store().read()
+        return
+    for rows in _row_batches("SELECT * FROM orders", stream=True, batch_size=batch_size):
+        yield from _rows_to_orders(rows)
+
+
 def find_by_id(order_id: str) -> Optional[Dict]:
     if _using_mysql():
         row = mysql_client.fetch_one("SELECT * FROM orders WHERE id = %(id)s", {"id": order_id})
@@ -653,6 +714,64 @@ def find_by_id(order_id: str) -> Optional[Dict]:
     return next((order for order in _load() if order.get("id") == order_id), None)
 
 
+def find_by_ids(order_ids: List[str]) -> Dict[str, Dict]:
+    """Load several orders by id (chunked IN queries in MySQL mode); maps id -> order."""
+    ids = list(dict.fromkeys(str(order_id or "").strip() for order_id in (order_ids or [])))
+    ids = [order_id for order_id in ids if order_id]
+    if not ids:
+        return {}
+    found: Dict[str, Dict] = {}
+    if _using_mysql():
+        chunk_size = 500
+        for offset in range(0, len(ids), chunk_size):
+            chunk = ids[offset : offset + chunk_size]
+            placeholders = ", ".join([f"%(id_{idx})s" for idx in range(len(chunk))])
+            params = {f"id_{idx}": order_id for idx, order_id in enumerate(chunk)}
+            rows = mysql_client.fetch_all(f"SELECT * FROM orders WHERE id IN ({placeholders})", params)
+            for order in _rows_to_orders(rows):
+                if order:
+                    found[str(order.get("id"))] = order
+        return found
+    wanted = set(ids)
+    for order in _load():
+        order_id = str(order.get("id") or "")
+        if order_id in wanted:
+            found[order_id] = order
+    return found
+
+
+def earliest_created_at() -> Optional[datetime]:
+    if _using_mysql():
+        row = mysql_client.fetch_one("SELECT MIN(created_at) AS earliest FROM orders")
+        value = (row or {}).get("earliest")
+        if isinstance(value, datetime):
+            return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+        return None
+    earliest: Optional[datetime] = None
+    for order in _load():
+        text = str(order.get("createdAt") or order.get("created_at") or "").strip()
+        if not text:
+            continue
+        try:
+            parsed = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+        except Exception:
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        if earliest is None or parsed < earliest:
+            earliest = parsed
+    return earliest
+
+
+def _mark_sales_rollup_dirty(*order_ids: object) -> None:
+    # Queue the order for the Sales-by-Rep rollup. Best effort: a lost mark is
+    # repaired by the rollup's periodic rebuild, and must never fail the write.
+    try:
+        sales_rep_rollup_repository.mark_orders_dirty(order_ids)
+    except Exception:
+        pass
+
+
 def find_by_order_identifier(identifier: str) -> Optional[Dict]:
     normalized = str(identifier or "").strip()
     if not normalized:
@@ -705,10 +824,152 @@ def find_by_order_identifier(identifier: str) -> Optional[Dict]:
     return None
 
 
+_WOO_IDENTIFIER_SOURCES = ("id", "number", "details")
+_WOO_IDENTIFIER_BACKFILL_CHUNK = 500
+
+
+def _normalize_woo_identifier(value: object) -> Optional[str]:
+    # Same digits-only normalization as order_service._normalize_woo_order_id.
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.isdigit():
+        return text
+    match = re.search(r"(\d+)", text)
+    return match.group(1) if match else None
+
+
+def _woo_identifiers(order: Dict) -> Dict[str, Optional[str]]:
+    """Normalized Woo id, Woo number and integration-payload number of an order, by source."""
+    details = _coerce_object(order.get("integrationDetails") or order.get("integrations"))
+    woo_details = _coerce_object(details.get("wooCommerce") or details.get("woocommerce"))
+    return {
+        "id": _normalize_woo_identifier(order.get("wooOrderId") or order.get("woo_order_id")),
+        "number": _normalize_woo_identifier(order.get("wooOrderNumber") or order.get("woo_order_number")),
+        "details": _normalize_woo_identifier(
+            woo_details.get("wooOrderNumber")
+            or woo_details.get("woo_order_number")
+            or _coerce_object(woo_details.get("payload")).get("number")
+            or _coerce_object(woo_details.get("response")).get("number")
+        ),
+    }
+
+
+def _index_woo_identifiers(order_id: object, identifiers: Dict[str, Optional[str]]) -> None:
+    """
+    Point `order_woo_identifiers` at the given per-source values for one order;
+    a None value drops that source's row. Sources not passed are left alone, so
+    writers only touch what they actually persisted. Best effort: the table may
+    not exist yet on an older schema.
+    """
+    key = str(order_id or "").strip()
+    if not key or not identifiers:
+        return
+    rows = [
+        {"order_id": key, "source": source, "identifier": value}
+        for source, value in identifiers.items()
+        if value
+    ]
+    cleared = [source for source, value in identifiers.items() if not value]
+    try:
+        with mysql_client.transaction():
+            if cleared:
+                params = {"order_id": key, **{f"source_{idx}": source for idx, source in enumerate(cleared)}}
+                placeholders = ", ".join(f"%(source_{idx})s" for idx in range(len(cleared)))
+                mysql_client.execute(
+                    f"DELETE FROM order_woo_identifiers WHERE order_id = %(order_id)s AND source IN ({placeholders})",
+                    params,
+                )
+            if rows:
+                mysql_client.bulk_upsert("order_woo_identifiers", rows, update_columns=("identifier",))
+    except Exception:
+        # backfill_woo_identifiers() rebuilds any rows lost here.
+        logger.warning("Woo identifier index write failed for order %s", key, exc_info=True)
+
+
+def _index_written_order(order: Dict) -> None:
+    # Only adds identifiers: insert()/update() do not write the Woo id/number
+    # columns, and a missing key in a partial update dict must not unindex them.
+    identifiers = {source: value for source, value in _woo_identifiers(order).items() if value}
+    if identifiers:
+        _index_woo_identifiers(order.get("id"), identifiers)
+
+
+def _after_order_write(order: Dict) -> None:
+    # Index rows and the rollup dirty mark are best effort; when the order is
+    # written inside a caller's transaction they run after it commits, so they
+    # never extend its locks or leave it aborted behind a swallowed error.
+    snapshot = dict(order)
+
+    def _run() -> None:
+        _index_written_order(snapshot)
+        _mark_sales_rollup_dirty(snapshot.get("id"))
+
+    mysql_client.after_commit(_run)
+
+
+def find_by_woo_identifier(value: object) -> Optional[Dict]:
+    """
+    Order whose Woo id, Woo number or integration-payload number matches `value`
+    (compared by their digits). MySQL mode resolves it with one indexed lookup on
+    `order_woo_identifiers` (a miss is a miss: existing orders are indexed by the
+    schema backfill and new ones at write time); the JSON store is scanned.
+    """
+    target = _normalize_woo_identifier(value)
+    if not target:
+        return None
+    if _using_mysql():
+        try:
+            row = mysql_client.fetch_one(
+                """
+                SELECT o.*
+                FROM order_woo_identifiers w
+                JOIN orders o ON o.id = w.order_id
+                WHERE w.identifier = %(identifier)s
+                ORDER BY w.order_id ASC
+                LIMIT 1
+                """,
+                {"identifier": target},
+            )
+            return _row_to_order(row) if row else None
+        except Exception:
+            # Older schema without the identifier table; fall back to the scan.
+            pass
+    for order in iter_all():
+        if target in _woo_identifiers(order).values():
+            return order
+    return None
+
+
+def backfill_woo_identifiers(*, batch_size: int = _WOO_IDENTIFIER_BACKFILL_CHUNK) -> int:
+    """Rebuild `order_woo_identifiers` from every stored order; returns the rows written."""
+    if not _using_mysql():
+        return 0
+    written = 0
+    pending: List[Dict] = []
+    for order in iter_all(batch_size=batch_size):
+        order_id = str(order.get("id") or "").strip()
+        if not order_id:
+            continue
+        for source, identifier in _woo_identifiers(order).items():
+            if identifier:
+                pending.append({"order_id": order_id, "source": source, "identifier": identifier})
+        if len(pending) >= batch_size:
+            written += len(pending)
+            mysql_client.bulk_upsert("order_woo_identifiers", pending, update_columns=("identifier",))
+            pending = []
+    if pending:
+        written += len(pending)
+        mysql_client.bulk_upsert("order_woo_identifiers", pending, update_columns=("identifier",))
+    return written
+
+
 def find_by_user_id(user_id: str) -> List[Dict]:
     if _using_mysql():
         rows = mysql_client.fetch_all("SELECT * FROM orders WHERE user_id = %(user_id)s", {"user_id": user_id})
-        return [_row_to_order(row) for row in rows]
+        return _rows_to_orders(rows)
     return [order for order in _load() if order.get("userId") == user_id]
 
 
@@ -809,7 +1070,7 @@ def list_user_overlay_fields(user_id: str) -> List[Dict]:
         return _normalize_optional_string(value)
 
     result: List[Dict] = []
-    for row in rows or []:
+    for row in _decrypt_order_rows(rows):
         payload = _read_order_json_field(row, "payload", {}) if row.get("payload") is not None else {}
         if not isinstance(payload, dict):
             payload = {}
@@ -1156,6 +1417,18 @@ def update_status_fields(
             )
         except Exception:
             return
+    _index_woo_identifiers(
+        order_id,
+        {
+            source: identifier
+            for source, identifier in (
+                ("id", _normalize_woo_identifier(woo_order_id)),
+                ("number", _normalize_woo_identifier(woo_order_number)),
+            )
+            if identifier
+        },
+    )
+    _mark_sales_rollup_dirty(order_id)
 
 
 def update_ups_tracking_status(
@@ -1167,17 +1440,144 @@ def update_ups_tracking_status(
     delivery_date_guaranteed: str | None = None,
     expected_shipment_window: str | None = None,
 ) -> Optional[Dict]:
-    normalized = _normalize_ups_tracking_status(ups_tracking_status)
-    normalized_delivered_at = _normalize_optional_string(delivered_at)
-    normalized_estimated_arrival_date = _normalize_optional_string(estimated_arrival_date)
-    normalized_delivery_date_guaranteed = _normalize_optional_string(delivery_date_guaranteed)
-    normalized_expected_shipment_window = _normalize_optional_string_max(expected_shipment_window, 128)
     if not order_id:
         return None
 
     existing = find_by_id(order_id)
     if not existing:
         return None
+    return update(
+        _apply_ups_tracking_update(
+            existing,
+            ups_tracking_status=ups_tracking_status,
+            delivered_at=delivered_at,
+            estimated_arrival_date=estimated_arrival_date,
+            delivery_date_guaranteed=delivery_date_guaranteed,
+            expected_shipment_window=expected_shipment_window,
+        )
+    )
+
+
+_UPS_TRACKING_COLUMNS = (
+    "ups_tracking_status",
+    "delivery_date",
+    "shipping_rate",
+    "expected_shipment_window",
+    "payload",
+    "updated_at",
+)
+_UPS_TRACKING_WRITE_CHUNK = 200
+
+
+def _write_ups_tracking_chunk(orders: List[Dict]) -> None:
+    """One UPDATE for a chunk of orders, touching only the tracking columns (and the payload that mirrors them)."""
+    params: Dict[str, object] = {}
+    cases: Dict[str, List[str]] = {column: [] for column in _UPS_TRACKING_COLUMNS}
+    id_placeholders: List[str] = []
+    for index, order in enumerate(orders):
+        row = _to_db_params(order)
+        params[f"id_{index}"] = row["id"]
+        id_placeholders.append(f"%(id_{index})s")
+        for column in _UPS_TRACKING_COLUMNS:
+            params[f"{column}_{index}"] = row[column]
+            cases[column].append(f"WHEN %(id_{index})s THEN %({column}_{index})s")
+    assignments = ",\n            ".join(
+        f"{column} = CASE id {' '.join(cases[column])} END" for column in _UPS_TRACKING_COLUMNS
+    )
+    mysql_client.execute(
+        f"""
+        UPDATE orders
+        SET {assignments}
+        WHERE id IN ({', '.join(id_placeholders)})
+        """,
+        params,
+    )
+
+
+def update_ups_tracking_statuses(updates: List[Dict]) -> Dict[str, object]:
+    """
+    Apply several `update_ups_tracking_status` changes at once.
+
+    Each entry carries `orderId` plus the keyword fields of the single-order
+    variant. The affected orders are read with one query and, in MySQL mode,
+    written with one CASE UPDATE per chunk of the tracking columns (one store
+    save in JSON mode). The result maps order id -> persisted order, None if the
+    order does not exist, or the exception that order's write failed with.
+    """
+    entries = [entry for entry in (updates or []) if str((entry or {}).get("orderId") or "").strip()]
+    if not entries:
+        return {}
+    ids = list(dict.fromkeys(str(entry.get("orderId")).strip() for entry in entries))
+
+    def _changed(existing: Dict, entry: Dict) -> Dict:
+        return _apply_ups_tracking_update(
+            existing,
+            ups_tracking_status=entry.get("upsTrackingStatus"),
+            delivered_at=entry.get("deliveredAt"),
+            estimated_arrival_date=entry.get("estimatedArrivalDate"),
+            delivery_date_guaranteed=entry.get("deliveryDateGuaranteed"),
+            expected_shipment_window=entry.get("expectedShipmentWindow"),
+        )
+
+    results: Dict[str, object] = {order_id: None for order_id in ids}
+    if _using_mysql():
+        existing_by_id = find_by_ids(ids)
+        changed_by_id: Dict[str, Dict] = {}
+        for entry in entries:
+            order_id = str(entry.get("orderId")).strip()
+            existing = changed_by_id.get(order_id) or existing_by_id.get(order_id)
+            if existing:
+                changed_by_id[order_id] = _changed(existing, entry)
+        pending = list(changed_by_id.items())
+        for offset in range(0, len(pending), _UPS_TRACKING_WRITE_CHUNK):
+            chunk = pending[offset : offset + _UPS_TRACKING_WRITE_CHUNK]
+            try:
+                _write_ups_tracking_chunk([order for _, order in chunk])
+                results.update(chunk)
+                _mark_sales_rollup_dirty(*(order_id for order_id, _ in chunk))
+                continue
+            except Exception:
+                logger.warning("Batched UPS tracking write failed; retrying per order", exc_info=True)
+            # Older schemas (or one bad row) fall back to the single-order path,
+            # so one failure only fails its own order.
+            for order_id, order in chunk:
+                try:
+                    results[order_id] = update(order)
+                except Exception as exc:
+                    results[order_id] = exc
+        return results
+
+    orders = _load()
+    index_by_id = {str(order.get("id")): index for index, order in enumerate(orders) if order.get("id") is not None}
+    touched = False
+    for entry in entries:
+        order_id = str(entry.get("orderId")).strip()
+        index = index_by_id.get(order_id)
+        if index is None:
+            continue
+        merged = {**orders[index], **_changed(orders[index], entry)}
+        orders[index] = merged
+        results[order_id] = merged
+        touched = True
+    if touched:
+        _save(orders)
+    return results
+
+
+def _apply_ups_tracking_update(
+    existing: Dict,
+    *,
+    ups_tracking_status: str | None,
+    delivered_at: str | None = None,
+    estimated_arrival_date: str | None = None,
+    delivery_date_guaranteed: str | None = None,
+    expected_shipment_window: str | None = None,
+) -> Dict:
+    normalized = _normalize_ups_tracking_status(ups_tracking_status)
+    normalized_delivered_at = _normalize_optional_string(delivered_at)
+    normalized_estimated_arrival_date = _normalize_optional_string(estimated_arrival_date)
+    normalized_delivery_date_guaranteed = _normalize_optional_string(delivery_date_guaranteed)
+    normalized_expected_shipment_window = _normalize_optional_string_max(expected_shipment_window, 128)
     updated = dict(existing)
     updated["upsTrackingStatus"] = normalized
     existing_delivery_date = _normalize_optional_string(
@@ -1235,7 +1635,7 @@ def update_ups_tracking_status(
     updated["upsDeliveredAt"] = resolved_delivered_at
     updated["deliveryDate"] = resolved_delivery_date
     updated["updatedAt"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    return update(updated)
+    return updated
 
 
 def find_by_user_ids(user_ids: List[str]) -> List[Dict]:
@@ -1253,7 +1653,7 @@ def find_by_user_ids(user_ids: List[str]) -> List[Dict]:
                 f"SELECT * FROM orders WHERE user_id IN ({placeholders})",
                 params,
             )
-            for row in rows or []:
+            for row in _decrypt_order_rows(rows):
                 mapped = _row_to_order(row)
                 if mapped:
                     results.append(mapped)
@@ -1282,7 +1682,7 @@ def find_sales_tracking_by_user_ids(user_ids: List[str]) -> List[Dict]:
                 """,
                 params,
             )
-            for row in rows or []:
+            for row in _decrypt_order_rows(rows):
                 mapped = _row_to_order(row)
                 if mapped:
                     results.append(mapped)
@@ -1301,7 +1701,7 @@ def list_recent(limit: int = 500) -> List[Dict]:
             "SELECT * FROM orders ORDER BY created_at DESC LIMIT %(limit)s",
             {"limit": limit_value},
         )
-        return [_row_to_order(row) for row in rows]
+        return _rows_to_orders(rows)
     orders = list(_load())
     orders.sort(key=lambda o: str(o.get("createdAt") or ""), reverse=True)
     return orders[:limit_value]
@@ -1323,7 +1723,7 @@ def list_recent_sales_tracking(limit: int = 500) -> List[Dict]:
             """,
             {"limit": limit_value},
         )
-        return [_row_to_order(row) for row in rows]
+        return _rows_to_orders(rows)
     return list_recent(limit_value)
 
 
@@ -1332,8 +1732,28 @@ def list_for_commission(start_utc: datetime, end_utc: datetime) -> List[Dict]:
     Return orders within the [start_utc, end_utc] window.
     Uses SQL when available; falls back to in-memory filtering otherwise.
     """
+    return list(_iter_for_commission(start_utc, end_utc, stream=False))
+
+
+def iter_for_commission(
+    start_utc: datetime,
+    end_utc: datetime,
+    *,
+    batch_size: int = _STREAM_BATCH_SIZE,
+) -> Iterator[Dict]:
+    """Streaming `list_for_commission` for long windows (rollup rebuilds, backfills)."""
+    return _iter_for_commission(start_utc, end_utc, stream=True, batch_size=batch_size)
+
+
+def _iter_for_commission(
+    start_utc: datetime,
+    end_utc: datetime,
+    *,
+    stream: bool,
+    batch_size: int = _STREAM_BATCH_SIZE,
+) -> Iterator[Dict]:
     if not start_utc or not end_utc:
-        return []
+        return
 
     def normalize_dt(value: datetime) -> datetime:
         if value.tzinfo is None:
@@ -1346,7 +1766,7 @@ def list_for_commission(start_utc: datetime, end_utc: datetime) -> List[Dict]:
     if _using_mysql():
         start_naive = start_value.replace(tzinfo=None)
         end_naive = end_value.replace(tzinfo=None)
-        rows = mysql_client.fetch_all(
+        for rows in _row_batches(
             """
             SELECT *
             FROM orders
@@ -1354,8 +1774,11 @@ def list_for_commission(start_utc: datetime, end_utc: datetime) -> List[Dict]:
             ORDER BY created_at DESC
             """,
             {"start": start_naive, "end": end_naive},
-        )
-        return [_row_to_order(row) for row in rows or []]
+            stream=stream,
+            batch_size=batch_size,
+        ):
+            yield from _rows_to_orders(rows)
+        return
 
     def parse_dt(value: object) -> Optional[datetime]:
         if not value:
@@ -1375,7 +1798,6 @@ def list_for_commission(start_utc: datetime, end_utc: datetime) -> List[Dict]:
             parsed = parsed.replace(tzinfo=timezone.utc)
         return parsed
 
-    results: List[Dict] = []
     for order in _load():
         created_at = parse_dt(order.get("createdAt") or order.get("created_at"))
         if not created_at:
@@ -1383,8 +1805,7 @@ def list_for_commission(start_utc: datetime, end_utc: datetime) -> List[Dict]:
         created_at = created_at.astimezone(timezone.utc)
         if created_at < start_value or created_at > end_value:
             continue
-        results.append(order)
-    return results
+        yield order
 
 
 def list_for_tax_reporting(start_utc: datetime, end_utc: datetime) -> List[Dict]:
@@ -1395,8 +1816,28 @@ def list_for_tax_reporting(start_utc: datetime, end_utc: datetime) -> List[Dict]
     When MySQL is enabled, use a narrow SQL projection and convert the UTC bounds into the
     local timezone used by the persisted `orders.created_at` DATETIME column.
     """
+    return list(_iter_for_tax_reporting(start_utc, end_utc, stream=False))
+
+
+def iter_for_tax_reporting(
+    start_utc: datetime,
+    end_utc: datetime,
+    *,
+    batch_size: int = _STREAM_BATCH_SIZE,
+) -> Iterator[Dict]:
+    """Streaming `list_for_tax_reporting` (server-side cursor in MySQL mode)."""
+    return _iter_for_tax_reporting(start_utc, end_utc, stream=True, batch_size=batch_size)
+
+
+def _iter_for_tax_reporting(
+    start_utc: datetime,
+    end_utc: datetime,
+    *,
+    stream: bool,
+    batch_size: int = _STREAM_BATCH_SIZE,
+) -> Iterator[Dict]:
     if not start_utc or not end_utc:
-        return []
+        return
 
     def normalize_dt(value: datetime) -> datetime:
         if value.tzinfo is None:
@@ -1531,7 +1972,7 @@ def list_for_tax_reporting(start_utc: datetime, end_utc: datetime) -> List[Dict]
         local_tz = _report_local_tz()
         start_local = start_value.astimezone(local_tz).replace(tzinfo=None)
         end_local = end_value.astimezone(local_tz).replace(tzinfo=None)
-        rows = mysql_client.fetch_all(
+        for rows in _row_batches(
             """
             SELECT
                 id,
@@ -1547,8 +1988,14 @@ def list_for_tax_reporting(start_utc: datetime, end_utc: datetime) -> List[Dict]
             ORDER BY created_at DESC
             """,
             {"start": start_local, "end": end_local},
-        )
-        return [projected for projected in (_project_from_row(row) for row in (rows or [])) if projected]
+            stream=stream,
+            batch_size=batch_size,
+        ):
+            for row in _decrypt_order_rows(rows):
+                projected = _project_from_row(row)
+                if projected:
+                    yield projected
+        return
 
     def parse_dt(value: object) -> Optional[datetime]:
         if not value:
@@ -1569,33 +2016,29 @@ def list_for_tax_reporting(start_utc: datetime, end_utc: datetime) -> List[Dict]
             parsed = parsed.replace(tzinfo=timezone.utc)
         return parsed.astimezone(timezone.utc)
 
-    results: List[Dict] = []
     for order in _load():
         if not isinstance(order, dict):
             continue
         created_at = parse_dt(order.get("createdAt") or order.get("created_at"))
         if not created_at or created_at < start_value or created_at > end_value:
             continue
-        results.append(
-            {
-                "id": order.get("id"),
-                "status": order.get("status"),
-                "total": _safe_float(order.get("grandTotal") or order.get("total")),
-                "grandTotal": _safe_float(order.get("grandTotal") or order.get("total")),
-                "taxTotal": _safe_float(
-                    order.get("taxTotal")
-                    or order.get("tax_total")
-                    or order.get("totalTax")
-                    or order.get("total_tax")
-                ),
-                "shippingAddress": order.get("shippingAddress") or order.get("shipping_address"),
-                "billingAddress": order.get("billingAddress") or order.get("billing_address"),
-                "wooOrderId": order.get("wooOrderId") or order.get("woo_order_id"),
-                "wooOrderNumber": order.get("wooOrderNumber") or order.get("woo_order_number"),
-                "createdAt": order.get("createdAt") or order.get("created_at"),
-            }
-        )
-    return results
+        yield {
+            "id": order.get("id"),
+            "status": order.get("status"),
+            "total": _safe_float(order.get("grandTotal") or order.get("total")),
+            "grandTotal": _safe_float(order.get("grandTotal") or order.get("total")),
+            "taxTotal": _safe_float(
+                order.get("taxTotal")
+                or order.get("tax_total")
+                or order.get("totalTax")
+                or order.get("total_tax")
+            ),
+            "shippingAddress": order.get("shippingAddress") or order.get("shipping_address"),
+            "billingAddress": order.get("billingAddress") or order.get("billing_address"),
+            "wooOrderId": order.get("wooOrderId") or order.get("woo_order_id"),
+            "wooOrderNumber": order.get("wooOrderNumber") or order.get("woo_order_number"),
+            "createdAt": order.get("createdAt") or order.get("created_at"),
+        }
 
 
 def get_pricing_mode_lookup_by_woo(
@@ -2038,6 +2481,7 @@ def insert(order: Dict) -> Dict:
                 params,
             )
             _sync_tracking_fields_after_fallback(params)
+        _after_order_write(order)
         return find_by_id(order["id"])
 
     orders = _load()
@@ -2127,6 +2571,7 @@ def update(order: Dict) -> Optional[Dict]:
                 params,
             )
             _sync_tracking_fields_after_fallback(params)
+        _after_order_write(order)
         return find_by_id(order.get("id"))
 
     orders = _load()
@@ -2168,6 +2613,10 @@ def update_woo_fields(order_id: str, woo_order_id: Optional[str], woo_order_numb
     except Exception:
         # Columns might not exist on older installs; ignore.
         return
+    _index_woo_identifiers(
+        order_id,
+        {"id": _normalize_woo_identifier(woo_order_id), "number": _normalize_woo_identifier(woo_order_number)},
+    )
 
 
 def _generate_id() -> str:
@@ -2178,7 +2627,7 @@ def _generate_id() -> str:
 
 def _mysql_get_all() -> List[Dict]:
     rows = mysql_client.fetch_all("SELECT * FROM orders")
-    return [_row_to_order(row) for row in rows]
+    return _rows_to_orders(rows)
 
 
 def _row_to_order(row: Optional[Dict]) -> Optional[Dict]:
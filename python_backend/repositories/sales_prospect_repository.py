@@ -7,7 +7,7 @@ from typing import Dict, List, Optional
 import uuid
 
 from ..services import get_config
-from ..database import mysql_client
+from ..database import mysql_client, schema_catalog
 from .. import storage
 from ..utils.http import utc_now_iso as _now
 from ._mysql_datetime import to_mysql_datetime
@@ -15,8 +15,6 @@ from ._mysql_datetime import to_mysql_datetime
 HOUSE_SALES_REP_ID = "house"
 DELETED_USER_ID = "0000000000000"
 
-_supports_office_address_columns: Optional[bool] = None
-
 
 def _using_mysql() -> bool:
     return bool(get_config().mysql.get("enabled"))
@@ -180,21 +178,12 @@ def _sales_prospects_supports_office_address() -> bool:
 
     Some environments may not yet have office address columns on `sales_prospects`.
     """
-    global _supports_office_address_columns
-    if _supports_office_address_columns is not None:
-        return _supports_office_address_columns
     if not _using_mysql():
-        _supports_office_address_columns = False
         return False
     try:
-        rows = mysql_client.fetch_all(
-            "SHOW COLUMNS FROM sales_prospects LIKE 'office_address_line1'",
-            {},
-        )
-        _supports_office_address_columns = bool(rows)
+        return schema_catalog.has_column("sales_prospects", "office_address_line1")
     except Exception:
-        _supports_office_address_columns = False
-    return _supports_office_address_columns
+        return False
 
 
 def _ensure_defaults(record: Dict) -> Dict:
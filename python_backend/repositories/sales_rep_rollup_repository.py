@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..database import mysql_client
+from ..services import get_config
+
+logger = logging.getLogger(__name__)
+
+# Persisted Sales-by-Rep rollup (MySQL only).
+#   - `sales_rep_order_rollup` is a ledger of what each order currently
+#     contributes: canonical rep id, report-local day, revenue and pricing mode.
+#   - `sales_rep_daily_rollup` holds the per rep/day sums the report reads.
+#   - `sales_rep_rollup_dirty` queues order ids whose contribution must be
+#     recomputed. Order writes only enqueue here; attribution runs on the reader.
+# The ledger lets a re-applied order subtract its previous contribution, so
+# status changes, refunds and rep reassignment keep the daily sums exact.
+_ORDER_TABLE = "sales_rep_order_rollup"
+_DAILY_TABLE = "sales_rep_daily_rollup"
+_DIRTY_TABLE = "sales_rep_rollup_dirty"
+_STATE_KEY = "salesRepRollupState"
+_CHUNK = 500
+
+LOCK_NAME = "sales_rep_rollup"
+
+
+def is_enabled() -> bool:
+    return bool(get_config().mysql.get("enabled"))
+
+
+def _normalize_ids(order_ids: Iterable[object]) -> List[str]:
+    normalized: List[str] = []
+    seen: set[str] = set()
+    for value in order_ids or []:
+        order_id = str(value or "").strip()
+        if not order_id or order_id in seen:
+            continue
+        seen.add(order_id)
+        normalized.append(order_id)
+    return normalized
+
+
+def _id_placeholders(ids: List[str], params: Dict[str, object]) -> str:
+    placeholders: List[str] = []
+    for index, order_id in enumerate(ids):
+        key = f"id_{index}"
+        params[key] = order_id
+        placeholders.append(f"%({key})s")
+    return ", ".join(placeholders)
+
+
+def _to_day(value: object) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or "").strip()[:10]
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text)
+    except Exception:
+        return None
+
+
+def _pricing_mode(value: object) -> str:
+    return "retail" if str(value or "").strip().lower() == "retail" else "wholesale"
+
+
+def _accumulate(
+    deltas: Dict[Tuple[str, date], List[float]],
+    *,
+    rep_id: object,
+    day: object,
+    revenue: object,
+    pricing_mode: object,
+    sign: int,
+) -> None:
+    rep_key = str(rep_id or "").strip()
+    day_key = _to_day(day)
+    if not rep_key or day_key is None:
+        return
+    amount = round(float(revenue or 0.0), 2) * sign
+    bucket = deltas.setdefault((rep_key, day_key), [0, 0.0, 0.0, 0.0])
+    bucket[0] += sign
+    bucket[1] += amount
+    if _pricing_mode(pricing_mode) == "retail":
+        bucket[3] += amount
+    else:
+        bucket[2] += amount
+
+
+def current_timestamp() -> datetime:
+    """Database clock; dirty-queue cutoffs must not depend on worker clocks."""
+    row = mysql_client.fetch_one("SELECT UTC_TIMESTAMP(6) AS now_utc")
+    value = (row or {}).get("now_utc")
+    if isinstance(value, datetime):
+        return value
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def mark_orders_dirty(order_ids: Iterable[object]) -> int:
+    ids = _normalize_ids(order_ids)
+    if not ids:
+        return 0
+    with mysql_client.cursor() as cur:
+        cur.executemany(
+            f"""
+            INSERT INTO {_DIRTY_TABLE} (order_id, queued_at)
+            VALUES (%(order_id)s, UTC_TIMESTAMP(6))
+            ON DUPLICATE KEY UPDATE queued_at = VALUES(queued_at)
+            """,
+            [{"order_id": order_id} for order_id in ids],
+        )
+    return len(ids)
+
+
+def list_dirty_orders(limit: int = _CHUNK) -> List[Dict[str, object]]:
+    rows = mysql_client.fetch_all(
+        f"""
+        SELECT order_id, queued_at
+        FROM {_DIRTY_TABLE}
+        ORDER BY queued_at ASC
+        LIMIT %(limit)s
+        """,
+        {"limit": max(1, int(limit or _CHUNK))},
+    )
+    return [
+        {"orderId": str(row.get("order_id")), "queuedAt": row.get("queued_at")}
+        for row in rows or []
+        if row and row.get("order_id")
+    ]
+
+
+def _write_daily_deltas(cur, deltas: Dict[Tuple[str, date], List[float]]) -> None:
+    rows = [
+        {
+            "rep_id": rep_id,
+            "day": day,
+            "order_count": int(values[0]),
+            "revenue": round(values[1], 2),
+            "wholesale_revenue": round(values[2], 2),
+            "retail_revenue": round(values[3], 2),
+        }
+        for (rep_id, day), values in deltas.items()
+        if values[0] or abs(values[1]) >= 0.005
+    ]
+    if not rows:
+        return
+    cur.executemany(
+        f"""
+        INSERT INTO {_DAILY_TABLE} (rep_id, day, order_count, revenue, wholesale_revenue, retail_revenue, updated_at)
+        VALUES (%(rep_id)s, %(day)s, %(order_count)s, %(revenue)s, %(wholesale_revenue)s, %(retail_revenue)s, UTC_TIMESTAMP())
+        ON DUPLICATE KEY UPDATE
+            order_count = order_count + VALUES(order_count),
+            revenue = revenue + VALUES(revenue),
+            wholesale_revenue = wholesale_revenue + VALUES(wholesale_revenue),
+            retail_revenue = retail_revenue + VALUES(retail_revenue),
+            updated_at = VALUES(updated_at)
+        """,
+        rows,
+    )
+    cur.executemany(
+        f"DELETE FROM {_DAILY_TABLE} WHERE rep_id = %(rep_id)s AND day = %(day)s AND order_count <= 0",
+        [{"rep_id": row["rep_id"], "day": row["day"]} for row in rows],
+    )
+
+
+def _ledger_rows(contributions: Dict[str, Optional[Dict]]) -> List[Dict[str, object]]:
+    rows: List[Dict[str, object]] = []
+    for order_id, contribution in contributions.items():
+        if not contribution:
+            continue
+        day = _to_day(contribution.get("day"))
+        rep_id = str(contribution.get("salesRepId") or "").strip()
+        if day is None or not rep_id:
+            continue
+        rows.append(
+            {
+                "order_id": order_id,
+                "rep_id": rep_id,
+                "day": day,
+                "revenue": round(float(contribution.get("revenue") or 0.0), 2),
+                "pricing_mode": _pricing_mode(contribution.get("pricingMode")),
+            }
+        )
+    return rows
+
+
+def _insert_ledger_rows(cur, rows: List[Dict[str, object]]) -> None:
+    for offset in range(0, len(rows), _CHUNK):
+        cur.executemany(
+            f"""
+            INSERT INTO {_ORDER_TABLE} (order_id, rep_id, day, revenue, pricing_mode, updated_at)
+            VALUES (%(order_id)s, %(rep_id)s, %(day)s, %(revenue)s, %(pricing_mode)s, UTC_TIMESTAMP())
+            """,
+            rows[offset : offset + _CHUNK],
+        )
+
+
+def apply_order_contributions(
+    contributions: Dict[str, Optional[Dict]],
+    *,
+    queued_at: Optional[Dict[str, object]] = None,
+) -> int:
+    """
+    Replace the ledger entries of the given orders and move the daily sums by
+    the difference. A `None` contribution removes the order from the rollup
+    (refunded, cancelled, deleted). Dirty-queue rows are cleared only if they
+    were not re-queued after `queued_at`, so concurrent writes are not lost.
+    """
+    normalized = {
+        str(order_id).strip(): contribution
+        for order_id, contribution in (contributions or {}).items()
+        if str(order_id or "").strip()
+    }
+    if not normalized:
+        return 0
+    ids = list(normalized.keys())
+    new_rows = _ledger_rows(normalized)
+    with mysql_client.cursor() as cur:
+        deltas: Dict[Tuple[str, date], List[float]] = {}
+        for offset in range(0, len(ids), _CHUNK):
+            chunk = ids[offset : offset + _CHUNK]
+            params: Dict[str, object] = {}
+            placeholders = _id_placeholders(chunk, params)
+            cur.execute(
+                f"""
+                SELECT order_id, rep_id, day, revenue, pricing_mode
+                FROM {_ORDER_TABLE}
+                WHERE order_id IN ({placeholders})
+                FOR UPDATE
+                """,
+                params,
+            )
+            for row in cur.fetchall() or []:
+                _accumulate(
+                    deltas,
+                    rep_id=row.get("rep_id"),
+                    day=row.get("day"),
+                    revenue=row.get("revenue"),
+                    pricing_mode=row.get("pricing_mode"),
+                    sign=-1,
+                )
+            cur.execute(f"DELETE FROM {_ORDER_TABLE} WHERE order_id IN ({placeholders})", params)
+        for row in new_rows:
+            _accumulate(
+                deltas,
+                rep_id=row["rep_id"],
+                day=row["day"],
+                revenue=row["revenue"],
+                pricing_mode=row["pricing_mode"],
+                sign=1,
+            )
+        _insert_ledger_rows(cur, new_rows)
+        _write_daily_deltas(cur, deltas)
+        cutoffs = [
+            {"order_id": order_id, "queued_at": (queued_at or {}).get(order_id)}
+            for order_id in ids
+            if (queued_at or {}).get(order_id) is not None
+        ]
+        if cutoffs:
+            cur.executemany(
+                f"DELETE FROM {_DIRTY_TABLE} WHERE order_id = %(order_id)s AND queued_at <= %(queued_at)s",
+                cutoffs,
+            )
+    return len(ids)
+
+
+def replace_all(contributions: Dict[str, Optional[Dict]], *, started_at: datetime) -> int:
+    """
+    Rebuild the rollup from scratch in one transaction. Orders queued before
+    `started_at` (database clock) are covered by the rebuild and dequeued;
+    later writes stay queued for the next incremental pass.
+    """
+    new_rows = _ledger_rows({str(k): v for k, v in (contributions or {}).items()})
+    deltas: Dict[Tuple[str, date], List[float]] = {}
+    for row in new_rows:
+        _accumulate(
+            deltas,
+            rep_id=row["rep_id"],
+            day=row["day"],
+            revenue=row["revenue"],
+            pricing_mode=row["pricing_mode"],
+            sign=1,
+        )
+    with mysql_client.cursor() as cur:
+        cur.execute(f"DELETE FROM {_DAILY_TABLE}")
+        cur.execute(f"DELETE FROM {_ORDER_TABLE}")
+        _insert_ledger_rows(cur, new_rows)
+        _write_daily_deltas(cur, deltas)
+        cur.execute(
+            f"DELETE FROM {_DIRTY_TABLE} WHERE queued_at <= %(started_at)s",
+            {"started_at": started_at},
+        )
+    return len(new_rows)
+
+
+def list_daily(start_day: date, end_day: date) -> List[Dict[str, object]]:
+    rows = mysql_client.fetch_all(
+        f"""
+        SELECT rep_id, day, order_count, revenue, wholesale_revenue, retail_revenue
+        FROM {_DAILY_TABLE}
+        WHERE day >= %(start_day)s AND day <= %(end_day)s
+        """,
+        {"start_day": start_day, "end_day": end_day},
+    )
+    results: List[Dict[str, object]] = []
+    for row in rows or []:
+        day = _to_day((row or {}).get("day"))
+        rep_id = str((row or {}).get("rep_id") or "").strip()
+        if day is None or not rep_id:
+            continue
+        results.append(
+            {
+                "salesRepId": rep_id,
+                "day": day,
+                "orderCount": int(row.get("order_count") or 0),
+                "revenue": float(row.get("revenue") or 0.0),
+                "wholesaleRevenue": float(row.get("wholesale_revenue") or 0.0),
+                "retailRevenue": float(row.get("retail_revenue") or 0.0),
+            }
+        )
+    return results
+
+
+def get_state() -> Optional[Dict]:
+    row = mysql_client.fetch_one(
+        "SELECT value_json FROM settings WHERE `key` = %(key)s",
+        {"key": _STATE_KEY},
+    )
+    raw = (row or {}).get("value_json")
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8", errors="replace")
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except Exception:
+            return None
+    return raw if isinstance(raw, dict) else None
+
+
+def set_state(state: Dict) -> None:
+    mysql_client.execute(
+        """
+        INSERT INTO settings (`key`, value_json, updated_at)
+        VALUES (%(key)s, %(value_json)s, UTC_TIMESTAMP())
+        ON DUPLICATE KEY UPDATE value_json = VALUES(value_json), updated_at = VALUES(updated_at)
+        """,
+        {"key": _STATE_KEY, "value_json": json.dumps(state or {})},
+    )
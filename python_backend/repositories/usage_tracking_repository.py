@@ -2,84 +2,24 @@ from __future__ import annotations
 
 import json
 import logging
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from ..database import mysql_client
 from ..services import get_config
+from ._mysql_datetime import to_mysql_datetime
 
 logger = logging.getLogger(__name__)
-_USAGE_TRACKING_COLUMNS_CACHE: Optional[set[str]] = None
 
-_PAYLOAD_COLUMN_CANDIDATES = ("details_json", "details", "metadata_json", "metadata", "payload_json", "payload")
+# One row per event occurrence. Writes are a single INSERT and reads are
+# indexed GROUP BY aggregates, so tracking cost does not grow with history.
+_EVENTS_TABLE = "usage_tracking_events"
 
 
 def _using_mysql() -> bool:
     return bool(get_config().mysql.get("enabled"))
 
 
-def _usage_tracking_columns() -> set[str]:
-    global _USAGE_TRACKING_COLUMNS_CACHE
-    if _USAGE_TRACKING_COLUMNS_CACHE is not None:
-        return _USAGE_TRACKING_COLUMNS_CACHE
-    if not _using_mysql():
-        _USAGE_TRACKING_COLUMNS_CACHE = set()
-        return _USAGE_TRACKING_COLUMNS_CACHE
-    try:
-        rows = mysql_client.fetch_all(
-            """
-            SELECT COLUMN_NAME
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = 'usage_tracking'
-            """,
-        )
-        cols = {str((row or {}).get("COLUMN_NAME") or "").strip() for row in (rows or [])}
-        _USAGE_TRACKING_COLUMNS_CACHE = {c for c in cols if c}
-    except Exception:
-        _USAGE_TRACKING_COLUMNS_CACHE = {"event", "details_json"}
-    return _USAGE_TRACKING_COLUMNS_CACHE
-
-
-def _payload_column(columns: set[str]) -> Optional[str]:
-    for candidate in _PAYLOAD_COLUMN_CANDIDATES:
-        if candidate in columns:
-            return candidate
-    return None
-
-
-def _parse_payload(value: Any) -> Dict[str, Any]:
-    if isinstance(value, dict):
-        return dict(value)
-    if isinstance(value, str):
-        raw = value.strip()
-        if not raw:
-            return {}
-        try:
-            parsed = json.loads(raw)
-        except Exception:
-            return {}
-        if isinstance(parsed, dict):
-            return parsed
-    return {}
-
-
-def _merge_event_payload(existing_payloads: list[Dict[str, Any]], latest_details: Dict[str, Any]) -> Dict[str, Any]:
-    instances: list[Dict[str, Any]] = []
-    for payload in existing_payloads:
-        existing_instances = payload.get("instances")
-        if isinstance(existing_instances, list) and existing_instances:
-            for item in existing_instances:
-                if isinstance(item, dict):
-                    instances.append(dict(item))
-        elif payload:
-            instances.append(dict(payload))
-    instances.append(dict(latest_details or {}))
-    return {
-        "count": len(instances),
-        "instances": instances,
-    }
-
-
 def _normalize_event_names(events: list[str] | tuple[str, ...] | None) -> list[str]:
     normalized: list[str] = []
     seen: set[str] = set()
@@ -92,25 +32,6 @@ def _normalize_event_names(events: list[str] | tuple[str, ...] | None) -> list[s
     return normalized
 
 
-def _payload_count(payload: Dict[str, Any]) -> int:
-    raw_count = payload.get("count")
-    if isinstance(raw_count, bool):
-        raw_count = int(raw_count)
-    if isinstance(raw_count, (int, float)):
-        return max(0, int(raw_count))
-    instances = payload.get("instances")
-    if isinstance(instances, list):
-        return len(instances)
-    return 1 if payload else 0
-
-
-def _payload_instances(payload: Dict[str, Any]) -> list[Dict[str, Any]]:
-    instances = payload.get("instances")
-    if isinstance(instances, list):
-        return [dict(item) for item in instances if isinstance(item, dict)]
-    return [dict(payload)] if payload else []
-
-
 def _normalize_actor_key(value: Any) -> Optional[str]:
     text = str(value or "").strip()
     return text or None
@@ -129,138 +50,67 @@ def _instance_actor_key(instance: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _instance_actor_summary(instance: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    who = instance.get("who")
-    if not isinstance(who, dict):
-        return None
-    key = _instance_actor_key(instance)
-    if not key:
-        return None
-    user_id = str(who.get("id") or "").strip() or None
-    name = str(who.get("name") or "").strip() or None
-    email = str(who.get("email") or "").strip() or None
-    role = str(who.get("role") or "").strip() or None
-    return {
-        "key": key,
-        "userId": user_id,
-        "name": name,
-        "email": email,
-        "role": role,
-        "eventCount": 1,
-    }
+def _actor_columns(details: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    who = details.get("who") if isinstance(details.get("who"), dict) else {}
+    key = _instance_actor_key(details)
 
+    def _text(value: Any, limit: int) -> Optional[str]:
+        text = str(value or "").strip()
+        return text[:limit] or None
 
-def _merge_actor_summary(current: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "key": current.get("key") or incoming.get("key"),
-        "userId": current.get("userId") or incoming.get("userId"),
-        "name": current.get("name") or incoming.get("name"),
-        "email": current.get("email") or incoming.get("email"),
-        "role": current.get("role") or incoming.get("role"),
-        "eventCount": int(current.get("eventCount") or 0) + int(incoming.get("eventCount") or 0),
+        "actor_key": key[:255] if key else None,
+        "actor_user_id": _text(who.get("id"), 64),
+        "actor_name": _text(who.get("name"), 190),
+        "actor_email": _text(who.get("email"), 190),
+        "actor_role": _text(who.get("role"), 32),
     }
 
 
-def _fetch_event_payload_rows(normalized_events: list[str], *, payload_column: str) -> list[Dict[str, Any]]:
-    params: Dict[str, Any] = {}
+def _event_placeholders(normalized_events: list[str], params: Dict[str, Any]) -> str:
     placeholders: list[str] = []
     for index, event in enumerate(normalized_events):
         key = f"event_{index}"
         params[key] = event
         placeholders.append(f"%({key})s")
-
-    return mysql_client.fetch_all(
-        f"""
-        SELECT event, `{payload_column}` AS payload_value
-        FROM usage_tracking
-        WHERE event IN ({", ".join(placeholders)})
-        """,
-        params,
-    )
+    return ", ".join(placeholders)
 
 
 def insert_event(event: str, details: Dict[str, Any], *, strict: bool = False) -> bool:
+    event_name = str(event or "").strip()[:128]
     if not _using_mysql():
         if strict:
             err = RuntimeError("Usage tracking requires MySQL to be enabled.")
             setattr(err, "status", 503)
             raise err
-        logger.warning("Usage tracking skipped because MySQL is disabled", extra={"event": str(event or "").strip()[:128] or None})
+        logger.warning("Usage tracking skipped because MySQL is disabled", extra={"event": event_name or None})
         return False
-    columns = _usage_tracking_columns()
-    payload_column = _payload_column(columns)
-    if "event" not in columns or not payload_column:
-        message = (
-            "usage_tracking table is missing the required columns. "
-            f"Detected columns: {sorted(columns) if columns else []}"
-        )
-        if strict:
-            err = RuntimeError(message)
-            setattr(err, "status", 500)
-            raise err
-        logger.error(message)
-        return False
-    params = {
-        "event": str(event or "").strip()[:128],
+    payload = dict(details or {})
+    created_at = to_mysql_datetime(payload.get("when")) or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    params: Dict[str, Any] = {
+        "event": event_name,
+        "details_json": json.dumps(payload, default=str),
+        "created_at": created_at,
+        **_actor_columns(payload),
     }
     try:
-        id_column_present = "id" in columns
-        select_columns = f"id, `{payload_column}` AS payload_value" if id_column_present else f"`{payload_column}` AS payload_value"
-        rows = mysql_client.fetch_all(
+        mysql_client.execute(
             f"""
-            SELECT {select_columns}
-            FROM usage_tracking
-            WHERE event = %(event)s
-            ORDER BY {"id ASC" if id_column_present else "event ASC"}
+            INSERT INTO {_EVENTS_TABLE} (
+                event, actor_key, actor_user_id, actor_name, actor_email, actor_role,
+                details_json, created_at
+            ) VALUES (
+                %(event)s, %(actor_key)s, %(actor_user_id)s, %(actor_name)s, %(actor_email)s, %(actor_role)s,
+                %(details_json)s, %(created_at)s
+            )
             """,
             params,
         )
-        existing_payloads = [_parse_payload((row or {}).get("payload_value")) for row in (rows or [])]
-        merged_payload = _merge_event_payload(existing_payloads, details)
-        payload_json = json.dumps(merged_payload or {})
-        if rows:
-            first_row = rows[0] or {}
-            if id_column_present and first_row.get("id") is not None:
-                mysql_client.execute(
-                    f"""
-                    UPDATE usage_tracking
-                    SET `{payload_column}` = %(details_json)s
-                    WHERE id = %(row_id)s
-                    """,
-                    {"details_json": payload_json, "row_id": first_row.get("id")},
-                )
-                duplicate_ids = [
-                    row.get("id")
-                    for row in rows[1:]
-                    if isinstance(row, dict) and row.get("id") is not None
-                ]
-                for duplicate_id in duplicate_ids:
-                    mysql_client.execute(
-                        "DELETE FROM usage_tracking WHERE id = %(row_id)s",
-                        {"row_id": duplicate_id},
-                    )
-            else:
-                mysql_client.execute(
-                    f"""
-                    UPDATE usage_tracking
-                    SET `{payload_column}` = %(details_json)s
-                    WHERE event = %(event)s
-                    """,
-                    {"event": params["event"], "details_json": payload_json},
-                )
-        else:
-            mysql_client.execute(
-                f"""
-                INSERT INTO usage_tracking (event, `{payload_column}`)
-                VALUES (%(event)s, %(details_json)s)
-                """,
-                {"event": params["event"], "details_json": payload_json},
-            )
         return True
     except Exception as exc:
         if strict:
             raise exc
-        logger.exception("Usage tracking insert failed", extra={"event": params["event"], "payloadColumn": payload_column})
+        logger.exception("Usage tracking insert failed", extra={"event": event_name})
         return False
 
 
@@ -275,46 +125,64 @@ def get_event_funnel(
     if not _using_mysql():
         return {"counts": {event: 0 for event in normalized_events}, "actors": []}
 
-    columns = _usage_tracking_columns()
-    payload_column = _payload_column(columns)
-    if "event" not in columns or not payload_column:
-        logger.error(
-            "usage_tracking table is missing the required columns for analytics. Detected columns: %s",
-            sorted(columns) if columns else [],
-        )
-        return {"counts": {event: 0 for event in normalized_events}, "actors": []}
+    count_params: Dict[str, Any] = {}
+    count_placeholders = _event_placeholders(normalized_events, count_params)
+    actor_clause = ""
+    normalized_actor_key = _normalize_actor_key(actor_key)
+    if normalized_actor_key:
+        actor_clause = "AND actor_key = %(actor_key)s"
+        count_params["actor_key"] = normalized_actor_key
+    count_rows = mysql_client.fetch_all(
+        f"""
+        SELECT event, COUNT(*) AS event_count
+        FROM {_EVENTS_TABLE}
+        WHERE event IN ({count_placeholders})
+          {actor_clause}
+        GROUP BY event
+        """,
+        count_params,
+    )
 
-    rows = _fetch_event_payload_rows(normalized_events, payload_column=payload_column)
+    actor_params: Dict[str, Any] = {}
+    actor_placeholders = _event_placeholders(normalized_events, actor_params)
+    actor_rows = mysql_client.fetch_all(
+        f"""
+        SELECT actor_key,
+               MAX(actor_user_id) AS actor_user_id,
+               MAX(actor_name) AS actor_name,
+               MAX(actor_email) AS actor_email,
+               MAX(actor_role) AS actor_role,
+               COUNT(*) AS event_count
+        FROM {_EVENTS_TABLE}
+        WHERE event IN ({actor_placeholders})
+          AND actor_key IS NOT NULL
+        GROUP BY actor_key
+        """,
+        actor_params,
+    )
 
     counts = {event: 0 for event in normalized_events}
-    actor_summaries: Dict[str, Dict[str, Any]] = {}
-    normalized_actor_key = _normalize_actor_key(actor_key)
-    for row in rows or []:
+    for row in count_rows or []:
         event_name = str((row or {}).get("event") or "").strip()
-        if not event_name or event_name not in counts:
-            continue
-        payload = _parse_payload((row or {}).get("payload_value"))
-        instances = _payload_instances(payload)
-        if normalized_actor_key:
-            counts[event_name] = sum(
-                1
-                for instance in instances
-                if _instance_actor_key(instance) == normalized_actor_key
-            )
-        else:
-            counts[event_name] = _payload_count(payload)
+        if event_name in counts:
+            counts[event_name] = int((row or {}).get("event_count") or 0)
 
-        for instance in instances:
-            summary = _instance_actor_summary(instance)
-            if not summary:
-                continue
-            key = str(summary.get("key") or "").strip()
-            if not key:
-                continue
-            actor_summaries[key] = _merge_actor_summary(actor_summaries.get(key) or {}, summary)
-
-    actors = sorted(
-        actor_summaries.values(),
+    actors: list[Dict[str, Any]] = []
+    for row in actor_rows or []:
+        key = str((row or {}).get("actor_key") or "").strip()
+        if not key:
+            continue
+        actors.append(
+            {
+                "key": key,
+                "userId": str(row.get("actor_user_id") or "").strip() or None,
+                "name": str(row.get("actor_name") or "").strip() or None,
+                "email": str(row.get("actor_email") or "").strip() or None,
+                "role": str(row.get("actor_role") or "").strip() or None,
+                "eventCount": int(row.get("event_count") or 0),
+            }
+        )
+    actors.sort(
         key=lambda item: (
             str(item.get("name") or item.get("email") or item.get("userId") or "").lower(),
             str(item.get("key") or "").lower(),
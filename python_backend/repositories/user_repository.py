@@ -3,10 +3,10 @@ from __future__ import annotations
 import json
 import re
 from datetime import datetime, timezone
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
 from ..services import get_config
-from ..database import mysql_client
+from ..database import mysql_client, schema_catalog
 
 from .. import storage
 from ._mysql_datetime import to_mysql_datetime
@@ -328,6 +328,15 @@ def get_all() -> List[Dict]:
     return _load()
 
 
+def iter_all(*, batch_size: int = 500) -> Iterator[Dict]:
+    """Stream every user (server-side cursor in MySQL mode) for backfills and full scans."""
+    if not _using_mysql():
+        yield from (_ensure_defaults(user) for user in _get_store().read())
+        return
+    for row in mysql_client.iter_rows("SELECT * FROM users", batch_size=batch_size):
+        yield _row_to_user(row)
+
+
 _PROFILE_SELECT_FIELDS = """
     id,
     name,
@@ -682,6 +691,214 @@ def list_sales_modal_lookup_users() -> List[Dict]:
     return [_row_to_user(row) for row in rows or []]
 
 
+# Targeted lookups ------------------------------------------------------------
+#
+# Request paths that only need identity and attribution for a handful of users
+# use these instead of `get_all()`: each reads an indexed subset (id, role,
+# sales_rep_id, email) with the narrow `_LOOKUP_SELECT_FIELDS` projection, so
+# the cost follows the users involved rather than the size of the table.
+# Projected rows are read-only views; never pass one to `update()` whole.
+
+_LOOKUP_SELECT_FIELDS = """
+    id,
+    name,
+    email,
+    role,
+    status,
+    sales_rep_id,
+    referrer_doctor_id,
+    lead_type,
+    lead_type_source,
+    lead_type_locked_at,
+    phone,
+    office_address_line1,
+    office_address_line2,
+    office_city,
+    office_state,
+    office_postal_code,
+    office_country,
+    profile_image_url,
+    greater_area,
+    study_focus,
+    bio,
+    reseller_permit_file_path,
+    reseller_permit_file_name,
+    reseller_permit_uploaded_at
+"""
+
+_LOOKUP_CHUNK = 500
+
+
+def _normalize_lookup_values(values, *, lower: bool = False) -> List[str]:
+    normalized: List[str] = []
+    seen: set[str] = set()
+    for value in values or []:
+        text = str(value or "").strip()
+        if lower:
+            text = text.lower()
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        normalized.append(text)
+    return normalized
+
+
+def _fetch_lookup_rows(column: str, values: List[str], *, select: str = _LOOKUP_SELECT_FIELDS) -> List[Dict]:
+    results: List[Dict] = []
+    for offset in range(0, len(values), _LOOKUP_CHUNK):
+        chunk = values[offset : offset + _LOOKUP_CHUNK]
+        placeholders = ", ".join(f"%(v{idx})s" for idx in range(len(chunk)))
+        params = {f"v{idx}": value for idx, value in enumerate(chunk)}
+        rows = mysql_client.fetch_all(
+            f"SELECT {select} FROM users WHERE {column} IN ({placeholders})",
+            params,
+        )
+        results.extend(_row_to_user(row) for row in rows or [] if row)
+    return results
+
+
+def list_lookup_users(*, include_dev_commission: bool = False) -> List[Dict]:
+    """
+    Every user, narrow projection (for reports that must resolve arbitrary orders).
+
+    `dev_commission` is an optional column; it is selected only when asked for
+    and present in the schema.
+    """
+    if not _using_mysql():
+        return _load()
+    select = _LOOKUP_SELECT_FIELDS
+    if include_dev_commission and schema_catalog.has_column("users", "dev_commission"):
+        select = f"{select.rstrip()},\n    dev_commission\n"
+    rows = mysql_client.fetch_all(f"SELECT {select} FROM users")
+    return [_row_to_user(row) for row in rows or [] if row]
+
+
+def find_lookup_by_ids(user_ids) -> List[Dict]:
+    ids = _normalize_lookup_values(user_ids)
+    if not ids:
+        return []
+    if not _using_mysql():
+        wanted = set(ids)
+        return [user for user in _load() if str(user.get("id") or "").strip() in wanted]
+    return _fetch_lookup_rows("id", ids)
+
+
+def find_by_ids(user_ids) -> List[Dict]:
+    """Full rows for a set of ids; use when the rows are written back."""
+    ids = _normalize_lookup_values(user_ids)
+    if not ids:
+        return []
+    if not _using_mysql():
+        wanted = set(ids)
+        return [user for user in _load() if str(user.get("id") or "").strip() in wanted]
+    return _fetch_lookup_rows("id", ids, select="*")
+
+
+def list_lookup_by_roles(roles) -> List[Dict]:
+    normalized_roles = _normalize_lookup_values(roles, lower=True)
+    if not normalized_roles:
+        return []
+    if not _using_mysql():
+        wanted = set(normalized_roles)
+        return [user for user in _load() if str(user.get("role") or "").strip().lower() in wanted]
+    return _fetch_lookup_rows("role", normalized_roles)
+
+
+def list_lookup_by_sales_rep_ids(sales_rep_ids, *, roles=None) -> List[Dict]:
+    rep_ids = _normalize_lookup_values(sales_rep_ids)
+    if not rep_ids:
+        return []
+    wanted_roles = set(_normalize_lookup_values(roles, lower=True)) if roles else None
+    if not _using_mysql():
+        wanted = set(rep_ids)
+        users = [
+            user
+            for user in _load()
+            if str(user.get("salesRepId") or user.get("sales_rep_id") or "").strip() in wanted
+        ]
+    else:
+        users = _fetch_lookup_rows("sales_rep_id", rep_ids)
+    if wanted_roles is None:
+        return users
+    return [user for user in users if str(user.get("role") or "").strip().lower() in wanted_roles]
+
+
+def _normalize_lead_type_key(value) -> str:
+    return str(value or "").strip().lower().replace("-", "_").replace(" ", "_")
+
+
+def list_lookup_by_lead_types(lead_types) -> List[Dict]:
+    normalized_types = _normalize_lookup_values((_normalize_lead_type_key(t) for t in lead_types or []))
+    if not normalized_types:
+        return []
+    if not _using_mysql():
+        wanted = set(normalized_types)
+        return [
+            user
+            for user in _load()
+            if _normalize_lead_type_key(user.get("leadType") or user.get("lead_type")) in wanted
+        ]
+    return _fetch_lookup_rows(
+        "REPLACE(REPLACE(LOWER(TRIM(COALESCE(lead_type, ''))), '-', '_'), ' ', '_')",
+        normalized_types,
+    )
+
+
+def find_lookup_by_emails(emails) -> List[Dict]:
+    normalized_emails = _normalize_lookup_values((_normalize_lookup_email(str(e or "")) for e in emails or []))
+    if not normalized_emails:
+        return []
+    if not _using_mysql():
+        wanted = set(normalized_emails)
+        return [user for user in _load() if str(user.get("email") or "").strip().lower() in wanted]
+    return _fetch_lookup_rows("email", normalized_emails)
+
+
+def list_online_presence_users() -> List[Dict]:
+    """Users currently flagged online, with just the fields the presence sweep needs."""
+    if not _using_mysql():
+        return [user for user in _load() if _normalize_bool(user.get("isOnline"))]
+    rows = mysql_client.fetch_all("SELECT id, is_online, last_seen_at FROM users WHERE is_online = 1")
+    return [
+        {
+            "id": row.get("id"),
+            "isOnline": True,
+            "lastSeenAt": row.get("last_seen_at").replace(tzinfo=timezone.utc).isoformat()
+            if isinstance(row.get("last_seen_at"), datetime)
+            else row.get("last_seen_at"),
+        }
+        for row in rows or []
+        if row and row.get("id")
+    ]
+
+
+def mark_offline(user_ids) -> int:
+    """Clear `isOnline` for the given users in one write (one store save in JSON mode)."""
+    ids = _normalize_lookup_values(user_ids)
+    if not ids:
+        return 0
+    if _using_mysql():
+        updated = 0
+        for offset in range(0, len(ids), _LOOKUP_CHUNK):
+            chunk = ids[offset : offset + _LOOKUP_CHUNK]
+            placeholders = ", ".join(f"%(v{idx})s" for idx in range(len(chunk)))
+            params = {f"v{idx}": value for idx, value in enumerate(chunk)}
+            updated += int(
+                mysql_client.execute(f"UPDATE users SET is_online = 0 WHERE id IN ({placeholders})", params) or 0
+            )
+        return updated
+    wanted = set(ids)
+    users = _load()
+    updated = 0
+    for index, user in enumerate(users):
+        if str(user.get("id") or "").strip() in wanted and _normalize_bool(user.get("isOnline")):
+            users[index] = {**user, "isOnline": False}
+            updated += 1
+    if updated:
+        _save(users)
+    return updated
+
+
 def list_recent_users_since(cutoff: datetime) -> List[Dict]:
     """
     Lightweight user activity projection used by admin dashboards.
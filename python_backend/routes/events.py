@@ -13,7 +13,6 @@ from ..utils.http import handle_action
 
 blueprint = Blueprint("events", __name__, url_prefix="/api")
 
-_POLL_SECONDS = 2.0
 _HEARTBEAT_SECONDS = 20.0
 
 
@@ -51,29 +50,35 @@ def app_events():
 
     @stream_with_context
     def generate():
-        last_versions = resource_version_service.get_versions(resources)
-        last_heartbeat = time.monotonic()
-        yield ": connected\n\n"
-        while True:
-            now = time.monotonic()
-            if now - last_heartbeat >= _HEARTBEAT_SECONDS:
-                last_heartbeat = now
-                yield f": heartbeat {_now_iso()}\n\n"
-
-            try:
-                current_versions = resource_version_service.get_versions(resources)
-            except Exception:
-                current_versions = last_versions
-
-            for resource, row in sorted(current_versions.items()):
-                previous = last_versions.get(resource)
-                previous_version = int((previous or {}).get("version") or 0)
-                current_version = int((row or {}).get("version") or 0)
-                if current_version > previous_version:
-                    yield _event_payload(row)
-
-            last_versions = current_versions
-            time.sleep(_POLL_SECONDS)
+        # Every stream in this process shares one version watcher; this loop
+        # only waits for its revision to move and diffs the snapshot.
+        revision = resource_version_service.subscribe()
+        try:
+            revision, last_versions = resource_version_service.watched_versions(resources)
+            last_heartbeat = time.monotonic()
+            yield ": connected\n\n"
+            while True:
+                now = time.monotonic()
+                if now - last_heartbeat >= _HEARTBEAT_SECONDS:
+                    last_heartbeat = now
+                    yield f": heartbeat {_now_iso()}\n\n"
+
+                revision, current_versions = resource_version_service.wait_for_change(
+                    revision,
+                    resources,
+                    timeout_s=max(0.0, _HEARTBEAT_SECONDS - (time.monotonic() - last_heartbeat)),
+                )
+
+                for resource, row in sorted(current_versions.items()):
+                    previous = last_versions.get(resource)
+                    previous_version = int((previous or {}).get("version") or 0)
+                    current_version = int((row or {}).get("version") or 0)
+                    if current_version > previous_version:
+                        yield _event_payload(row)
+
+                last_versions = current_versions
+        finally:
+            resource_version_service.unsubscribe()
 
     response = Response(generate(), mimetype="text/event-stream")
     response.headers["Cache-Control"] = "no-store"
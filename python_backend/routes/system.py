@@ -22,6 +22,8 @@ from ..services import get_config
 from ..services import news_service
 from ..integrations import ship_engine, woo_commerce
 from ..utils.http import handle_action, utc_now_iso as _now
+from ..utils import http_client
+from ..database import mysql_client
 
 blueprint = Blueprint("system", __name__, url_prefix="/api")
 
@@ -993,6 +995,9 @@ def health():
             request_stats = _active_request_stats()
             if int(request_stats.get("slowCount") or 0) > 0:
                 status = "degraded"
+            outbound_http = http_client.get_metrics()
+            mysql_pool = mysql_client.get_pool_metrics() if mysql_enabled else None
+            woo_catalog_cache = woo_commerce.get_catalog_cache_stats()
         except Exception:
             # Never allow health checks to 500; return a degraded payload instead.
             build = os.environ.get("BACKEND_BUILD", "unknown")
@@ -1002,6 +1007,9 @@ def health():
             workers = None
             background_jobs = None
             request_stats = None
+            outbound_http = None
+            mysql_pool = None
+            woo_catalog_cache = None
             master = None
             children = None
             uptime = None
@@ -1010,7 +1018,7 @@ def health():
             "message": "Server is running",
             "build": build,
             "routeSet": str(current_app.config.get("APP_ROUTE_SET") or ""),
-            "mysql": {"enabled": mysql_enabled},
+            "mysql": {"enabled": mysql_enabled, "pool": mysql_pool},
             "usage": usage,
             "cgroup": {"memory": _read_cgroup_memory()},
             "workers": workers,
@@ -1018,6 +1026,8 @@ def health():
             "uptime": uptime,
             "backgroundJobs": background_jobs,
             "requests": request_stats,
+            "outboundHttp": outbound_http,
+            "wooCatalogCache": woo_catalog_cache,
             "timestamp": _now(),
         }
 
@@ -103,14 +103,14 @@ def main() -> None:
     limit = int(args.limit or 0)
     rep_scope = str(args.sales_rep_id or "").strip()
 
-    users = user_repository.get_all()
+    users = user_repository.iter_all()
     scanned = 0
     created = 0
     updated = 0
     skipped = 0
     errors = 0
 
-    for user in users or []:
+    for user in users:
         if not isinstance(user, dict):
             continue
         if rep_scope:
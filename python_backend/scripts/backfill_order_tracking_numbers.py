@@ -61,7 +61,9 @@ def _resolve_tracking(payload: Dict[str, Any]) -> Optional[str]:
 
 
 def main(limit: int = 2000) -> None:
-    rows = mysql_client.fetch_all(
+    # Streamed so large backfills keep flat memory; the UPDATEs below run on
+    # pooled connections while the scan holds its own.
+    rows = mysql_client.iter_rows(
         """
         SELECT id, woo_order_number, payload
         FROM orders
@@ -74,7 +76,7 @@ def main(limit: int = 2000) -> None:
     )
     updated = 0
     scanned = 0
-    for row in rows or []:
+    for row in rows:
         scanned += 1
         order_id = _safe_str(row.get("id"))
         payload_raw = row.get("payload")
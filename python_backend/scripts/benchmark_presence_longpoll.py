@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socketserver
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from flask import Flask, Response, request
+
+from python_backend.presence_async import PresenceLongPollServer
+
+# Compares concurrent long-poll capacity of the two ways to serve the presence
+# route set, using a stand-in app whose long-poll view behaves like
+# `settings.longpoll_live_users` (etag check, then wait on the presence revision):
+#
+#   threaded - a fixed pool of N request threads, like gunicorn gthread --threads N
+#   async    - python_backend.presence_async with N WSGI threads
+#
+# For each mode it parks --clients long-polls, times a presence ping issued while
+# they are parked, then bumps the revision and times how long until every poll
+# has its answer. pingWhileParkedMs is null when the ping got no thread within
+# --timeout-ms.
+
+
+class _Revisions:
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.revision = 0
+
+    def current_revision(self) -> int:
+        with self.condition:
+            return self.revision
+
+    def wait_for_change(self, since_revision: int, *, timeout_s: float) -> int:
+        with self.condition:
+            if self.revision == since_revision and timeout_s > 0:
+                self.condition.wait(timeout=timeout_s)
+            return self.revision
+
+    def bump(self) -> None:
+        with self.condition:
+            self.revision += 1
+            self.condition.notify_all()
+
+
+def _build_app(revisions: _Revisions) -> Flask:
+    app = Flask(__name__)
+
+    @app.get("/api/settings/live-users/longpoll")
+    def live_users_longpoll():
+        client_etag = request.args.get("etag")
+        timeout_s = int(request.args.get("timeoutMs") or 25000) / 1000.0
+        deadline = time.monotonic() + timeout_s
+        revision = revisions.current_revision()
+        if f"r{revision}" != client_etag:
+            return {"etag": f"r{revision}"}
+        while time.monotonic() < deadline:
+            revision = revisions.wait_for_change(revision, timeout_s=min(1.0, deadline - time.monotonic()))
+            if f"r{revision}" != client_etag:
+                return {"etag": f"r{revision}"}
+        return Response(status=204)
+
+    @app.post("/api/settings/presence")
+    def record_presence():
+        return {"ok": True}
+
+    return app
+
+
+class _PooledWSGIServer(WSGIServer):
+    """wsgiref server that handles requests on a fixed thread pool (gthread-like)."""
+
+    request_queue_size = 4096
+
+    def __init__(self, *args, threads: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+async def _http(port: int, method: str, target: str) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: bench\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    return int(raw.split(b" ", 2)[1]) if raw else 0
+
+
+async def _measure(port: int, revisions: _Revisions, clients: int, timeout_ms: int) -> dict:
+    target = f"/api/settings/live-users/longpoll?etag=r{revisions.current_revision()}&timeoutMs={timeout_ms}"
+    answered: list[float] = []
+
+    async def poll() -> int:
+        status = await _http(port, "GET", target)
+        answered.append(time.perf_counter())
+        return status
+
+    polls = [asyncio.ensure_future(poll()) for _ in range(clients)]
+    await asyncio.sleep(1.0)
+
+    ping_started = time.perf_counter()
+    try:
+        await asyncio.wait_for(_http(port, "POST", "/api/settings/presence"), timeout=timeout_ms / 1000.0)
+        ping_ms = round((time.perf_counter() - ping_started) * 1000, 1)
+    except asyncio.TimeoutError:
+        ping_ms = None
+
+    bump_at = time.perf_counter()
+    revisions.bump()
+    statuses = await asyncio.gather(*polls, return_exceptions=True)
+    woken = [stamp - bump_at for stamp in answered if stamp >= bump_at]
+    return {
+        "clients": clients,
+        "pingWhileParkedMs": ping_ms,
+        "answeredWithChange": sum(1 for status in statuses if status == 200),
+        "timedOutOrFailed": sum(1 for status in statuses if status != 200),
+        "wakeP50Ms": round(statistics.median(woken) * 1000, 1) if woken else None,
+        "wakeMaxMs": round(max(woken) * 1000, 1) if woken else None,
+    }
+
+
+def _bench_threaded(clients: int, threads: int, timeout_ms: int) -> dict:
+    revisions = _Revisions()
+    server = make_server(
+        "127.0.0.1",
+        0,
+        _build_app(revisions),
+        server_class=lambda *a, **k: _PooledWSGIServer(*a, threads=threads, **k),
+        handler_class=_QuietHandler,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return asyncio.run(_measure(server.server_port, revisions, clients, timeout_ms))
+    finally:
+        server.shutdown()
+
+
+def _bench_async(clients: int, threads: int, timeout_ms: int) -> dict:
+    revisions = _Revisions()
+
+    async def run() -> dict:
+        server = PresenceLongPollServer(_build_app(revisions), threads=threads, revision_source=revisions)
+        listener = await server.start("127.0.0.1", 0)
+        try:
+            return await _measure(listener.sockets[0].getsockname()[1], revisions, clients, timeout_ms)
+        finally:
+            await server.stop()
+
+    return asyncio.run(run())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent presence long-polls: thread pool vs event loop.")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--timeout-ms", type=int, default=5000)
+    parser.add_argument("--mode", choices=("both", "threaded", "async"), default="both")
+    args = parser.parse_args()
+
+    socketserver.TCPServer.allow_reuse_address = True
+    results = {}
+    if args.mode in ("both", "threaded"):
+        results["threaded"] = _bench_threaded(args.clients, args.threads, args.timeout_ms)
+    if args.mode in ("both", "async"):
+        results["async"] = _bench_async(args.clients, args.threads, args.timeout_ms)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,13 +16,29 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Sync only product/category snapshots and skip variable-product variation payloads.",
     )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--full",
+        action="store_const",
+        const="full",
+        dest="mode",
+        help="Refetch every product and prune deleted ones, regardless of the full-sync interval.",
+    )
+    mode.add_argument(
+        "--incremental",
+        action="store_const",
+        const="incremental",
+        dest="mode",
+        help="Only fetch products modified since the last successful run (falls back to full without a watermark).",
+    )
+    parser.set_defaults(mode="auto")
     return parser
 
 
 def main() -> int:
     args = _build_parser().parse_args()
     bootstrap()
-    result = sync_catalog_snapshots(include_variations=not args.skip_variations)
+    result = sync_catalog_snapshots(include_variations=not args.skip_variations, mode=args.mode)
     print(json.dumps(result, indent=2, sort_keys=True))
     if result.get("ok"):
         return 0
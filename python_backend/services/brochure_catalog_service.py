@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import logging
 import re
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -9,28 +8,11 @@ from ..database import mysql_client
 from ..repositories import product_document_repository
 from . import get_config
 from . import delegation_service
-from .catalog_snapshot_service import KIND_CATALOG_PRODUCT_FULL, KIND_CATALOG_PRODUCT_LIGHT
+from . import catalog_snapshot_service
 
 logger = logging.getLogger(__name__)
 
 
-def _decode_json(raw: Any) -> Optional[Dict[str, Any]]:
-    if isinstance(raw, memoryview):
-        raw = raw.tobytes()
-    if isinstance(raw, (bytes, bytearray)):
-        try:
-            raw = raw.decode("utf-8")
-        except Exception:
-            return None
-    if not isinstance(raw, str) or not raw.strip():
-        return None
-    try:
-        parsed = json.loads(raw)
-    except Exception:
-        return None
-    return parsed if isinstance(parsed, dict) else None
-
-
 def _text(value: Any) -> str:
     return str(value or "").strip()
 
@@ -172,33 +154,7 @@ def _load_brochure_rows() -> List[Dict[str, Any]]:
 
 
 def _load_snapshot_products() -> List[Dict[str, Any]]:
-    rows = mysql_client.fetch_all(
-        """
-        SELECT woo_product_id, kind, data
-        FROM product_documents
-        WHERE kind IN (%(kind_full)s, %(kind_light)s)
-          AND woo_product_id <> 0
-          AND data IS NOT NULL
-          AND OCTET_LENGTH(data) > 0
-        ORDER BY woo_product_id ASC,
-          CASE WHEN kind = %(kind_full)s THEN 0 ELSE 1 END
-        """,
-        {"kind_full": KIND_CATALOG_PRODUCT_FULL, "kind_light": KIND_CATALOG_PRODUCT_LIGHT},
-    )
-    seen: set[int] = set()
-    products: List[Dict[str, Any]] = []
-    for row in rows or []:
-        try:
-            woo_id = int(row.get("woo_product_id"))
-        except Exception:
-            continue
-        if woo_id in seen:
-            continue
-        parsed = _decode_json(row.get("data"))
-        if isinstance(parsed, dict):
-            seen.add(woo_id)
-            products.append(parsed)
-    return products
+    return catalog_snapshot_service.get_all_catalog_products()
 
 
 def _coa_available_by_product_id(product_ids: Iterable[int]) -> Dict[int, bool]:
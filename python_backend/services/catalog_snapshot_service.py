@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
 import logging
 import os
+import re
 import threading
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set, Tuple
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 from ..database import mysql_client
 from ..integrations import woo_commerce
@@ -18,6 +24,41 @@ KIND_CATALOG_PRODUCT_LIGHT = "catalog_product_light"
 KIND_CATALOG_PRODUCT_FULL = "catalog_product_full"
 KIND_CATALOG_CATEGORIES = "catalog_categories"
 
+# Incremental runs ask Woo only for products modified since the last successful
+# run's start (minus an overlap for clock skew) and skip snapshot rows whose
+# content hash is unchanged. A full run (every product, plus pruning of deleted
+# ones) happens when there is no watermark yet, when the last full run is older
+# than CATALOG_SNAPSHOT_FULL_INTERVAL_HOURS, or when asked for explicitly.
+# Variation-only edits that do not touch the parent product are picked up by
+# the next full run.
+_SYNC_STATE_KEY = "catalog_snapshot_sync_state"
+_MODIFIED_AFTER_OVERLAP = timedelta(minutes=5)
+SYNC_MODES = ("auto", "incremental", "full")
+
+# Readers share one decoded, immutable CatalogIndex per process instead of
+# paging and re-decoding product_documents on every call. The index is keyed on
+# the "catalog" resource version: at most every CATALOG_INDEX_RECHECK_SECONDS a
+# reader compares the version and, when a sync has bumped it, one thread
+# reloads the whole index while the others keep serving the previous one. The
+# snapshot dicts inside are shared between requests, so the accessors below hand
+# out deep copies; only `get_catalog_index()` itself exposes the shared dicts.
+_INDEX_LOCK = threading.Lock()
+_INDEX: Optional["CatalogIndex"] = None
+_INDEX_CHECKED_AT = 0.0
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    version: Any
+    light_products: Tuple[Dict[str, Any], ...]
+    products: Tuple[Dict[str, Any], ...]
+    by_id: Mapping[int, Dict[str, Any]]
+    full_ids: frozenset
+    by_sku: Mapping[str, Dict[str, Any]]
+    by_category: Mapping[str, Tuple[Dict[str, Any], ...]]
+    by_tag: Mapping[str, Tuple[Dict[str, Any], ...]]
+    categories: Tuple[Dict[str, Any], ...]
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -51,6 +92,93 @@ def _prune_coa_stubs_enabled() -> bool:
     return raw not in ("0", "false", "no", "off")
 
 
+def _index_recheck_seconds() -> float:
+    raw = str(os.environ.get("CATALOG_INDEX_RECHECK_SECONDS", "5")).strip()
+    try:
+        value = float(raw)
+    except Exception:
+        value = 5.0
+    return max(0.0, min(value, 300.0))
+
+
+def _full_interval() -> timedelta:
+    raw = str(os.environ.get("CATALOG_SNAPSHOT_FULL_INTERVAL_HOURS", "6")).strip()
+    try:
+        value = float(raw)
+    except Exception:
+        value = 6.0
+    return timedelta(hours=max(0.0, min(value, 24.0 * 7)))
+
+
+def _parse_state_time(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except Exception:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _load_sync_state() -> Dict[str, Any]:
+    try:
+        row = mysql_client.fetch_one(
+            "SELECT value_json FROM settings WHERE `key` = %(key)s",
+            {"key": _SYNC_STATE_KEY},
+        )
+    except Exception:
+        logger.warning("[catalog-snapshot] sync state read failed; running a full sync", exc_info=True)
+        return {}
+    parsed = _decode_snapshot_json((row or {}).get("value_json") if isinstance(row, dict) else None)
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _save_sync_state(state: Dict[str, Any]) -> None:
+    mysql_client.execute(
+        """
+        INSERT INTO settings (`key`, value_json, updated_at)
+        VALUES (%(key)s, %(value_json)s, %(updated_at)s)
+        ON DUPLICATE KEY UPDATE
+            value_json = VALUES(value_json),
+            updated_at = VALUES(updated_at)
+        """,
+        {"key": _SYNC_STATE_KEY, "value_json": json.dumps(state), "updated_at": _utc_now_sql()},
+    )
+
+
+def _resolve_sync_mode(requested: str, state: Dict[str, Any], now: datetime) -> str:
+    if requested in ("incremental", "full"):
+        mode = requested
+    else:
+        last_full = _parse_state_time(state.get("lastFullSyncAt"))
+        mode = "full" if last_full is None or now - last_full >= _full_interval() else "incremental"
+    if mode == "incremental" and _parse_state_time(state.get("watermark")) is None:
+        return "full"
+    return mode
+
+
+def _existing_snapshot_hashes() -> Dict[Tuple[int, str], str]:
+    rows = mysql_client.fetch_all(
+        """
+        SELECT woo_product_id, kind, sha256
+        FROM product_documents
+        WHERE kind IN (%(kind_light)s, %(kind_full)s, %(kind_categories)s)
+        """,
+        {
+            "kind_light": KIND_CATALOG_PRODUCT_LIGHT,
+            "kind_full": KIND_CATALOG_PRODUCT_FULL,
+            "kind_categories": KIND_CATALOG_CATEGORIES,
+        },
+    )
+    hashes: Dict[Tuple[int, str], str] = {}
+    for row in rows or []:
+        try:
+            hashes[(int((row or {}).get("woo_product_id")), str(row.get("kind")))] = str(row.get("sha256") or "")
+        except Exception:
+            continue
+    return hashes
+
+
 def _try_acquire_lock(name: str) -> bool:
     try:
         row = mysql_client.fetch_one("SELECT GET_LOCK(%(name)s, 0) AS acquired", {"name": name})
@@ -301,12 +429,18 @@ def _product_full_snapshot(
     return base
 
 
-def _fetch_all_products() -> Tuple[List[Dict[str, Any]], bool]:
+def _fetch_all_products(*, modified_after: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], bool]:
     per_page = 100
     page = 1
     results: List[Dict[str, Any]] = []
     max_pages = 250
     hit_limit = False
+    filters: Dict[str, Any] = {}
+    if modified_after is not None:
+        filters = {
+            "modified_after": modified_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+            "dates_are_gmt": "true",
+        }
 
     while page <= max_pages:
         data, _meta = woo_commerce.fetch_catalog_fresh(
@@ -317,6 +451,7 @@ def _fetch_all_products() -> Tuple[List[Dict[str, Any]], bool]:
                 "status": "publish",
                 "orderby": "id",
                 "order": "asc",
+                **filters,
             },
             acquire_timeout=8,
         )
@@ -354,7 +489,7 @@ def _fetch_categories() -> List[Dict[str, Any]]:
     return [item for item in data if isinstance(item, dict)]
 
 
-def sync_catalog_snapshots(*, include_variations: bool = True) -> Dict[str, Any]:
+def sync_catalog_snapshots(*, include_variations: bool = True, mode: str = "auto") -> Dict[str, Any]:
     config = get_config()
     if not bool(config.mysql.get("enabled")):
         return {"ok": False, "skipped": True, "reason": "mysql_disabled"}
@@ -362,6 +497,9 @@ def sync_catalog_snapshots(*, include_variations: bool = True) -> Dict[str, Any]
         return {"ok": False, "skipped": True, "reason": "woo_disabled"}
     if not _enabled():
         return {"ok": False, "skipped": True, "reason": "snapshot_disabled"}
+    requested_mode = str(mode or "auto").strip().lower()
+    if requested_mode not in SYNC_MODES:
+        raise ValueError(f"mode must be one of {', '.join(SYNC_MODES)}")
 
     lock_name = "trufusion:sync:catalog-snapshot"
     if not _try_acquire_lock(lock_name):
@@ -370,210 +508,361 @@ def sync_catalog_snapshots(*, include_variations: bool = True) -> Dict[str, Any]
     started_at = _utc_now()
     now_sql = _utc_now_sql()
 
-    products, hit_limit = _fetch_all_products()
-    categories = _fetch_categories()
-    category_by_id: Dict[int, Dict[str, Any]] = {}
-    for cat in categories:
-        try:
-            cat_id = int(cat.get("id")) if isinstance(cat, dict) and cat.get("id") is not None else None
-        except Exception:
-            cat_id = None
-        if cat_id is None:
-            continue
-        category_by_id[cat_id] = {"id": cat_id, "name": cat.get("name"), "slug": cat.get("slug")}
-
-    product_count = 0
-    variation_products = 0
-    variation_rows = 0
-
-    # Limit concurrent variation pulls so we never stampede Woo.
-    concurrency = int(os.environ.get("CATALOG_SNAPSHOT_VARIATION_CONCURRENCY", "2").strip() or 2)
-    concurrency = max(1, min(concurrency, 8))
-    semaphore = threading.BoundedSemaphore(concurrency)
-    variation_acquire_timeout = float(os.environ.get("CATALOG_SNAPSHOT_VARIATION_ACQUIRE_TIMEOUT_SECONDS", "120").strip() or 120)
-    variation_acquire_timeout = max(5.0, min(variation_acquire_timeout, 900.0))
-
-    def sync_one(product: Dict[str, Any]) -> None:
-        nonlocal product_count, variation_products, variation_rows
-        try:
-            woo_id_raw = product.get("id")
-            if not isinstance(woo_id_raw, int):
-                woo_id_raw = int(str(woo_id_raw))
-            woo_id = int(woo_id_raw)
-        except Exception:
-            return
-        name = product.get("name") if isinstance(product.get("name"), str) else None
-        sku = product.get("sku") if isinstance(product.get("sku"), str) else None
-
-        light = _product_light_snapshot(product, category_by_id=category_by_id)
-        product_document_repository.upsert_payload(
-            woo_product_id=woo_id,
-            kind=KIND_CATALOG_PRODUCT_LIGHT,
-            mime_type="application/json",
-            filename=None,
-            data=_compact_json(light),
-            product_name=name,
-            product_sku=sku,
-            woo_synced_at=now_sql,
-        )
-
-        product_count += 1
-
-        if not include_variations:
-            return
-        is_variable = str(product.get("type") or "").strip().lower() == "variable"
-        if not is_variable:
-            return
-
-        acquired = semaphore.acquire(timeout=variation_acquire_timeout)
-        if not acquired:
-            logger.warning(
-                "[catalog-snapshot] variation fetch skipped (semaphore timeout)",
-                extra={"wooProductId": woo_id, "timeoutSeconds": variation_acquire_timeout, "concurrency": concurrency},
+    try:
+        state = _load_sync_state()
+        sync_mode = _resolve_sync_mode(requested_mode, state, started_at)
+        modified_after = None
+        if sync_mode == "incremental":
+            modified_after = _parse_state_time(state.get("watermark")) - _MODIFIED_AFTER_OVERLAP
+
+        products, hit_limit = _fetch_all_products(modified_after=modified_after)
+        categories = _fetch_categories()
+        category_by_id: Dict[int, Dict[str, Any]] = {}
+        for cat in categories:
+            try:
+                cat_id = int(cat.get("id")) if isinstance(cat, dict) and cat.get("id") is not None else None
+            except Exception:
+                cat_id = None
+            if cat_id is None:
+                continue
+            category_by_id[cat_id] = {"id": cat_id, "name": cat.get("name"), "slug": cat.get("slug")}
+
+        existing_hashes = _existing_snapshot_hashes()
+        counters_lock = threading.Lock()
+        product_count = 0
+        variation_products = 0
+        variation_rows = 0
+        written_rows = 0
+        unchanged_rows = 0
+        failed_products = 0
+
+        def write_snapshot(woo_id: int, kind: str, payload: Any, *, name: Optional[str], sku: Optional[str]) -> None:
+            # Skip the write (and its full-row rewrite) when the stored payload hash matches.
+            nonlocal written_rows, unchanged_rows
+            data = _compact_json(payload)
+            if existing_hashes.get((woo_id, kind)) == hashlib.sha256(data).hexdigest():
+                with counters_lock:
+                    unchanged_rows += 1
+                return
+            product_document_repository.upsert_payload(
+                woo_product_id=woo_id,
+                kind=kind,
+                mime_type="application/json",
+                filename=None,
+                data=data,
+                product_name=name,
+                product_sku=sku,
+                woo_synced_at=now_sql,
             )
-            return
-        try:
-            variations = _fetch_product_variations(woo_id)
-        finally:
+            with counters_lock:
+                written_rows += 1
+
+        # Limit concurrent variation pulls so we never stampede Woo.
+        concurrency = int(os.environ.get("CATALOG_SNAPSHOT_VARIATION_CONCURRENCY", "2").strip() or 2)
+        concurrency = max(1, min(concurrency, 8))
+        semaphore = threading.BoundedSemaphore(concurrency)
+        variation_acquire_timeout = float(os.environ.get("CATALOG_SNAPSHOT_VARIATION_ACQUIRE_TIMEOUT_SECONDS", "120").strip() or 120)
+        variation_acquire_timeout = max(5.0, min(variation_acquire_timeout, 900.0))
+
+        def sync_one(product: Dict[str, Any]) -> None:
+            nonlocal product_count, variation_products, variation_rows
             try:
-                semaphore.release()
-            except ValueError:
-                pass
-        variation_products += 1
-        variation_rows += len(variations)
-
-        full = _product_full_snapshot(product, variations, category_by_id=category_by_id)
-        product_document_repository.upsert_payload(
-            woo_product_id=woo_id,
-            kind=KIND_CATALOG_PRODUCT_FULL,
-            mime_type="application/json",
-            filename=None,
-            data=_compact_json(full),
-            product_name=name,
-            product_sku=sku,
-            woo_synced_at=now_sql,
-        )
+                woo_id_raw = product.get("id")
+                if not isinstance(woo_id_raw, int):
+                    woo_id_raw = int(str(woo_id_raw))
+                woo_id = int(woo_id_raw)
+            except Exception:
+                return
+            name = product.get("name") if isinstance(product.get("name"), str) else None
+            sku = product.get("sku") if isinstance(product.get("sku"), str) else None
+
+            write_snapshot(
+                woo_id,
+                KIND_CATALOG_PRODUCT_LIGHT,
+                _product_light_snapshot(product, category_by_id=category_by_id),
+                name=name,
+                sku=sku,
+            )
+            with counters_lock:
+                product_count += 1
+
+            if not include_variations:
+                return
+            is_variable = str(product.get("type") or "").strip().lower() == "variable"
+            if not is_variable:
+                return
+
+            acquired = semaphore.acquire(timeout=variation_acquire_timeout)
+            if not acquired:
+                logger.warning(
+                    "[catalog-snapshot] variation fetch skipped (semaphore timeout)",
+                    extra={"wooProductId": woo_id, "timeoutSeconds": variation_acquire_timeout, "concurrency": concurrency},
+                )
+                return
+            try:
+                variations = _fetch_product_variations(woo_id)
+            finally:
+                try:
+                    semaphore.release()
+                except ValueError:
+                    pass
+            with counters_lock:
+                variation_products += 1
+                variation_rows += len(variations)
+
+            write_snapshot(
+                woo_id,
+                KIND_CATALOG_PRODUCT_FULL,
+                _product_full_snapshot(product, variations, category_by_id=category_by_id),
+                name=name,
+                sku=sku,
+            )
+
+        def run_one(product: Dict[str, Any]) -> None:
+            nonlocal failed_products
+            try:
+                sync_one(product)
+            except Exception:
+                logger.warning(
+                    "[catalog-snapshot] product sync failed",
+                    exc_info=True,
+                    extra={"wooProductId": (product or {}).get("id")},
+                )
+                with counters_lock:
+                    failed_products += 1
 
-    try:
         threads: List[threading.Thread] = []
         for product in products:
-            t = threading.Thread(target=sync_one, args=(product,), daemon=True)
+            t = threading.Thread(target=run_one, args=(product,), daemon=True)
             threads.append(t)
             t.start()
         for t in threads:
             t.join()
 
-        product_document_repository.upsert_payload(
-            woo_product_id=0,
-            kind=KIND_CATALOG_CATEGORIES,
-            mime_type="application/json",
-            filename=None,
-            data=_compact_json({"categories": categories, "syncedAt": started_at.isoformat()}),
-            product_name=None,
-            product_sku=None,
-            woo_synced_at=now_sql,
+        write_snapshot(
+            0,
+            KIND_CATALOG_CATEGORIES,
+            # Keyed on content only so an unchanged category list is not rewritten every run.
+            {"categories": categories},
+            name=None,
+            sku=None,
         )
 
-        seen_ids: Set[int] = set()
-        for product in products:
-            try:
-                seen_ids.add(int((product or {}).get("id")))
-            except Exception:
-                continue
+        if sync_mode == "full":
+            seen_ids: Set[int] = set()
+            for product in products:
+                try:
+                    seen_ids.add(int((product or {}).get("id")))
+                except Exception:
+                    continue
+            prune_result = _prune_missing_products(seen_ids, fetch_hit_limit=hit_limit)
+        else:
+            prune_result = {"ok": True, "skipped": True, "reason": "incremental"}
 
-        prune_result = _prune_missing_products(seen_ids, fetch_hit_limit=hit_limit)
+        # Advance the watermark only when every product landed, so a failed
+        # product is retried by the next incremental run.
+        if failed_products == 0 and not hit_limit:
+            state["watermark"] = started_at.isoformat()
+            if sync_mode == "full":
+                state["lastFullSyncAt"] = started_at.isoformat()
+            _save_sync_state(state)
 
         result = {
             "ok": True,
+            "mode": sync_mode,
             "products": product_count,
             "variableProducts": variation_products,
             "variationRows": variation_rows,
+            "writtenRows": written_rows,
+            "unchangedRows": unchanged_rows,
+            "failedProducts": failed_products,
             "prune": prune_result,
             "durationMs": int((_utc_now() - started_at).total_seconds() * 1000),
         }
-        resource_version_service.bump_safe(
-            "catalog",
-            metadata={"source": "catalog.snapshot", "products": product_count},
-        )
+        if written_rows or (isinstance(prune_result, dict) and prune_result.get("prunedProducts")):
+            resource_version_service.bump_safe(
+                "catalog",
+                metadata={"source": "catalog.snapshot", "products": product_count, "mode": sync_mode},
+            )
+            invalidate_catalog_index()
         return result
     finally:
         _release_lock(lock_name)
 
 
-def get_catalog_products(*, page: int = 1, per_page: int = 100) -> List[Dict[str, Any]]:
+def _require_mysql() -> None:
     if not bool(get_config().mysql.get("enabled")):
         err = RuntimeError("MySQL is not enabled")
         setattr(err, "status", 503)
         raise err
-    safe_page = max(1, int(page))
-    safe_per_page = max(1, min(int(per_page), 200))
-    offset = (safe_page - 1) * safe_per_page
-    rows = mysql_client.fetch_all(
-        """
-        SELECT woo_product_id, data, woo_synced_at
-        FROM product_documents
-        WHERE kind = %(kind)s AND data IS NOT NULL AND OCTET_LENGTH(data) > 0
-        ORDER BY woo_product_id ASC
-        LIMIT %(limit)s OFFSET %(offset)s
-        """,
-        {"kind": KIND_CATALOG_PRODUCT_LIGHT, "limit": safe_per_page, "offset": offset},
-    )
-    items: List[Dict[str, Any]] = []
-    for row in rows or []:
-        parsed = _decode_snapshot_json((row or {}).get("data"))
-        if isinstance(parsed, dict):
-            items.append(parsed)
-    return items
 
 
-def get_catalog_categories() -> List[Dict[str, Any]]:
-    if not bool(get_config().mysql.get("enabled")):
-        err = RuntimeError("MySQL is not enabled")
-        setattr(err, "status", 503)
-        raise err
-    row = mysql_client.fetch_one(
-        """
-        SELECT data
-        FROM product_documents
-        WHERE woo_product_id = 0 AND kind = %(kind)s
-        """,
-        {"kind": KIND_CATALOG_CATEGORIES},
+def filter_key(value: object) -> str:
+    return re.sub(
+        r"^-+|-+$",
+        "",
+        re.sub(r"[^a-z0-9]+", "-", str(value or "").strip().lower().replace("&", "and")),
     )
-    parsed = _decode_snapshot_json((row or {}).get("data") if isinstance(row, dict) else None)
-    if isinstance(parsed, dict):
-        cats = parsed.get("categories")
-        return cats if isinstance(cats, list) else []
-    return []
 
 
-def get_catalog_product(product_id: int) -> Dict[str, Any]:
-    if not bool(get_config().mysql.get("enabled")):
-        err = RuntimeError("MySQL is not enabled")
-        setattr(err, "status", 503)
-        raise err
-    pid = int(product_id)
-    row = mysql_client.fetch_one(
+def _sku_key(value: object) -> str:
+    return str(value or "").strip().lower()
+
+
+def _current_catalog_version() -> Any:
+    row = resource_version_service.get_versions(["catalog"]).get("catalog") or {}
+    return row.get("version")
+
+
+def _term_keys(terms: Any) -> Set[str]:
+    keys: Set[str] = set()
+    for term in terms if isinstance(terms, list) else []:
+        if not isinstance(term, dict):
+            continue
+        for value in (term.get("slug"), term.get("name")):
+            key = filter_key(value)
+            if key:
+                keys.add(key)
+    return keys
+
+
+def _load_catalog_index(version: Any) -> CatalogIndex:
+    # Full rows sort first so they win by_id and by_sku; among duplicate SKUs
+    # the most recently synced product wins.
+    rows = mysql_client.fetch_all(
         """
-        SELECT data
+        SELECT woo_product_id, kind, product_sku, data
         FROM product_documents
-        WHERE woo_product_id = %(woo_product_id)s
-          AND kind IN (%(kind_full)s, %(kind_light)s)
-        ORDER BY CASE
-            WHEN kind = %(kind_full)s THEN 0
-            WHEN kind = %(kind_light)s THEN 1
-            ELSE 2
-        END
-        LIMIT 1
+        WHERE kind IN (%(kind_full)s, %(kind_light)s, %(kind_categories)s)
+          AND data IS NOT NULL
+          AND OCTET_LENGTH(data) > 0
+        ORDER BY CASE WHEN kind = %(kind_full)s THEN 0 ELSE 1 END,
+                 woo_synced_at DESC,
+                 woo_product_id ASC
         """,
         {
-            "woo_product_id": pid,
             "kind_full": KIND_CATALOG_PRODUCT_FULL,
             "kind_light": KIND_CATALOG_PRODUCT_LIGHT,
+            "kind_categories": KIND_CATALOG_CATEGORIES,
         },
     )
-    parsed = _decode_snapshot_json((row or {}).get("data") if isinstance(row, dict) else None)
-    if isinstance(parsed, dict):
-        return parsed
+    light_by_id: Dict[int, Dict[str, Any]] = {}
+    by_id: Dict[int, Dict[str, Any]] = {}
+    full_ids: Set[int] = set()
+    by_sku: Dict[str, Dict[str, Any]] = {}
+    categories: List[Dict[str, Any]] = []
+    for row in rows or []:
+        kind = (row or {}).get("kind")
+        parsed = _decode_snapshot_json((row or {}).get("data"))
+        if not isinstance(parsed, dict):
+            continue
+        if kind == KIND_CATALOG_CATEGORIES:
+            cats = parsed.get("categories")
+            if isinstance(cats, list):
+                categories = [cat for cat in cats if isinstance(cat, dict)]
+            continue
+        try:
+            woo_id = int(row.get("woo_product_id"))
+        except Exception:
+            continue
+        if woo_id <= 0:
+            continue
+        if kind == KIND_CATALOG_PRODUCT_LIGHT:
+            light_by_id.setdefault(woo_id, parsed)
+        elif kind == KIND_CATALOG_PRODUCT_FULL:
+            full_ids.add(woo_id)
+        by_id.setdefault(woo_id, parsed)
+        sku = _sku_key(row.get("product_sku") or parsed.get("sku"))
+        if sku:
+            by_sku.setdefault(sku, parsed)
+
+    products = tuple(by_id[woo_id] for woo_id in sorted(by_id))
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    by_tag: Dict[str, List[Dict[str, Any]]] = {}
+    for product in products:
+        for key in _term_keys(product.get("categories")):
+            by_category.setdefault(key, []).append(product)
+        for key in _term_keys(product.get("tags")):
+            by_tag.setdefault(key, []).append(product)
+
+    return CatalogIndex(
+        version=version,
+        light_products=tuple(light_by_id[woo_id] for woo_id in sorted(light_by_id)),
+        products=products,
+        by_id=MappingProxyType(by_id),
+        full_ids=frozenset(full_ids),
+        by_sku=MappingProxyType(by_sku),
+        by_category=MappingProxyType({key: tuple(items) for key, items in by_category.items()}),
+        by_tag=MappingProxyType({key: tuple(items) for key, items in by_tag.items()}),
+        categories=tuple(categories),
+    )
+
+
+def get_catalog_index() -> CatalogIndex:
+    """Return the shared catalog index, reloading it when the catalog version moved."""
+    global _INDEX, _INDEX_CHECKED_AT
+    _require_mysql()
+    index = _INDEX
+    if index is not None and time.monotonic() - _INDEX_CHECKED_AT < _index_recheck_seconds():
+        return index
+    with _INDEX_LOCK:
+        index = _INDEX
+        if index is not None and time.monotonic() - _INDEX_CHECKED_AT < _index_recheck_seconds():
+            return index
+        try:
+            version = _current_catalog_version()
+            if index is None or index.version != version:
+                index = _load_catalog_index(version)
+                _INDEX = index
+        except Exception:
+            if index is None:
+                raise
+            logger.warning("Catalog index refresh failed; serving the previous index", exc_info=True)
+        _INDEX_CHECKED_AT = time.monotonic()
+        return index
+
+
+def invalidate_catalog_index() -> None:
+    """Force the next reader to re-check the catalog version (and drop the index)."""
+    global _INDEX, _INDEX_CHECKED_AT
+    with _INDEX_LOCK:
+        _INDEX = None
+        _INDEX_CHECKED_AT = 0.0
+
+
+def get_catalog_products(*, page: int = 1, per_page: int = 100) -> List[Dict[str, Any]]:
+    safe_page = max(1, int(page))
+    safe_per_page = max(1, min(int(per_page), 200))
+    offset = (safe_page - 1) * safe_per_page
+    return copy.deepcopy(list(get_catalog_index().light_products[offset : offset + safe_per_page]))
+
+
+def get_all_catalog_products(*, light: bool = False) -> List[Dict[str, Any]]:
+    index = get_catalog_index()
+    return copy.deepcopy(list(index.light_products if light else index.products))
+
+
+def get_catalog_products_by_category(key: object) -> List[Dict[str, Any]]:
+    return copy.deepcopy(list(get_catalog_index().by_category.get(filter_key(key), ())))
+
+
+def get_catalog_products_by_tag(key: object) -> List[Dict[str, Any]]:
+    return copy.deepcopy(list(get_catalog_index().by_tag.get(filter_key(key), ())))
+
+
+def find_catalog_product_by_sku(sku: object) -> Optional[Dict[str, Any]]:
+    key = _sku_key(sku)
+    return copy.deepcopy(get_catalog_index().by_sku.get(key)) if key else None
+
+
+def get_catalog_categories() -> List[Dict[str, Any]]:
+    return copy.deepcopy(list(get_catalog_index().categories))
+
+
+def get_catalog_product(product_id: int) -> Dict[str, Any]:
+    product = get_catalog_index().by_id.get(int(product_id))
+    if isinstance(product, dict):
+        return copy.deepcopy(product)
     err = RuntimeError("NOT_FOUND")
     setattr(err, "status", 404)
     raise err
@@ -583,19 +872,11 @@ def _get_snapshot_product_variations(product_id: int) -> List[Dict[str, Any]]:
     if not bool(get_config().mysql.get("enabled")):
         return []
     pid = int(product_id)
-    row = mysql_client.fetch_one(
-        """
-        SELECT data
-        FROM product_documents
-        WHERE woo_product_id = %(woo_product_id)s AND kind = %(kind)s
-        """,
-        {"woo_product_id": pid, "kind": KIND_CATALOG_PRODUCT_FULL},
-    )
-    parsed = _decode_snapshot_json((row or {}).get("data") if isinstance(row, dict) else None)
-    if isinstance(parsed, dict):
-        variations = parsed.get("variations")
-        return [item for item in variations if isinstance(item, dict)] if isinstance(variations, list) else []
-    return []
+    index = get_catalog_index()
+    if pid not in index.full_ids:
+        return []
+    variations = index.by_id[pid].get("variations")
+    return copy.deepcopy([item for item in variations if isinstance(item, dict)]) if isinstance(variations, list) else []
 
 
 def get_catalog_product_variations(
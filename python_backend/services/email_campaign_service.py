@@ -55,6 +55,9 @@ _BOUNCE_DIAGNOSTIC_MAX_LENGTH = 1200
 _BOUNCE_POLL_LOCK = threading.Lock()
 _BOUNCE_LAST_POLL_MONOTONIC = 0.0
 _SENT_PENDING_BOUNCE_CHECK_STATUS = "sent_pending_bounce_check"
+# Queued email_events rows are written in one multi-row statement once this many
+# accumulate (and always before a bounce poll and at the end of a batch).
+_WORKER_FLUSH_BATCH = 50
 
 _THREAD_STARTED = False
 _THREAD_LOCK = threading.Lock()
@@ -952,41 +955,46 @@ def _payload_test_recipient_email(payload: Dict[str, Any]) -> str:
     )
 
 
-def resolve_recipients(selection: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _iter_selected_recipients(selection: Optional[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
     selected = selection if isinstance(selection, dict) else {}
     mode = str(selected.get("mode") or "test").strip()
-    recipients: List[Dict[str, Any]] = []
     if mode == "test":
         email = _require_email(selected.get("testEmail") or selected.get("email"), "A test recipient email is required")
-        recipients.append({"email": email, "name": "Test Recipient", "type": "test"})
+        yield {"email": email, "name": "Test Recipient", "type": "test"}
     elif mode == "selected_physician":
         user_repository = _repository_module("user_repository")
         email = _require_email(selected.get("selectedPhysicianEmail") or selected.get("email"), "A selected physician email is required")
         user = user_repository.find_by_email(email)
         if not user:
             raise service_error("Selected physician was not found", 404)
-        recipients.append(_recipient_from_user({**user, "email": email}))
+        yield _recipient_from_user({**user, "email": email})
     elif mode == "all_verified_physicians":
         user_repository = _repository_module("user_repository")
         for user in user_repository.get_all():
             if _is_verified_physician(user):
-                recipients.append(_recipient_from_user(user))
+                yield _recipient_from_user(user)
     elif mode == "sales_reps":
         sales_rep_repository = _repository_module("sales_rep_repository")
         for rep in sales_rep_repository.get_all():
             if str(rep.get("status") or "active").strip().lower() in ("disabled", "inactive", "deleted"):
                 continue
-            recipients.append(_recipient_from_sales_rep(rep))
+            yield _recipient_from_sales_rep(rep)
     elif mode == "custom":
         emails = selected.get("emails")
         if isinstance(emails, list):
             normalized = [_normalize_email(email) for email in emails]
         else:
             normalized = _custom_emails_from_text(selected.get("customEmails") or selected.get("emailList"))
-        recipients.extend(_recipient_from_custom_email(email) for email in normalized if email)
+        for email in normalized:
+            if email:
+                yield _recipient_from_custom_email(email)
     else:
         raise service_error("Unsupported recipient selection", 400)
-    return _dedupe_recipients(recipients)
+
+
+def resolve_recipients(selection: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Deduped as the selection is read, so only one list of the audience is kept.
+    return _dedupe_recipients(_iter_selected_recipients(selection))
 
 
 def _assert_allowed_recipients(template: Dict[str, Any], recipients: List[Dict[str, Any]], selection: Optional[Dict[str, Any]]) -> None:
@@ -1356,26 +1364,26 @@ def create_campaign(payload: Dict[str, Any], *, admin: Dict[str, Any]) -> Dict[s
         "scheduled_at": scheduled_at.isoformat().replace("+00:00", "Z") if scheduled_at else None,
         "sent_at": None,
     }
-    recipient_records: List[Dict[str, Any]] = []
-    for recipient in ([] if save_as_draft else recipients):
-        recipient_variables = {
-            **_base_variables_for_recipient(recipient, campaign_id),
-            **dict(recipient.get("variables") or {}),
+    # Records are built lazily so the repository can insert them chunk by chunk
+    # without a second full copy of the audience (with per-recipient variables).
+    recipient_records = (
+        {
+            "id": _new_id("emr"),
+            "campaign_id": campaign_id,
+            "recipient_email": recipient["email"],
+            "recipient_name": recipient.get("name") or None,
+            "recipient_type": recipient.get("type") or "custom",
+            "status": "pending",
+            "variables_json": {
+                **_base_variables_for_recipient(recipient, campaign_id),
+                **dict(recipient.get("variables") or {}),
+            },
+            "created_at": now_iso,
+            "sent_at": None,
+            "error_message": None,
         }
-        recipient_records.append(
-            {
-                "id": _new_id("emr"),
-                "campaign_id": campaign_id,
-                "recipient_email": recipient["email"],
-                "recipient_name": recipient.get("name") or None,
-                "recipient_type": recipient.get("type") or "custom",
-                "status": "pending",
-                "variables_json": recipient_variables,
-                "created_at": now_iso,
-                "sent_at": None,
-                "error_message": None,
-            }
-        )
+        for recipient in ([] if save_as_draft else recipients)
+    )
     campaign = email_campaign_repository.create_campaign(campaign_record, recipient_records)
     email_campaign_repository.log_event(
         event_id=_new_id("evt"),
@@ -1874,8 +1882,55 @@ def _active_bounce_check_count(*, limit: int = 1000) -> int:
 
 def process_pending_campaign_emails(*, limit: int = 25, throttle_seconds: float = 0.25) -> Dict[str, Any]:
     bounce_polls: List[Dict[str, Any]] = []
+    # A recipient's status (which also releases its claim) is written as soon as
+    # it changes, so a worker killed mid-batch never leaves an already-sent
+    # recipient claimed and due for a re-send. Only the email_events rows and
+    # the matching UI notifications are queued and written in batches.
+    queued_events: List[Dict[str, Any]] = []
+    queued_notifications: List[Dict[str, str]] = []
+
+    def flush_transitions() -> None:
+        if queued_events:
+            email_campaign_repository.log_events(list(queued_events))
+            queued_events.clear()
+        notifications = list(queued_notifications)
+        queued_notifications.clear()
+        for notification in notifications:
+            _notify_campaign_recipient_status_changed(**notification)
+
+    def queue_transition(
+        *,
+        recipient_id: str,
+        campaign_id: str,
+        recipient_email: str,
+        status: str,
+        sent_at: Any = None,
+        error_message: Optional[str] = None,
+        event_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if recipient_id:
+            email_campaign_repository.update_recipient_statuses(
+                [{"id": recipient_id, "status": status, "sent_at": sent_at, "error_message": error_message}]
+            )
+        if event_type:
+            queued_events.append(
+                {
+                    "event_id": _new_id("evt"),
+                    "campaign_id": campaign_id,
+                    "recipient_email": recipient_email,
+                    "event_type": event_type,
+                    "metadata": metadata,
+                }
+            )
+        queued_notifications.append(
+            {"campaign_id": campaign_id, "recipient_email": recipient_email, "status": status}
+        )
+        if len(queued_events) >= _WORKER_FLUSH_BATCH:
+            flush_transitions()
 
     def run_bounce_poll(*, force: bool = False, record_skipped: bool = True) -> Dict[str, Any]:
+        flush_transitions()
         result = poll_bounce_mailbox(force=force)
         if record_skipped or not result.get("skipped"):
             bounce_polls.append(result)
@@ -1907,13 +1962,18 @@ def process_pending_campaign_emails(*, limit: int = 25, throttle_seconds: float
             return 0
         if not poll_result or not poll_result.get("ok") or poll_result.get("skipped"):
             return 0
+        open_deliveries = [delivery for delivery in accepted_deliveries if not delivery.get("finalized")]
+        if not open_deliveries:
+            return 0
+        recipients = email_campaign_repository.get_recipients_by_ids(
+            str(delivery.get("recipient_id") or "") for delivery in open_deliveries
+        )
         finalized = 0
-        for delivery in accepted_deliveries:
-            if delivery.get("finalized"):
-                continue
+        for delivery in open_deliveries:
             campaign_id = str(delivery.get("campaign_id") or "")
             recipient_email = str(delivery.get("recipient_email") or "")
-            recipient = email_campaign_repository.get_recipient_by_campaign_and_email(campaign_id, recipient_email)
+            recipient_id = str(delivery.get("recipient_id") or "")
+            recipient = recipients.get(recipient_id)
             current_status = str((recipient or {}).get("status") or "").strip().lower()
             if current_status in {"failed", "bounced", "unsubscribed"}:
                 delivery["finalized"] = True
@@ -1925,179 +1985,157 @@ def process_pending_campaign_emails(*, limit: int = 25, throttle_seconds: float
                 continue
             if not _bounce_check_ready_for_sent(delivery):
                 continue
-            updated = email_campaign_repository.update_recipient_status_by_campaign_and_email(
-                campaign_id,
-                recipient_email,
-                "sent",
-                sent_at=delivery.get("accepted_at") or _now_iso(),
-            )
-            if not updated:
-                continue
             sent += 1
             finalized += 1
             delivery["finalized"] = True
-            email_campaign_repository.log_event(
-                event_id=_new_id("evt"),
+            queue_transition(
+                recipient_id=recipient_id,
                 campaign_id=campaign_id,
                 recipient_email=recipient_email,
+                status="sent",
+                sent_at=delivery.get("accepted_at") or _now_iso(),
                 event_type="sent",
                 metadata={"templateId": delivery.get("template_id"), "bouncePollChecked": True},
             )
-            _notify_campaign_recipient_status_changed(
-                campaign_id=campaign_id,
-                recipient_email=recipient_email,
-                status="sent",
-            )
+        flush_transitions()
         return finalized
 
     finalize_bounce_checked_recipients(bounce_poll)
 
-    for job in jobs:
-        processed += 1
-        campaign_id = str(job.get("campaign_id") or "")
-        campaign_ids.add(campaign_id)
-        recipient_id = str(job.get("recipient_id") or "")
-        recipient_email = _normalize_email(job.get("recipient_email"))
-        if not recipient_email:
-            failed += 1
-            email_campaign_repository.update_recipient_status(
-                recipient_id,
-                "failed",
-                error_message="Invalid recipient email",
-            )
-            _notify_campaign_recipient_status_changed(
-                campaign_id=campaign_id,
-                recipient_email=recipient_email or str(job.get("recipient_email") or ""),
-                status="failed",
-            )
-            continue
-        if job.get("campaign_status") == "scheduled":
-            email_campaign_repository.update_campaign_status(campaign_id, "sending")
-            _notify_email_campaigns_changed(event="campaign_started", campaignId=campaign_id)
-        if email_campaign_repository.is_unsubscribed(recipient_email):
-            skipped += 1
-            email_campaign_repository.update_recipient_status(
-                recipient_id,
-                "unsubscribed",
-                sent_at=_now_iso(),
-            )
-            email_campaign_repository.log_event(
-                event_id=_new_id("evt"),
-                campaign_id=campaign_id,
-                recipient_email=recipient_email,
-                event_type="unsubscribed",
-                metadata={"reason": "recipient_unsubscribed"},
-            )
-            _notify_campaign_recipient_status_changed(
-                campaign_id=campaign_id,
-                recipient_email=recipient_email,
-                status="unsubscribed",
-            )
-            if bounce_polling_active:
-                run_bounce_poll(record_skipped=False)
-            continue
-        try:
-            campaign_variables = dict(job.get("campaign_variables_json") or {})
-            custom_html = str(campaign_variables.pop(_CUSTOM_HTML_VARIABLE_KEY, "") or "")
-            cc_recipients = _normalize_campaign_extra_recipients(
-                campaign_variables.pop(_CC_RECIPIENTS_VARIABLE_KEY, []),
-                message="Enter valid CC recipient emails.",
-                raise_on_empty_input=False,
-            )
-            bcc_recipients = _normalize_campaign_extra_recipients(
-                campaign_variables.pop(_BCC_RECIPIENTS_VARIABLE_KEY, []),
-                message="Enter valid BCC recipient emails.",
-                raise_on_empty_input=False,
-            )
-            campaign_variables = _strip_campaign_reserved_variables(campaign_variables)
-            variables = {
-                **campaign_variables,
-                **dict(job.get("recipient_variables_json") or {}),
-            }
-            rendered = render_campaign_html(str(job.get("template_id") or ""), variables, custom_html=custom_html)
-            email_service.send_campaign_email(
-                recipient_email,
-                str(job.get("subject") or "Message from TrufusionLabs"),
-                rendered["html"],
-                rendered["plainText"],
-                cc=cc_recipients,
-                bcc=bcc_recipients,
-                headers={
-                    "X-Trufusion-Campaign-Id": campaign_id,
-                    "X-Trufusion-Campaign-Template": str(job.get("template_id") or ""),
-                },
-            )
-            accepted_at = _now_iso()
-            if bounce_polling_active:
-                email_campaign_repository.update_recipient_status(
-                    recipient_id,
-                    _SENT_PENDING_BOUNCE_CHECK_STATUS,
-                    sent_at=accepted_at,
+    # `throttle_seconds` is the minimum spacing between sends (the provider's rate
+    # limit). Time spent rendering, sending and bookkeeping counts toward it, and
+    # the pooled SMTP session in email_service keeps each send to one round of
+    # MAIL/RCPT/DATA, so the batch runs at the throttle rate instead of paying a
+    # fixed sleep on top of a fresh connection per recipient.
+    send_interval = max(0.0, min(float(throttle_seconds or 0.0), 10.0))
+    next_send_at = 0.0
+    unsubscribed_emails = email_campaign_repository.list_unsubscribed_emails(
+        _normalize_email(job.get("recipient_email")) for job in jobs
+    )
+    started_campaign_ids: set[str] = set()
+
+    try:
+        for job in jobs:
+            processed += 1
+            campaign_id = str(job.get("campaign_id") or "")
+            campaign_ids.add(campaign_id)
+            recipient_id = str(job.get("recipient_id") or "")
+            recipient_email = _normalize_email(job.get("recipient_email"))
+            if not recipient_email:
+                failed += 1
+                queue_transition(
+                    recipient_id=recipient_id,
+                    campaign_id=campaign_id,
+                    recipient_email=str(job.get("recipient_email") or ""),
+                    status="failed",
+                    error_message="Invalid recipient email",
                 )
-                email_campaign_repository.log_event(
-                    event_id=_new_id("evt"),
+                continue
+            if job.get("campaign_status") == "scheduled" and campaign_id not in started_campaign_ids:
+                started_campaign_ids.add(campaign_id)
+                email_campaign_repository.update_campaign_status(campaign_id, "sending")
+                _notify_email_campaigns_changed(event="campaign_started", campaignId=campaign_id)
+            if recipient_email in unsubscribed_emails:
+                skipped += 1
+                queue_transition(
+                    recipient_id=recipient_id,
                     campaign_id=campaign_id,
                     recipient_email=recipient_email,
-                    event_type="send_accepted",
-                    metadata={"templateId": job.get("template_id"), "awaitingBouncePoll": True},
+                    status="unsubscribed",
+                    sent_at=_now_iso(),
+                    event_type="unsubscribed",
+                    metadata={"reason": "recipient_unsubscribed"},
                 )
-                accepted_deliveries.append(
-                    {
-                        "campaign_id": campaign_id,
-                        "recipient_email": recipient_email,
-                        "recipient_id": recipient_id,
-                        "template_id": job.get("template_id"),
-                        "accepted_at": accepted_at,
-                        "finalized": False,
-                    }
+                if bounce_polling_active:
+                    run_bounce_poll(record_skipped=False)
+                continue
+            try:
+                campaign_variables = dict(job.get("campaign_variables_json") or {})
+                custom_html = str(campaign_variables.pop(_CUSTOM_HTML_VARIABLE_KEY, "") or "")
+                cc_recipients = _normalize_campaign_extra_recipients(
+                    campaign_variables.pop(_CC_RECIPIENTS_VARIABLE_KEY, []),
+                    message="Enter valid CC recipient emails.",
+                    raise_on_empty_input=False,
                 )
-                _notify_campaign_recipient_status_changed(
-                    campaign_id=campaign_id,
-                    recipient_email=recipient_email,
-                    status=_SENT_PENDING_BOUNCE_CHECK_STATUS,
+                bcc_recipients = _normalize_campaign_extra_recipients(
+                    campaign_variables.pop(_BCC_RECIPIENTS_VARIABLE_KEY, []),
+                    message="Enter valid BCC recipient emails.",
+                    raise_on_empty_input=False,
                 )
-            else:
-                sent += 1
-                email_campaign_repository.update_recipient_status(recipient_id, "sent", sent_at=accepted_at)
-                email_campaign_repository.log_event(
-                    event_id=_new_id("evt"),
-                    campaign_id=campaign_id,
-                    recipient_email=recipient_email,
-                    event_type="sent",
-                    metadata={"templateId": job.get("template_id")},
+                campaign_variables = _strip_campaign_reserved_variables(campaign_variables)
+                variables = {
+                    **campaign_variables,
+                    **dict(job.get("recipient_variables_json") or {}),
+                }
+                rendered = render_campaign_html(str(job.get("template_id") or ""), variables, custom_html=custom_html)
+                if send_interval > 0:
+                    wait_seconds = next_send_at - time.monotonic()
+                    if wait_seconds > 0:
+                        time.sleep(wait_seconds)
+                    next_send_at = time.monotonic() + send_interval
+                email_service.send_campaign_email(
+                    recipient_email,
+                    str(job.get("subject") or "Message from TrufusionLabs"),
+                    rendered["html"],
+                    rendered["plainText"],
+                    cc=cc_recipients,
+                    bcc=bcc_recipients,
+                    headers={
+                        "X-Trufusion-Campaign-Id": campaign_id,
+                        "X-Trufusion-Campaign-Template": str(job.get("template_id") or ""),
+                    },
                 )
-                _notify_campaign_recipient_status_changed(
+                accepted_at = _now_iso()
+                if bounce_polling_active:
+                    queue_transition(
+                        recipient_id=recipient_id,
+                        campaign_id=campaign_id,
+                        recipient_email=recipient_email,
+                        status=_SENT_PENDING_BOUNCE_CHECK_STATUS,
+                        sent_at=accepted_at,
+                        event_type="send_accepted",
+                        metadata={"templateId": job.get("template_id"), "awaitingBouncePoll": True},
+                    )
+                    accepted_deliveries.append(
+                        {
+                            "campaign_id": campaign_id,
+                            "recipient_email": recipient_email,
+                            "recipient_id": recipient_id,
+                            "template_id": job.get("template_id"),
+                            "accepted_at": accepted_at,
+                            "finalized": False,
+                        }
+                    )
+                else:
+                    sent += 1
+                    queue_transition(
+                        recipient_id=recipient_id,
+                        campaign_id=campaign_id,
+                        recipient_email=recipient_email,
+                        status="sent",
+                        sent_at=accepted_at,
+                        event_type="sent",
+                        metadata={"templateId": job.get("template_id")},
+                    )
+            except Exception as exc:
+                failed += 1
+                message = str(exc)[:1000] or exc.__class__.__name__
+                logger.exception("Failed to send campaign recipient", extra={"campaignId": campaign_id, "recipient": recipient_email})
+                queue_transition(
+                    recipient_id=recipient_id,
                     campaign_id=campaign_id,
                     recipient_email=recipient_email,
-                    status="sent",
+                    status="failed",
+                    sent_at=_now_iso(),
+                    error_message=message,
+                    event_type="failed",
+                    metadata={"error": message},
                 )
-        except Exception as exc:
-            failed += 1
-            message = str(exc)[:1000] or exc.__class__.__name__
-            logger.exception("Failed to send campaign recipient", extra={"campaignId": campaign_id, "recipient": recipient_email})
-            email_campaign_repository.update_recipient_status(
-                recipient_id,
-                "failed",
-                sent_at=_now_iso(),
-                error_message=message,
-            )
-            email_campaign_repository.log_event(
-                event_id=_new_id("evt"),
-                campaign_id=campaign_id,
-                recipient_email=recipient_email,
-                event_type="failed",
-                metadata={"error": message},
-            )
-            _notify_campaign_recipient_status_changed(
-                campaign_id=campaign_id,
-                recipient_email=recipient_email,
-                status="failed",
-            )
-        if bounce_polling_active:
-            interim_bounce_poll = run_bounce_poll(record_skipped=False)
-            finalize_bounce_checked_recipients(interim_bounce_poll)
-        if throttle_seconds > 0:
-            time.sleep(max(0.0, min(float(throttle_seconds), 10.0)))
+            if bounce_polling_active:
+                interim_bounce_poll = run_bounce_poll(record_skipped=False)
+                finalize_bounce_checked_recipients(interim_bounce_poll)
+    finally:
+        flush_transitions()
 
     final_poll_campaign_ids: set[str] = set()
     for campaign_id in campaign_ids:
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import os
 import smtplib
+import threading
+import time
 import html as _html
 from datetime import datetime
 from email.message import EmailMessage
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 import logging
 from email.utils import formatdate, make_msgid, parseaddr
 from urllib.parse import quote
@@ -593,6 +595,138 @@ def _normalize_extra_recipients(recipients: Optional[Iterable[str] | str]) -> li
     return normalized
 
 
+# Pooled SMTP sessions --------------------------------------------------------
+#
+# Authenticated sessions are kept open between messages (per host/credentials)
+# so consecutive sends skip the connect/EHLO/STARTTLS/LOGIN round trips. A
+# session idle longer than SMTP_POOL_IDLE_SECONDS is closed rather than reused,
+# one idle for a few seconds is probed with NOOP first, and a send that fails
+# because the server dropped a pooled session before accepting MAIL FROM is
+# retried once on a new one. Nothing is retried once MAIL FROM was accepted:
+# the relay may already hold the message, and a resend would duplicate it.
+
+_SMTP_POOL_LOCK = threading.Lock()
+_SMTP_POOL: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+_SMTP_NOOP_AFTER_SECONDS = 5.0
+
+
+def _smtp_pool_size() -> int:
+    raw = str(os.environ.get("SMTP_POOL_SIZE", "4")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 4
+    # 0 disables pooling: every message gets its own connection again.
+    return max(0, min(value, 16))
+
+
+def _smtp_pool_idle_seconds() -> float:
+    raw = str(os.environ.get("SMTP_POOL_IDLE_SECONDS", "60")).strip()
+    try:
+        value = float(raw)
+    except Exception:
+        value = 60.0
+    return max(1.0, min(value, 600.0))
+
+
+def _smtp_pool_max_messages() -> int:
+    raw = str(os.environ.get("SMTP_POOL_MAX_MESSAGES", "100")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 100
+    return max(1, min(value, 10000))
+
+
+def _close_smtp_server(server: Any) -> None:
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _is_stale_smtp_error(exc: Exception) -> bool:
+    # Timeouts are deliberately excluded: the server may still be processing.
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, ConnectionResetError, BrokenPipeError)):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code == 421
+
+
+def _send_smtp_message(server: Any, msg: EmailMessage, from_addr: str, to_addrs: List[str]) -> None:
+    """
+    `send_message` that tags a raised exception with `handed_off`: whether the
+    server had already accepted MAIL FROM, after which a resend may duplicate.
+    """
+    original_mail = getattr(server, "mail", None)
+    accepted = False
+
+    def _mail(sender: str, options: Any = ()) -> Any:
+        nonlocal accepted
+        reply = original_mail(sender, options)
+        accepted = reply[0] == 250
+        return reply
+
+    if callable(original_mail):
+        server.mail = _mail
+    try:
+        server.send_message(msg, from_addr=from_addr, to_addrs=to_addrs)
+    except Exception as exc:
+        exc.handed_off = accepted  # type: ignore[attr-defined]
+        raise
+    finally:
+        if callable(original_mail):
+            del server.mail
+
+
+def _checkout_smtp_session(key: Tuple[Any, ...], open_server: Callable[[], Any]) -> Dict[str, Any]:
+    idle_limit = _smtp_pool_idle_seconds()
+    while True:
+        with _SMTP_POOL_LOCK:
+            idle = _SMTP_POOL.get(key) or []
+            session = idle.pop() if idle else None
+        if session is None:
+            break
+        idle_for = time.monotonic() - float(session.get("lastUsed") or 0)
+        if idle_for > idle_limit:
+            _close_smtp_server(session["server"])
+            continue
+        if idle_for > _SMTP_NOOP_AFTER_SECONDS:
+            try:
+                code = session["server"].noop()[0]
+            except Exception:
+                code = None
+            if code != 250:
+                _close_smtp_server(session["server"])
+                continue
+        session["reused"] = True
+        return session
+    return {"server": open_server(), "messages": 0, "lastUsed": time.monotonic(), "reused": False}
+
+
+def _checkin_smtp_session(key: Tuple[Any, ...], session: Dict[str, Any]) -> None:
+    session["messages"] = int(session.get("messages") or 0) + 1
+    session["lastUsed"] = time.monotonic()
+    if session["messages"] < _smtp_pool_max_messages():
+        with _SMTP_POOL_LOCK:
+            idle = _SMTP_POOL.setdefault(key, [])
+            if len(idle) < _smtp_pool_size():
+                idle.append(session)
+                return
+    _close_smtp_server(session["server"])
+
+
+def close_smtp_pool() -> None:
+    """Close every idle pooled SMTP session (worker shutdown, credential rotation)."""
+    with _SMTP_POOL_LOCK:
+        sessions = [session for idle in _SMTP_POOL.values() for session in idle]
+        _SMTP_POOL.clear()
+    for session in sessions:
+        _close_smtp_server(session["server"])
+
+
 def _send_via_smtp(
     recipient: str,
     subject: str,
@@ -649,28 +783,47 @@ def _send_via_smtp(
 
     bcc_recipients = _normalize_extra_recipients(bcc)
 
-    server: smtplib.SMTP | smtplib.SMTP_SSL
-    if use_ssl:
-        server = smtplib.SMTP_SSL(host=host, port=port, timeout=timeout)
-    else:
-        server = smtplib.SMTP(host=host, port=port, timeout=timeout)
-
-    try:
-        server.ehlo()
-        if not use_ssl and use_starttls:
-            server.starttls()
-            server.ehlo()
-        if use_auth:
-            if user:
-                server.login(user, password)
-            else:
-                server.login(from_addr.get("email") or "", password)
-        server.send_message(msg, from_addr=from_email, to_addrs=[recipient, *cc_recipients, *bcc_recipients])
-    finally:
+    def _open() -> smtplib.SMTP:
+        server: smtplib.SMTP | smtplib.SMTP_SSL
+        if use_ssl:
+            server = smtplib.SMTP_SSL(host=host, port=port, timeout=timeout)
+        else:
+            server = smtplib.SMTP(host=host, port=port, timeout=timeout)
         try:
-            server.quit()
+            server.ehlo()
+            if not use_ssl and use_starttls:
+                server.starttls()
+                server.ehlo()
+            if use_auth:
+                if user:
+                    server.login(user, password)
+                else:
+                    server.login(from_addr.get("email") or "", password)
         except Exception:
-            pass
+            _close_smtp_server(server)
+            raise
+        return server
+
+    pool_key = (host, port, use_ssl, use_starttls, use_auth, user or from_addr.get("email") or "", password, timeout)
+    to_addrs = [recipient, *cc_recipients, *bcc_recipients]
+    for attempt in range(2):
+        session = _checkout_smtp_session(pool_key, _open)
+        try:
+            _send_smtp_message(session["server"], msg, from_email, to_addrs)
+        except Exception as exc:
+            _close_smtp_server(session["server"])
+            if (
+                attempt == 0
+                and session["reused"]
+                and not getattr(exc, "handed_off", True)
+                and _is_stale_smtp_error(exc)
+            ):
+                # The server dropped a pooled session before taking the message; resend on a fresh one.
+                logger.info("Pooled SMTP session was stale; reconnecting", extra={"host": host, "port": port})
+                continue
+            raise
+        _checkin_smtp_session(pool_key, session)
+        break
     logger.info("Password reset email dispatched via SMTP", extra={"recipient": recipient, "host": host, "port": port})
 
 
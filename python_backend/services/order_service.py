@@ -16,6 +16,7 @@ from ..repositories import (
     order_repository,
     user_repository,
     sales_rep_repository,
+    sales_rep_rollup_repository,
     referral_code_repository,
     sales_prospect_repository,
     discount_code_repository,
@@ -24,11 +25,13 @@ from ..database import mysql_client
 from ..integrations import ship_station, stripe_payments, ups_tracking, woo_commerce
 from .. import storage
 from ..brand import with_legacy_meta_keys
+from . import catalog_snapshot_service
 from . import referral_service
 from . import settings_service
 from . import discount_code_service
 from . import tax_tracking_service
 from . import user_media_service
+from . import shared_cache
 
 logger = logging.getLogger(__name__)
 
@@ -349,12 +352,47 @@ def invalidate_admin_taxes_by_state_cache() -> None:
         _admin_taxes_by_state_cache["data"] = None
         _admin_taxes_by_state_cache["key"] = None
         _admin_taxes_by_state_cache["expiresAtMs"] = 0
+    shared_cache.invalidate(shared_cache.NAMESPACE_ADMIN_TAXES_BY_STATE)
 
 
 def invalidate_ship_time_average_cache() -> None:
     with _ship_time_average_lock:
         _ship_time_average_cache["data"] = None
         _ship_time_average_cache["expiresAtMs"] = 0
+    shared_cache.invalidate(shared_cache.NAMESPACE_SHIP_TIME_AVERAGE)
+
+
+def invalidate_sales_rep_orders_cache() -> None:
+    with _sales_rep_orders_cache_lock:
+        _sales_rep_orders_cache.clear()
+    shared_cache.invalidate(shared_cache.NAMESPACE_SALES_REP_ORDERS)
+
+
+def invalidate_sales_by_rep_summary_cache() -> None:
+    with _sales_by_rep_summary_lock:
+        _sales_by_rep_summary_cache["data"] = None
+        _sales_by_rep_summary_cache["key"] = None
+        _sales_by_rep_summary_cache["fetchedAtMs"] = 0
+        _sales_by_rep_summary_cache["expiresAtMs"] = 0
+    shared_cache.invalidate(shared_cache.NAMESPACE_SALES_BY_REP_SUMMARY)
+
+
+def invalidate_admin_products_commission_cache() -> None:
+    with _admin_products_commission_lock:
+        _admin_products_commission_cache["data"] = None
+        _admin_products_commission_cache["key"] = None
+        _admin_products_commission_cache["expiresAtMs"] = 0
+    shared_cache.invalidate(shared_cache.NAMESPACE_ADMIN_PRODUCTS_COMMISSION)
+
+
+def invalidate_order_report_caches() -> None:
+    # Order create/update/cancel, carrier status writes (and the referral
+    # commission written with a new order) change the per-rep order lists, the
+    # Sales-by-Rep summary and the products/commission report; drop them for
+    # every worker.
+    invalidate_sales_rep_orders_cache()
+    invalidate_sales_by_rep_summary_cache()
+    invalidate_admin_products_commission_cache()
 
 
 def _get_report_timezone() -> timezone:
@@ -613,6 +651,12 @@ def _get_historical_ship_time_average() -> Dict[str, object]:
             expires_at = int(_ship_time_average_cache.get("expiresAtMs") or 0)
             if isinstance(cached, dict) and expires_at > now_ms:
                 return dict(cached)
+        shared = shared_cache.get(shared_cache.NAMESPACE_SHIP_TIME_AVERAGE, "all")
+        if isinstance(shared, dict):
+            with _ship_time_average_lock:
+                _ship_time_average_cache["data"] = dict(shared)
+                _ship_time_average_cache["expiresAtMs"] = now_ms + (_SHIP_TIME_AVERAGE_TTL_SECONDS * 1000)
+            return dict(shared)
 
     durations: List[float] = []
     rows = _fetch_ship_time_average_rows(_SHIP_TIME_AVERAGE_SAMPLE_LIMIT)
@@ -637,6 +681,12 @@ def _get_historical_ship_time_average() -> Dict[str, object]:
         with _ship_time_average_lock:
             _ship_time_average_cache["data"] = dict(result)
             _ship_time_average_cache["expiresAtMs"] = now_ms + (_SHIP_TIME_AVERAGE_TTL_SECONDS * 1000)
+        shared_cache.put(
+            shared_cache.NAMESPACE_SHIP_TIME_AVERAGE,
+            "all",
+            result,
+            ttl_seconds=_SHIP_TIME_AVERAGE_TTL_SECONDS,
+        )
     return result
 
 
@@ -1122,6 +1172,33 @@ def _compute_allowed_sales_rep_ids(
     return allowed_rep_ids
 
 
+def _lookup_allowed_sales_rep_ids(sales_rep_id: str, rep_records: Dict[str, Dict]) -> set[str]:
+    """
+    `_compute_allowed_sales_rep_ids` over just the users it can match: the rep's
+    own user row and the users sharing the rep's email, instead of every user.
+    """
+    normalized_sales_rep_id = str(sales_rep_id or "").strip()
+    if not normalized_sales_rep_id:
+        return set()
+    users = user_repository.find_lookup_by_ids([normalized_sales_rep_id])
+    emails = {str(user.get("email") or "").strip().lower() for user in users}
+    rep_record_ids = {normalized_sales_rep_id}
+    for rep_id, rep in rep_records.items():
+        if str(rep.get("legacyUserId") or "").strip() == normalized_sales_rep_id:
+            rep_record_ids.add(str(rep_id))
+    for rep_id in rep_record_ids:
+        record = rep_records.get(rep_id)
+        if isinstance(record, dict):
+            emails.add(str(record.get("email") or "").strip().lower())
+    emails.discard("")
+    if emails:
+        known_ids = {str(user.get("id")) for user in users}
+        users = users + [
+            user for user in user_repository.find_lookup_by_emails(emails) if str(user.get("id")) not in known_ids
+        ]
+    return _compute_allowed_sales_rep_ids(normalized_sales_rep_id, users, rep_records)
+
+
 def _ensure_dict(value):
     if isinstance(value, dict):
         return dict(value)
@@ -1174,77 +1251,20 @@ def _parse_positive_int(value: object) -> Optional[int]:
     return parsed if parsed > 0 else None
 
 
-def _decode_snapshot_product_row(row: object) -> Optional[Dict[str, Any]]:
-    if not isinstance(row, dict):
-        return None
-    raw = row.get("data")
-    if isinstance(raw, memoryview):
-        raw = raw.tobytes()
-    if isinstance(raw, (bytes, bytearray)):
-        try:
-            raw = raw.decode("utf-8")
-        except Exception:
-            return None
-    if not isinstance(raw, str) or not raw.strip():
-        return None
-    try:
-        parsed = json.loads(raw)
-    except Exception:
-        return None
-    return parsed if isinstance(parsed, dict) else None
-
-
 def _get_catalog_snapshot_product(*, product_id: object = None, sku: object = None) -> Optional[Dict[str, Any]]:
     normalized_product_id = _parse_positive_int(product_id)
     if normalized_product_id is not None:
         try:
-            row = mysql_client.fetch_one(
-                """
-                SELECT data
-                FROM product_documents
-                WHERE woo_product_id = %(woo_product_id)s
-                  AND kind IN (%(kind_full)s, %(kind_light)s)
-                ORDER BY CASE WHEN kind = %(kind_full)s THEN 0 ELSE 1 END
-                LIMIT 1
-                """,
-                {
-                    "woo_product_id": normalized_product_id,
-                    "kind_full": "catalog_product_full",
-                    "kind_light": "catalog_product_light",
-                },
-            )
+            return catalog_snapshot_service.get_catalog_product(normalized_product_id)
         except Exception:
-            row = None
-        parsed = _decode_snapshot_product_row(row)
-        if parsed:
-            return parsed
+            pass
 
     normalized_sku = _normalize_optional_text(sku)
     if normalized_sku:
         try:
-            row = mysql_client.fetch_one(
-                """
-                SELECT data
-                FROM product_documents
-                WHERE product_sku = %(product_sku)s
-                  AND kind IN (%(kind_full)s, %(kind_light)s)
-                ORDER BY CASE WHEN kind = %(kind_full)s THEN 0 ELSE 1 END,
-                         woo_synced_at DESC,
-                         updated_at DESC
-                LIMIT 1
-                """,
-                {
-                    "product_sku": normalized_sku,
-                    "kind_full": "catalog_product_full",
-                    "kind_light": "catalog_product_light",
-                },
-            )
+            return catalog_snapshot_service.find_catalog_product_by_sku(normalized_sku)
         except Exception:
-            row = None
-        parsed = _decode_snapshot_product_row(row)
-        if parsed:
-            return parsed
-
+            return None
     return None
 
 
@@ -1903,6 +1923,7 @@ def _refresh_authoritative_ups_status_for_order_view(order: Dict, *, local_order
             )
             if isinstance(persisted, dict):
                 refreshed_local_order = persisted
+            invalidate_order_report_caches()
         except Exception:
             logger.warning(
                 "Failed to persist refreshed UPS tracking status",
@@ -2654,13 +2675,13 @@ def create_order(
         setattr(err, "error_code", "WOO_ORDER_CREATE_FAILED")
         raise err from exc
 
-    order_repository.insert(order)
-    try:
-        sales_prospect_repository.mark_doctor_as_nurturing_if_purchased(user_id)
-    except Exception:
-        pass
-
-    if integrations.get("wooCommerce", {}).get("status") == "success":
+    woo_linked = integrations.get("wooCommerce", {}).get("status") == "success"
+    # Only the order row (and its legacy-schema tracking follow-up) share the
+    # transaction; the identifier index and rollup mark run after it commits,
+    # and the best-effort Woo columns are written afterwards on their own.
+    with mysql_client.transaction():
+        order_repository.insert(order)
+    if woo_linked:
         try:
             order_repository.update_woo_fields(
                 order_id=order.get("id"),
@@ -2670,7 +2691,12 @@ def create_order(
             )
         except Exception:
             pass
+    try:
+        sales_prospect_repository.mark_doctor_as_nurturing_if_purchased(user_id)
+    except Exception:
+        pass
 
+    if woo_linked:
         try:
             print(
                 f"[checkout] woo linked order_id={order.get('id')} woo_id={order.get('wooOrderId')} woo_number={order.get('wooOrderNumber')} sales_rep_id={order.get('doctorSalesRepId')} facility_pickup={order.get('facilityPickup')} recipient={order.get('facilityPickupRecipientName')} shipping_name={(order.get('shippingAddress') or {}).get('name') if isinstance(order.get('shippingAddress'), dict) else None} billing_name={(order.get('billingAddress') or {}).get('name') if isinstance(order.get('billingAddress'), dict) else None}",
@@ -2753,6 +2779,7 @@ def create_order(
     if integrations.get("stripe", {}).get("paymentIntentId"):
         order["paymentIntentId"] = integrations["stripe"]["paymentIntentId"]
     order_repository.update(order)
+    invalidate_order_report_caches()
 
     message = None
     if referral_effects.get("checkoutBonus"):
@@ -2774,25 +2801,7 @@ def _find_order_by_woo_id(woo_order_id: str) -> Optional[Dict]:
     """Best-effort lookup of a local order using a WooCommerce order id/number."""
     if not woo_order_id:
         return None
-    target = _normalize_woo_order_id(woo_order_id) or str(woo_order_id)
-    for order in order_repository.get_all():
-        local_candidate = _normalize_woo_order_id(order.get("wooOrderId") or order.get("woo_order_id"))
-        if local_candidate and local_candidate == target:
-            return order
-        local_number = _normalize_woo_order_id(order.get("wooOrderNumber") or order.get("woo_order_number"))
-        if local_number and local_number == target:
-            return order
-        details = _ensure_dict(order.get("integrationDetails") or order.get("integrations"))
-        woo_details = _ensure_dict(details.get("wooCommerce") or details.get("woocommerce"))
-        detail_candidate = _normalize_woo_order_id(
-            woo_details.get("wooOrderNumber")
-            or woo_details.get("woo_order_number")
-            or _ensure_dict(woo_details.get("payload")).get("number")
-            or _ensure_dict(woo_details.get("response")).get("number")
-        )
-        if detail_candidate and detail_candidate == target:
-            return order
-    return None
+    return order_repository.find_by_woo_identifier(woo_order_id)
 
 
 def sync_order_status_from_woo_webhook(order_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -2843,6 +2852,7 @@ def sync_order_status_from_woo_webhook(order_data: Dict[str, Any]) -> Dict[str,
             woo_order_number=woo_order_number,
             woo_order_key=woo_order_key,
         )
+        invalidate_order_report_caches()
     except Exception:
         # Fallback: update full record for non-MySQL installs.
         try:
@@ -2855,6 +2865,7 @@ def sync_order_status_from_woo_webhook(order_data: Dict[str, Any]) -> Dict[str,
                 local_order["wooOrderKey"] = woo_order_key
             local_order["updatedAt"] = _now_order_iso()
             order_repository.update(local_order)
+            invalidate_order_report_caches()
         except Exception:
             pass
 
@@ -2871,7 +2882,7 @@ def cancel_order(user_id: str, order_id: str, reason: Optional[str] = None) -> D
     """
     Cancel a WooCommerce order first (source of truth), then mirror status locally if present.
     """
-    local_order = _find_order_by_woo_id(order_id) or order_repository.find_by_id(order_id)
+    local_order = order_repository.find_by_id(order_id) or _find_order_by_woo_id(order_id)
     stripe_refund = None
     woo_order = None
     woo_order_id = _extract_woo_order_id(local_order)
@@ -3058,6 +3069,7 @@ def cancel_order(user_id: str, order_id: str, reason: Optional[str] = None) -> D
         local_order["status"] = "refunded" if did_refund else "cancelled"
         local_order["cancellationReason"] = reason or ""
         order_repository.update(local_order)
+        invalidate_order_report_caches()
 
     return {
         "status": "refunded" if did_refund else (woo_result.get("status") if isinstance(woo_result, dict) else "cancelled"),
@@ -3331,18 +3343,17 @@ def update_order_notes(*, order_id: str, actor: Dict, notes: Optional[str]) -> D
         candidate = candidate[:4000]
         text = candidate or None
 
-    local_order = _find_order_by_woo_id(order_id) or order_repository.find_by_id(str(order_id))
+    local_order = order_repository.find_by_id(str(order_id)) or _find_order_by_woo_id(order_id)
     if not local_order:
         raise _service_error("ORDER_NOT_FOUND", 404)
 
     if actor_role != "admin":
-        users = user_repository.get_all()
         rep_records = {
             str(rep.get("id")): rep
             for rep in sales_rep_repository.get_all()
             if isinstance(rep, dict) and rep.get("id") is not None
         }
-        allowed_rep_ids = _compute_allowed_sales_rep_ids(str(actor.get("id") or ""), users, rep_records)
+        allowed_rep_ids = _lookup_allowed_sales_rep_ids(str(actor.get("id") or ""), rep_records)
 
         doctor_id = str(local_order.get("userId") or local_order.get("user_id") or "").strip()
         doctor = user_repository.find_by_id(doctor_id) if doctor_id else None
@@ -3399,18 +3410,17 @@ def update_order_fields(
     status_value = _sanitize_optional_text(status, max_len=32)
     expected_window = _sanitize_optional_text(expected_shipment_window, max_len=64)
 
-    local_order = _find_order_by_woo_id(order_id) or order_repository.find_by_id(str(order_id))
+    local_order = order_repository.find_by_id(str(order_id)) or _find_order_by_woo_id(order_id)
     if not local_order:
         raise _service_error("ORDER_NOT_FOUND", 404)
 
     if actor_role != "admin":
-        users = user_repository.get_all()
         rep_records = {
             str(rep.get("id")): rep
             for rep in sales_rep_repository.get_all()
             if isinstance(rep, dict) and rep.get("id") is not None
         }
-        allowed_rep_ids = _compute_allowed_sales_rep_ids(str(actor.get("id") or ""), users, rep_records)
+        allowed_rep_ids = _lookup_allowed_sales_rep_ids(str(actor.get("id") or ""), rep_records)
 
         doctor_id = str(local_order.get("userId") or local_order.get("user_id") or "").strip()
         doctor = user_repository.find_by_id(doctor_id) if doctor_id else None
@@ -3448,6 +3458,7 @@ def update_order_fields(
 
     updated["updatedAt"] = _now_order_iso()
     saved = order_repository.update(updated) or updated
+    invalidate_order_report_caches()
     return {"order": saved}
 
 
@@ -3482,22 +3493,48 @@ def get_orders_for_sales_rep(
                     _SALES_REP_ORDERS_TTL_SECONDS,
                 )
                 return cached.get("value")
+        shared = shared_cache.get(shared_cache.NAMESPACE_SALES_REP_ORDERS, cache_key)
+        if shared is not None:
+            with _sales_rep_orders_cache_lock:
+                _sales_rep_orders_cache[cache_key] = {
+                    "value": shared,
+                    "expiresAt": now + _SALES_REP_ORDERS_TTL_SECONDS,
+                }
+            return shared
     use_local_sql_path = bool(local_only)
     use_admin_local_fast_path = bool(
         use_local_sql_path and include_all_doctors and not normalized_sales_rep_id
     )
-    users = (
-        user_repository.list_sales_tracking_users_for_admin()
-        if use_local_sql_path
-        else user_repository.get_all()
-    )
-    user_by_id = {str(u.get("id")): u for u in users if isinstance(u, dict) and u.get("id") is not None}
     rep_records = {str(rep.get("id")): rep for rep in sales_rep_repository.get_all() if rep.get("id")}
-    allowed_rep_ids = (
-        _compute_allowed_sales_rep_ids(normalized_sales_rep_id, users, rep_records)
-        if normalized_sales_rep_id
-        else set()
-    )
+    if use_local_sql_path:
+        users = user_repository.list_sales_tracking_users_for_admin()
+        allowed_rep_ids = (
+            _compute_allowed_sales_rep_ids(normalized_sales_rep_id, users, rep_records)
+            if normalized_sales_rep_id
+            else set()
+        )
+    else:
+        # Load only the users this scope can return: the rep's assigned users when scoped,
+        # every doctor (and rep-customer) otherwise, plus house-contact leads when requested.
+        allowed_rep_ids = (
+            _lookup_allowed_sales_rep_ids(normalized_sales_rep_id, rep_records)
+            if normalized_sales_rep_id
+            else set()
+        )
+        if allowed_rep_ids or not include_all_doctors:
+            users = user_repository.list_lookup_by_sales_rep_ids(allowed_rep_ids)
+        else:
+            users = user_repository.list_lookup_by_roles(
+                ("doctor", "test_doctor", "sales_rep", "sales_partner", "rep")
+            )
+        if include_house_contacts:
+            seen_user_ids = {str(u.get("id")) for u in users if isinstance(u, dict)}
+            users = users + [
+                u
+                for u in user_repository.list_lookup_by_lead_types(("contact_form", "house", "house_contact"))
+                if str(u.get("id")) not in seen_user_ids
+            ]
+    user_by_id = {str(u.get("id")): u for u in users if isinstance(u, dict) and u.get("id") is not None}
     include_sales_rep_customers = include_all_doctors and not allowed_rep_ids
 
     doctors = []
@@ -3756,6 +3793,18 @@ def get_orders_for_sales_rep(
                 local_orders.append(fallback_order)
                 if fallback_order_id:
                     existing_order_ids.add(fallback_order_id)
+        missing_user_ids = {
+            str(order.get("userId") or order.get("user_id") or "").strip()
+            for order in local_orders
+            if isinstance(order, dict)
+        } - set(user_by_id.keys())
+        missing_user_ids.discard("")
+        if missing_user_ids:
+            try:
+                for user in user_repository.find_lookup_by_ids(missing_user_ids):
+                    user_by_id.setdefault(str(user.get("id")), user)
+            except Exception:
+                logger.warning("[SalesRep] Failed to resolve users for fallback orders", exc_info=True)
 
     seen_local_doctor_ids = set(str(doc.get("id")) for doc in doctors if doc.get("id") is not None)
     for local in local_orders or []:
@@ -3952,6 +4001,12 @@ def get_orders_for_sales_rep(
                 "value": result,
                 "expiresAt": now + _SALES_REP_ORDERS_TTL_SECONDS,
             }
+        shared_cache.put(
+            shared_cache.NAMESPACE_SALES_REP_ORDERS,
+            cache_key,
+            result,
+            ttl_seconds=_SALES_REP_ORDERS_TTL_SECONDS,
+        )
     return result
 
 
@@ -3971,15 +4026,9 @@ def get_on_hold_orders_for_sales_rep(
     scan_limit = max(effective_limit * 4, 1500)
     scan_limit = min(scan_limit, 10000)
 
-    users = user_repository.get_all()
-    user_by_id = {
-        str(user.get("id")): user
-        for user in users
-        if isinstance(user, dict) and user.get("id") is not None
-    }
     rep_records = {str(rep.get("id")): rep for rep in sales_rep_repository.get_all() if rep.get("id")}
     allowed_rep_ids = (
-        _compute_allowed_sales_rep_ids(normalized_sales_rep_id, users, rep_records)
+        _lookup_allowed_sales_rep_ids(normalized_sales_rep_id, rep_records)
         if normalized_sales_rep_id
         else set()
     )
@@ -4011,6 +4060,17 @@ def get_on_hold_orders_for_sales_rep(
         return full or None
 
     local_orders = order_repository.list_recent_sales_tracking(scan_limit) or []
+    on_hold_user_ids = {
+        str(local.get("userId") or local.get("user_id") or "").strip()
+        for local in local_orders
+        if isinstance(local, dict) and _normalize_status(local.get("status")) in ("on-hold", "onhold")
+    }
+    on_hold_user_ids.discard("")
+    user_by_id = {
+        str(user.get("id")): user
+        for user in user_repository.find_lookup_by_ids(on_hold_user_ids)
+        if isinstance(user, dict) and user.get("id") is not None
+    }
     summaries: List[Dict] = []
     for local in local_orders:
         if not isinstance(local, dict):
@@ -4161,6 +4221,19 @@ def get_on_hold_orders_for_sales_rep(
     return {"orders": summaries[:effective_limit]}
 
 
+_SALES_MODAL_LOOKUP_ROLES = (
+    "admin",
+    "sales_lead",
+    "saleslead",
+    "sales_rep",
+    "sales_partner",
+    "test_rep",
+    "rep",
+    "doctor",
+    "test_doctor",
+)
+
+
 def get_sales_modal_detail(*, actor: Dict, target_user_id: str) -> Dict[str, object]:
     actor_role = _normalize_role((actor or {}).get("role"))
     if not _is_sales_access_role(actor_role):
@@ -4170,27 +4243,25 @@ def get_sales_modal_detail(*, actor: Dict, target_user_id: str) -> Dict[str, obj
     if not normalized_target_user_id:
         raise _service_error("USER_ID_REQUIRED", 400)
 
-    users = user_repository.list_sales_modal_lookup_users()
-    user_by_id = {
-        str(user.get("id")): user
-        for user in users
-        if isinstance(user, dict) and user.get("id") is not None
-    }
     rep_records = {
         str(rep.get("id")): rep
         for rep in sales_rep_repository.get_all()
         if isinstance(rep, dict) and rep.get("id") is not None
     }
 
-    target_user = user_by_id.get(normalized_target_user_id)
+    def _is_modal_user(user: object) -> bool:
+        return isinstance(user, dict) and _normalize_role(user.get("role")) in _SALES_MODAL_LOOKUP_ROLES
+
+    target_user = next(
+        (user for user in user_repository.find_lookup_by_ids([normalized_target_user_id]) if _is_modal_user(user)),
+        None,
+    )
     if not isinstance(target_user, dict):
         target_user = next(
             (
                 user
-                for user in users
-                if isinstance(user, dict)
-                and str(user.get("salesRepId") or user.get("sales_rep_id") or "").strip()
-                == normalized_target_user_id
+                for user in user_repository.list_lookup_by_sales_rep_ids([normalized_target_user_id])
+                if _is_modal_user(user)
             ),
             None,
         )
@@ -4213,7 +4284,7 @@ def get_sales_modal_detail(*, actor: Dict, target_user_id: str) -> Dict[str, obj
                 return normalized
         user_id = str(user.get("id") or "").strip()
         if user_id:
-            allowed = _compute_allowed_sales_rep_ids(user_id, users, rep_records)
+            allowed = _lookup_allowed_sales_rep_ids(user_id, rep_records)
             if allowed:
                 preferred = next((value for value in allowed if value in rep_records), None)
                 return preferred or next(iter(allowed))
@@ -4259,7 +4330,7 @@ def get_sales_modal_detail(*, actor: Dict, target_user_id: str) -> Dict[str, obj
 
     actor_user_id = str((actor or {}).get("id") or "").strip()
     actor_allowed_rep_ids = (
-        _compute_allowed_sales_rep_ids(actor_user_id, users, rep_records)
+        _lookup_allowed_sales_rep_ids(actor_user_id, rep_records)
         if actor_role != "admin" and actor_user_id
         else set()
     )
@@ -4267,7 +4338,7 @@ def get_sales_modal_detail(*, actor: Dict, target_user_id: str) -> Dict[str, obj
     target_is_sales_actor = _is_sales_actor_role(target_role)
     target_sales_rep_id = _resolve_sales_rep_id(target_user)
     target_allowed_rep_ids = (
-        _compute_allowed_sales_rep_ids(normalized_target_user_id, users, rep_records)
+        _lookup_allowed_sales_rep_ids(normalized_target_user_id, rep_records)
         if target_is_sales_actor
         else ({target_sales_rep_id} if target_sales_rep_id else set())
     )
@@ -4383,11 +4454,11 @@ def get_sales_modal_detail(*, actor: Dict, target_user_id: str) -> Dict[str, obj
     if target_is_sales_actor and target_allowed_rep_ids:
         assigned_doctor_ids = [
             str(user.get("id"))
-            for user in users
-            if isinstance(user, dict)
-            and user.get("id") is not None
-            and _normalize_role(user.get("role")) in ("doctor", "test_doctor")
-            and str(user.get("salesRepId") or user.get("sales_rep_id") or "").strip() in target_allowed_rep_ids
+            for user in user_repository.list_lookup_by_sales_rep_ids(
+                target_allowed_rep_ids,
+                roles=("doctor", "test_doctor"),
+            )
+            if isinstance(user, dict) and user.get("id") is not None
         ]
         if assigned_doctor_ids:
             sales_orders = order_repository.find_sales_tracking_by_user_ids(assigned_doctor_ids)
@@ -4628,6 +4699,7 @@ def _persist_shipping_update(
 
     try:
         order_repository.update(merged)
+        invalidate_order_report_caches()
     except Exception:
         logger.warning(
             "Failed to persist shipping update to primary store",
@@ -5063,9 +5135,8 @@ def get_sales_rep_order_detail(
     )
     if resolved_doctor:
         if not is_admin_request:
-            users = user_repository.get_all()
             rep_records = {str(rep.get("id")): rep for rep in sales_rep_repository.get_all() if rep.get("id")}
-            allowed_rep_ids = _compute_allowed_sales_rep_ids(sales_rep_id, users, rep_records)
+            allowed_rep_ids = _lookup_allowed_sales_rep_ids(sales_rep_id, rep_records)
 
             doctor_sales_rep = str(
                 resolved_doctor.get("salesRepId") or resolved_doctor.get("sales_rep_id") or ""
@@ -5075,9 +5146,8 @@ def get_sales_rep_order_detail(
     elif not is_admin_request:
         if not local_order:
             raise _service_error("Order not found", 404)
-        users = user_repository.get_all()
         rep_records = {str(rep.get("id")): rep for rep in sales_rep_repository.get_all() if rep.get("id")}
-        allowed_rep_ids = _compute_allowed_sales_rep_ids(sales_rep_id, users, rep_records)
+        allowed_rep_ids = _lookup_allowed_sales_rep_ids(sales_rep_id, rep_records)
         order_rep_candidates = {
             str(local_order.get("doctorSalesRepId") or "").strip(),
             str(local_order.get("salesRepId") or "").strip(),
@@ -5407,370 +5477,1091 @@ def get_sales_rep_order_detail(
     return mapped
 
 
-def get_sales_by_rep(
-    exclude_sales_rep_id: Optional[str] = None,
-    period_start: Optional[str] = None,
-    period_end: Optional[str] = None,
-    force: bool = False,
-    debug: bool = False,
-):
-    global _sales_by_rep_summary_inflight
-
-    start_dt, end_dt, period_meta = _resolve_report_period_bounds(period_start, period_end)
-    period_cache_key = f"{period_meta['periodStart']}::{period_meta['periodEnd']}"
-    report_tz = _get_report_timezone()
-    period_start_local_date = start_dt.astimezone(report_tz).date()
-    period_end_local_date = end_dt.astimezone(report_tz).date()
-    now_local = datetime.now(report_tz)
-    current_year_start_local = datetime(now_local.year, 1, 1, 0, 0, 0, 0, tzinfo=report_tz)
-    current_year_start_dt = current_year_start_local.astimezone(timezone.utc)
-    current_year_end_date = date(now_local.year, 12, 31)
-
-    def _meta_value(meta: object, key: str):
-        if not isinstance(meta, list):
-            return None
-        keys = set(with_legacy_meta_keys(key))
-        for entry in meta:
-            if isinstance(entry, dict) and entry.get("key") in keys:
-                return entry.get("value")
+def _sales_meta_value(meta: object, key: str):
+    if not isinstance(meta, list):
         return None
+    keys = set(with_legacy_meta_keys(key))
+    for entry in meta:
+        if isinstance(entry, dict) and entry.get("key") in keys:
+            return entry.get("value")
+    return None
 
-    def _is_truthy(value: object) -> bool:
-        if value is True:
-            return True
-        if value is False or value is None:
-            return False
-        if isinstance(value, (int, float)):
-            try:
-                return float(value) != 0
-            except Exception:
-                return False
-        text = str(value).strip().lower()
-        return text in ("1", "true", "yes", "y", "on")
 
-    def _safe_float(value: object) -> float:
+def _sales_is_truthy(value: object) -> bool:
+    if value is True:
+        return True
+    if value is False or value is None:
+        return False
+    if isinstance(value, (int, float)):
         try:
-            if value is None:
-                return 0.0
-            return float(value)
+            return float(value) != 0
         except Exception:
-            try:
-                return float(str(value).strip() or 0)
-            except Exception:
-                return 0.0
+            return False
+    text = str(value).strip().lower()
+    return text in ("1", "true", "yes", "y", "on")
 
-    def _local_date_key(value: datetime) -> str:
-        return value.astimezone(report_tz).date().isoformat()
 
-    def _build_cumulative_series(
-        daily_totals: Optional[Dict[str, float]] = None,
-        daily_orders: Optional[Dict[str, int]] = None,
-        *,
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None,
-    ) -> List[Dict[str, Any]]:
-        totals = daily_totals or {}
-        orders = daily_orders or {}
-        series: List[Dict[str, Any]] = []
-        running_total = 0.0
-        range_start = start_date or period_start_local_date
-        range_end = end_date or period_end_local_date
-        current_date = range_start
-        while current_date <= range_end:
-            key = current_date.isoformat()
-            daily_revenue = round(float(totals.get(key) or 0.0), 2)
-            running_total = round(running_total + daily_revenue, 2)
-            series.append(
-                {
-                    "date": key,
-                    "dailyRevenue": daily_revenue,
-                    "cumulativeRevenue": running_total,
-                    "orderCount": int(orders.get(key) or 0),
-                }
-            )
-            current_date += timedelta(days=1)
-        return series
+def _sales_safe_float(value: object) -> float:
+    try:
+        if value is None:
+            return 0.0
+        return float(value)
+    except Exception:
+        try:
+            return float(str(value).strip() or 0)
+        except Exception:
+            return 0.0
 
-    def _build_year_projection(revenue_to_date: float = 0.0, order_count: int = 0) -> Dict[str, Any]:
-        year_start_date = current_year_start_local.date()
-        as_of_date = now_local.date()
-        total_days_in_year = (date(now_local.year + 1, 1, 1) - year_start_date).days
-        days_elapsed = max(1, (as_of_date - year_start_date).days + 1)
-        average_daily_revenue = float(revenue_to_date) / days_elapsed if days_elapsed > 0 else 0.0
-        projected_year_end_revenue = average_daily_revenue * total_days_in_year
-        return {
-            "year": int(now_local.year),
-            "yearStart": year_start_date.isoformat(),
-            "asOfDate": as_of_date.isoformat(),
-            "yearEnd": current_year_end_date.isoformat(),
-            "daysElapsed": int(days_elapsed),
-            "totalDaysInYear": int(total_days_in_year),
-            "orderCount": int(order_count),
-            "revenueToDate": round(float(revenue_to_date), 2),
-            "averageDailyRevenue": round(float(average_daily_revenue), 2),
-            "projectedYearEndRevenue": round(float(projected_year_end_revenue), 2),
-            "timeZone": getattr(report_tz, "key", None) or str(report_tz),
-        }
 
-    def _compute_summary() -> Dict[str, Any]:
-        users = user_repository.get_all()
-        rep_like_roles = {"sales_rep", "sales_partner", "rep", "admin", "sales_lead", "saleslead"}
-        reps = [u for u in users if _normalize_role(u.get("role")) in rep_like_roles]
-        rep_records_list = sales_rep_repository.get_all()
-        rep_records = {str(rep.get("id")): rep for rep in rep_records_list if rep.get("id")}
-        user_lookup = {str(u.get("id")): u for u in users if u.get("id")}
-        rep_lookup_by_id: Dict[str, Dict] = {}
-        for u in users:
-            if _normalize_role(u.get("role")) not in rep_like_roles:
-                continue
-            user_id = str(u.get("id") or "").strip()
-            if not user_id:
-                continue
-            rep_lookup_by_id[user_id] = {
-                "id": user_id,
-                "name": u.get("name") or u.get("email") or "Sales Rep",
-                "email": u.get("email"),
-                "role": _normalize_role(u.get("role")) or "sales_rep",
-            }
-        for rep in rep_records_list:
-            rep_id = str(rep.get("id") or "").strip()
-            if not rep_id:
-                continue
-            rep_role = _resolve_rep_record_role(rep)
-            if rep_role and rep_role not in ("sales_rep", "sales_partner"):
-                continue
-            rep_lookup_by_id.setdefault(
-                rep_id,
-                {
-                    "id": rep_id,
-                    "name": rep.get("name") or rep.get("email") or "Sales Rep",
-                    "email": rep.get("email"),
-                    "role": rep_role or "sales_rep",
-                },
-            )
+def _sales_norm_email(value: object) -> str:
+    return str(value or "").strip().lower()
 
-        def _norm_email(value: object) -> str:
-            return str(value or "").strip().lower()
 
-        users_by_email: Dict[str, Dict] = {}
-        for u in users:
-            email = _norm_email(u.get("email"))
-            if email:
-                users_by_email[email] = u
+def _sales_norm_code(value: object) -> str:
+    raw = str(value or "").strip()
+    if not raw:
+        return ""
+    return re.sub(r"[^A-Za-z0-9]", "", raw).upper()
 
-        rep_user_id_by_rep_id: Dict[str, str] = {}
 
-        # Allow resolving a rep by their `users.sales_rep_id` external key (common in MySQL deployments).
-        for u in users:
-            if _normalize_role(u.get("role")) not in rep_like_roles:
-                continue
-            user_id = str(u.get("id") or "").strip()
-            if user_id:
-                rep_user_id_by_rep_id[user_id] = user_id
-            rep_alias = str(u.get("salesRepId") or u.get("sales_rep_id") or "").strip()
-            if rep_alias:
-                if rep_alias not in user_lookup:
-                    user_lookup[rep_alias] = u
-                if user_id:
-                    rep_user_id_by_rep_id[rep_alias] = user_id
-
-        # Canonical rep id is `sales_reps.id`.
-        # We treat `users.id`, `users.sales_rep_id` (external key), and `sales_reps.legacy_user_id`
-        # as aliases that should resolve to `sales_reps.id` for reporting.
-        rep_id_by_email: Dict[str, str] = {}
-        rep_record_by_email: Dict[str, Dict] = {}
-        for rep_record in rep_records_list:
-            rep_id = str(rep_record.get("id") or "").strip()
-            if not rep_id:
-                continue
-            rep_email = _norm_email(rep_record.get("email"))
-            if rep_email:
-                rep_id_by_email.setdefault(rep_email, rep_id)
-                rep_record_by_email.setdefault(rep_email, rep_record)
-            legacy_id_raw = rep_record.get("legacyUserId") or rep_record.get("legacy_user_id")
-            legacy_id = str(legacy_id_raw or "").strip()
-            if legacy_id:
-                rep_user_id_by_rep_id[rep_id] = legacy_id
-            elif rep_email and rep_email in users_by_email:
-                linked_user_id = str((users_by_email[rep_email] or {}).get("id") or "").strip()
-                if linked_user_id:
-                    rep_user_id_by_rep_id[rep_id] = linked_user_id
+def _sales_normalize_rep_id(value: object) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
 
-        def _norm_sales_code(value: object) -> str:
-            raw = str(value or "").strip()
-            if not raw:
-                return ""
-            return re.sub(r"[^A-Za-z0-9]", "", raw).upper()
 
-        rep_id_by_sales_code: Dict[str, str] = {}
-        rep_id_by_initials: Dict[str, str] = {}
-        for rep_record in rep_records_list:
-            rep_id = str(rep_record.get("id") or "").strip()
-            if not rep_id:
-                continue
-            rep_code = _norm_sales_code(rep_record.get("salesCode") or rep_record.get("sales_code"))
-            if rep_code:
-                rep_id_by_sales_code.setdefault(rep_code, rep_id)
-            rep_initials = str(rep_record.get("initials") or "").strip().upper()
-            if rep_initials:
-                rep_id_by_initials.setdefault(rep_initials, rep_id)
+def _sales_order_email(order: Dict[str, object]) -> str:
+    for key in (
+        "doctorEmail",
+        "doctor_email",
+        "billingEmail",
+        "billing_email",
+        "customerEmail",
+        "customer_email",
+    ):
+        candidate = order.get(key)
+        if isinstance(candidate, str) and candidate.strip():
+            return candidate.strip().lower()
+    for address_key in (
+        "billingAddress",
+        "billing",
+        "billing_address",
+        "shippingAddress",
+        "shipping",
+        "shipping_address",
+    ):
+        address = order.get(address_key)
+        if isinstance(address, str):
+            try:
+                address = json.loads(address)
+            except Exception:
+                address = None
+        if isinstance(address, dict):
+            email = address.get("email")
+            if isinstance(email, str) and email.strip():
+                return email.strip().lower()
+    return ""
 
-        alias_to_rep_id: Dict[str, str] = {}
-        for rep_record in rep_records_list:
-            rep_id = str(rep_record.get("id") or "").strip()
-            if not rep_id:
-                continue
-            alias_to_rep_id[rep_id] = rep_id
-            legacy_id_raw = rep_record.get("legacyUserId") or rep_record.get("legacy_user_id")
-            legacy_id = str(legacy_id_raw or "").strip()
-            if legacy_id:
-                alias_to_rep_id[legacy_id] = rep_id
-        for u in users:
-            if _normalize_role(u.get("role")) not in rep_like_roles:
-                continue
-            user_id = str(u.get("id") or "").strip()
-            rep_alias = str(u.get("salesRepId") or u.get("sales_rep_id") or "").strip()
-            linked_record = _resolve_sales_rep_record_for_user(u, rep_records)
-            linked_record_id = str((linked_record or {}).get("id") or "").strip()
-            canonical_rep_id = linked_record_id or rep_alias or user_id
-            if not canonical_rep_id:
-                continue
+
+def _sales_order_items(order: Dict[str, object]) -> List[Dict[str, object]]:
+    raw = order.get("items")
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except Exception:
+            raw = None
+    if isinstance(raw, list):
+        return [item for item in raw if isinstance(item, dict)]
+    line_items = order.get("lineItems") or order.get("line_items")
+    if isinstance(line_items, list):
+        return [item for item in line_items if isinstance(item, dict)]
+    return []
+
+
+def _sales_order_items_subtotal(order: Dict[str, object], items: List[Dict[str, object]]) -> float:
+    total_from_items = 0.0
+    for item in items:
+        qty = _sales_safe_float(item.get("quantity") or item.get("qty") or 0)
+        if qty <= 0:
+            continue
+        line_total = _sales_safe_float(
+            item.get("subtotal")
+            or item.get("line_total")
+            or item.get("priceTotal")
+            or item.get("price_total")
+            or item.get("total")
+        )
+        if line_total <= 0:
+            line_total = _sales_safe_float(item.get("price")) * qty
+        total_from_items += max(0.0, line_total)
+    if total_from_items > 0:
+        return total_from_items
+    subtotal = _sales_safe_float(
+        order.get("itemsSubtotal")
+        or order.get("items_subtotal")
+        or order.get("itemsTotal")
+        or order.get("items_total")
+    )
+    if subtotal > 0:
+        return subtotal
+    return 0.0
+
+
+def _sales_entry_pricing_mode(entry: Dict[str, object]) -> str:
+    hint = str(entry.get("pricingModeHint") or "").strip().lower()
+    return "retail" if hint == "retail" else "wholesale"
+
+
+def _sales_entry_revenue(entry: Dict[str, object]) -> float:
+    subtotal = _sales_safe_float(entry.get("itemsSubtotal"))
+    if subtotal > 0:
+        return subtotal
+    return _sales_safe_float(entry.get("total"))
+
+
+def _build_sales_attribution_context() -> Dict[str, Any]:
+    """
+    Load users, sales reps and prospects once and build the alias maps used to
+    attribute an order to its canonical sales rep (`sales_reps.id`) or the house.
+    """
+    users = user_repository.list_lookup_users()
+    rep_like_roles = {"sales_rep", "sales_partner", "rep", "admin", "sales_lead", "saleslead"}
+    reps = [u for u in users if _normalize_role(u.get("role")) in rep_like_roles]
+    rep_records_list = sales_rep_repository.get_all()
+    rep_records = {str(rep.get("id")): rep for rep in rep_records_list if rep.get("id")}
+    user_lookup = {str(u.get("id")): u for u in users if u.get("id")}
+    rep_lookup_by_id: Dict[str, Dict] = {}
+    for u in users:
+        if _normalize_role(u.get("role")) not in rep_like_roles:
+            continue
+        user_id = str(u.get("id") or "").strip()
+        if not user_id:
+            continue
+        rep_lookup_by_id[user_id] = {
+            "id": user_id,
+            "name": u.get("name") or u.get("email") or "Sales Rep",
+            "email": u.get("email"),
+            "role": _normalize_role(u.get("role")) or "sales_rep",
+        }
+    for rep in rep_records_list:
+        rep_id = str(rep.get("id") or "").strip()
+        if not rep_id:
+            continue
+        rep_role = _resolve_rep_record_role(rep)
+        if rep_role and rep_role not in ("sales_rep", "sales_partner"):
+            continue
+        rep_lookup_by_id.setdefault(
+            rep_id,
+            {
+                "id": rep_id,
+                "name": rep.get("name") or rep.get("email") or "Sales Rep",
+                "email": rep.get("email"),
+                "role": rep_role or "sales_rep",
+            },
+        )
+
+    users_by_email: Dict[str, Dict] = {}
+    for u in users:
+        email = _sales_norm_email(u.get("email"))
+        if email:
+            users_by_email[email] = u
+
+    rep_user_id_by_rep_id: Dict[str, str] = {}
+
+    # Allow resolving a rep by their `users.sales_rep_id` external key (common in MySQL deployments).
+    for u in users:
+        if _normalize_role(u.get("role")) not in rep_like_roles:
+            continue
+        user_id = str(u.get("id") or "").strip()
+        if user_id:
+            rep_user_id_by_rep_id[user_id] = user_id
+        rep_alias = str(u.get("salesRepId") or u.get("sales_rep_id") or "").strip()
+        if rep_alias:
+            if rep_alias not in user_lookup:
+                user_lookup[rep_alias] = u
             if user_id:
-                alias_to_rep_id[user_id] = canonical_rep_id
-                rep_user_id_by_rep_id.setdefault(user_id, user_id)
-                rep_user_id_by_rep_id.setdefault(canonical_rep_id, user_id)
-            if rep_alias:
-                alias_to_rep_id[rep_alias] = canonical_rep_id
-                if user_id:
-                    rep_user_id_by_rep_id.setdefault(rep_alias, user_id)
-        for u in users:
-            if _normalize_role(u.get("role")) not in rep_like_roles:
-                continue
-            email = _norm_email(u.get("email"))
-            if not email:
-                continue
-            canonical_rep_id = rep_id_by_email.get(email)
-            if not canonical_rep_id:
-                continue
-            user_id = str(u.get("id") or "").strip()
+                rep_user_id_by_rep_id[rep_alias] = user_id
+
+    # Canonical rep id is `sales_reps.id`.
+    # We treat `users.id`, `users.sales_rep_id` (external key), and `sales_reps.legacy_user_id`
+    # as aliases that should resolve to `sales_reps.id` for reporting.
+    rep_id_by_email: Dict[str, str] = {}
+    rep_record_by_email: Dict[str, Dict] = {}
+    for rep_record in rep_records_list:
+        rep_id = str(rep_record.get("id") or "").strip()
+        if not rep_id:
+            continue
+        rep_email = _sales_norm_email(rep_record.get("email"))
+        if rep_email:
+            rep_id_by_email.setdefault(rep_email, rep_id)
+            rep_record_by_email.setdefault(rep_email, rep_record)
+        legacy_id_raw = rep_record.get("legacyUserId") or rep_record.get("legacy_user_id")
+        legacy_id = str(legacy_id_raw or "").strip()
+        if legacy_id:
+            rep_user_id_by_rep_id[rep_id] = legacy_id
+        elif rep_email and rep_email in users_by_email:
+            linked_user_id = str((users_by_email[rep_email] or {}).get("id") or "").strip()
+            if linked_user_id:
+                rep_user_id_by_rep_id[rep_id] = linked_user_id
+
+    rep_id_by_sales_code: Dict[str, str] = {}
+    rep_id_by_initials: Dict[str, str] = {}
+    for rep_record in rep_records_list:
+        rep_id = str(rep_record.get("id") or "").strip()
+        if not rep_id:
+            continue
+        rep_code = _sales_norm_code(rep_record.get("salesCode") or rep_record.get("sales_code"))
+        if rep_code:
+            rep_id_by_sales_code.setdefault(rep_code, rep_id)
+        rep_initials = str(rep_record.get("initials") or "").strip().upper()
+        if rep_initials:
+            rep_id_by_initials.setdefault(rep_initials, rep_id)
+
+    alias_to_rep_id: Dict[str, str] = {}
+    for rep_record in rep_records_list:
+        rep_id = str(rep_record.get("id") or "").strip()
+        if not rep_id:
+            continue
+        alias_to_rep_id[rep_id] = rep_id
+        legacy_id_raw = rep_record.get("legacyUserId") or rep_record.get("legacy_user_id")
+        legacy_id = str(legacy_id_raw or "").strip()
+        if legacy_id:
+            alias_to_rep_id[legacy_id] = rep_id
+    for u in users:
+        if _normalize_role(u.get("role")) not in rep_like_roles:
+            continue
+        user_id = str(u.get("id") or "").strip()
+        rep_alias = str(u.get("salesRepId") or u.get("sales_rep_id") or "").strip()
+        linked_record = _resolve_sales_rep_record_for_user(u, rep_records)
+        linked_record_id = str((linked_record or {}).get("id") or "").strip()
+        canonical_rep_id = linked_record_id or rep_alias or user_id
+        if not canonical_rep_id:
+            continue
+        if user_id:
+            alias_to_rep_id[user_id] = canonical_rep_id
+            rep_user_id_by_rep_id.setdefault(user_id, user_id)
+            rep_user_id_by_rep_id.setdefault(canonical_rep_id, user_id)
+        if rep_alias:
+            alias_to_rep_id[rep_alias] = canonical_rep_id
             if user_id:
-                alias_to_rep_id[user_id] = canonical_rep_id
-                rep_user_id_by_rep_id[canonical_rep_id] = user_id
-            rep_alias = str(u.get("salesRepId") or u.get("sales_rep_id") or "").strip()
-            if rep_alias:
-                alias_to_rep_id[rep_alias] = canonical_rep_id
-                if user_id:
-                    rep_user_id_by_rep_id[rep_alias] = user_id
+                rep_user_id_by_rep_id.setdefault(rep_alias, user_id)
+    for u in users:
+        if _normalize_role(u.get("role")) not in rep_like_roles:
+            continue
+        email = _sales_norm_email(u.get("email"))
+        if not email:
+            continue
+        canonical_rep_id = rep_id_by_email.get(email)
+        if not canonical_rep_id:
+            continue
+        user_id = str(u.get("id") or "").strip()
+        if user_id:
+            alias_to_rep_id[user_id] = canonical_rep_id
+            rep_user_id_by_rep_id[canonical_rep_id] = user_id
+        rep_alias = str(u.get("salesRepId") or u.get("sales_rep_id") or "").strip()
+        if rep_alias:
+            alias_to_rep_id[rep_alias] = canonical_rep_id
+            if user_id:
+                rep_user_id_by_rep_id[rep_alias] = user_id
 
-        # Keep alias and canonical rep ids synchronized back to a real user id whenever one is known.
-        for alias, canonical_rep_id in list(alias_to_rep_id.items()):
-            alias_key = str(alias or "").strip()
-            canonical_key = str(canonical_rep_id or "").strip()
-            if not alias_key or not canonical_key:
-                continue
-            linked_user_id = rep_user_id_by_rep_id.get(alias_key) or rep_user_id_by_rep_id.get(canonical_key)
-            if not linked_user_id:
-                continue
-            rep_user_id_by_rep_id.setdefault(alias_key, linked_user_id)
-            rep_user_id_by_rep_id.setdefault(canonical_key, linked_user_id)
+    # Keep alias and canonical rep ids synchronized back to a real user id whenever one is known.
+    for alias, canonical_rep_id in list(alias_to_rep_id.items()):
+        alias_key = str(alias or "").strip()
+        canonical_key = str(canonical_rep_id or "").strip()
+        if not alias_key or not canonical_key:
+            continue
+        linked_user_id = rep_user_id_by_rep_id.get(alias_key) or rep_user_id_by_rep_id.get(canonical_key)
+        if not linked_user_id:
+            continue
+        rep_user_id_by_rep_id.setdefault(alias_key, linked_user_id)
+        rep_user_id_by_rep_id.setdefault(canonical_key, linked_user_id)
 
-        def _canonicalize_known_rep_id(value: object) -> str:
-            normalized = str(value or "").strip()
-            if not normalized:
-                return ""
-            if normalized == "__house__" or normalized.lower() == "house":
-                return "__house__"
-            canonical = str(alias_to_rep_id.get(normalized) or "").strip()
-            if not canonical:
-                return ""
-            if canonical.lower() == "house":
-                return "__house__"
-            return canonical
+    def _canonicalize_known_rep_id(value: object) -> str:
+        normalized = str(value or "").strip()
+        if not normalized:
+            return ""
+        if normalized == "__house__" or normalized.lower() == "house":
+            return "__house__"
+        canonical = str(alias_to_rep_id.get(normalized) or "").strip()
+        if not canonical:
+            return ""
+        if canonical.lower() == "house":
+            return "__house__"
+        return canonical
+
+    # Prospect-backed mapping for doctors that don't have `salesRepId` persisted yet.
+    prospect_rep_by_doctor: Dict[str, str] = {}
+    prospect_rep_updated_ms: Dict[str, int] = {}
+    prospect_rep_by_email: Dict[str, str] = {}
+    prospect_rep_email_updated_ms: Dict[str, int] = {}
+    try:
+        prospects = sales_prospect_repository.get_all()
+    except Exception:
+        prospects = []
+    for prospect in prospects or []:
+        if not isinstance(prospect, dict):
+            continue
+        doctor_id = str(prospect.get("doctorId") or prospect.get("doctor_id") or "").strip()
+        rep_id_raw = str(prospect.get("salesRepId") or prospect.get("sales_rep_id") or "").strip()
+        contact_email = _sales_norm_email(prospect.get("contactEmail") or prospect.get("contact_email"))
+        if not rep_id_raw:
+            continue
+        rep_id_norm = _canonicalize_known_rep_id(rep_id_raw)
+        if not rep_id_norm:
+            continue
+        updated_at = prospect.get("updatedAt") or prospect.get("updated_at") or prospect.get("createdAt") or prospect.get("created_at")
+        updated_dt = _parse_datetime_utc(updated_at)
+        updated_ms = int(updated_dt.timestamp() * 1000) if updated_dt else 0
+        if doctor_id:
+            prev_ms = prospect_rep_updated_ms.get(doctor_id, -1)
+            if updated_ms >= prev_ms:
+                prospect_rep_by_doctor[doctor_id] = str(rep_id_norm)
+                prospect_rep_updated_ms[doctor_id] = updated_ms
+        if contact_email:
+            prev_ms = prospect_rep_email_updated_ms.get(contact_email, -1)
+            if updated_ms >= prev_ms:
+                prospect_rep_by_email[contact_email] = str(rep_id_norm)
+                prospect_rep_email_updated_ms[contact_email] = updated_ms
+
+    # Used as a fallback when older Woo orders are missing meta.
+    doctors_by_email = {}
+    for u in users:
+        if (u.get("role") or "").lower() not in (
+            "doctor",
+            "test_doctor",
+            "sales_lead",
+            "saleslead",
+            "sales-lead",
+        ):
+            continue
+        email = (u.get("email") or "").strip().lower()
+        if email:
+            doctors_by_email[email] = u
+
+    # Ensure doctors have a stable lead type stored for commission tracking.
+    try:
+        doctors_list = referral_service.backfill_lead_types_for_doctors(list(doctors_by_email.values()))
+        doctors_by_email = {
+            str(d.get("email") or "").strip().lower(): d
+            for d in doctors_list
+            if str(d.get("email") or "").strip()
+        }
+    except Exception:
+        pass
 
-        # Prospect-backed mapping for doctors that don't have `salesRepId` persisted yet.
-        prospect_rep_by_doctor: Dict[str, str] = {}
-        prospect_rep_updated_ms: Dict[str, int] = {}
-        prospect_rep_by_email: Dict[str, str] = {}
-        prospect_rep_email_updated_ms: Dict[str, int] = {}
+    # Only contact-form prospects explicitly assigned to the house bucket should fall
+    # back to house attribution. Regular rep-owned contact-form leads stay with the rep.
+    house_contact_form_emails = _house_contact_form_emails_from_prospects(prospects or [])
+
+    valid_rep_ids: set[str] = set()
+    for rep in reps:
+        rep_id_raw = str(rep.get("id") or "").strip()
+        if not rep_id_raw:
+            continue
+        valid_rep_ids.add(alias_to_rep_id.get(rep_id_raw, rep_id_raw))
+    for rep in rep_records_list:
+        rep_id = rep.get("id")
+        if rep_id:
+            valid_rep_ids.add(alias_to_rep_id.get(str(rep_id), str(rep_id)))
+    for rep_id in (prospect_rep_by_doctor.values() if isinstance(prospect_rep_by_doctor, dict) else []):
+        if rep_id:
+            valid_rep_ids.add(alias_to_rep_id.get(str(rep_id), str(rep_id)))
+    for rep_id in (prospect_rep_by_email.values() if isinstance(prospect_rep_by_email, dict) else []):
+        if rep_id:
+            valid_rep_ids.add(alias_to_rep_id.get(str(rep_id), str(rep_id)))
+
+    # Filled in while attributing orders; used to name reps that only appear via order hints.
+    rep_email_hint_by_rep_id: Dict[str, str] = {}
+
+    def _resolve_rep_from_email_hint(email_hint: str) -> str:
+        if not email_hint:
+            return ""
+        resolved = rep_id_by_email.get(email_hint) or ""
+        if resolved:
+            return alias_to_rep_id.get(resolved, resolved)
+        return ""
+
+    def _resolve_rep_from_code_hint(code_hint: str) -> str:
+        code = _sales_norm_code(code_hint)
+        if not code:
+            return ""
+        resolved = rep_id_by_sales_code.get(code) or ""
+        if resolved:
+            return alias_to_rep_id.get(resolved, resolved)
+        return ""
+
+    def _resolve_rep_from_initials_hint(initials_hint: str) -> str:
+        initials = str(initials_hint or "").strip().upper()
+        if not initials:
+            return ""
+        resolved = rep_id_by_initials.get(initials) or ""
+        if resolved:
+            return alias_to_rep_id.get(resolved, resolved)
+        return ""
+
+    return {
+        "users": users,
+        "reps": reps,
+        "rep_like_roles": rep_like_roles,
+        "rep_records_list": rep_records_list,
+        "rep_records": rep_records,
+        "user_lookup": user_lookup,
+        "users_by_email": users_by_email,
+        "rep_user_id_by_rep_id": rep_user_id_by_rep_id,
+        "rep_id_by_email": rep_id_by_email,
+        "alias_to_rep_id": alias_to_rep_id,
+        "prospect_rep_by_doctor": prospect_rep_by_doctor,
+        "prospect_rep_by_email": prospect_rep_by_email,
+        "doctors_by_email": doctors_by_email,
+        "house_contact_form_emails": house_contact_form_emails,
+        "valid_rep_ids": valid_rep_ids,
+        "rep_email_hint_by_rep_id": rep_email_hint_by_rep_id,
+        "_canonicalize_known_rep_id": _canonicalize_known_rep_id,
+        "_resolve_rep_from_email_hint": _resolve_rep_from_email_hint,
+        "_resolve_rep_from_code_hint": _resolve_rep_from_code_hint,
+        "_resolve_rep_from_initials_hint": _resolve_rep_from_initials_hint,
+    }
+
+
+def _attribute_sales_order(
+    local_order: Dict[str, Any],
+    ctx: Dict[str, Any],
+    *,
+    debug_counts: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """
+    Resolve the sales rep and revenue of one order against an attribution context
+    from `_build_sales_attribution_context`.
+
+    Orders that never count toward revenue come back as `{"skip": reason}` with
+    reason "status", "refunded", "missing_created_at" or "meta_refunded".
+    """
+    debug = debug_counts is not None
+    rep_like_roles = ctx["rep_like_roles"]
+    user_lookup = ctx["user_lookup"]
+    users_by_email = ctx["users_by_email"]
+    rep_id_by_email = ctx["rep_id_by_email"]
+    prospect_rep_by_doctor = ctx["prospect_rep_by_doctor"]
+    prospect_rep_by_email = ctx["prospect_rep_by_email"]
+    doctors_by_email = ctx["doctors_by_email"]
+    house_contact_form_emails = ctx["house_contact_form_emails"]
+    rep_email_hint_by_rep_id = ctx["rep_email_hint_by_rep_id"]
+    _canonicalize_known_rep_id = ctx["_canonicalize_known_rep_id"]
+    _resolve_rep_from_email_hint = ctx["_resolve_rep_from_email_hint"]
+    _resolve_rep_from_code_hint = ctx["_resolve_rep_from_code_hint"]
+    _resolve_rep_from_initials_hint = ctx["_resolve_rep_from_initials_hint"]
+
+    status = str(local_order.get("status") or "").strip().lower()
+    if not _is_revenue_recognized_order_status(status):
+        return {"skip": "refunded" if status == "refunded" else "status", "status": status}
+    created_at = _parse_datetime_utc(local_order.get("createdAt") or local_order.get("created_at"))
+    if not created_at:
+        return {"skip": "missing_created_at", "status": status}
+
+    meta_data = local_order.get("meta_data") or local_order.get("metaData") or local_order.get("meta") or []
+    if isinstance(meta_data, str):
         try:
-            prospects = sales_prospect_repository.get_all()
+            meta_data = json.loads(meta_data)
         except Exception:
-            prospects = []
-        for prospect in prospects or []:
-            if not isinstance(prospect, dict):
-                continue
-            doctor_id = str(prospect.get("doctorId") or prospect.get("doctor_id") or "").strip()
-            rep_id_raw = str(prospect.get("salesRepId") or prospect.get("sales_rep_id") or "").strip()
-            contact_email = _norm_email(prospect.get("contactEmail") or prospect.get("contact_email"))
-            if not rep_id_raw:
-                continue
-            rep_id_norm = _canonicalize_known_rep_id(rep_id_raw)
-            if not rep_id_norm:
-                continue
-            updated_at = prospect.get("updatedAt") or prospect.get("updated_at") or prospect.get("createdAt") or prospect.get("created_at")
-            updated_dt = _parse_datetime_utc(updated_at)
-            updated_ms = int(updated_dt.timestamp() * 1000) if updated_dt else 0
-            if doctor_id:
-                prev_ms = prospect_rep_updated_ms.get(doctor_id, -1)
-                if updated_ms >= prev_ms:
-                    prospect_rep_by_doctor[doctor_id] = str(rep_id_norm)
-                    prospect_rep_updated_ms[doctor_id] = updated_ms
-            if contact_email:
-                prev_ms = prospect_rep_email_updated_ms.get(contact_email, -1)
-                if updated_ms >= prev_ms:
-                    prospect_rep_by_email[contact_email] = str(rep_id_norm)
-                    prospect_rep_email_updated_ms[contact_email] = updated_ms
-
-        # Used as a fallback when older Woo orders are missing meta.
-        doctors_by_email = {}
-        for u in users:
-            if (u.get("role") or "").lower() not in (
-                "doctor",
-                "test_doctor",
-                "sales_lead",
-                "saleslead",
-                "sales-lead",
-            ):
-                continue
-            email = (u.get("email") or "").strip().lower()
-            if email:
-                doctors_by_email[email] = u
-
-        # Ensure doctors have a stable lead type stored for commission tracking.
+            meta_data = []
+    if not isinstance(meta_data, list):
+        meta_data = []
+    if _sales_is_truthy(_sales_meta_value(meta_data, "trufusion_refunded")):
+        return {"skip": "meta_refunded", "status": status}
+
+    order_user_id = str(local_order.get("userId") or local_order.get("user_id") or "").strip()
+    order_user = user_lookup.get(order_user_id) if order_user_id else None
+    order_user_email = _sales_norm_email(order_user.get("email") if isinstance(order_user, dict) else None)
+    billing_email = _sales_order_email(local_order)
+    attribution_email = billing_email or order_user_email
+    force_house_contact_form = bool(attribution_email and attribution_email in house_contact_form_emails)
+
+    integrations = local_order.get("integrations") or local_order.get("integrationDetails") or {}
+    if isinstance(integrations, str):
         try:
-            doctors_list = referral_service.backfill_lead_types_for_doctors(list(doctors_by_email.values()))
-            doctors_by_email = {
-                str(d.get("email") or "").strip().lower(): d
-                for d in doctors_list
-                if str(d.get("email") or "").strip()
-            }
+            integrations = json.loads(integrations)
         except Exception:
-            pass
+            integrations = {}
+    if not isinstance(integrations, dict):
+        integrations = {}
+
+    rep_id = _sales_normalize_rep_id(
+        local_order.get("doctorSalesRepId")
+        or local_order.get("salesRepId")
+        or local_order.get("sales_rep_id")
+        or local_order.get("doctor_sales_rep_id")
+    )
+    if not rep_id:
+        rep_id = _sales_normalize_rep_id(
+            integrations.get("salesRepId")
+            or integrations.get("sales_rep_id")
+            or integrations.get("doctorSalesRepId")
+            or integrations.get("doctor_sales_rep_id")
+        )
+    rep_email_hint = _sales_norm_email(
+        local_order.get("salesRepEmail")
+        or local_order.get("sales_rep_email")
+        or local_order.get("doctorSalesRepEmail")
+        or local_order.get("doctor_sales_rep_email")
+        or integrations.get("salesRepEmail")
+        or integrations.get("sales_rep_email")
+        or integrations.get("doctorSalesRepEmail")
+        or integrations.get("doctor_sales_rep_email")
+    )
+    rep_code_hint = str(
+        local_order.get("salesRepCode")
+        or local_order.get("sales_rep_code")
+        or local_order.get("doctorSalesRepCode")
+        or local_order.get("doctor_sales_rep_code")
+        or integrations.get("salesRepCode")
+        or integrations.get("sales_rep_code")
+        or integrations.get("doctorSalesRepCode")
+        or integrations.get("doctor_sales_rep_code")
+        or ""
+    ).strip()
+    rep_initials_hint = str(
+        local_order.get("salesRepInitials")
+        or local_order.get("sales_rep_initials")
+        or local_order.get("doctorSalesRepInitials")
+        or local_order.get("doctor_sales_rep_initials")
+        or integrations.get("salesRepInitials")
+        or integrations.get("sales_rep_initials")
+        or integrations.get("doctorSalesRepInitials")
+        or integrations.get("doctor_sales_rep_initials")
+        or ""
+    ).strip()
+
+    meta_rep_id = _sales_normalize_rep_id(
+        _sales_meta_value(meta_data, "trufusion_sales_rep_id")
+        or _sales_meta_value(meta_data, "sales_rep_id")
+        or _sales_meta_value(meta_data, "salesRepId")
+        or _sales_meta_value(meta_data, "doctor_sales_rep_id")
+        or _sales_meta_value(meta_data, "doctorSalesRepId")
+    )
+    meta_rep_email = _sales_norm_email(
+        _sales_meta_value(meta_data, "trufusion_sales_rep_email")
+        or _sales_meta_value(meta_data, "sales_rep_email")
+        or _sales_meta_value(meta_data, "salesRepEmail")
+        or _sales_meta_value(meta_data, "doctor_sales_rep_email")
+        or _sales_meta_value(meta_data, "doctorSalesRepEmail")
+    )
+    meta_rep_code = str(
+        _sales_meta_value(meta_data, "trufusion_sales_rep_code")
+        or _sales_meta_value(meta_data, "sales_rep_code")
+        or _sales_meta_value(meta_data, "salesRepCode")
+        or _sales_meta_value(meta_data, "doctor_sales_rep_code")
+        or _sales_meta_value(meta_data, "doctorSalesRepCode")
+        or ""
+    ).strip()
+    meta_rep_initials = str(
+        _sales_meta_value(meta_data, "sales_rep_initials")
+        or _sales_meta_value(meta_data, "salesRepInitials")
+        or _sales_meta_value(meta_data, "doctor_sales_rep_initials")
+        or _sales_meta_value(meta_data, "doctorSalesRepInitials")
+        or ""
+    ).strip()
+
+    if not rep_id and meta_rep_id:
+        rep_id = meta_rep_id
+        if debug:
+            debug_counts["metaRepId"] += 1
+    if not rep_email_hint and meta_rep_email:
+        rep_email_hint = meta_rep_email
+    if not rep_code_hint and meta_rep_code:
+        rep_code_hint = meta_rep_code
+    if not rep_initials_hint and meta_rep_initials:
+        rep_initials_hint = meta_rep_initials
+
+    rep_id_raw = rep_id
+    if rep_id:
+        rep_id_candidate = rep_id_raw
+        if rep_email_hint:
+            canonical_by_email = rep_id_by_email.get(rep_email_hint) or ""
+            if canonical_by_email:
+                rep_id_candidate = str(canonical_by_email).strip()
+        rep_id = _canonicalize_known_rep_id(rep_id_candidate)
+        if rep_id and rep_email_hint:
+            rep_email_hint_by_rep_id[rep_id_raw] = rep_email_hint
+            rep_email_hint_by_rep_id[rep_id] = rep_email_hint
+
+    if not rep_id and rep_email_hint:
+        rep_id = _resolve_rep_from_email_hint(rep_email_hint)
+        if rep_id and debug and rep_email_hint == meta_rep_email:
+            debug_counts["metaRepEmail"] += 1
+    if not rep_id and rep_code_hint:
+        rep_id = _resolve_rep_from_code_hint(rep_code_hint)
+        if rep_id and debug:
+            debug_counts["metaRepCode"] += 1
+    if not rep_id and rep_initials_hint:
+        rep_id = _resolve_rep_from_initials_hint(rep_initials_hint)
+
+    if not rep_id and attribution_email:
+        rep_id = _resolve_rep_from_email_hint(attribution_email)
+        if rep_id and debug:
+            debug_counts["billingEmailIsRep"] += 1
+
+    if not rep_id and (attribution_email or order_user_id):
+        user_match = users_by_email.get(attribution_email) if attribution_email else None
+        if not user_match and order_user_id:
+            user_match = user_lookup.get(order_user_id)
+        if user_match:
+            rep_id = _canonicalize_known_rep_id(user_match.get("salesRepId") or user_match.get("sales_rep_id"))
+            if rep_id and debug:
+                debug_counts["userSalesRepId"] += 1
+            if not rep_id and user_match.get("id"):
+                rep_id = str(prospect_rep_by_doctor.get(str(user_match.get("id")), "") or "").strip()
+                if rep_id and debug:
+                    debug_counts["prospectDoctorId"] += 1
+            if not rep_id and _normalize_role(user_match.get("role")) in rep_like_roles:
+                rep_id = _canonicalize_known_rep_id(user_match.get("id"))
+                if rep_id and debug:
+                    debug_counts["userIsRep"] += 1
 
-        # Only contact-form prospects explicitly assigned to the house bucket should fall
-        # back to house attribution. Regular rep-owned contact-form leads stay with the rep.
-        house_contact_form_emails = _house_contact_form_emails_from_prospects(prospects or [])
+    if not rep_id:
+        doctor = doctors_by_email.get(attribution_email) if attribution_email else None
+        if doctor is None and isinstance(order_user, dict) and _normalize_role(order_user.get("role")) in (
+            "doctor",
+            "test_doctor",
+        ):
+            doctor = order_user
+        rep_id = (
+            _canonicalize_known_rep_id((doctor or {}).get("salesRepId") or (doctor or {}).get("sales_rep_id"))
+            if doctor
+            else ""
+        )
+        if rep_id and debug:
+            debug_counts["doctorSalesRepId"] += 1
+        if not rep_id and doctor and doctor.get("id"):
+            rep_id = str(prospect_rep_by_doctor.get(str(doctor.get("id")), "") or "").strip()
+            if rep_id and debug:
+                debug_counts["prospectDoctorId"] += 1
+
+    if not rep_id and attribution_email:
+        rep_id = str(prospect_rep_by_email.get(attribution_email, "") or "").strip()
+        if rep_id and debug:
+            debug_counts["prospectEmail"] += 1
+
+    if str(rep_id or "").strip().lower() == "house":
+        rep_id = "__house__"
+
+    items = _sales_order_items(local_order)
+    subtotal = _sales_order_items_subtotal(local_order, items)
+    total = _sales_safe_float(
+        local_order.get("total")
+        or local_order.get("grandTotal")
+        or local_order.get("grand_total")
+    )
+    pricing_mode_hint = (
+        local_order.get("pricingMode")
+        or local_order.get("pricing_mode")
+        or integrations.get("pricingMode")
+        or integrations.get("pricing_mode")
+        or _sales_meta_value(meta_data, "trufusion_pricing_mode")
+        or _sales_meta_value(meta_data, "trufusion_pricingMode")
+        or _sales_meta_value(meta_data, "pricing_mode")
+        or _sales_meta_value(meta_data, "pricingMode")
+    )
 
-        valid_rep_ids: set[str] = set()
-        for rep in reps:
-            rep_id_raw = str(rep.get("id") or "").strip()
-            if not rep_id_raw:
-                continue
-            valid_rep_ids.add(alias_to_rep_id.get(rep_id_raw, rep_id_raw))
-        for rep in rep_records_list:
-            rep_id = rep.get("id")
-            if rep_id:
-                valid_rep_ids.add(alias_to_rep_id.get(str(rep_id), str(rep_id)))
-        for rep_id in (prospect_rep_by_doctor.values() if isinstance(prospect_rep_by_doctor, dict) else []):
-            if rep_id:
-                valid_rep_ids.add(alias_to_rep_id.get(str(rep_id), str(rep_id)))
-        for rep_id in (prospect_rep_by_email.values() if isinstance(prospect_rep_by_email, dict) else []):
-            if rep_id:
-                valid_rep_ids.add(alias_to_rep_id.get(str(rep_id), str(rep_id)))
+    tracked_rep_id = rep_id
+    if not tracked_rep_id or tracked_rep_id == "__house__":
+        if not tracked_rep_id and force_house_contact_form:
+            tracked_rep_id = "__house__"
+        if tracked_rep_id != "__house__":
+            tracked_rep_id = "__house__"
+        if debug:
+            debug_counts["fallbackHouse"] += 1
+
+    return {
+        "skip": None,
+        "status": status,
+        "createdAt": created_at,
+        "salesRepId": tracked_rep_id,
+        "unattributed": not rep_id,
+        "itemsSubtotal": subtotal,
+        "total": total,
+        "wooId": local_order.get("wooOrderId"),
+        "wooNumber": local_order.get("wooOrderNumber") or local_order.get("number"),
+        "orderId": local_order.get("id"),
+        "pricingModeHint": pricing_mode_hint,
+        "metaRepId": meta_rep_id,
+        "metaRepEmail": meta_rep_email,
+        "billingEmail": billing_email,
+    }
+
+
+def _build_sales_by_rep_rows(
+    ctx: Dict[str, Any],
+    rep_totals: Dict[str, Dict[str, float]],
+    house_totals: Dict[str, float],
+) -> List[Dict]:
+    """Sales-by-Rep report rows (one per known rep plus the house bucket), by revenue."""
+    reps = ctx["reps"]
+    rep_records = ctx["rep_records"]
+    user_lookup = ctx["user_lookup"]
+    users_by_email = ctx["users_by_email"]
+    rep_user_id_by_rep_id = ctx["rep_user_id_by_rep_id"]
+    alias_to_rep_id = ctx["alias_to_rep_id"]
+    valid_rep_ids = ctx["valid_rep_ids"]
+    rep_email_hint_by_rep_id = ctx["rep_email_hint_by_rep_id"]
+
+    rep_lookup: Dict[str, Dict] = {}
+    # Seed with canonical user rep records.
+    for rep in reps:
+        rep_id = rep.get("id")
+        if rep_id:
+            rep_id_str = str(rep_id)
+            canonical = alias_to_rep_id.get(rep_id_str, rep_id_str)
+            rep_lookup[canonical] = rep
+            rep_lookup[str(rep_id)] = rep
+        rep_alias = str(rep.get("salesRepId") or rep.get("sales_rep_id") or "").strip()
+        if rep_alias:
+            canonical = alias_to_rep_id.get(rep_alias, rep_alias)
+            rep_lookup[canonical] = rep
+    # Fill in any remaining reps from sales_reps (canonicalized).
+    for rep_id, rep_record in rep_records.items():
+        canonical = alias_to_rep_id.get(rep_id, rep_id)
+        rep_lookup.setdefault(canonical, rep_record)
+
+    summary: List[Dict] = []
+    rep_ids_for_summary = set(valid_rep_ids)
+    rep_ids_for_summary.update({rid for rid in rep_totals.keys() if rid and rid != "__house__"})
+    for rep_id in sorted(rep_ids_for_summary):
+        totals = rep_totals.get(
+            rep_id,
+            {"totalOrders": 0.0, "totalRevenue": 0.0, "wholesaleRevenue": 0.0, "retailRevenue": 0.0},
+        )
+        rep = rep_lookup.get(rep_id) or user_lookup.get(rep_id) or {}
+        rep_record = rep_records.get(rep_id) or {}
+
+        rep_user_id = (
+            rep_user_id_by_rep_id.get(rep_id)
+            or rep_user_id_by_rep_id.get(str(rep_record.get("id") or "").strip())
+            or ""
+        )
+        if not rep_user_id:
+            rep_email_key = _sales_norm_email(rep_record.get("email")) if isinstance(rep_record, dict) else ""
+            if rep_email_key and rep_email_key in users_by_email:
+                rep_user_id = str((users_by_email[rep_email_key] or {}).get("id") or "").strip()
+        if not rep_user_id:
+            canonical_rep_id = alias_to_rep_id.get(rep_id, rep_id)
+            rep_user_id = rep_user_id_by_rep_id.get(canonical_rep_id) or ""
+        if not rep_user_id and rep_id in user_lookup:
+            rep_user_id = rep_id
+        # Prefer the linked user's name if available (sales reps edit their own name there).
+        user_rec = user_lookup.get(rep_user_id) or {}
+        preferred_name = (user_rec.get("name") or "").strip() if isinstance(user_rec, dict) else ""
+        legacy_user = None
+        legacy_id_raw = rep_record.get("legacyUserId") or rep_record.get("legacy_user_id")
+        if legacy_id_raw:
+            legacy_id = str(legacy_id_raw).strip()
+            legacy_user = user_lookup.get(legacy_id) if legacy_id else None
+        legacy_name = (legacy_user.get("name") or "").strip() if isinstance(legacy_user, dict) else ""
+        legacy_email = (legacy_user.get("email") or "").strip() if isinstance(legacy_user, dict) else ""
+        hinted_email = rep_email_hint_by_rep_id.get(rep_id) or rep_email_hint_by_rep_id.get(str(rep_record.get("id") or "")) or ""
+        hinted_user = users_by_email.get(hinted_email) if hinted_email else None
+        hinted_name = (hinted_user.get("name") or "").strip() if isinstance(hinted_user, dict) else ""
+        hinted_user_email = (hinted_user.get("email") or "").strip() if isinstance(hinted_user, dict) else ""
+        preferred_role = _normalize_role(
+            (user_rec.get("role") if isinstance(user_rec, dict) else None)
+            or (legacy_user.get("role") if isinstance(legacy_user, dict) else None)
+            or (hinted_user.get("role") if isinstance(hinted_user, dict) else None)
+            or rep.get("role")
+            or rep_record.get("role")
+            or "sales_rep"
+        ) or "sales_rep"
+        summary.append(
+            {
+                "salesRepId": rep_id,
+                "salesRepUserId": rep_user_id or None,
+                "salesRepName": preferred_name
+                or legacy_name
+                or hinted_name
+                or rep.get("name")
+                or rep_record.get("name")
+                or (f"Sales Rep {rep_id}" if rep_id else "Sales Rep"),
+                # Keep Sales by Rep email strict: only use the sales_rep table value.
+                "salesRepEmail": (
+                    str(rep_record.get("email") or "").strip() or None
+                ),
+                "salesRepPhone": rep.get("phone") or rep_record.get("phone"),
+                "role": preferred_role,
+                "isPartner": _normalize_bool(
+                    rep_record.get("isPartner")
+                    if isinstance(rep_record, dict) and "isPartner" in rep_record
+                    else rep_record.get("is_partner")
+                )
+                if isinstance(rep_record, dict)
+                else _normalize_bool(
+                    rep.get("isPartner") if isinstance(rep, dict) and "isPartner" in rep else rep.get("is_partner")
+                ),
+                "allowedRetail": _normalize_bool(
+                    rep_record.get("allowedRetail")
+                    if isinstance(rep_record, dict) and "allowedRetail" in rep_record
+                    else rep_record.get("allowed_retail")
+                )
+                if isinstance(rep_record, dict)
+                else _normalize_bool(
+                    rep.get("allowedRetail")
+                    if isinstance(rep, dict) and "allowedRetail" in rep
+                    else rep.get("allowed_retail")
+                ),
+                "totalOrders": int(totals["totalOrders"]),
+                "totalRevenue": float(totals["totalRevenue"]),
+                "wholesaleRevenue": float(totals.get("wholesaleRevenue") or 0.0),
+                "retailRevenue": float(totals.get("retailRevenue") or 0.0),
+            }
+        )
+
+    if house_totals["totalOrders"] > 0:
+        summary.append(
+            {
+                "salesRepId": "__house__",
+                "salesRepName": "House / Unassigned",
+                "salesRepEmail": None,
+                "salesRepPhone": None,
+                "totalOrders": int(house_totals["totalOrders"]),
+                "totalRevenue": float(house_totals["totalRevenue"]),
+                "wholesaleRevenue": float(house_totals.get("wholesaleRevenue") or 0.0),
+                "retailRevenue": float(house_totals.get("retailRevenue") or 0.0),
+            }
+        )
+
+    summary.sort(key=lambda r: float(r.get("totalRevenue") or 0), reverse=True)
+    return summary
+
+
+_sales_rep_rollup_context_lock = threading.Lock()
+_sales_rep_rollup_context_cache: Dict[str, object] = {"ctx": None, "expiresAtMs": 0}
+_SALES_REP_ROLLUP_DRAIN_BATCH = 500
+_SALES_REP_ROLLUP_DRAIN_MAX_BATCHES = 20
+_SALES_REP_ROLLUP_REBUILD_WINDOW_DAYS = 31
+
+
+def _sales_rep_rollup_enabled() -> bool:
+    raw = str(os.environ.get("SALES_REP_ROLLUP_ENABLED", "true")).strip().lower()
+    if raw in ("0", "false", "no", "off"):
+        return False
+    try:
+        return sales_rep_rollup_repository.is_enabled()
+    except Exception:
+        return False
+
+
+def _sales_rep_rollup_rebuild_seconds() -> int:
+    raw = str(os.environ.get("SALES_REP_ROLLUP_REBUILD_SECONDS", "21600")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 21600
+    # 0 disables the periodic rebuild; the rollup is then only rebuilt when missing.
+    return max(0, min(value, 7 * 24 * 60 * 60))
+
+
+def _sales_rep_rollup_context_ttl_seconds() -> int:
+    raw = str(os.environ.get("SALES_REP_ROLLUP_CONTEXT_TTL_SECONDS", "60")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 60
+    return max(0, min(value, 60 * 60))
+
+
+def _sales_rep_rollup_context() -> Dict[str, Any]:
+    now_ms = int(time.time() * 1000)
+    with _sales_rep_rollup_context_lock:
+        cached = _sales_rep_rollup_context_cache.get("ctx")
+        if isinstance(cached, dict) and int(_sales_rep_rollup_context_cache.get("expiresAtMs") or 0) > now_ms:
+            return cached
+    ctx = _build_sales_attribution_context()
+    with _sales_rep_rollup_context_lock:
+        _sales_rep_rollup_context_cache["ctx"] = ctx
+        _sales_rep_rollup_context_cache["expiresAtMs"] = now_ms + _sales_rep_rollup_context_ttl_seconds() * 1000
+    return ctx
+
+
+def _sales_period_covers_whole_days(start_dt: datetime, end_dt: datetime, report_tz) -> bool:
+    start_local = start_dt.astimezone(report_tz)
+    end_local = end_dt.astimezone(report_tz)
+    return (start_local.hour, start_local.minute, start_local.second, start_local.microsecond) == (0, 0, 0, 0) and (
+        end_local.hour,
+        end_local.minute,
+        end_local.second,
+        end_local.microsecond,
+    ) == (23, 59, 59, 999999)
+
+
+def _sales_rep_rollup_contribution(order: Dict[str, Any], ctx: Dict[str, Any], report_tz) -> Optional[Dict[str, Any]]:
+    attributed = _attribute_sales_order(order, ctx)
+    if attributed.get("skip"):
+        return None
+    return {
+        "salesRepId": attributed.get("salesRepId"),
+        "day": attributed["createdAt"].astimezone(report_tz).date(),
+        "revenue": _sales_entry_revenue(attributed),
+        "pricingMode": _sales_entry_pricing_mode(attributed),
+    }
+
+
+def _sales_rep_rollup_is_stale(state: Optional[Dict], report_tz) -> bool:
+    if not isinstance(state, dict) or not state.get("builtAt"):
+        return True
+    if state.get("timeZone") != (getattr(report_tz, "key", None) or str(report_tz)):
+        return True
+    max_age = _sales_rep_rollup_rebuild_seconds()
+    if max_age <= 0:
+        return False
+    built_at = _parse_datetime_utc(state.get("builtAt"))
+    if not built_at:
+        return True
+    return (datetime.now(timezone.utc) - built_at).total_seconds() >= max_age
+
+
+def _rebuild_sales_rep_rollup_locked(ctx: Dict[str, Any], report_tz) -> int:
+    # Attribution depends on users, reps and prospects as well as the order, so the
+    # periodic rebuild also picks up reassignments that never touched an order row.
+    started_at = sales_rep_rollup_repository.current_timestamp()
+    contributions: Dict[str, Optional[Dict[str, Any]]] = {}
+    window_end = datetime.now(timezone.utc)
+    window_start = order_repository.earliest_created_at()
+    while window_start is not None and window_start <= window_end:
+        chunk_end = min(window_start + timedelta(days=_SALES_REP_ROLLUP_REBUILD_WINDOW_DAYS), window_end)
+        for order in order_repository.iter_for_commission(window_start, chunk_end):
+            order_id = str((order or {}).get("id") or "").strip()
+            if order_id:
+                contributions[order_id] = _sales_rep_rollup_contribution(order, ctx, report_tz)
+        window_start = chunk_end + timedelta(microseconds=1)
+    count = sales_rep_rollup_repository.replace_all(contributions, started_at=started_at)
+    sales_rep_rollup_repository.set_state(
+        {
+            "builtAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "timeZone": getattr(report_tz, "key", None) or str(report_tz),
+            "orders": count,
+        }
+    )
+    logger.info("[SalesByRep] Rollup rebuilt", extra={"orders": count})
+    return count
+
+
+def _drain_sales_rep_rollup_locked(ctx: Dict[str, Any], report_tz) -> int:
+    applied = 0
+    for _ in range(_SALES_REP_ROLLUP_DRAIN_MAX_BATCHES):
+        pending = sales_rep_rollup_repository.list_dirty_orders(_SALES_REP_ROLLUP_DRAIN_BATCH)
+        if not pending:
+            break
+        order_ids = [entry["orderId"] for entry in pending]
+        orders = order_repository.find_by_ids(order_ids)
+        contributions = {
+            order_id: _sales_rep_rollup_contribution(orders[order_id], ctx, report_tz) if order_id in orders else None
+            for order_id in order_ids
+        }
+        applied += sales_rep_rollup_repository.apply_order_contributions(
+            contributions,
+            queued_at={entry["orderId"]: entry["queuedAt"] for entry in pending},
+        )
+        if len(pending) < _SALES_REP_ROLLUP_DRAIN_BATCH:
+            break
+    return applied
+
+
+def _prepare_sales_rep_rollup(report_tz) -> Optional[Dict[str, Any]]:
+    """
+    Bring the Sales-by-Rep rollup up to date (rebuild when missing or old, then
+    fold in queued order writes) and return the attribution context used to
+    label its rows. Returns None when the rollup cannot serve yet because another
+    worker is rebuilding it; callers then compute from orders.
+    """
+    ctx = _sales_rep_rollup_context()
+    stale = _sales_rep_rollup_is_stale(sales_rep_rollup_repository.get_state(), report_tz)
+    with mysql_client.named_lock(sales_rep_rollup_repository.LOCK_NAME) as acquired:
+        if not acquired:
+            # A fresh rollup is at most one drain behind the worker holding the lock.
+            return None if stale else ctx
+        if stale and _sales_rep_rollup_is_stale(sales_rep_rollup_repository.get_state(), report_tz):
+            _rebuild_sales_rep_rollup_locked(ctx, report_tz)
+        _drain_sales_rep_rollup_locked(ctx, report_tz)
+    return ctx
+
+
+def get_sales_by_rep(
+    exclude_sales_rep_id: Optional[str] = None,
+    period_start: Optional[str] = None,
+    period_end: Optional[str] = None,
+    force: bool = False,
+    debug: bool = False,
+):
+    global _sales_by_rep_summary_inflight
+
+    start_dt, end_dt, period_meta = _resolve_report_period_bounds(period_start, period_end)
+    period_cache_key = f"{period_meta['periodStart']}::{period_meta['periodEnd']}"
+    report_tz = _get_report_timezone()
+    period_start_local_date = start_dt.astimezone(report_tz).date()
+    period_end_local_date = end_dt.astimezone(report_tz).date()
+    now_local = datetime.now(report_tz)
+    current_year_start_local = datetime(now_local.year, 1, 1, 0, 0, 0, 0, tzinfo=report_tz)
+    current_year_start_dt = current_year_start_local.astimezone(timezone.utc)
+    current_year_end_date = date(now_local.year, 12, 31)
+
+    def _local_date_key(value: datetime) -> str:
+        return value.astimezone(report_tz).date().isoformat()
+
+    def _build_cumulative_series(
+        daily_totals: Optional[Dict[str, float]] = None,
+        daily_orders: Optional[Dict[str, int]] = None,
+        *,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        totals = daily_totals or {}
+        orders = daily_orders or {}
+        series: List[Dict[str, Any]] = []
+        running_total = 0.0
+        range_start = start_date or period_start_local_date
+        range_end = end_date or period_end_local_date
+        current_date = range_start
+        while current_date <= range_end:
+            key = current_date.isoformat()
+            daily_revenue = round(float(totals.get(key) or 0.0), 2)
+            running_total = round(running_total + daily_revenue, 2)
+            series.append(
+                {
+                    "date": key,
+                    "dailyRevenue": daily_revenue,
+                    "cumulativeRevenue": running_total,
+                    "orderCount": int(orders.get(key) or 0),
+                }
+            )
+            current_date += timedelta(days=1)
+        return series
+
+    def _build_year_projection(revenue_to_date: float = 0.0, order_count: int = 0) -> Dict[str, Any]:
+        year_start_date = current_year_start_local.date()
+        as_of_date = now_local.date()
+        total_days_in_year = (date(now_local.year + 1, 1, 1) - year_start_date).days
+        days_elapsed = max(1, (as_of_date - year_start_date).days + 1)
+        average_daily_revenue = float(revenue_to_date) / days_elapsed if days_elapsed > 0 else 0.0
+        projected_year_end_revenue = average_daily_revenue * total_days_in_year
+        return {
+            "year": int(now_local.year),
+            "yearStart": year_start_date.isoformat(),
+            "asOfDate": as_of_date.isoformat(),
+            "yearEnd": current_year_end_date.isoformat(),
+            "daysElapsed": int(days_elapsed),
+            "totalDaysInYear": int(total_days_in_year),
+            "orderCount": int(order_count),
+            "revenueToDate": round(float(revenue_to_date), 2),
+            "averageDailyRevenue": round(float(average_daily_revenue), 2),
+            "projectedYearEndRevenue": round(float(projected_year_end_revenue), 2),
+            "timeZone": getattr(report_tz, "key", None) or str(report_tz),
+        }
+
+    def _compute_summary() -> Dict[str, Any]:
+        ctx = _build_sales_attribution_context()
+        reps = ctx["reps"]
+        rep_records_list = ctx["rep_records_list"]
+        valid_rep_ids = ctx["valid_rep_ids"]
 
         tracked_orders: List[Dict[str, object]] = []
         debug_samples: List[Dict[str, object]] = []
-        rep_email_hint_by_rep_id: Dict[str, str] = {}
         debug_counts: Dict[str, int] = {}
         if debug:
             debug_counts = {
@@ -5791,126 +6582,21 @@ def get_sales_by_rep(
         skipped_status = 0
         skipped_refunded = 0
         skipped_outside_period = 0
-        orders_seen = 0
-        tracking_window_start_dt = start_dt if start_dt <= current_year_start_dt else current_year_start_dt
-        tracking_window_end_dt = now_local.astimezone(timezone.utc)
-
-        logger.info(
-            "[SalesByRep] Begin aggregation",
-            extra={
-                "validRepCount": len(valid_rep_ids),
-                "userReps": len(reps),
-                "repoReps": len(rep_records_list),
-                "queryStart": tracking_window_start_dt.isoformat(),
-                "queryEnd": tracking_window_end_dt.isoformat(),
-                "source": "local_orders_sql",
-            },
-        )
-
-        def _normalize_rep_id(value: object) -> str:
-            if value is None:
-                return ""
-            return str(value).strip()
-
-        def _resolve_order_email(order: Dict[str, object]) -> str:
-            for key in (
-                "doctorEmail",
-                "doctor_email",
-                "billingEmail",
-                "billing_email",
-                "customerEmail",
-                "customer_email",
-            ):
-                candidate = order.get(key)
-                if isinstance(candidate, str) and candidate.strip():
-                    return candidate.strip().lower()
-            for address_key in (
-                "billingAddress",
-                "billing",
-                "billing_address",
-                "shippingAddress",
-                "shipping",
-                "shipping_address",
-            ):
-                address = order.get(address_key)
-                if isinstance(address, str):
-                    try:
-                        address = json.loads(address)
-                    except Exception:
-                        address = None
-                if isinstance(address, dict):
-                    email = address.get("email")
-                    if isinstance(email, str) and email.strip():
-                        return email.strip().lower()
-            return ""
-
-        def _resolve_rep_from_email_hint(email_hint: str) -> str:
-            if not email_hint:
-                return ""
-            resolved = rep_id_by_email.get(email_hint) or ""
-            if resolved:
-                return alias_to_rep_id.get(resolved, resolved)
-            return ""
-
-        def _resolve_rep_from_code_hint(code_hint: str) -> str:
-            code = _norm_sales_code(code_hint)
-            if not code:
-                return ""
-            resolved = rep_id_by_sales_code.get(code) or ""
-            if resolved:
-                return alias_to_rep_id.get(resolved, resolved)
-            return ""
-
-        def _resolve_rep_from_initials_hint(initials_hint: str) -> str:
-            initials = str(initials_hint or "").strip().upper()
-            if not initials:
-                return ""
-            resolved = rep_id_by_initials.get(initials) or ""
-            if resolved:
-                return alias_to_rep_id.get(resolved, resolved)
-            return ""
-
-        def _resolve_items_list(order: Dict[str, object]) -> List[Dict[str, object]]:
-            raw = order.get("items")
-            if isinstance(raw, str):
-                try:
-                    raw = json.loads(raw)
-                except Exception:
-                    raw = None
-            if isinstance(raw, list):
-                return [item for item in raw if isinstance(item, dict)]
-            line_items = order.get("lineItems") or order.get("line_items")
-            if isinstance(line_items, list):
-                return [item for item in line_items if isinstance(item, dict)]
-            return []
+        orders_seen = 0
+        tracking_window_start_dt = start_dt if start_dt <= current_year_start_dt else current_year_start_dt
+        tracking_window_end_dt = now_local.astimezone(timezone.utc)
 
-        def _resolve_items_subtotal(order: Dict[str, object], items: List[Dict[str, object]]) -> float:
-            total_from_items = 0.0
-            for item in items:
-                qty = _safe_float(item.get("quantity") or item.get("qty") or 0)
-                if qty <= 0:
-                    continue
-                line_total = _safe_float(
-                    item.get("subtotal")
-                    or item.get("line_total")
-                    or item.get("priceTotal")
-                    or item.get("price_total")
-                    or item.get("total")
-                )
-                if line_total <= 0:
-                    line_total = _safe_float(item.get("price")) * qty
-                total_from_items += max(0.0, line_total)
-            if total_from_items > 0:
-                return total_from_items
-            subtotal = _safe_float(
-                order.get("itemsSubtotal")
-                or order.get("items_subtotal")
-                or order.get("itemsTotal")
-                or order.get("items_total")
-            )
-            if subtotal > 0:
-                return subtotal
-            return 0.0
+        logger.info(
+            "[SalesByRep] Begin aggregation",
+            extra={
+                "validRepCount": len(valid_rep_ids),
+                "userReps": len(reps),
+                "repoReps": len(rep_records_list),
+                "queryStart": tracking_window_start_dt.isoformat(),
+                "queryEnd": tracking_window_end_dt.isoformat(),
+                "source": "local_orders_sql",
+            },
+        )
 
         local_orders = order_repository.list_for_commission(tracking_window_start_dt, tracking_window_end_dt)
         orders_loaded = len(local_orders)
@@ -5938,234 +6624,27 @@ def get_sales_by_rep(
                 skipped_outside_period += 1
                 continue
 
-            meta_data = local_order.get("meta_data") or local_order.get("metaData") or local_order.get("meta") or []
-            if isinstance(meta_data, str):
-                try:
-                    meta_data = json.loads(meta_data)
-                except Exception:
-                    meta_data = []
-            if not isinstance(meta_data, list):
-                meta_data = []
-            if _is_truthy(_meta_value(meta_data, "trufusion_refunded")):
+            attributed = _attribute_sales_order(local_order, ctx, debug_counts=debug_counts if debug else None)
+            if attributed.get("skip") == "meta_refunded":
                 skipped_refunded += 1
                 continue
-
-            order_user_id = str(local_order.get("userId") or local_order.get("user_id") or "").strip()
-            order_user = user_lookup.get(order_user_id) if order_user_id else None
-            order_user_email = _norm_email(order_user.get("email") if isinstance(order_user, dict) else None)
-            billing_email = _resolve_order_email(local_order)
-            attribution_email = billing_email or order_user_email
-            force_house_contact_form = bool(attribution_email and attribution_email in house_contact_form_emails)
-
-            integrations = local_order.get("integrations") or local_order.get("integrationDetails") or {}
-            if isinstance(integrations, str):
-                try:
-                    integrations = json.loads(integrations)
-                except Exception:
-                    integrations = {}
-            if not isinstance(integrations, dict):
-                integrations = {}
-
-            rep_id = _normalize_rep_id(
-                local_order.get("doctorSalesRepId")
-                or local_order.get("salesRepId")
-                or local_order.get("sales_rep_id")
-                or local_order.get("doctor_sales_rep_id")
-            )
-            if not rep_id:
-                rep_id = _normalize_rep_id(
-                    integrations.get("salesRepId")
-                    or integrations.get("sales_rep_id")
-                    or integrations.get("doctorSalesRepId")
-                    or integrations.get("doctor_sales_rep_id")
-                )
-            rep_email_hint = _norm_email(
-                local_order.get("salesRepEmail")
-                or local_order.get("sales_rep_email")
-                or local_order.get("doctorSalesRepEmail")
-                or local_order.get("doctor_sales_rep_email")
-                or integrations.get("salesRepEmail")
-                or integrations.get("sales_rep_email")
-                or integrations.get("doctorSalesRepEmail")
-                or integrations.get("doctor_sales_rep_email")
-            )
-            rep_code_hint = str(
-                local_order.get("salesRepCode")
-                or local_order.get("sales_rep_code")
-                or local_order.get("doctorSalesRepCode")
-                or local_order.get("doctor_sales_rep_code")
-                or integrations.get("salesRepCode")
-                or integrations.get("sales_rep_code")
-                or integrations.get("doctorSalesRepCode")
-                or integrations.get("doctor_sales_rep_code")
-                or ""
-            ).strip()
-            rep_initials_hint = str(
-                local_order.get("salesRepInitials")
-                or local_order.get("sales_rep_initials")
-                or local_order.get("doctorSalesRepInitials")
-                or local_order.get("doctor_sales_rep_initials")
-                or integrations.get("salesRepInitials")
-                or integrations.get("sales_rep_initials")
-                or integrations.get("doctorSalesRepInitials")
-                or integrations.get("doctor_sales_rep_initials")
-                or ""
-            ).strip()
-
-            meta_rep_id = _normalize_rep_id(
-                _meta_value(meta_data, "trufusion_sales_rep_id")
-                or _meta_value(meta_data, "sales_rep_id")
-                or _meta_value(meta_data, "salesRepId")
-                or _meta_value(meta_data, "doctor_sales_rep_id")
-                or _meta_value(meta_data, "doctorSalesRepId")
-            )
-            meta_rep_email = _norm_email(
-                _meta_value(meta_data, "trufusion_sales_rep_email")
-                or _meta_value(meta_data, "sales_rep_email")
-                or _meta_value(meta_data, "salesRepEmail")
-                or _meta_value(meta_data, "doctor_sales_rep_email")
-                or _meta_value(meta_data, "doctorSalesRepEmail")
-            )
-            meta_rep_code = str(
-                _meta_value(meta_data, "trufusion_sales_rep_code")
-                or _meta_value(meta_data, "sales_rep_code")
-                or _meta_value(meta_data, "salesRepCode")
-                or _meta_value(meta_data, "doctor_sales_rep_code")
-                or _meta_value(meta_data, "doctorSalesRepCode")
-                or ""
-            ).strip()
-            meta_rep_initials = str(
-                _meta_value(meta_data, "sales_rep_initials")
-                or _meta_value(meta_data, "salesRepInitials")
-                or _meta_value(meta_data, "doctor_sales_rep_initials")
-                or _meta_value(meta_data, "doctorSalesRepInitials")
-                or ""
-            ).strip()
-
-            if not rep_id and meta_rep_id:
-                rep_id = meta_rep_id
-                if debug:
-                    debug_counts["metaRepId"] += 1
-            if not rep_email_hint and meta_rep_email:
-                rep_email_hint = meta_rep_email
-            if not rep_code_hint and meta_rep_code:
-                rep_code_hint = meta_rep_code
-            if not rep_initials_hint and meta_rep_initials:
-                rep_initials_hint = meta_rep_initials
-
-            rep_id_raw = rep_id
-            if rep_id:
-                rep_id_candidate = rep_id_raw
-                if rep_email_hint:
-                    canonical_by_email = rep_id_by_email.get(rep_email_hint) or ""
-                    if canonical_by_email:
-                        rep_id_candidate = str(canonical_by_email).strip()
-                rep_id = _canonicalize_known_rep_id(rep_id_candidate)
-                if rep_id and rep_email_hint:
-                    rep_email_hint_by_rep_id[rep_id_raw] = rep_email_hint
-                    rep_email_hint_by_rep_id[rep_id] = rep_email_hint
-
-            if not rep_id and rep_email_hint:
-                rep_id = _resolve_rep_from_email_hint(rep_email_hint)
-                if rep_id and debug and rep_email_hint == meta_rep_email:
-                    debug_counts["metaRepEmail"] += 1
-            if not rep_id and rep_code_hint:
-                rep_id = _resolve_rep_from_code_hint(rep_code_hint)
-                if rep_id and debug:
-                    debug_counts["metaRepCode"] += 1
-            if not rep_id and rep_initials_hint:
-                rep_id = _resolve_rep_from_initials_hint(rep_initials_hint)
-
-            if not rep_id and attribution_email:
-                rep_id = _resolve_rep_from_email_hint(attribution_email)
-                if rep_id and debug:
-                    debug_counts["billingEmailIsRep"] += 1
-
-            if not rep_id and (attribution_email or order_user_id):
-                user_match = users_by_email.get(attribution_email) if attribution_email else None
-                if not user_match and order_user_id:
-                    user_match = user_lookup.get(order_user_id)
-                if user_match:
-                    rep_id = _canonicalize_known_rep_id(user_match.get("salesRepId") or user_match.get("sales_rep_id"))
-                    if rep_id and debug:
-                        debug_counts["userSalesRepId"] += 1
-                    if not rep_id and user_match.get("id"):
-                        rep_id = str(prospect_rep_by_doctor.get(str(user_match.get("id")), "") or "").strip()
-                        if rep_id and debug:
-                            debug_counts["prospectDoctorId"] += 1
-                    if not rep_id and _normalize_role(user_match.get("role")) in rep_like_roles:
-                        rep_id = _canonicalize_known_rep_id(user_match.get("id"))
-                        if rep_id and debug:
-                            debug_counts["userIsRep"] += 1
-
-            if not rep_id:
-                doctor = doctors_by_email.get(attribution_email) if attribution_email else None
-                if doctor is None and isinstance(order_user, dict) and _normalize_role(order_user.get("role")) in (
-                    "doctor",
-                    "test_doctor",
-                ):
-                    doctor = order_user
-                rep_id = (
-                    _canonicalize_known_rep_id((doctor or {}).get("salesRepId") or (doctor or {}).get("sales_rep_id"))
-                    if doctor
-                    else ""
-                )
-                if rep_id and debug:
-                    debug_counts["doctorSalesRepId"] += 1
-                if not rep_id and doctor and doctor.get("id"):
-                    rep_id = str(prospect_rep_by_doctor.get(str(doctor.get("id")), "") or "").strip()
-                    if rep_id and debug:
-                        debug_counts["prospectDoctorId"] += 1
-
-            if not rep_id and attribution_email:
-                rep_id = str(prospect_rep_by_email.get(attribution_email, "") or "").strip()
-                if rep_id and debug:
-                    debug_counts["prospectEmail"] += 1
-
-            if str(rep_id or "").strip().lower() == "house":
-                rep_id = "__house__"
-
-            items = _resolve_items_list(local_order)
-            subtotal = _resolve_items_subtotal(local_order, items)
-            total = _safe_float(
-                local_order.get("total")
-                or local_order.get("grandTotal")
-                or local_order.get("grand_total")
-            )
-            pricing_mode_hint = (
-                local_order.get("pricingMode")
-                or local_order.get("pricing_mode")
-                or integrations.get("pricingMode")
-                or integrations.get("pricing_mode")
-                or _meta_value(meta_data, "trufusion_pricing_mode")
-                or _meta_value(meta_data, "trufusion_pricingMode")
-                or _meta_value(meta_data, "pricing_mode")
-                or _meta_value(meta_data, "pricingMode")
-            )
-
-            tracked_rep_id = rep_id
+            tracked_rep_id = str(attributed.get("salesRepId") or "").strip()
             if tracked_rep_id and tracked_rep_id != "__house__":
                 counted_rep += 1
             else:
-                if not tracked_rep_id:
+                if attributed.get("unattributed"):
                     skipped_unattributed += 1
-                    if force_house_contact_form:
-                        tracked_rep_id = "__house__"
-                if tracked_rep_id != "__house__":
-                    tracked_rep_id = "__house__"
-                if debug:
-                    debug_counts["fallbackHouse"] += 1
                 counted_house += 1
 
             tracked_orders.append(
                 {
                     "salesRepId": tracked_rep_id,
-                    "itemsSubtotal": subtotal,
-                    "total": total,
-                    "wooId": local_order.get("wooOrderId"),
-                    "wooNumber": local_order.get("wooOrderNumber") or local_order.get("number"),
-                    "orderId": local_order.get("id"),
-                    "pricingModeHint": pricing_mode_hint,
+                    "itemsSubtotal": attributed.get("itemsSubtotal"),
+                    "total": attributed.get("total"),
+                    "wooId": attributed.get("wooId"),
+                    "wooNumber": attributed.get("wooNumber"),
+                    "orderId": attributed.get("orderId"),
+                    "pricingModeHint": attributed.get("pricingModeHint"),
                     "createdAt": created_at.isoformat(),
                     "includeInReport": in_report_period,
                     "includeInYtd": in_ytd_period,
@@ -6180,27 +6659,17 @@ def get_sales_by_rep(
                         "wooNumber": local_order.get("wooOrderNumber") or local_order.get("number"),
                         "status": status,
                         "repId": tracked_rep_id or None,
-                        "metaRepId": meta_rep_id or None,
-                        "metaRepEmail": meta_rep_email or None,
-                        "billingEmail": billing_email or None,
-                        "total": total,
-                        "itemsSubtotal": subtotal,
-                        "pricingModeHint": pricing_mode_hint,
+                        "metaRepId": attributed.get("metaRepId") or None,
+                        "metaRepEmail": attributed.get("metaRepEmail") or None,
+                        "billingEmail": attributed.get("billingEmail") or None,
+                        "total": attributed.get("total"),
+                        "itemsSubtotal": attributed.get("itemsSubtotal"),
+                        "pricingModeHint": attributed.get("pricingModeHint"),
                     }
                 )
 
             orders_seen += 1
 
-        def _resolve_pricing_mode(entry: Dict[str, object]) -> str:
-            hint = str(entry.get("pricingModeHint") or "").strip().lower()
-            return "retail" if hint == "retail" else "wholesale"
-
-        def _resolve_order_subtotal(entry: Dict[str, object]) -> float:
-            subtotal = _safe_float(entry.get("itemsSubtotal"))
-            if subtotal > 0:
-                return subtotal
-            return _safe_float(entry.get("total"))
-
         rep_totals: Dict[str, Dict[str, float]] = {}
         house_totals = {"totalOrders": 0.0, "totalRevenue": 0.0, "wholesaleRevenue": 0.0, "retailRevenue": 0.0}
         performance_daily_totals: Dict[str, float] = {}
@@ -6212,11 +6681,11 @@ def get_sales_by_rep(
 
         for entry in tracked_orders:
             rep_id = str(entry.get("salesRepId") or "").strip()
-            total = _resolve_order_subtotal(entry)
-            pricing_mode = _resolve_pricing_mode(entry)
+            total = _sales_entry_revenue(entry)
+            pricing_mode = _sales_entry_pricing_mode(entry)
             created_at = _parse_datetime_utc(entry.get("createdAt"))
-            include_in_report = _is_truthy(entry.get("includeInReport"))
-            include_in_ytd = _is_truthy(entry.get("includeInYtd"))
+            include_in_report = _sales_is_truthy(entry.get("includeInReport"))
+            include_in_ytd = _sales_is_truthy(entry.get("includeInYtd"))
             local_date_key = _local_date_key(created_at) if created_at else None
 
             if include_in_report:
@@ -6266,129 +6735,7 @@ def get_sales_by_rep(
                         ytd_daily_orders.get(local_date_key) or 0
                     ) + 1
 
-        rep_lookup: Dict[str, Dict] = {}
-        # Seed with canonical user rep records.
-        for rep in reps:
-            rep_id = rep.get("id")
-            if rep_id:
-                rep_id_str = str(rep_id)
-                canonical = alias_to_rep_id.get(rep_id_str, rep_id_str)
-                rep_lookup[canonical] = rep
-                rep_lookup[str(rep_id)] = rep
-            rep_alias = str(rep.get("salesRepId") or rep.get("sales_rep_id") or "").strip()
-            if rep_alias:
-                canonical = alias_to_rep_id.get(rep_alias, rep_alias)
-                rep_lookup[canonical] = rep
-        # Fill in any remaining reps from sales_reps (canonicalized).
-        for rep_id, rep_record in rep_records.items():
-            canonical = alias_to_rep_id.get(rep_id, rep_id)
-            rep_lookup.setdefault(canonical, rep_record)
-
-        summary: List[Dict] = []
-        rep_ids_for_summary = set(valid_rep_ids)
-        rep_ids_for_summary.update({rid for rid in rep_totals.keys() if rid and rid != "__house__"})
-        for rep_id in sorted(rep_ids_for_summary):
-            totals = rep_totals.get(
-                rep_id,
-                {"totalOrders": 0.0, "totalRevenue": 0.0, "wholesaleRevenue": 0.0, "retailRevenue": 0.0},
-            )
-            rep = rep_lookup.get(rep_id) or user_lookup.get(rep_id) or {}
-            rep_record = rep_records.get(rep_id) or {}
-
-            rep_user_id = (
-                rep_user_id_by_rep_id.get(rep_id)
-                or rep_user_id_by_rep_id.get(str(rep_record.get("id") or "").strip())
-                or ""
-            )
-            if not rep_user_id:
-                rep_email_key = _norm_email(rep_record.get("email")) if isinstance(rep_record, dict) else ""
-                if rep_email_key and rep_email_key in users_by_email:
-                    rep_user_id = str((users_by_email[rep_email_key] or {}).get("id") or "").strip()
-            if not rep_user_id:
-                canonical_rep_id = alias_to_rep_id.get(rep_id, rep_id)
-                rep_user_id = rep_user_id_by_rep_id.get(canonical_rep_id) or ""
-            if not rep_user_id and rep_id in user_lookup:
-                rep_user_id = rep_id
-            # Prefer the linked user's name if available (sales reps edit their own name there).
-            user_rec = user_lookup.get(rep_user_id) or {}
-            preferred_name = (user_rec.get("name") or "").strip() if isinstance(user_rec, dict) else ""
-            legacy_user = None
-            legacy_id_raw = rep_record.get("legacyUserId") or rep_record.get("legacy_user_id")
-            if legacy_id_raw:
-                legacy_id = str(legacy_id_raw).strip()
-                legacy_user = user_lookup.get(legacy_id) if legacy_id else None
-            legacy_name = (legacy_user.get("name") or "").strip() if isinstance(legacy_user, dict) else ""
-            legacy_email = (legacy_user.get("email") or "").strip() if isinstance(legacy_user, dict) else ""
-            hinted_email = rep_email_hint_by_rep_id.get(rep_id) or rep_email_hint_by_rep_id.get(str(rep_record.get("id") or "")) or ""
-            hinted_user = users_by_email.get(hinted_email) if hinted_email else None
-            hinted_name = (hinted_user.get("name") or "").strip() if isinstance(hinted_user, dict) else ""
-            hinted_user_email = (hinted_user.get("email") or "").strip() if isinstance(hinted_user, dict) else ""
-            preferred_role = _normalize_role(
-                (user_rec.get("role") if isinstance(user_rec, dict) else None)
-                or (legacy_user.get("role") if isinstance(legacy_user, dict) else None)
-                or (hinted_user.get("role") if isinstance(hinted_user, dict) else None)
-                or rep.get("role")
-                or rep_record.get("role")
-                or "sales_rep"
-            ) or "sales_rep"
-            summary.append(
-                {
-                    "salesRepId": rep_id,
-                    "salesRepUserId": rep_user_id or None,
-                    "salesRepName": preferred_name
-                    or legacy_name
-                    or hinted_name
-                    or rep.get("name")
-                    or rep_record.get("name")
-                    or (f"Sales Rep {rep_id}" if rep_id else "Sales Rep"),
-                    # Keep Sales by Rep email strict: only use the sales_rep table value.
-                    "salesRepEmail": (
-                        str(rep_record.get("email") or "").strip() or None
-                    ),
-                    "salesRepPhone": rep.get("phone") or rep_record.get("phone"),
-                    "role": preferred_role,
-                    "isPartner": _normalize_bool(
-                        rep_record.get("isPartner")
-                        if isinstance(rep_record, dict) and "isPartner" in rep_record
-                        else rep_record.get("is_partner")
-                    )
-                    if isinstance(rep_record, dict)
-                    else _normalize_bool(
-                        rep.get("isPartner") if isinstance(rep, dict) and "isPartner" in rep else rep.get("is_partner")
-                    ),
-                    "allowedRetail": _normalize_bool(
-                        rep_record.get("allowedRetail")
-                        if isinstance(rep_record, dict) and "allowedRetail" in rep_record
-                        else rep_record.get("allowed_retail")
-                    )
-                    if isinstance(rep_record, dict)
-                    else _normalize_bool(
-                        rep.get("allowedRetail")
-                        if isinstance(rep, dict) and "allowedRetail" in rep
-                        else rep.get("allowed_retail")
-                    ),
-                    "totalOrders": int(totals["totalOrders"]),
-                    "totalRevenue": float(totals["totalRevenue"]),
-                    "wholesaleRevenue": float(totals.get("wholesaleRevenue") or 0.0),
-                    "retailRevenue": float(totals.get("retailRevenue") or 0.0),
-                }
-            )
-
-        if house_totals["totalOrders"] > 0:
-            summary.append(
-                {
-                    "salesRepId": "__house__",
-                    "salesRepName": "House / Unassigned",
-                    "salesRepEmail": None,
-                    "salesRepPhone": None,
-                    "totalOrders": int(house_totals["totalOrders"]),
-                    "totalRevenue": float(house_totals["totalRevenue"]),
-                    "wholesaleRevenue": float(house_totals.get("wholesaleRevenue") or 0.0),
-                    "retailRevenue": float(house_totals.get("retailRevenue") or 0.0),
-                }
-            )
-
-        summary.sort(key=lambda r: float(r.get("totalRevenue") or 0), reverse=True)
+        summary = _build_sales_by_rep_rows(ctx, rep_totals, house_totals)
         totals_all = {
             "totalOrders": int(sum(int(r.get("totalOrders") or 0) for r in summary)),
             "totalRevenue": float(sum(float(r.get("totalRevenue") or 0) for r in summary)),
@@ -6451,6 +6798,92 @@ def get_sales_by_rep(
             payload["debug"] = {"counts": debug_counts, "samples": debug_samples}
         return payload
 
+    def _compute_summary_from_rollup() -> Optional[Dict[str, Any]]:
+        ctx = _prepare_sales_rep_rollup(report_tz)
+        if ctx is None:
+            return None
+        today_local = now_local.date()
+        year_start_local_date = current_year_start_local.date()
+        report_last_day = min(period_end_local_date, today_local)
+        daily_rows = sales_rep_rollup_repository.list_daily(min(period_start_local_date, year_start_local_date), today_local)
+
+        rep_totals: Dict[str, Dict[str, float]] = {}
+        house_totals = {"totalOrders": 0.0, "totalRevenue": 0.0, "wholesaleRevenue": 0.0, "retailRevenue": 0.0}
+        performance_daily_totals: Dict[str, float] = {}
+        performance_daily_orders: Dict[str, int] = {}
+        ytd_daily_totals: Dict[str, float] = {}
+        ytd_daily_orders: Dict[str, int] = {}
+        ytd_revenue_total = 0.0
+        ytd_order_count = 0
+
+        for row in daily_rows:
+            day = row["day"]
+            rep_id = str(row.get("salesRepId") or "").strip()
+            order_count = int(row.get("orderCount") or 0)
+            revenue = float(row.get("revenue") or 0.0)
+            local_date_key = day.isoformat()
+
+            if period_start_local_date <= day <= report_last_day:
+                current = house_totals if rep_id == "__house__" else rep_totals.setdefault(
+                    rep_id,
+                    {"totalOrders": 0.0, "totalRevenue": 0.0, "wholesaleRevenue": 0.0, "retailRevenue": 0.0},
+                )
+                current["totalOrders"] += float(order_count)
+                current["totalRevenue"] += revenue
+                current["wholesaleRevenue"] += float(row.get("wholesaleRevenue") or 0.0)
+                current["retailRevenue"] += float(row.get("retailRevenue") or 0.0)
+                performance_daily_totals[local_date_key] = round(
+                    float(performance_daily_totals.get(local_date_key) or 0.0) + revenue,
+                    2,
+                )
+                performance_daily_orders[local_date_key] = int(performance_daily_orders.get(local_date_key) or 0) + order_count
+
+            if year_start_local_date <= day <= today_local:
+                ytd_revenue_total = round(ytd_revenue_total + revenue, 2)
+                ytd_order_count += order_count
+                ytd_daily_totals[local_date_key] = round(float(ytd_daily_totals.get(local_date_key) or 0.0) + revenue, 2)
+                ytd_daily_orders[local_date_key] = int(ytd_daily_orders.get(local_date_key) or 0) + order_count
+
+        summary = _build_sales_by_rep_rows(ctx, rep_totals, house_totals)
+        totals_all = {
+            "totalOrders": int(sum(int(r.get("totalOrders") or 0) for r in summary)),
+            "totalRevenue": float(sum(float(r.get("totalRevenue") or 0) for r in summary)),
+            "wholesaleRevenue": float(sum(float(r.get("wholesaleRevenue") or 0) for r in summary)),
+            "retailRevenue": float(sum(float(r.get("retailRevenue") or 0) for r in summary)),
+        }
+        performance_series = _build_cumulative_series(
+            daily_totals=performance_daily_totals,
+            daily_orders=performance_daily_orders,
+        )
+        year_performance_series = _build_cumulative_series(
+            daily_totals=ytd_daily_totals,
+            daily_orders=ytd_daily_orders,
+            start_date=year_start_local_date,
+            end_date=today_local,
+        )
+        year_projection = _build_year_projection(
+            revenue_to_date=ytd_revenue_total,
+            order_count=ytd_order_count,
+        )
+        logger.info(
+            "[SalesByRep] Summary computed",
+            extra={
+                "rows": len(summary),
+                "rollupRows": len(daily_rows),
+                "source": "sales_rep_daily_rollup",
+                "periodStart": period_meta["periodStart"],
+                "periodEnd": period_meta["periodEnd"],
+            },
+        )
+        return {
+            "orders": summary,
+            "totals": totals_all,
+            "performanceSeries": performance_series,
+            "yearPerformanceSeries": year_performance_series,
+            "yearProjection": year_projection,
+            **period_meta,
+        }
+
     now_ms = int(time.time() * 1000)
     cached = None
     inflight_event = None
@@ -6510,34 +6943,58 @@ def get_sales_by_rep(
             "error": "Sales summary is temporarily unavailable.",
         }
 
+    # Another worker may already have computed (or be computing) this period.
+    flight = shared_cache.begin(
+        shared_cache.NAMESPACE_SALES_BY_REP_SUMMARY,
+        period_cache_key,
+        ttl_seconds=_SALES_BY_REP_SUMMARY_TTL_SECONDS,
+        force=force,
+    )
     try:
-        summary = _compute_summary()
+        summary = flight.value if isinstance(flight.value, dict) else None
+        computed = summary is None
+        if (
+            summary is None
+            and not force
+            and not debug
+            and _sales_rep_rollup_enabled()
+            and _sales_period_covers_whole_days(start_dt, end_dt, report_tz)
+        ):
+            try:
+                summary = _compute_summary_from_rollup()
+            except Exception:
+                logger.warning("[SalesByRep] Rollup read failed; computing from orders", exc_info=True)
+                summary = None
+        if summary is None:
+            summary = _compute_summary()
         now_ms = int(time.time() * 1000)
         with _sales_by_rep_summary_lock:
             _sales_by_rep_summary_cache["data"] = summary
             _sales_by_rep_summary_cache["key"] = period_cache_key
             _sales_by_rep_summary_cache["fetchedAtMs"] = now_ms
             _sales_by_rep_summary_cache["expiresAtMs"] = now_ms + (_SALES_BY_REP_SUMMARY_TTL_SECONDS * 1000)
-        # Best-effort persistence for admins (optional columns).
-        for row in summary.get("orders") if isinstance(summary, dict) else []:
-            rep_id = row.get("salesRepId")
-            if not rep_id or rep_id == "__house__":
-                continue
-            try:
-                target_id = str(rep_id)
-                record = sales_rep_repository.find_by_id(target_id)
-                if not record:
-                    email = row.get("salesRepEmail")
-                    if isinstance(email, str) and email.strip():
-                        record = sales_rep_repository.find_by_email(email)
-                        if record and record.get("id"):
-                            target_id = str(record.get("id"))
-                sales_rep_repository.update_revenue_summary(
-                    target_id,
-                    float(row.get("totalRevenue") or 0),
-                )
-            except Exception:
-                continue
+        if computed:
+            flight.publish(summary)
+            # Best-effort persistence for admins (optional columns).
+            for row in summary.get("orders") if isinstance(summary, dict) else []:
+                rep_id = row.get("salesRepId")
+                if not rep_id or rep_id == "__house__":
+                    continue
+                try:
+                    target_id = str(rep_id)
+                    record = sales_rep_repository.find_by_id(target_id)
+                    if not record:
+                        email = row.get("salesRepEmail")
+                        if isinstance(email, str) and email.strip():
+                            record = sales_rep_repository.find_by_email(email)
+                            if record and record.get("id"):
+                                target_id = str(record.get("id"))
+                    sales_rep_repository.update_revenue_summary(
+                        target_id,
+                        float(row.get("totalRevenue") or 0),
+                    )
+                except Exception:
+                    continue
         if exclude_sales_rep_id:
             exclude_id = str(exclude_sales_rep_id)
             rows = summary.get("orders") if isinstance(summary, dict) else []
@@ -6585,6 +7042,7 @@ def get_sales_by_rep(
             "error": "Sales summary is temporarily unavailable.",
         }
     finally:
+        flight.release()
         with _sales_by_rep_summary_lock:
             if _sales_by_rep_summary_inflight is not None:
                 try:
@@ -6593,7 +7051,6 @@ def get_sales_by_rep(
                     pass
             _sales_by_rep_summary_inflight = None
 
-
 def get_taxes_by_state_for_admin(*, period_start: Optional[str] = None, period_end: Optional[str] = None) -> Dict:
     """
     Aggregate taxes by destination state for the given period.
@@ -6642,7 +7099,20 @@ def get_taxes_by_state_for_admin(*, period_start: Optional[str] = None, period_e
                 return {**cached, "stale": True}
         return {"rows": [], "totals": {"orderCount": 0, "taxTotal": 0.0}, **period_meta, "stale": True}
 
+    flight = shared_cache.begin(
+        shared_cache.NAMESPACE_ADMIN_TAXES_BY_STATE,
+        period_cache_key,
+        ttl_seconds=_ADMIN_TAXES_BY_STATE_TTL_SECONDS,
+    )
     try:
+        if isinstance(flight.value, dict):
+            now_ms = int(time.time() * 1000)
+            with _admin_taxes_by_state_lock:
+                _admin_taxes_by_state_cache["data"] = flight.value
+                _admin_taxes_by_state_cache["key"] = period_cache_key
+                _admin_taxes_by_state_cache["expiresAtMs"] = now_ms + (_ADMIN_TAXES_BY_STATE_TTL_SECONDS * 1000)
+            return flight.value
+
         bucket: Dict[str, Dict[str, float]] = {}
         order_lines: List[Dict[str, object]] = []
         order_count = 0
@@ -6718,6 +7188,7 @@ def get_taxes_by_state_for_admin(*, period_start: Optional[str] = None, period_e
             _admin_taxes_by_state_cache["data"] = result
             _admin_taxes_by_state_cache["key"] = period_cache_key
             _admin_taxes_by_state_cache["expiresAtMs"] = now_ms + (_ADMIN_TAXES_BY_STATE_TTL_SECONDS * 1000)
+        flight.publish(result)
         return result
     except Exception as exc:
         # Serve stale cached data if available; otherwise return a stable payload instead of a 503.
@@ -6739,6 +7210,7 @@ def get_taxes_by_state_for_admin(*, period_start: Optional[str] = None, period_e
             "error": "Taxes-by-state report is temporarily unavailable.",
         }
     finally:
+        flight.release()
         with _admin_taxes_by_state_lock:
             if _admin_taxes_by_state_inflight is not None:
                 try:
@@ -6821,8 +7293,21 @@ def get_products_and_commission_for_admin(*, period_start: Optional[str] = None,
                 return {**cached, "stale": True}
         return {"products": [], "commissions": [], "totals": {}, **period_meta, "stale": True}
 
+    flight = shared_cache.begin(
+        shared_cache.NAMESPACE_ADMIN_PRODUCTS_COMMISSION,
+        period_cache_key,
+        ttl_seconds=_ADMIN_PRODUCTS_COMMISSION_TTL_SECONDS,
+    )
     try:
-        users = user_repository.get_all()
+        if isinstance(flight.value, dict):
+            now_ms = int(time.time() * 1000)
+            with _admin_products_commission_lock:
+                _admin_products_commission_cache["data"] = flight.value
+                _admin_products_commission_cache["key"] = period_cache_key
+                _admin_products_commission_cache["expiresAtMs"] = now_ms + (_ADMIN_PRODUCTS_COMMISSION_TTL_SECONDS * 1000)
+            return flight.value
+
+        users = user_repository.list_lookup_users(include_dev_commission=True)
         rep_like_roles = {"sales_rep", "sales_partner", "rep", "sales_lead", "saleslead"}
         admins = [u for u in users if _normalize_role(u.get("role")) == "admin"]
         reps = [u for u in users if _normalize_role(u.get("role")) in rep_like_roles]
@@ -6953,6 +7438,10 @@ def get_products_and_commission_for_admin(*, period_start: Optional[str] = None,
             if rep_initials:
                 rep_canonical_by_initials.setdefault(rep_initials, canonical)
 
+        users_by_id: Dict[str, Dict] = {}
+        for u in users:
+            users_by_id.setdefault(str(u.get("id") or ""), u)
+
         doctors_by_email = {}
         for u in users:
             if (u.get("role") or "").lower() not in ("doctor", "test_doctor"):
@@ -7206,7 +7695,7 @@ def get_products_and_commission_for_admin(*, period_start: Optional[str] = None,
                 continue
 
             order_user_id = str(local_order.get("userId") or local_order.get("user_id") or "").strip()
-            order_user = next((u for u in users if str(u.get("id") or "") == order_user_id), None)
+            order_user = users_by_id.get(order_user_id)
             order_role = _normalize_role(order_user.get("role") if isinstance(order_user, dict) else None)
 
             billing_email = _resolve_order_email(local_order)
@@ -7779,6 +8268,7 @@ def get_products_and_commission_for_admin(*, period_start: Optional[str] = None,
             _admin_products_commission_cache["data"] = result
             _admin_products_commission_cache["key"] = period_cache_key
             _admin_products_commission_cache["expiresAtMs"] = now_ms + (_ADMIN_PRODUCTS_COMMISSION_TTL_SECONDS * 1000)
+        flight.publish(result)
         return result
     except Exception as exc:
         with _admin_products_commission_lock:
@@ -7804,6 +8294,7 @@ def get_products_and_commission_for_admin(*, period_start: Optional[str] = None,
             "error": "Product sales commission report is temporarily unavailable.",
         }
     finally:
+        flight.release()
         with _admin_products_commission_lock:
             if _admin_products_commission_inflight is not None:
                 try:
@@ -1,16 +1,162 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
+import socket
+import sqlite3
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from ..utils import worker_signals
+from . import get_config
+
+logger = logging.getLogger(__name__)
 
 _LOCK = threading.Lock()
 _CONDITION = threading.Condition(_LOCK)
 _PRESENCE: Dict[str, Dict[str, object]] = {}
 _REVISION = 0
 
+# Shared presence across gunicorn workers. With the sqlite backend the
+# `presence` table in a local WAL-mode SQLite file is the source of truth and
+# its revision counter is the one handed to long-poll clients, so any worker
+# can answer a poll that started on another. `_PRESENCE` is this worker's
+# mirror: when the shared revision moves it re-reads only the rows written
+# after the revision it last saw (removals are kept as `null` tombstones until
+# `_TOMBSTONE_KEEP` revisions later). Writers signal waiting workers over unix
+# datagram sockets (`utils.worker_signals`, shared with resource versions); a
+# short re-check interval is the safety net for lost signals.
+#
+# USER_PRESENCE_BACKEND:
+#   auto   - sqlite when more than one worker is configured, else memory
+#   sqlite - always share through USER_PRESENCE_SHARED_PATH
+#   memory - process-local only
+_SHARED_CONNECTION: Optional[sqlite3.Connection] = None
+_SHARED_KEY: Optional[tuple[int, str]] = None
+_SHARED_SEEN = -1
+_SHARED_RECHECK_SECONDS = 1.0
+_TOMBSTONE_KEEP = 1000
+_SIGNAL_SOCKET_NAME = "presence"
+_LISTENER_LOCK = threading.Lock()
+_LISTENER_PID: Optional[int] = None
+
+
+def _configured_workers() -> int:
+    for key in ("WEB_CONCURRENCY", "GUNICORN_WORKERS", "PASSENGER_APP_POOL_SIZE"):
+        value = str(os.environ.get(key) or "").strip()
+        if value.isdigit():
+            return int(value)
+    return 1
+
+
+def _data_dir() -> Optional[Path]:
+    try:
+        return Path(get_config().data_dir)
+    except Exception:
+        return None
+
+
+def _shared_path() -> Optional[Path]:
+    backend = str(os.environ.get("USER_PRESENCE_BACKEND", "auto")).strip().lower()
+    if backend not in ("sqlite", "auto") or (backend == "auto" and _configured_workers() <= 1):
+        return None
+    explicit = str(os.environ.get("USER_PRESENCE_SHARED_PATH") or "").strip()
+    if explicit:
+        return Path(explicit)
+    data_dir = _data_dir()
+    return data_dir / "presence.sqlite3" if data_dir is not None else None
+
+
+def _signal_dir() -> Optional[Path]:
+    path = _shared_path()
+    return path.parent / ".presence-signals" if path is not None else None
+
+
+def _shared_connection_locked() -> Optional[sqlite3.Connection]:
+    global _SHARED_CONNECTION, _SHARED_KEY, _SHARED_SEEN
+    path = _shared_path()
+    if path is None:
+        return None
+    key = (os.getpid(), str(path))
+    if _SHARED_CONNECTION is not None and _SHARED_KEY == key:
+        return _SHARED_CONNECTION
+    # New process (after fork) or new location: never reuse an inherited handle.
+    _SHARED_CONNECTION = None
+    _SHARED_SEEN = -1
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS presence ("
+            "user_id TEXT PRIMARY KEY, entry TEXT NOT NULL, heartbeat_at REAL, revision INTEGER NOT NULL DEFAULT 0)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS presence_meta ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), revision INTEGER NOT NULL, tombstone_floor INTEGER NOT NULL DEFAULT 0)"
+        )
+        # Files created before incremental reloads lack the revision columns.
+        _add_missing_column(connection, "presence", "revision", "INTEGER NOT NULL DEFAULT 0")
+        _add_missing_column(connection, "presence_meta", "tombstone_floor", "INTEGER NOT NULL DEFAULT 0")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_presence_revision ON presence (revision)")
+        connection.execute("INSERT OR IGNORE INTO presence_meta (id, revision) VALUES (1, 0)")
+    except Exception:
+        logger.warning("Shared presence store unavailable at %s; using process memory", path, exc_info=True)
+        return None
+    _SHARED_CONNECTION = connection
+    _SHARED_KEY = key
+    return connection
+
+
+def _add_missing_column(connection: sqlite3.Connection, table: str, column: str, definition: str) -> None:
+    columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _shared_sync_locked(connection: sqlite3.Connection) -> None:
+    """Apply the rows other workers wrote since the revision this mirror last saw."""
+    global _REVISION, _SHARED_SEEN
+    row = connection.execute("SELECT revision, tombstone_floor FROM presence_meta WHERE id = 1").fetchone()
+    revision = int(row[0]) if row else 0
+    floor = int(row[1]) if row else 0
+    if revision == _SHARED_SEEN:
+        return
+    if _SHARED_SEEN < 0 or _SHARED_SEEN < floor or revision < _SHARED_SEEN:
+        # First read, or tombstones this mirror still needed were pruned: full reload.
+        _PRESENCE.clear()
+        rows = connection.execute("SELECT user_id, entry FROM presence")
+    else:
+        rows = connection.execute("SELECT user_id, entry FROM presence WHERE revision > ?", (_SHARED_SEEN,))
+    for user_id, raw in rows:
+        try:
+            entry = json.loads(raw)
+        except Exception:
+            continue
+        if isinstance(entry, dict):
+            _PRESENCE[str(user_id)] = entry
+        else:
+            _PRESENCE.pop(str(user_id), None)
+    _SHARED_SEEN = revision
+    _REVISION = revision
+    _CONDITION.notify_all()
+
+
+def _sync_locked() -> None:
+    connection = _shared_connection_locked()
+    if connection is None:
+        return
+    try:
+        _shared_sync_locked(connection)
+    except Exception:
+        logger.warning("Shared presence read failed; serving local mirror", exc_info=True)
+
 
 def _bump_revision_locked() -> None:
     global _REVISION
@@ -18,25 +164,165 @@ def _bump_revision_locked() -> None:
     _CONDITION.notify_all()
 
 
+@contextmanager
+def _changes_locked(*, force: bool = False) -> Iterator[Dict[str, Optional[Dict[str, object]]]]:
+    """
+    Collect presence changes (user id -> entry, or None to remove) and apply
+    them atomically: to the shared store when enabled, then to the local mirror.
+    The revision moves when anything changed (or always, with `force`).
+    Call with `_CONDITION` held; the mirror is fresh inside the block.
+    """
+    global _REVISION, _SHARED_SEEN
+    changes: Dict[str, Optional[Dict[str, object]]] = {}
+    connection = _shared_connection_locked()
+    if connection is not None:
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+        except Exception:
+            logger.warning("Shared presence write lock failed; updating process memory only", exc_info=True)
+            connection = None
+    if connection is None:
+        yield changes
+        _apply_local_locked(changes)
+        if changes or force:
+            _bump_revision_locked()
+        return
+    try:
+        _shared_sync_locked(connection)
+        yield changes
+        if changes or force:
+            connection.execute("UPDATE presence_meta SET revision = revision + 1 WHERE id = 1")
+            revision = int(connection.execute("SELECT revision FROM presence_meta WHERE id = 1").fetchone()[0])
+            for user_id, entry in changes.items():
+                # Removals stay behind as `null` tombstones so incremental readers see them.
+                connection.execute(
+                    "INSERT OR REPLACE INTO presence (user_id, entry, heartbeat_at, revision) VALUES (?, ?, ?, ?)",
+                    (
+                        user_id,
+                        json.dumps(entry),
+                        _coerce_epoch(entry.get("lastHeartbeatAt")) if entry is not None else None,
+                        revision,
+                    ),
+                )
+            if revision % _TOMBSTONE_KEEP == 0:
+                floor = revision - _TOMBSTONE_KEEP
+                connection.execute("DELETE FROM presence WHERE entry = 'null' AND revision <= ?", (floor,))
+                connection.execute("UPDATE presence_meta SET tombstone_floor = ? WHERE id = 1", (floor,))
+        connection.execute("COMMIT")
+    except sqlite3.Error:
+        logger.warning("Shared presence write failed; updating process memory only", exc_info=True)
+        _rollback(connection)
+        _SHARED_SEEN = -1
+        _apply_local_locked(changes)
+        if changes or force:
+            _bump_revision_locked()
+        return
+    except BaseException:
+        _rollback(connection)
+        raise
+    if changes or force:
+        _apply_local_locked(changes)
+        _SHARED_SEEN = revision
+        _REVISION = revision
+        _CONDITION.notify_all()
+
+
+def _rollback(connection: sqlite3.Connection) -> None:
+    try:
+        connection.execute("ROLLBACK")
+    except Exception:
+        pass
+
+
+def _apply_local_locked(changes: Dict[str, Optional[Dict[str, object]]]) -> None:
+    for user_id, entry in changes.items():
+        if entry is None:
+            _PRESENCE.pop(user_id, None)
+        else:
+            _PRESENCE[user_id] = entry
+
+
+def _broadcast_change() -> None:
+    """Wake long-polls waiting in other worker processes."""
+    directory = _signal_dir()
+    if directory is None:
+        return
+    worker_signals.broadcast(directory, _SIGNAL_SOCKET_NAME, b"1")
+
+
+def _listen_loop(receiver: socket.socket, path: Path) -> None:
+    try:
+        while True:
+            try:
+                receiver.recv(64)
+            except socket.timeout:
+                continue
+            except Exception:
+                logger.warning("Presence signal socket failed; waiters fall back to re-checking", exc_info=True)
+                return
+            with _CONDITION:
+                _CONDITION.notify_all()
+    finally:
+        worker_signals.close_receiver(receiver, path)
+
+
+def _ensure_listener() -> None:
+    """Start this worker's signal receiver the first time something long-polls."""
+    global _LISTENER_PID
+    if _LISTENER_PID == os.getpid() or not worker_signals.supported():
+        return
+    directory = _signal_dir()
+    if directory is None:
+        return
+    with _LISTENER_LOCK:
+        if _LISTENER_PID == os.getpid():
+            return
+        try:
+            receiver, path = worker_signals.open_receiver(directory, _SIGNAL_SOCKET_NAME)
+            receiver.settimeout(60.0)
+        except Exception:
+            # Left unset so a later long-poll retries the bind.
+            logger.warning("Presence signal socket unavailable; waiters fall back to re-checking", exc_info=True)
+            return
+        _LISTENER_PID = os.getpid()
+    threading.Thread(
+        target=_listen_loop,
+        args=(receiver, path),
+        name="presence-signal-listener",
+        daemon=True,
+    ).start()
+
+
 def current_revision() -> int:
     with _LOCK:
+        _sync_locked()
         return int(_REVISION)
 
 
 def wait_for_change(since_revision: int, *, timeout_s: float) -> int:
     timeout = max(0.0, float(timeout_s or 0.0))
+    shared = _shared_path() is not None
+    if shared and timeout > 0:
+        _ensure_listener()
+    deadline = time.monotonic() + timeout
     with _CONDITION:
-        if _REVISION != int(since_revision):
-            return int(_REVISION)
-        if timeout > 0:
-            _CONDITION.wait(timeout=timeout)
-        return int(_REVISION)
+        while True:
+            _sync_locked()
+            remaining = deadline - time.monotonic()
+            if _REVISION != int(since_revision) or remaining <= 0:
+                return int(_REVISION)
+            _CONDITION.wait(timeout=min(remaining, _SHARED_RECHECK_SECONDS) if shared else remaining)
+            if not shared:
+                return int(_REVISION)
 
 
 def notify_change() -> int:
     with _CONDITION:
-        _bump_revision_locked()
-        return int(_REVISION)
+        with _changes_locked(force=True):
+            pass
+        revision = int(_REVISION)
+    _broadcast_change()
+    return revision
 
 
 def is_recent_epoch(
@@ -138,7 +424,7 @@ def record_ping(
         return {}
     normalized_kind = str(kind or "heartbeat").strip().lower()
     now = time.time()
-    with _CONDITION:
+    with _CONDITION, _changes_locked() as changes:
         entry = dict(_PRESENCE.get(uid) or {})
         previous_heartbeat = _coerce_epoch(entry.get("lastHeartbeatAt"))
         online_since = _coerce_epoch(entry.get("onlineSinceAt"))
@@ -160,13 +446,14 @@ def record_ping(
             if is_idle is False:
                 entry["lastInteractionAt"] = now
         entry["updatedAt"] = now
-        _PRESENCE[uid] = entry
-        _bump_revision_locked()
-        return dict(entry)
+        changes[uid] = entry
+    _broadcast_change()
+    return dict(entry)
 
 
 def snapshot() -> Dict[str, Dict[str, object]]:
     with _LOCK:
+        _sync_locked()
         return {k: dict(v) for k, v in _PRESENCE.items()}
 
 def prune_stale(*, max_age_s: float) -> int:
@@ -183,8 +470,7 @@ def prune_stale(*, max_age_s: float) -> int:
     if max_age <= 0:
         return 0
     now = time.time()
-    removed = 0
-    with _CONDITION:
+    with _CONDITION, _changes_locked() as changes:
         stale_ids = []
         for uid, entry in _PRESENCE.items():
             if not isinstance(entry, dict):
@@ -198,23 +484,23 @@ def prune_stale(*, max_age_s: float) -> int:
             if not last_hb or last_hb <= 0 or (now - float(last_hb)) >= max_age:
                 stale_ids.append(uid)
         for uid in stale_ids:
-            if uid in _PRESENCE:
-                _PRESENCE.pop(uid, None)
-                removed += 1
-        if removed > 0:
-            _bump_revision_locked()
+            changes[uid] = None
+    removed = len(changes)
+    if removed > 0:
+        _broadcast_change()
     return removed
 
 def clear_user(user_id: str) -> bool:
     uid = str(user_id or "").strip()
     if not uid:
         return False
-    with _CONDITION:
+    with _CONDITION, _changes_locked() as changes:
         existed = uid in _PRESENCE
-        _PRESENCE.pop(uid, None)
         if existed:
-            _bump_revision_locked()
-        return existed
+            changes[uid] = None
+    if existed:
+        _broadcast_change()
+    return existed
 
 
 def to_public_fields(entry: Optional[Dict[str, object]]) -> Dict[str, Optional[object]]:
@@ -147,11 +147,11 @@ def sweep_once() -> Dict[str, Any]:
             _release_lock(lock_name)
 
     # JSON-store fallback.
-    updated = 0
     try:
-        users = user_repository.get_all() or []
+        users = user_repository.list_online_presence_users() or []
     except Exception:
         users = []
+    stale_ids = []
     for user in users:
         if not isinstance(user, dict) or not bool(user.get("isOnline")):
             continue
@@ -159,11 +159,11 @@ def sweep_once() -> Dict[str, Any]:
         if not last_seen:
             continue
         if last_seen.astimezone(timezone.utc) < cutoff:
-            try:
-                user_repository.update({**user, "isOnline": False})
-                updated += 1
-            except Exception:
-                continue
+            stale_ids.append(user.get("id"))
+    try:
+        updated = user_repository.mark_offline(stale_ids)
+    except Exception:
+        updated = 0
 
     if updated > 0:
         presence_service.notify_change()
@@ -176,39 +176,32 @@ def _is_excluded_catalog_product(product: Dict[str, Any]) -> bool:
 
 def _load_catalog_candidates() -> Dict[int, Dict[str, Any]]:
     candidates: Dict[int, Dict[str, Any]] = {}
-    page = 1
-    while page <= 25:
-        try:
-            batch = catalog_snapshot_service.get_catalog_products(page=page, per_page=200)
-        except Exception:
-            break
-        if not isinstance(batch, list) or not batch:
-            break
-        for product in batch:
-            if not isinstance(product, dict):
-                continue
-            woo_id = _parse_positive_int(product.get("id"))
-            if woo_id is None or _is_excluded_catalog_product(product):
-                continue
-            category_keys = {
-                _normalize_filter_key(category.get("name") or category.get("slug"))
-                for category in _catalog_categories(product)
-            }
-            tag_keys = {
-                _normalize_filter_key(tag.get("slug") or tag.get("name"))
-                for tag in _catalog_tags(product)
-            }
-            candidates[woo_id] = {
-                "wooProductId": woo_id,
-                "productId": f"woo-{woo_id}",
-                "sku": str(product.get("sku") or "").strip() or None,
-                "name": str(product.get("name") or "").strip() or None,
-                "categoryKeys": {value for value in category_keys if value},
-                "tagKeys": {value for value in tag_keys if value},
-            }
-        if len(batch) < 200:
-            break
-        page += 1
+    try:
+        products = catalog_snapshot_service.get_all_catalog_products(light=True)
+    except Exception:
+        return candidates
+    for product in products:
+        if not isinstance(product, dict):
+            continue
+        woo_id = _parse_positive_int(product.get("id"))
+        if woo_id is None or _is_excluded_catalog_product(product):
+            continue
+        category_keys = {
+            _normalize_filter_key(category.get("name") or category.get("slug"))
+            for category in _catalog_categories(product)
+        }
+        tag_keys = {
+            _normalize_filter_key(tag.get("slug") or tag.get("name"))
+            for tag in _catalog_tags(product)
+        }
+        candidates[woo_id] = {
+            "wooProductId": woo_id,
+            "productId": f"woo-{woo_id}",
+            "sku": str(product.get("sku") or "").strip() or None,
+            "name": str(product.get("name") or "").strip() or None,
+            "categoryKeys": {value for value in category_keys if value},
+            "tagKeys": {value for value in tag_keys if value},
+        }
     return candidates
 
 
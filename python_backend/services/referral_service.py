@@ -22,13 +22,11 @@ from ..repositories import (
     sales_rep_repository,
     user_repository,
 )
-from ..database import mysql_client
+from ..database import mysql_client, schema_catalog
 from ..utils.crypto_envelope import compute_blind_index, decrypt_text
 from . import get_config, user_media_service
 logger = logging.getLogger(__name__)
 
-_supports_sales_prospect_office_address_columns: Optional[bool] = None
-
 ALLOWED_SUFFIX_CHARS = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
 REFERRAL_STATUS_CHOICES = [
     "pending",
@@ -625,21 +623,12 @@ def _sales_prospects_support_office_address_columns() -> bool:
 
     The sales_prospects table may not have address columns yet.
     """
-    global _supports_sales_prospect_office_address_columns
-    if _supports_sales_prospect_office_address_columns is not None:
-        return _supports_sales_prospect_office_address_columns
     try:
         if not bool(get_config().mysql.get("enabled")):
-            _supports_sales_prospect_office_address_columns = False
             return False
-        rows = mysql_client.fetch_all(
-            "SHOW COLUMNS FROM sales_prospects LIKE 'office_address_line1'",
-            {},
-        )
-        _supports_sales_prospect_office_address_columns = bool(rows)
+        return schema_catalog.has_column("sales_prospects", "office_address_line1")
     except Exception:
-        _supports_sales_prospect_office_address_columns = False
-    return _supports_sales_prospect_office_address_columns
+        return False
 
 
 def _sanitize_notes(value: Optional[str]) -> Optional[str]:
@@ -1002,13 +991,16 @@ def lock_lead_type_for_doctor(
     normalized = _normalize_lead_type(lead_type)
     if not normalized:
         return doctor
-    update = {
-        **doctor,
+    # Only send the lead-type fields: `doctor` may be a narrow lookup projection,
+    # and writing it back whole would blank the columns it does not carry.
+    changes = {
+        "id": doctor.get("id"),
         "leadType": normalized,
         "leadTypeSource": _sanitize_text(source, 64) if source else doctor.get("leadTypeSource") or None,
         "leadTypeLockedAt": locked_at or doctor.get("leadTypeLockedAt") or _now(),
     }
-    return user_repository.update(update) or update
+    user_repository.update(changes)
+    return {**doctor, **changes}
 
 
 def backfill_lead_types_for_doctors(doctors: List[Dict]) -> List[Dict]:
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
+import socket
 import threading
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from ..database import mysql_client
+from ..utils import worker_signals
 from . import get_config
 
 logger = logging.getLogger(__name__)
@@ -16,6 +21,17 @@ _RESOURCE_RE = re.compile(r"^[a-z0-9][a-z0-9._:-]{0,63}$")
 _LOCK = threading.Lock()
 _MEMORY_VERSIONS: Dict[str, Dict[str, Any]] = {}
 
+# Per-process version watcher shared by every `/api/events` stream. One thread
+# keeps `_WATCH_VERSIONS` current (local bumps publish directly, other workers
+# signal over unix datagram sockets, and a slow poll is the safety net) and SSE
+# generators wait on `_WATCH_CONDITION` instead of querying MySQL themselves.
+_WATCH_CONDITION = threading.Condition()
+_WATCH_VERSIONS: Dict[str, Dict[str, Any]] = {}
+_WATCH_REVISION = 0
+_WATCH_SUBSCRIBERS = 0
+_WATCH_THREAD: Optional[threading.Thread] = None
+_SIGNAL_SOCKET_NAME = "rv"
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -126,7 +142,7 @@ def _memory_get(resources: List[str]) -> Dict[str, Dict[str, Any]]:
 def bump(resource_name: object, *, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     name = normalize_resource_name(resource_name)
     if not _mysql_enabled():
-        return _memory_bump(name, metadata=metadata)
+        return _publish_local_bump(_memory_bump(name, metadata=metadata))
 
     metadata_json = _metadata_json(metadata)
     try:
@@ -149,12 +165,15 @@ def bump(resource_name: object, *, metadata: Optional[Dict[str, Any]] = None) ->
             """,
             {"resource_name": name},
         )
-        return _serialize_row(row or {"resource_name": name, "version": 1})
+        result = _serialize_row(row or {"resource_name": name, "version": 1})
     except Exception as exc:
         if isinstance(exc, RuntimeError) and "not been initialised" in str(exc):
-            return _memory_bump(name, metadata=metadata)
+            return _publish_local_bump(_memory_bump(name, metadata=metadata))
         logger.warning("Failed to bump resource version", exc_info=True, extra={"resource": name})
-        return _memory_bump(name, metadata=metadata)
+        return _publish_local_bump(_memory_bump(name, metadata=metadata))
+    _publish_versions({name: result})
+    _broadcast_versions({name: result})
+    return result
 
 
 def bump_many(resources: Iterable[object], *, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
@@ -215,3 +234,185 @@ def get_versions(resources: Iterable[object] | None = None) -> Dict[str, Dict[st
             return _memory_get(names)
         logger.warning("Failed to read resource versions", exc_info=True)
         return _memory_get(names)
+
+
+def _publish_local_bump(row: Dict[str, Any]) -> Dict[str, Any]:
+    name = str(row.get("resource") or "")
+    if name:
+        _publish_versions({name: row})
+    return row
+
+
+def _watch_poll_seconds() -> float:
+    raw = str(os.environ.get("RESOURCE_VERSION_WATCH_POLL_SECONDS", "5")).strip()
+    try:
+        value = float(raw)
+    except Exception:
+        value = 5.0
+    return max(0.5, min(value, 300.0))
+
+
+def _signal_enabled() -> bool:
+    raw = str(os.environ.get("RESOURCE_VERSION_SIGNAL_ENABLED", "true")).strip().lower()
+    return raw not in ("0", "false", "no", "off") and worker_signals.supported()
+
+
+def _signal_dir() -> Optional[Path]:
+    explicit = str(os.environ.get("RESOURCE_VERSION_SIGNAL_DIR") or "").strip()
+    if explicit:
+        return Path(explicit)
+    try:
+        return Path(get_config().data_dir) / ".resource-version-signals"
+    except Exception:
+        return None
+
+
+def _publish_versions(rows: Dict[str, Dict[str, Any]]) -> bool:
+    """Merge newer versions into the watcher snapshot and wake waiters on change."""
+    global _WATCH_REVISION
+    changed = False
+    with _WATCH_CONDITION:
+        for name, row in (rows or {}).items():
+            if not name or not isinstance(row, dict):
+                continue
+            version = int(row.get("version") or 0)
+            current = _WATCH_VERSIONS.get(name)
+            if current is not None and int(current.get("version") or 0) >= version:
+                continue
+            _WATCH_VERSIONS[name] = {
+                "resource": name,
+                "version": version,
+                "updatedAt": row.get("updatedAt") or _now_iso(),
+            }
+            changed = True
+        if changed:
+            _WATCH_REVISION += 1
+            _WATCH_CONDITION.notify_all()
+    return changed
+
+
+def _watched_snapshot(resources: List[str]) -> Dict[str, Dict[str, Any]]:
+    source = _WATCH_VERSIONS
+    names = resources or sorted(source.keys())
+    return {name: dict(source[name]) for name in names if name in source}
+
+
+def _broadcast_versions(rows: Dict[str, Dict[str, Any]]) -> None:
+    """Tell watchers in other worker processes about a bump without a MySQL round-trip."""
+    if not rows or not _signal_enabled():
+        return
+    directory = _signal_dir()
+    if directory is None or not directory.is_dir():
+        return
+    payload = json.dumps({"pid": os.getpid(), "rows": rows}, separators=(",", ":")).encode("utf-8")
+    if len(payload) > 8192:
+        return
+    worker_signals.broadcast(directory, _SIGNAL_SOCKET_NAME, payload)
+
+
+def _open_signal_socket() -> Tuple[Optional[socket.socket], Optional[Path]]:
+    if not _signal_enabled():
+        return None, None
+    directory = _signal_dir()
+    if directory is None:
+        return None, None
+    try:
+        return worker_signals.open_receiver(directory, _SIGNAL_SOCKET_NAME)
+    except Exception:
+        logger.warning("Resource version signal socket unavailable; falling back to polling", exc_info=True)
+        return None, None
+
+
+def _poll_all_versions() -> None:
+    try:
+        _publish_versions(get_versions(None))
+    except Exception:
+        logger.warning("Resource version watcher poll failed", exc_info=True)
+
+
+def _watch_loop() -> None:
+    global _WATCH_THREAD
+    receiver, path = _open_signal_socket()
+    try:
+        next_poll = time.monotonic() + _watch_poll_seconds()
+        while True:
+            with _WATCH_CONDITION:
+                if _WATCH_SUBSCRIBERS <= 0:
+                    _WATCH_THREAD = None
+                    return
+            now = time.monotonic()
+            if now >= next_poll:
+                _poll_all_versions()
+                next_poll = time.monotonic() + _watch_poll_seconds()
+                continue
+            remaining = max(0.05, next_poll - now)
+            if receiver is None:
+                time.sleep(remaining)
+                continue
+            try:
+                receiver.settimeout(remaining)
+                data = receiver.recv(8192)
+            except socket.timeout:
+                continue
+            except Exception:
+                logger.warning("Resource version signal socket failed; falling back to polling", exc_info=True)
+                worker_signals.close_receiver(receiver, path)
+                receiver, path = None, None
+                continue
+            try:
+                message = json.loads(data.decode("utf-8"))
+                rows = message.get("rows") if isinstance(message, dict) else None
+                if isinstance(rows, dict):
+                    _publish_versions({str(name): row for name, row in rows.items() if isinstance(row, dict)})
+            except Exception:
+                continue
+    finally:
+        worker_signals.close_receiver(receiver, path)
+
+
+def subscribe() -> int:
+    """Register an SSE stream with the process-wide watcher and return the current revision."""
+    global _WATCH_SUBSCRIBERS, _WATCH_THREAD
+    prime = False
+    with _WATCH_CONDITION:
+        _WATCH_SUBSCRIBERS += 1
+        if _WATCH_THREAD is None or not _WATCH_THREAD.is_alive():
+            # The snapshot may be stale after an idle period; refresh it before streaming.
+            prime = True
+            _WATCH_THREAD = threading.Thread(target=_watch_loop, name="resource-version-watcher", daemon=True)
+            _WATCH_THREAD.start()
+    if prime:
+        _poll_all_versions()
+    with _WATCH_CONDITION:
+        return int(_WATCH_REVISION)
+
+
+def unsubscribe() -> None:
+    global _WATCH_SUBSCRIBERS
+    with _WATCH_CONDITION:
+        _WATCH_SUBSCRIBERS = max(0, _WATCH_SUBSCRIBERS - 1)
+
+
+def watched_versions(resources: Iterable[object] | None = None) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    names = normalize_resource_names(resources)
+    with _WATCH_CONDITION:
+        return int(_WATCH_REVISION), _watched_snapshot(names)
+
+
+def wait_for_change(
+    since_revision: int,
+    resources: Iterable[object] | None = None,
+    *,
+    timeout_s: float,
+) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """
+    Block until the watcher publishes a revision newer than `since_revision`
+    (or `timeout_s` elapses) and return the new revision with a snapshot of
+    the requested resources.
+    """
+    names = normalize_resource_names(resources)
+    timeout = max(0.0, float(timeout_s or 0.0))
+    with _WATCH_CONDITION:
+        if _WATCH_REVISION == int(since_revision) and timeout > 0:
+            _WATCH_CONDITION.wait(timeout=timeout)
+        return int(_WATCH_REVISION), _watched_snapshot(names)
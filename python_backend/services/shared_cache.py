@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from ..database import mysql_client
+from . import get_config
+
+try:  # pragma: no cover - POSIX only
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Shared (L2) tier behind the per-process report caches. Each gunicorn worker
+# keeps its own in-memory dict as L1; on an L1 miss the worker reads this tier,
+# and only one worker at a time computes a given key (cross-worker
+# single-flight) so the others pick up its result instead of recomputing.
+#
+# Backends (SHARED_CACHE_BACKEND):
+#   auto  - the `shared_cache_entries` MySQL table when MySQL is enabled, else off
+#   mysql - same as auto (the table needs MySQL)
+#   disk  - JSON files under SHARED_CACHE_DIR (workers on one host)
+#   off   - no shared tier; L1 only
+
+NAMESPACE_SALES_REP_ORDERS = "sales_rep_orders"
+NAMESPACE_SALES_BY_REP_SUMMARY = "sales_by_rep_summary"
+NAMESPACE_ADMIN_TAXES_BY_STATE = "admin_taxes_by_state"
+NAMESPACE_ADMIN_PRODUCTS_COMMISSION = "admin_products_commission"
+NAMESPACE_SHIP_TIME_AVERAGE = "ship_time_average"
+
+_MAX_KEY_LENGTH = 191
+
+# Last expired-row sweep per namespace (ms), so puts only sweep periodically.
+_last_sweep_ms: dict = {}
+
+
+def _backend() -> str:
+    raw = str(os.environ.get("SHARED_CACHE_BACKEND", "auto")).strip().lower()
+    if raw in ("0", "false", "no", "off", "none", "disabled"):
+        return "off"
+    if raw == "disk":
+        return "disk"
+    # "auto" and "mysql" both use the table, and fall back to off without MySQL.
+    return "mysql" if mysql_client.is_enabled() else "off"
+
+
+def is_enabled() -> bool:
+    return _backend() != "off"
+
+
+def _lock_wait_seconds() -> int:
+    raw = str(os.environ.get("SHARED_CACHE_LOCK_WAIT_SECONDS", "30")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 30
+    return max(0, min(value, 120))
+
+
+def _sweep_interval_seconds() -> int:
+    raw = str(os.environ.get("SHARED_CACHE_SWEEP_SECONDS", "300")).strip()
+    try:
+        value = int(float(raw))
+    except Exception:
+        value = 300
+    return max(0, min(value, 86400))
+
+
+def _sweep_due(namespace: str, now_ms: int) -> bool:
+    last = _last_sweep_ms.get(namespace)
+    if last is not None and now_ms - last < _sweep_interval_seconds() * 1000:
+        return False
+    _last_sweep_ms[namespace] = now_ms
+    return True
+
+
+def _disk_dir() -> Path:
+    raw = str(os.environ.get("SHARED_CACHE_DIR") or "").strip()
+    if raw:
+        return Path(raw)
+    return Path(get_config().data_dir) / "shared-cache"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _storage_key(key: str) -> str:
+    text = str(key or "")
+    if len(text) <= _MAX_KEY_LENGTH:
+        return text
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _file_stem(key: str) -> str:
+    return hashlib.sha256(str(key or "").encode("utf-8")).hexdigest()
+
+
+def _namespace_dir(namespace: str) -> Path:
+    return _disk_dir() / namespace
+
+
+# Backend primitives ----------------------------------------------------------
+
+
+def _read(namespace: str, key: str, *, now_ms: int) -> Optional[Any]:
+    backend = _backend()
+    if backend == "mysql":
+        row = mysql_client.fetch_one(
+            """
+            SELECT payload, expires_at_ms
+            FROM shared_cache_entries
+            WHERE namespace = %(namespace)s AND cache_key = %(cache_key)s
+            """,
+            {"namespace": namespace, "cache_key": _storage_key(key)},
+        )
+        if not row or int(row.get("expires_at_ms") or 0) <= now_ms:
+            return None
+        return json.loads(row.get("payload") or "null")
+    if backend == "disk":
+        path = _namespace_dir(namespace) / f"{_file_stem(key)}.json"
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        if not isinstance(entry, dict) or int(entry.get("expiresAtMs") or 0) <= now_ms:
+            return None
+        return entry.get("value")
+    return None
+
+
+def _write(namespace: str, key: str, value: Any, *, expires_at_ms: int) -> None:
+    backend = _backend()
+    if backend == "mysql":
+        mysql_client.execute(
+            """
+            INSERT INTO shared_cache_entries (namespace, cache_key, payload, expires_at_ms, updated_at)
+            VALUES (%(namespace)s, %(cache_key)s, %(payload)s, %(expires_at_ms)s, %(updated_at)s)
+            ON DUPLICATE KEY UPDATE
+                payload = VALUES(payload),
+                expires_at_ms = VALUES(expires_at_ms),
+                updated_at = VALUES(updated_at)
+            """,
+            {
+                "namespace": namespace,
+                "cache_key": _storage_key(key),
+                "payload": json.dumps(value, default=str),
+                "expires_at_ms": int(expires_at_ms),
+                "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+        now_ms = _now_ms()
+        if _sweep_due(namespace, now_ms):
+            mysql_client.execute(
+                "DELETE FROM shared_cache_entries WHERE namespace = %(namespace)s AND expires_at_ms < %(now_ms)s",
+                {"namespace": namespace, "now_ms": now_ms},
+            )
+        return
+    if backend == "disk":
+        directory = _namespace_dir(namespace)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{_file_stem(key)}.json"
+        tmp_path = directory / f".{path.name}.{os.getpid()}.tmp"
+        tmp_path.write_text(
+            json.dumps({"expiresAtMs": int(expires_at_ms), "value": value}, default=str),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+def _delete(namespace: str, key: Optional[str]) -> None:
+    backend = _backend()
+    if backend == "mysql":
+        if key is None:
+            mysql_client.execute(
+                "DELETE FROM shared_cache_entries WHERE namespace = %(namespace)s",
+                {"namespace": namespace},
+            )
+        else:
+            mysql_client.execute(
+                "DELETE FROM shared_cache_entries WHERE namespace = %(namespace)s AND cache_key = %(cache_key)s",
+                {"namespace": namespace, "cache_key": _storage_key(key)},
+            )
+        return
+    if backend == "disk":
+        directory = _namespace_dir(namespace)
+        paths = (
+            list(directory.glob("*.json"))
+            if key is None
+            else [directory / f"{_file_stem(key)}.json"]
+        )
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+
+
+@contextmanager
+def _flight_lock(namespace: str, key: str, *, timeout_seconds: int) -> Iterator[bool]:
+    backend = _backend()
+    if backend == "mysql":
+        name = f"shared_cache:{namespace}:{_file_stem(key)[:24]}"
+        with mysql_client.named_lock(name, timeout_seconds=timeout_seconds) as acquired:
+            yield acquired
+        return
+    if backend == "disk" and fcntl is not None:
+        directory = _namespace_dir(namespace)
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / f"{_file_stem(key)}.lock", "a+") as handle:
+            deadline = time.monotonic() + timeout_seconds
+            acquired = False
+            while True:
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        break
+                    time.sleep(0.1)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        return
+    yield False
+
+
+# Public API ------------------------------------------------------------------
+
+
+def get(namespace: str, key: str) -> Optional[Any]:
+    """Unexpired shared value for `key`, or None (also on backend errors)."""
+    if not is_enabled():
+        return None
+    try:
+        return _read(namespace, key, now_ms=_now_ms())
+    except Exception:
+        logger.warning("[SharedCache] Read failed namespace=%s", namespace, exc_info=True)
+        return None
+
+
+def put(namespace: str, key: str, value: Any, *, ttl_seconds: float) -> None:
+    if not is_enabled() or ttl_seconds <= 0:
+        return
+    try:
+        _write(namespace, key, value, expires_at_ms=_now_ms() + int(ttl_seconds * 1000))
+    except Exception:
+        logger.warning("[SharedCache] Write failed namespace=%s", namespace, exc_info=True)
+
+
+def invalidate(namespace: str, key: Optional[str] = None) -> None:
+    """Drop one key, or the whole namespace when `key` is None, for every worker."""
+    if not is_enabled():
+        return
+    try:
+        _delete(namespace, key)
+    except Exception:
+        logger.warning("[SharedCache] Invalidate failed namespace=%s", namespace, exc_info=True)
+
+
+class Flight:
+    """
+    One worker's claim on computing `key`. Created by `begin()`; `value` holds the
+    shared result when another worker already produced it, otherwise compute and
+    `publish()`. Always `release()` (in a `finally`).
+    """
+
+    def __init__(self, namespace: str, key: str, *, ttl_seconds: float) -> None:
+        self.namespace = namespace
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.value: Optional[Any] = None
+        self._stack = ExitStack()
+
+    def publish(self, value: Any) -> None:
+        put(self.namespace, self.key, value, ttl_seconds=self.ttl_seconds)
+
+    def release(self) -> None:
+        try:
+            self._stack.close()
+        except Exception:
+            logger.warning("[SharedCache] Lock release failed namespace=%s", self.namespace, exc_info=True)
+
+
+def begin(namespace: str, key: str, *, ttl_seconds: float, force: bool = False) -> Flight:
+    """
+    Start a cross-worker single-flight for `key`.
+
+    Reads the shared tier first; on a miss, waits (up to
+    SHARED_CACHE_LOCK_WAIT_SECONDS) for any other worker computing the same key
+    and re-reads, so at most one worker runs the computation. If the wait times
+    out the caller computes anyway rather than failing the request.
+    """
+    flight = Flight(namespace, key, ttl_seconds=ttl_seconds)
+    if not is_enabled():
+        return flight
+    if not force:
+        flight.value = get(namespace, key)
+        if flight.value is not None:
+            return flight
+    try:
+        acquired = flight._stack.enter_context(
+            _flight_lock(namespace, key, timeout_seconds=_lock_wait_seconds())
+        )
+    except Exception:
+        logger.warning("[SharedCache] Lock failed namespace=%s", namespace, exc_info=True)
+        return flight
+    if not acquired:
+        logger.info("[SharedCache] Lock wait timed out namespace=%s; computing locally", namespace)
+    if not force:
+        flight.value = get(namespace, key)
+    return flight
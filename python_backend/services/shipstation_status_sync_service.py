@@ -308,10 +308,21 @@ def _map_shipstation_status_to_woo(status: Any) -> Optional[str]:
     return None
 
 
-def _persist_local_order_shipping_update(woo_order_id: Any, shipstation_info: Dict[str, Any]) -> None:
+def _invalidate_order_report_caches() -> None:
+    try:
+        # Imported lazily: order_service pulls in the checkout/integration stack
+        # this worker otherwise does not load.
+        from .order_service import invalidate_order_report_caches
+
+        invalidate_order_report_caches()
+    except Exception:
+        logger.warning("[shipstation-sync] failed to drop order report caches", exc_info=True)
+
+
+def _persist_local_order_shipping_update(woo_order_id: Any, shipstation_info: Dict[str, Any]) -> bool:
     local_order = order_repository.find_by_order_identifier(str(woo_order_id or "").strip())
     if not local_order:
-        return
+        return False
 
     merged = dict(local_order)
     estimate = dict(merged.get("shippingEstimate") or {})
@@ -373,6 +384,8 @@ def _persist_local_order_shipping_update(woo_order_id: Any, shipstation_info: Di
             exc_info=True,
             extra={"wooOrderId": woo_order_id, "orderId": local_order.get("id")},
         )
+        return False
+    return True
 
 
 def _fetch_orders_for_sync(*, lookback_days: int, max_orders: int) -> List[Dict[str, Any]]:
@@ -488,6 +501,7 @@ def run_sync_once(*, ignore_cooldown: bool = False) -> Dict[str, Any]:
     updated = 0
     missing = 0
     failed = 0
+    local_writes = 0
     stopped_early = False
 
     try:
@@ -568,7 +582,8 @@ def run_sync_once(*, ignore_cooldown: bool = False) -> Dict[str, Any]:
                     ship_date=ss.get("shipDate"),
                     existing_meta_data=order.get("meta_data") if isinstance(order.get("meta_data"), list) else None,
                 )
-                _persist_local_order_shipping_update(woo_order_id, ss)
+                if _persist_local_order_shipping_update(woo_order_id, ss):
+                    local_writes += 1
                 if isinstance(result, dict) and result.get("changed") is True:
                     updated += 1
                     note = woo_commerce.build_shipstation_note(
@@ -604,6 +619,8 @@ def run_sync_once(*, ignore_cooldown: bool = False) -> Dict[str, Any]:
             "stoppedEarly": stopped_early,
             "maxRuntimeSeconds": int(max_runtime),
         }
+        if local_writes > 0:
+            _invalidate_order_report_caches()
         if updated > 0:
             resource_version_service.bump_safe(
                 "orders",
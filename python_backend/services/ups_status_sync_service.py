@@ -99,6 +99,15 @@ def _throttle_ms() -> int:
     return max(0, min(value, 2000))
 
 
+def _fetch_concurrency() -> int:
+    raw = str(os.environ.get("UPS_STATUS_SYNC_CONCURRENCY", "4")).strip()
+    try:
+        value = int(raw)
+    except Exception:
+        value = 4
+    return max(1, min(value, 16))
+
+
 def _max_runtime_seconds() -> int:
     raw = str(os.environ.get("UPS_STATUS_SYNC_MAX_RUNTIME_SECONDS", "45")).strip()
     try:
@@ -552,6 +561,72 @@ def _fetch_orders_for_sync(*, lookback_days: int, max_orders: int) -> List[Dict[
     return selected
 
 
+def _tracking_key(value: Any) -> str:
+    return str(value or "").replace(" ", "").strip().upper()
+
+
+def _fetch_tracking_batch(
+    tracking_numbers: List[str],
+    *,
+    deadline: float,
+    throttle_ms: int,
+) -> Dict[str, Any]:
+    """
+    Fetch UPS tracking for each number on a small worker pool.
+
+    `throttle_ms` is a global rate budget: call starts are spaced that far apart
+    across all workers. No call starts after `deadline` (a `time.time()` value).
+    Returns number -> tracking info (or the exception raised); numbers that were
+    never attempted are absent.
+    """
+    pending = list(tracking_numbers)
+    results: Dict[str, Any] = {}
+    lock = threading.Lock()
+    interval = max(0, int(throttle_ms)) / 1000.0
+    next_slot = [0.0]
+
+    def claim() -> Optional[str]:
+        with lock:
+            if not pending:
+                return None
+            now = time.time()
+            slot = max(now, next_slot[0])
+            if slot >= deadline:
+                pending.clear()
+                return None
+            next_slot[0] = slot + interval
+            number = pending.pop(0)
+        if slot > now:
+            time.sleep(slot - now)
+        return number
+
+    def work() -> None:
+        while True:
+            number = claim()
+            if number is None:
+                return
+            try:
+                info: Any = ups_tracking.fetch_tracking_status(number)
+            except Exception as exc:
+                info = exc
+            with lock:
+                results[number] = info
+
+    worker_count = min(_fetch_concurrency(), len(pending))
+    if worker_count <= 1:
+        work()
+        return results
+    workers = [
+        threading.Thread(target=work, name=f"ups-status-fetch-{index}", daemon=True)
+        for index in range(worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
 def get_status() -> Dict[str, Any]:
     return {
         **background_job_supervisor.get_job_status(_JOB_NAME),
@@ -564,10 +639,22 @@ def get_status() -> Dict[str, Any]:
         "maxOrders": _max_orders(),
         "leaseSeconds": _lease_seconds(),
         "throttleMs": _throttle_ms(),
+        "concurrency": _fetch_concurrency(),
         "maxRuntimeSeconds": _max_runtime_seconds(),
     }
 
 
+def _invalidate_order_report_caches() -> None:
+    try:
+        # Imported lazily: order_service pulls in the checkout/integration stack
+        # this worker otherwise does not load.
+        from .order_service import invalidate_order_report_caches
+
+        invalidate_order_report_caches()
+    except Exception:
+        logger.warning("[ups-status-sync] failed to drop order report caches", exc_info=True)
+
+
 def run_sync_once(*, ignore_cooldown: bool = False) -> Dict[str, Any]:
     global _IN_FLIGHT
 
@@ -647,108 +734,155 @@ def run_sync_once(*, ignore_cooldown: bool = False) -> Dict[str, Any]:
             extra={"lookbackDays": lookback_days, "maxOrders": max_orders, "candidateOrders": len(orders)},
         )
 
+        # Orders are classified up front, unique tracking numbers are fetched in
+        # parallel, and every resulting status change is written in one batch.
+        writes: List[Dict[str, Any]] = []
+        notifications: List[Dict[str, Any]] = []
+        fetch_queue: List[tuple[Dict[str, Any], str, str]] = []
         for order in orders:
-            if time.time() - started >= max_runtime:
-                stopped_early = True
-                break
             if not isinstance(order, dict):
                 continue
             order_id = str(order.get("id") or "").strip()
             tracking_number = str(order.get("trackingNumber") or order.get("tracking_number") or "").strip()
             if not order_id or not tracking_number:
                 continue
-
-            processed += 1
-            try:
-                current_status = _normalize_ups_status(order.get("upsTrackingStatus") or order.get("ups_tracking_status"))
-                current_persisted_delivery_date = _extract_persisted_delivery_date(order)
-                current_known_delivery_date = _extract_known_delivery_date(order)
-                if current_status == "delivered" and current_known_delivery_date and current_persisted_delivery_date != current_known_delivery_date:
-                    persisted = order_repository.update_ups_tracking_status(
-                        order_id,
-                        ups_tracking_status="delivered",
-                        delivered_at=_extract_known_delivered_at(order),
-                        estimated_arrival_date=None,
-                        delivery_date_guaranteed=None,
-                        expected_shipment_window=None,
-                    )
-                    _notify_shipping_status(
-                        str((persisted or {}).get("id") or order_id),
-                        "delivered",
-                        tracking_number=tracking_number,
-                    )
-                    updated += 1
-                    continue
-
-                info = ups_tracking.fetch_tracking_status(tracking_number)
-                if not info:
-                    missing += 1
-                    continue
-                next_status = _normalize_ups_status(info.get("trackingStatus") or info.get("trackingStatusRaw"))
-                delivered_at = str(info.get("deliveredAt") or "").strip() or None
-                estimated_arrival_date = _normalize_optional_text(
-                    info.get("estimatedArrivalDate") or info.get("estimated_arrival_date")
-                )
-                delivery_date_guaranteed = _normalize_optional_text(
-                    info.get("deliveryDateGuaranteed") or info.get("delivery_date_guaranteed")
+            current_status = _normalize_ups_status(order.get("upsTrackingStatus") or order.get("ups_tracking_status"))
+            current_persisted_delivery_date = _extract_persisted_delivery_date(order)
+            current_known_delivery_date = _extract_known_delivery_date(order)
+            if current_status == "delivered" and current_known_delivery_date and current_persisted_delivery_date != current_known_delivery_date:
+                processed += 1
+                writes.append(
+                    {
+                        "orderId": order_id,
+                        "upsTrackingStatus": "delivered",
+                        "deliveredAt": _extract_known_delivered_at(order),
+                        "estimatedArrivalDate": None,
+                        "deliveryDateGuaranteed": None,
+                        "expectedShipmentWindow": None,
+                    }
                 )
-                expected_shipment_window = _normalize_optional_text(
-                    info.get("expectedShipmentWindow") or info.get("expected_shipment_window")
+                notifications.append(
+                    {"orderId": order_id, "status": "delivered", "trackingNumber": tracking_number, "written": True}
                 )
-                delivery_date = _resolve_known_delivery_date_value(
-                    delivered_at=delivered_at,
-                    estimated_arrival_date=estimated_arrival_date,
-                    delivery_date_guaranteed=delivery_date_guaranteed,
-                    expected_shipment_window=expected_shipment_window,
+                continue
+            fetch_queue.append((order, order_id, tracking_number))
+
+        unique_numbers: Dict[str, str] = {}
+        for _order, _order_id, tracking_number in fetch_queue:
+            unique_numbers.setdefault(_tracking_key(tracking_number), tracking_number)
+        fetched = _fetch_tracking_batch(
+            list(unique_numbers.values()),
+            deadline=started + max_runtime,
+            throttle_ms=throttle_ms,
+        )
+        fetched_by_key = {_tracking_key(number): info for number, info in fetched.items()}
+
+        for order, order_id, tracking_number in fetch_queue:
+            key = _tracking_key(tracking_number)
+            if key not in fetched_by_key:
+                stopped_early = True
+                continue
+            processed += 1
+            info = fetched_by_key[key]
+            if isinstance(info, Exception):
+                failed += 1
+                logger.warning(
+                    "[ups-status-sync] order failed",
+                    exc_info=False,
+                    extra={"orderId": order_id, "trackingNumber": tracking_number, "error": str(info)},
                 )
-                if not next_status:
-                    if info.get("error"):
-                        failed += 1
-                    else:
-                        missing += 1
-                    continue
-                current_delivered_at = _extract_known_delivered_at(order)
-                current_estimated_arrival_date = _extract_estimated_arrival_date(order)
-                current_delivery_date_guaranteed = _extract_delivery_date_guaranteed(order)
-                current_expected_shipment_window = _extract_expected_shipment_window(order)
-                if current_status == next_status and (
-                    not delivery_date or current_persisted_delivery_date == delivery_date
-                ) and (
-                    next_status != "delivered" or not delivered_at or current_delivered_at == delivered_at
-                ) and (
-                    next_status == "delivered"
-                    or (
-                        (not estimated_arrival_date or current_estimated_arrival_date == estimated_arrival_date)
-                        and (not delivery_date_guaranteed or current_delivery_date_guaranteed == delivery_date_guaranteed)
-                        and (not expected_shipment_window or current_expected_shipment_window == expected_shipment_window)
-                    )
-                ):
-                    _notify_shipping_status(order_id, next_status, tracking_number=tracking_number)
-                    continue
-                persisted = order_repository.update_ups_tracking_status(
-                    order_id,
-                    ups_tracking_status=next_status,
-                    delivered_at=delivered_at,
-                    estimated_arrival_date=estimated_arrival_date,
-                    delivery_date_guaranteed=delivery_date_guaranteed,
-                    expected_shipment_window=expected_shipment_window,
+                continue
+            if not info:
+                missing += 1
+                continue
+            next_status = _normalize_ups_status(info.get("trackingStatus") or info.get("trackingStatusRaw"))
+            delivered_at = str(info.get("deliveredAt") or "").strip() or None
+            estimated_arrival_date = _normalize_optional_text(
+                info.get("estimatedArrivalDate") or info.get("estimated_arrival_date")
+            )
+            delivery_date_guaranteed = _normalize_optional_text(
+                info.get("deliveryDateGuaranteed") or info.get("delivery_date_guaranteed")
+            )
+            expected_shipment_window = _normalize_optional_text(
+                info.get("expectedShipmentWindow") or info.get("expected_shipment_window")
+            )
+            delivery_date = _resolve_known_delivery_date_value(
+                delivered_at=delivered_at,
+                estimated_arrival_date=estimated_arrival_date,
+                delivery_date_guaranteed=delivery_date_guaranteed,
+                expected_shipment_window=expected_shipment_window,
+            )
+            if not next_status:
+                if info.get("error"):
+                    failed += 1
+                else:
+                    missing += 1
+                continue
+            current_status = _normalize_ups_status(order.get("upsTrackingStatus") or order.get("ups_tracking_status"))
+            current_persisted_delivery_date = _extract_persisted_delivery_date(order)
+            current_delivered_at = _extract_known_delivered_at(order)
+            current_estimated_arrival_date = _extract_estimated_arrival_date(order)
+            current_delivery_date_guaranteed = _extract_delivery_date_guaranteed(order)
+            current_expected_shipment_window = _extract_expected_shipment_window(order)
+            if current_status == next_status and (
+                not delivery_date or current_persisted_delivery_date == delivery_date
+            ) and (
+                next_status != "delivered" or not delivered_at or current_delivered_at == delivered_at
+            ) and (
+                next_status == "delivered"
+                or (
+                    (not estimated_arrival_date or current_estimated_arrival_date == estimated_arrival_date)
+                    and (not delivery_date_guaranteed or current_delivery_date_guaranteed == delivery_date_guaranteed)
+                    and (not expected_shipment_window or current_expected_shipment_window == expected_shipment_window)
                 )
-                _notify_shipping_status(
-                    str((persisted or {}).get("id") or order_id),
-                    next_status,
-                    tracking_number=tracking_number,
+            ):
+                notifications.append(
+                    {"orderId": order_id, "status": next_status, "trackingNumber": tracking_number, "written": False}
                 )
-                updated += 1
+                continue
+            writes.append(
+                {
+                    "orderId": order_id,
+                    "upsTrackingStatus": next_status,
+                    "deliveredAt": delivered_at,
+                    "estimatedArrivalDate": estimated_arrival_date,
+                    "deliveryDateGuaranteed": delivery_date_guaranteed,
+                    "expectedShipmentWindow": expected_shipment_window,
+                }
+            )
+            notifications.append(
+                {"orderId": order_id, "status": next_status, "trackingNumber": tracking_number, "written": True}
+            )
+
+        persisted_by_id: Dict[str, Any] = {}
+        if writes:
+            try:
+                persisted_by_id = order_repository.update_ups_tracking_statuses(writes) or {}
             except Exception as exc:
-                failed += 1
+                persisted_by_id = {write["orderId"]: exc for write in writes}
+            write_errors = {
+                order_id: value for order_id, value in persisted_by_id.items() if isinstance(value, Exception)
+            }
+            failed += len(write_errors)
+            updated += len(writes) - len(write_errors)
+            for order_id, exc in write_errors.items():
                 logger.warning(
-                    "[ups-status-sync] order failed",
+                    "[ups-status-sync] order update failed",
                     exc_info=False,
-                    extra={"orderId": order_id, "trackingNumber": tracking_number, "error": str(exc)},
+                    extra={"orderId": order_id, "error": str(exc)},
                 )
-            finally:
-                if throttle_ms > 0:
-                    time.sleep(throttle_ms / 1000.0)
+        for notification in notifications:
+            order_id = notification["orderId"]
+            if notification["written"]:
+                persisted = persisted_by_id.get(order_id)
+                if isinstance(persisted, Exception):
+                    continue
+                order_id = str((persisted or {}).get("id") or order_id)
+            _notify_shipping_status(
+                order_id,
+                notification["status"],
+                tracking_number=notification["trackingNumber"],
+            )
 
         elapsed_ms = int((time.time() - started) * 1000)
         result = {
@@ -762,6 +896,7 @@ def run_sync_once(*, ignore_cooldown: bool = False) -> Dict[str, Any]:
             "maxRuntimeSeconds": int(max_runtime),
         }
         if updated > 0:
+            _invalidate_order_report_caches()
             resource_version_service.bump_safe(
                 "orders",
                 metadata={"source": "ups.sync", "updated": updated},
@@ -24,6 +24,7 @@ seamless_store: Optional[JsonStore[List[dict]]] = None
 def _make_store(config, file_name: str, default) -> JsonStore:
     secret = (config.encryption.get("key") or "").strip() if config.encryption else ""
     algorithm = config.encryption.get("algorithm", "aes-256-gcm") if config.encryption else "aes-256-gcm"
+    store_settings = getattr(config, "json_store", None) or {}
     if isinstance(default, list):
         default_factory = lambda: list(default)
     else:
@@ -34,6 +35,10 @@ def _make_store(config, file_name: str, default) -> JsonStore:
         default_factory=default_factory,
         encryption_secret=secret or None,
         encryption_algorithm=algorithm,
+        cache_enabled=bool(store_settings.get("cache", True)),
+        copy_on_read=bool(store_settings.get("copy_on_read", True)),
+        journal_enabled=bool(store_settings.get("journal", False)),
+        journal_compact_bytes=int(store_settings.get("journal_compact_bytes") or 1024 * 1024),
     )
 
 
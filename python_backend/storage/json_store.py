@@ -4,6 +4,7 @@ import base64
 import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
 from hashlib import sha256
@@ -26,6 +27,86 @@ def _derive_key(secret: str) -> bytes:
     return sha256(secret.encode("utf-8")).digest()
 
 
+def _copy_json(value: Any) -> Any:
+    """Deep copy for decoded JSON (dicts/lists of scalars); much cheaper than copy.deepcopy."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _record_id(record: Any) -> Any:
+    if isinstance(record, dict):
+        record_id = record.get("id")
+        if isinstance(record_id, (str, int)) and record_id != "":
+            return record_id
+    return None
+
+
+def _journal_operations(old: Any, new: Any) -> Optional[list[dict[str, Any]]]:
+    """
+    Record-level changes turning `old` into `new`, or None when the change
+    can't be replayed from per-record entries and needs a full snapshot.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations: list[dict[str, Any]] = [
+            {"op": "unset", "key": key} for key in old if key not in new
+        ]
+        operations.extend(
+            {"op": "set", "key": key, "value": value}
+            for key, value in new.items()
+            if key not in old or old[key] != value
+        )
+        return operations
+    if not isinstance(old, list) or not isinstance(new, list):
+        return None
+    old_records: dict[Any, Any] = {}
+    for record in old:
+        record_id = _record_id(record)
+        if record_id is None or record_id in old_records:
+            return None
+        old_records[record_id] = record
+    new_ids = [_record_id(record) for record in new]
+    if None in new_ids or len(set(new_ids)) != len(new_ids):
+        return None
+    kept = set(new_ids)
+    surviving = [record_id for record_id in old_records if record_id in kept]
+    # Replay keeps existing records in place and appends new ones, so anything
+    # else (inserting at the front, re-sorting) needs a snapshot.
+    if new_ids[: len(surviving)] != surviving:
+        return None
+    operations = [{"op": "delete", "id": record_id} for record_id in old_records if record_id not in kept]
+    operations.extend(
+        {"op": "put", "id": record_id, "record": record}
+        for record_id, record in zip(new_ids, new)
+        if record_id not in old_records or old_records[record_id] != record
+    )
+    return operations
+
+
+def _apply_journal_operations(value: Any, operations: list[dict[str, Any]]) -> Any:
+    if isinstance(value, dict):
+        for operation in operations:
+            if operation.get("op") == "set":
+                value[operation["key"]] = operation.get("value")
+            elif operation.get("op") == "unset":
+                value.pop(operation["key"], None)
+        return value
+    if not isinstance(value, list):
+        return value
+    records: dict[Any, Any] = {}
+    for record in value:
+        record_id = _record_id(record)
+        records[object() if record_id is None else record_id] = record
+    for operation in operations:
+        if operation.get("op") == "put":
+            records[operation["id"]] = operation.get("record")
+        elif operation.get("op") == "delete":
+            records.pop(operation["id"], None)
+    return list(records.values())
+
+
 @dataclass
 class JsonStore(Generic[T]):
     base_dir: Path
@@ -33,10 +114,27 @@ class JsonStore(Generic[T]):
     default_factory: Callable[[], T]
     encryption_secret: Optional[str] = None
     encryption_algorithm: str = "aes-256-gcm"
+    # Keep the last decoded value and serve it while the file's
+    # (inode, mtime_ns, size) is unchanged. Writes always go through an atomic
+    # replace, so any write (from any process) changes the inode.
+    cache_enabled: bool = True
+    # Hand each caller its own copy of the cached value so in-place edits to
+    # records can't leak into the cache (or into other requests).
+    copy_on_read: bool = True
+    # Journaled writes: append only the changed records (keyed by "id" for list
+    # stores, by key for dict stores) to `<file>.journal` and fold the journal
+    # into the snapshot once it grows past `journal_compact_bytes`. Reads replay
+    # snapshot + journal. Writes that can't be expressed as record changes
+    # (reordering, records without ids, type changes) fall back to a snapshot.
+    journal_enabled: bool = False
+    journal_compact_bytes: int = 1024 * 1024
 
     def __post_init__(self) -> None:
         self.file_path = self.base_dir / self.file_name
         self.lock_path = self.base_dir / f"{self.file_name}.lock"
+        self.journal_path = self.base_dir / f"{self.file_name}.journal"
+        self._cache_lock = threading.Lock()
+        self._cached: Optional[tuple[tuple[int, ...], Any]] = None
 
     def _ensure_dir(self) -> None:
         self.base_dir.mkdir(parents=True, exist_ok=True)
@@ -50,6 +148,8 @@ class JsonStore(Generic[T]):
         self._ensure_dir()
         if not self.file_path.exists():
             self.write(self.default_factory())
+        elif self.journal_path.exists():
+            self.compact()
 
     def _acquire_lock(self, shared: bool) -> Any:
         self._ensure_dir()
@@ -120,35 +220,104 @@ class JsonStore(Generic[T]):
 
         return combined, True
 
+    def _replace_snapshot(self, payload: str) -> None:
+        tmp_path = self.file_path.with_suffix(
+            self.file_path.suffix + f".tmp.{os.getpid()}.{int(time.time() * 1000)}"
+        )
+        tmp_path.write_text(payload, encoding="utf-8")
+        try:
+            with open(tmp_path, "rb") as fp:
+                os.fsync(fp.fileno())
+        except Exception:
+            pass
+        os.replace(tmp_path, self.file_path)
+        # The snapshot now holds everything; replaying an old journal on top of
+        # it is harmless (entries are idempotent) but wasted work.
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+
     def _write_payload_atomic(self, payload: str) -> None:
         self._ensure_dir()
         lock_file = self._acquire_lock(shared=False)
         try:
-            tmp_path = self.file_path.with_suffix(
-                self.file_path.suffix + f".tmp.{os.getpid()}.{int(time.time() * 1000)}"
-            )
-            tmp_path.write_text(payload, encoding="utf-8")
-            try:
-                with open(tmp_path, "rb") as fp:
-                    os.fsync(fp.fileno())
-            except Exception:
-                pass
-            os.replace(tmp_path, self.file_path)
+            self._replace_snapshot(payload)
         finally:
             self._release_lock(lock_file)
 
+    @staticmethod
+    def _stat_signature(path: Path) -> tuple[int, int, int]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return (0, 0, 0)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _signature(self) -> tuple[int, ...]:
+        snapshot = self._stat_signature(self.file_path)
+        if snapshot == (0, 0, 0):
+            raise FileNotFoundError(str(self.file_path))
+        return snapshot + self._stat_signature(self.journal_path)
+
+    def _serve(self, value: Any) -> Any:
+        return _copy_json(value) if self.copy_on_read else value
+
+    def invalidate_cache(self) -> None:
+        with self._cache_lock:
+            self._cached = None
+
+    def _remember(self, signature: tuple[int, ...], value: Any) -> None:
+        if self.cache_enabled:
+            with self._cache_lock:
+                self._cached = (signature, value)
+
+    def _read_files(self) -> tuple[tuple[int, ...], str, str]:
+        """Signature, snapshot text and journal text; call with the lock held."""
+        signature = self._signature()
+        raw = self.file_path.read_text(encoding="utf-8")
+        try:
+            journal_raw = self.journal_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            journal_raw = ""
+        return signature, raw, journal_raw
+
+    def _materialize(self, raw: str, journal_raw: str, *, repair: bool = True) -> Any:
+        value = self._decode(raw, repair=repair) if raw else self.default_factory()
+        if journal_raw:
+            value = self._replay(value, journal_raw)
+        return value
+
     def read(self) -> T:
         self._ensure_dir()
-        if not self.file_path.exists():
+        if self.cache_enabled:
+            try:
+                signature = self._signature()
+            except FileNotFoundError:
+                return self.default_factory()
+            with self._cache_lock:
+                cached = self._cached
+            if cached is not None and cached[0] == signature:
+                return self._serve(cached[1])
+        elif not self.file_path.exists():
             return self.default_factory()
         lock_file = self._acquire_lock(shared=True)
         try:
-            raw = self.file_path.read_text(encoding="utf-8")
+            signature, raw, journal_raw = self._read_files()
+        except FileNotFoundError:
+            return self.default_factory()
         finally:
             self._release_lock(lock_file)
-        if not raw:
+        if not raw and not journal_raw:
             return self.default_factory()
 
+        value = self._materialize(raw, journal_raw)
+        if self.cache_enabled:
+            self._remember(signature, value)
+            return self._serve(value)
+        return value
+
+    def _decode(self, raw: str, *, repair: bool = True) -> T:
         key = self._get_key()
         if key:
             try:
@@ -162,25 +331,25 @@ class JsonStore(Generic[T]):
                 ):
                     decrypted = self._decrypt(envelope, key)
                     value, had_extra_decrypted = self._safe_json_loads(decrypted)
-                    if had_extra_decrypted:
+                    if had_extra_decrypted and repair:
                         logger.warning(
                             "Recovered %s with extra JSON data after decryption; rewriting canonical file.",
                             self.file_name,
                         )
                         try:
-                            self.write(value)  # type: ignore[arg-type]
+                            self._write_snapshot(value)
                         except Exception:
                             logger.warning(
                                 "Failed to rewrite recovered %s", self.file_name, exc_info=True
                             )
                     return value
-                if had_extra:
+                if had_extra and repair:
                     logger.warning(
                         "Recovered %s with extra JSON data; rewriting canonical file.",
                         self.file_name,
                     )
                     try:
-                        self.write(envelope)  # type: ignore[arg-type]
+                        self._write_snapshot(envelope)  # type: ignore[arg-type]
                     except Exception:
                         logger.warning(
                             "Failed to rewrite recovered %s", self.file_name, exc_info=True
@@ -191,13 +360,13 @@ class JsonStore(Generic[T]):
 
         try:
             value, had_extra = self._safe_json_loads(raw)
-            if had_extra:
+            if had_extra and repair:
                 logger.warning(
                     "Recovered %s with extra JSON data; rewriting canonical file.",
                     self.file_name,
                 )
                 try:
-                    self.write(value)  # type: ignore[arg-type]
+                    self._write_snapshot(value)  # type: ignore[arg-type]
                 except Exception:
                     logger.warning(
                         "Failed to rewrite recovered %s", self.file_name, exc_info=True
@@ -215,17 +384,138 @@ class JsonStore(Generic[T]):
                 pass
             return self.default_factory()
 
-    def write(self, data: T) -> None:
-        self._ensure_dir()
+    def _snapshot_payload(self, data: Any) -> str:
         key = self._get_key()
         if key:
             serialized = json.dumps(data, ensure_ascii=False)
             envelope = self._encrypt(serialized, key)
-            payload = json.dumps(envelope, indent=2)
-        else:
-            payload = json.dumps(data, indent=2, ensure_ascii=False)
+            return json.dumps(envelope, indent=2)
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def _write_snapshot(self, data: Any) -> None:
+        self._ensure_dir()
+        payload = self._snapshot_payload(data)
+        self.invalidate_cache()
         self._write_payload_atomic(payload)
 
+    def write(self, data: T) -> None:
+        if not self.journal_enabled:
+            self._write_snapshot(data)
+            return
+        self._ensure_dir()
+        lock_file = self._acquire_lock(shared=False)
+        try:
+            self._write_journaled(data)
+        finally:
+            self._release_lock(lock_file)
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot."""
+        self._ensure_dir()
+        lock_file = self._acquire_lock(shared=False)
+        try:
+            try:
+                _, raw, journal_raw = self._read_files()
+            except FileNotFoundError:
+                return
+            if not journal_raw:
+                return
+            self.invalidate_cache()
+            self._replace_snapshot(self._snapshot_payload(self._materialize(raw, journal_raw, repair=False)))
+        finally:
+            self._release_lock(lock_file)
+
+    # Journal ----------------------------------------------------------
+
+    def _current_locked(self) -> Any:
+        """Current contents for diffing; call with the exclusive lock held."""
+        try:
+            signature = self._signature()
+        except FileNotFoundError:
+            return self.default_factory()
+        with self._cache_lock:
+            cached = self._cached
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        _, raw, journal_raw = self._read_files()
+        return self._materialize(raw, journal_raw, repair=False)
+
+    def _write_journaled(self, data: Any) -> None:
+        current = self._current_locked()
+        operations = _journal_operations(current, data)
+        self.invalidate_cache()
+        if operations is None or not self.file_path.exists():
+            self._replace_snapshot(self._snapshot_payload(data))
+            return
+        if operations:
+            entry = json.dumps({"ops": operations}, ensure_ascii=False)
+            key = self._get_key()
+            if key:
+                entry = json.dumps(self._encrypt(entry, key))
+            self._trim_torn_tail()
+            with open(self.journal_path, "a", encoding="utf-8") as handle:
+                handle.write(entry + "\n")
+                handle.flush()
+                try:
+                    os.fsync(handle.fileno())
+                except Exception:
+                    pass
+            if self._stat_signature(self.journal_path)[2] > self.journal_compact_bytes:
+                self._replace_snapshot(self._snapshot_payload(data))
+        self._remember(self._signature(), _copy_json(data))
+
+    def _trim_torn_tail(self) -> None:
+        """Cut a partial last entry left by a crash mid-append; call with the exclusive lock held."""
+        try:
+            handle = open(self.journal_path, "rb+")
+        except FileNotFoundError:
+            return
+        with handle:
+            size = handle.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            handle.seek(size - 1)
+            if handle.read(1) == b"\n":
+                return
+            # Without this the next append would be glued onto the torn line
+            # and lost with it on replay.
+            keep = 0
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                handle.seek(start)
+                cut = handle.read(end - start).rfind(b"\n")
+                if cut != -1:
+                    keep = start + cut + 1
+                    break
+                end = start
+            logger.warning("Dropping torn journal tail in %s (%d bytes)", self.file_name, size - keep)
+            handle.truncate(keep)
+            handle.flush()
+            try:
+                os.fsync(handle.fileno())
+            except Exception:
+                pass
+
+    def _replay(self, value: Any, journal_raw: str) -> Any:
+        key = self._get_key()
+        lines = [(number, line) for number, line in enumerate(journal_raw.splitlines(), start=1) if line.strip()]
+        for position, (number, line) in enumerate(lines):
+            try:
+                entry = json.loads(line)
+                if key and isinstance(entry, dict) and entry.get("v") == 1 and "payload" in entry:
+                    entry = json.loads(self._decrypt(entry, key))
+                operations = entry["ops"]
+            except Exception as exc:
+                if position < len(lines) - 1:
+                    # Appends are whole lines under the lock, so only the last
+                    # entry can be torn; anything earlier is real corruption.
+                    raise ValueError(f"Corrupt journal entry in {self.file_name} at line {number}") from exc
+                logger.warning("Skipping torn final journal entry in %s", self.file_name, exc_info=True)
+                continue
+            value = _apply_journal_operations(value, operations)
+        return value
+
     # Internal helpers -------------------------------------------------
 
     def _encrypt(self, plaintext: str, key: bytes) -> dict[str, Any]:
@@ -54,7 +54,7 @@ class WooCommerceProxyGuardrailTests(unittest.TestCase):
                 return_value=("https://shop.example.test", "wc/v3", None, 120),
             ),
             patch.object(woo_commerce.logger, "warning"),
-            patch.object(woo_commerce.requests, "get", side_effect=requests.Timeout("slow upstream")),
+            patch.object(woo_commerce, "_http_get", side_effect=requests.Timeout("slow upstream")),
         ):
             with self.assertRaises(woo_commerce.IntegrationError) as ctx:
                 woo_commerce._fetch_catalog_http("products/1512", {"status": "publish"}, suppress_log=True)
@@ -87,7 +87,7 @@ class WooCommerceProxyGuardrailTests(unittest.TestCase):
             patch.object(woo_commerce, "_timeout_seconds_for_endpoint", return_value=0.05),
             patch.object(woo_commerce, "_release_woo_http_permit", side_effect=release_permit),
             patch.object(woo_commerce.logger, "warning"),
-            patch.object(woo_commerce.requests, "get", side_effect=slow_get),
+            patch.object(woo_commerce, "_http_get", side_effect=slow_get),
         ):
             started_at = time.perf_counter()
             with self.assertRaises(woo_commerce.IntegrationError) as ctx:
@@ -113,7 +113,7 @@ class WooCommerceProxyGuardrailTests(unittest.TestCase):
                     "_client_config",
                     return_value=("https://shop.example.test", "wc/v3", None, 120),
                 ),
-                patch.object(woo_commerce.requests, "get", Mock()),
+                patch.object(woo_commerce, "_http_get", Mock()),
             ):
                 with self.assertRaises(woo_commerce.IntegrationError) as ctx:
                     woo_commerce._fetch_catalog_http(
@@ -155,6 +155,49 @@ class WooCommerceProxyGuardrailTests(unittest.TestCase):
         self.assertEqual(meta["cache"], "MISS")
         self.assertLess(elapsed, 0.1)
 
+    def test_memory_cache_evicts_expired_then_lru_entries_within_byte_budget(self):
+        cache = woo_commerce._CatalogMemoryCache(max_bytes=300, max_keys=10)
+        cache.set("fresh-a", "a", 2_000, 100, 1_000)
+        cache.set("stale", "s", 500, 100, 1_000)
+        cache.set("fresh-b", "b", 2_000, 100, 1_000)
+        self.assertIsNotNone(cache.lookup("fresh-a", 1_000))
+
+        cache.set("fresh-c", "c", 2_000, 100, 1_000)
+        self.assertIsNone(cache.get("stale"))
+        cache.set("fresh-d", "d", 2_000, 100, 1_000)
+        self.assertIsNone(cache.get("fresh-b"))
+        self.assertIsNone(cache.lookup("missing", 1_000))
+
+        stats = cache.stats(1_000)
+        self.assertEqual(
+            [stats[key] for key in ("entries", "bytes", "evictions", "staleEvictions", "hits", "misses")],
+            [3, 300, 2, 1, 1, 1],
+        )
+        self.assertEqual(sorted(cache._entries), ["fresh-a", "fresh-c", "fresh-d"])
+
+    def test_proxy_counts_memory_hits_and_stale_serves(self):
+        params = {"status": "publish"}
+        cache_key = woo_commerce._build_cache_key("products", params)
+        now_ms = woo_commerce._now_ms()
+        with woo_commerce._catalog_cache_lock:
+            woo_commerce._set_in_memory_cache(cache_key, [{"id": 1}], now_ms + 60_000, 64)
+        before = woo_commerce.get_catalog_cache_stats()
+
+        with patch.object(woo_commerce, "is_configured", return_value=True):
+            data, meta = woo_commerce.fetch_catalog_proxy("products", params)
+            self.assertEqual((data, meta["cache"]), ([{"id": 1}], "HIT"))
+            with woo_commerce._catalog_cache_lock:
+                woo_commerce._set_in_memory_cache(cache_key, [{"id": 1}], now_ms - 1, 64)
+            with patch.object(woo_commerce, "_start_background_refresh") as refresh:
+                _, meta = woo_commerce.fetch_catalog_proxy("products", params)
+            refresh.assert_called_once()
+            self.assertEqual(meta["cache"], "STALE")
+
+        after = woo_commerce.get_catalog_cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["staleHits"] - before["staleHits"], 1)
+        self.assertEqual(after["staleEntries"], 1)
+
     def test_build_order_payload_keeps_manual_tax_as_fee_fallback(self):
         order = {
             "id": "1778107541902",
@@ -0,0 +1,65 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from python_backend.integrations import woo_commerce
+from python_backend.integrations.woo_disk_cache import WooDiskCache
+
+
+class WooDiskCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "woo-proxy-cache.sqlite3"
+
+    def test_round_trip_is_shared_across_connections(self):
+        store = WooDiskCache(self.path, max_bytes=1024, max_age_ms=60_000)
+        store.put("products::{}", {"data": [{"id": 1}], "fetchedAt": 1_000, "expiresAt": 2_000})
+
+        results = []
+        reader = threading.Thread(target=lambda: results.append(store.get("products::{}")))
+        reader.start()
+        reader.join()
+
+        self.assertEqual(results, [{"data": [{"id": 1}], "fetchedAt": 1_000, "expiresAt": 2_000}])
+        self.assertIsNone(WooDiskCache(self.path, max_bytes=1024, max_age_ms=60_000).get("missing"))
+
+    def test_eviction_drops_aged_rows_then_soonest_expired_until_under_budget(self):
+        store = WooDiskCache(self.path, max_bytes=25, max_age_ms=10_000)
+        payload = "x" * 8
+        store.put("aged", {"data": payload, "fetchedAt": 1_000, "expiresAt": 90_000})
+        store.put("expires-first", {"data": payload, "fetchedAt": 50_000, "expiresAt": 51_000})
+        store.put("expires-second", {"data": payload, "fetchedAt": 50_000, "expiresAt": 52_000})
+        store.put("expires-last", {"data": payload, "fetchedAt": 50_000, "expiresAt": 99_000})
+
+        self.assertEqual(store.evict(now_ms=55_000), 2)
+
+        self.assertIsNone(store.get("aged"))
+        self.assertIsNone(store.get("expires-first"))
+        self.assertIsNotNone(store.get("expires-second"))
+        self.assertEqual(store.stats()["entries"], 2)
+
+    def test_legacy_json_file_is_migrated_on_first_read(self):
+        legacy_dir = Path(self.tmp.name) / "woo-proxy-cache"
+        store = WooDiskCache(self.path, max_bytes=1024, max_age_ms=60_000)
+        with (
+            patch.object(woo_commerce, "_disk_cache_store", return_value=store),
+            patch.object(woo_commerce, "_disk_cache_dir", return_value=str(legacy_dir)),
+            patch.object(woo_commerce, "_write_disk_cache", side_effect=woo_commerce._write_disk_cache_sync),
+        ):
+            legacy_dir.mkdir()
+            legacy = Path(woo_commerce._disk_cache_path("products::{}"))
+            legacy.write_text('{"data": [1], "fetchedAt": 5, "expiresAt": 6}', encoding="utf-8")
+
+            first = woo_commerce._read_disk_cache("products::{}")
+            second = woo_commerce._read_disk_cache("products::{}")
+
+        self.assertEqual(first, {"data": [1], "fetchedAt": 5, "expiresAt": 6})
+        self.assertEqual(second, first)
+        self.assertFalse(legacy.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+if "pymysql" not in sys.modules:
+    pymysql_stub = types.ModuleType("pymysql")
+    pymysql_stub.connect = lambda *args, **kwargs: None
+    pymysql_stub.connections = types.SimpleNamespace(Connection=object)
+    pymysql_stub.err = types.SimpleNamespace(Error=Exception, OperationalError=Exception, InterfaceError=Exception)
+    cursors_stub = types.ModuleType("pymysql.cursors")
+    cursors_stub.DictCursor = object
+    pymysql_stub.cursors = cursors_stub
+    sys.modules["pymysql"] = pymysql_stub
+    sys.modules["pymysql.cursors"] = cursors_stub
+
+from python_backend.repositories import email_campaign_repository as repo
+
+
+class EmailCampaignRepositoryBulkTests(unittest.TestCase):
+    def test_claim_tags_the_batch_in_one_update_and_reads_it_back_by_token(self) -> None:
+        executed: list[tuple[str, dict]] = []
+        fetched: list[tuple[str, dict]] = []
+
+        def fake_execute(query, params=None):
+            executed.append((query, params or {}))
+            return 2
+
+        def fake_fetch_all(query, params=None):
+            fetched.append((query, params or {}))
+            return [
+                {"recipient_id": "emr_1", "recipient_variables_json": '{"a": 1}', "campaign_variables_json": None},
+                {"recipient_id": "emr_2", "recipient_variables_json": None, "campaign_variables_json": "{}"},
+            ]
+
+        with patch.object(repo, "_using_mysql", return_value=True), \
+            patch.object(repo.mysql_client, "execute", side_effect=fake_execute), \
+            patch.object(repo.mysql_client, "fetch_all", side_effect=fake_fetch_all):
+            jobs = repo.list_due_pending_recipients(limit=10)
+
+        self.assertEqual(len(executed), 1)
+        self.assertEqual(len(fetched), 1)
+        self.assertIn("LIMIT %(limit)s", executed[0][0])
+        self.assertEqual(executed[0][1]["limit"], 10)
+        self.assertEqual(fetched[0][1]["claim_token"], executed[0][1]["claim_token"])
+        self.assertEqual([job["recipient_id"] for job in jobs], ["emr_1", "emr_2"])
+        self.assertEqual(jobs[0]["recipient_variables_json"], {"a": 1})
+        self.assertEqual(jobs[1]["recipient_variables_json"], {})
+
+    def _patch_connection(self) -> MagicMock:
+        connection = MagicMock()
+        connection.cursor.return_value.execute.return_value = 1
+        for patcher in (
+            patch.object(repo, "_using_mysql", return_value=True),
+            patch.object(repo.mysql_client, "is_enabled", return_value=True),
+            patch.object(repo.mysql_client, "_acquire_connection", return_value=connection),
+            patch.object(repo.mysql_client, "_release_connection"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return connection
+
+    def test_bulk_status_and_event_writes_use_one_statement_per_chunk(self) -> None:
+        connection = self._patch_connection()
+        updates = [
+            {"id": f"emr_{index}", "status": "sent", "sent_at": "2026-05-01T10:00:00Z"}
+            for index in range(repo._BULK_CHUNK + 1)
+        ]
+        repo.update_recipient_statuses(updates)
+        repo.log_events(
+            [
+                {"event_id": "evt_1", "event_type": "sent", "campaign_id": "emc_1", "recipient_email": "a@example.com"},
+                {"event_id": "evt_2", "event_type": "failed", "campaign_id": "emc_1", "metadata": {"error": "x"}},
+            ]
+        )
+
+        executed = connection.cursor.return_value.execute.call_args_list
+        self.assertEqual(len(executed), 3)
+        self.assertIn("CASE id", executed[0].args[0])
+        self.assertEqual(executed[0].args[1]["sent_at_0"], "2026-05-01 10:00:00")
+        self.assertIn("INSERT INTO `email_events`", executed[2].args[0])
+        self.assertEqual(executed[2].args[1]["r1_4"], '{"error":"x"}')
+
+    def test_create_campaign_inserts_recipients_in_chunks_in_one_transaction(self) -> None:
+        connection = self._patch_connection()
+        recipients = (
+            {"id": f"emr_{index}", "campaign_id": "emc_1", "recipient_email": f"r{index}@example.com", "recipient_type": "custom"}
+            for index in range(repo._BULK_CHUNK * 2 + 1)
+        )
+
+        with patch.object(repo, "get_campaign", return_value={"id": "emc_1"}):
+            repo.create_campaign({"id": "emc_1", "status": "sending", "recipient_count": 401}, recipients)
+
+        executed = connection.cursor.return_value.execute.call_args_list
+        statements = [call.args[0] for call in executed]
+        self.assertEqual(len(statements), 4)
+        self.assertIn("INSERT INTO email_campaigns", statements[0])
+        self.assertTrue(all("INSERT INTO `email_campaign_recipients`" in query for query in statements[1:]))
+        self.assertEqual(len([key for key in executed[1].args[1] if key.endswith("_0")]), repo._BULK_CHUNK)
+        last_params = executed[3].args[1]
+        self.assertEqual(last_params["r0_5"], "pending")
+        self.assertEqual(len([key for key in last_params if key.endswith("_0")]), 1)
+        connection.commit.assert_called_once()
+
+    def test_unsubscribe_lookup_resolves_the_batch_with_one_query(self) -> None:
+        with patch.object(repo, "_using_mysql", return_value=True), \
+            patch.object(
+                repo.mysql_client,
+                "fetch_all",
+                return_value=[{"recipient_email": "Gone@Example.com"}],
+            ) as fetch_all:
+            found = repo.list_unsubscribed_emails(["gone@example.com", "stay@example.com", "GONE@example.com", ""])
+
+        self.assertEqual(found, {"gone@example.com"})
+        fetch_all.assert_called_once()
+        self.assertEqual(len(fetch_all.call_args.args[1]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
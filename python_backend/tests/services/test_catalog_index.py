@@ -0,0 +1,111 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+class TestCatalogIndex(unittest.TestCase):
+    def setUp(self):
+        try:
+            from python_backend.services import catalog_snapshot_service as svc
+        except ModuleNotFoundError as exc:
+            self.skipTest(f"python deps not installed: {exc}")
+        self.svc = svc
+        svc.invalidate_catalog_index()
+        self.addCleanup(svc.invalidate_catalog_index)
+        self.version = {"catalog": {"version": 1}}
+        patches = [
+            patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})),
+            patch.object(svc.resource_version_service, "get_versions", side_effect=lambda _names: self.version),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        mysql_patcher = patch.object(svc, "mysql_client")
+        self.mysql = mysql_patcher.start()
+        self.addCleanup(mysql_patcher.stop)
+        self.mysql.fetch_all.return_value = self._rows()
+
+    def _rows(self):
+        svc = self.svc
+        bpc_full = {
+            "id": 20,
+            "name": "BPC",
+            "sku": "BPC-10",
+            "categories": [{"id": 1, "name": "Peptides & Blends", "slug": "peptides"}],
+            "tags": [{"id": 7, "name": "Recovery", "slug": "recovery"}],
+            "variations": [{"id": 201}],
+        }
+        bpc_light = {key: value for key, value in bpc_full.items() if key != "variations"}
+        nad_light = {"id": 10, "name": "NAD", "sku": "nad", "categories": [], "tags": [{"slug": "recovery"}]}
+        return [
+            {"woo_product_id": 20, "kind": svc.KIND_CATALOG_PRODUCT_FULL, "product_sku": "BPC-10", "data": json.dumps(bpc_full)},
+            {"woo_product_id": 20, "kind": svc.KIND_CATALOG_PRODUCT_LIGHT, "product_sku": "BPC-10", "data": json.dumps(bpc_light)},
+            {"woo_product_id": 10, "kind": svc.KIND_CATALOG_PRODUCT_LIGHT, "product_sku": "nad", "data": json.dumps(nad_light).encode("utf-8")},
+            {"woo_product_id": 0, "kind": svc.KIND_CATALOG_CATEGORIES, "data": json.dumps({"categories": [{"id": 1}]})},
+            {"woo_product_id": 30, "kind": svc.KIND_CATALOG_PRODUCT_LIGHT, "data": "not json"},
+        ]
+
+    def test_lookups_share_one_decoded_load(self):
+        svc = self.svc
+
+        self.assertEqual([item["id"] for item in svc.get_catalog_products(page=1, per_page=1)], [10])
+        self.assertEqual([item["id"] for item in svc.get_catalog_products(page=2, per_page=1)], [20])
+        self.assertEqual(svc.get_catalog_product(20)["variations"], [{"id": 201}])
+        self.assertEqual(svc.get_catalog_product_variations(10), [])
+        self.assertEqual(svc.find_catalog_product_by_sku(" bpc-10 ")["id"], 20)
+        self.assertEqual([item["id"] for item in svc.get_catalog_products_by_category("Peptides & Blends")], [20])
+        self.assertEqual([item["id"] for item in svc.get_catalog_products_by_category("peptides")], [20])
+        self.assertEqual([item["id"] for item in svc.get_catalog_products_by_tag("Recovery")], [10, 20])
+        self.assertEqual(svc.get_catalog_categories(), [{"id": 1}])
+        self.assertEqual(self.mysql.fetch_all.call_count, 1)
+
+    def test_reloads_only_when_catalog_version_changes(self):
+        svc = self.svc
+        with patch.dict("os.environ", {"CATALOG_INDEX_RECHECK_SECONDS": "0"}):
+            first = svc.get_catalog_index()
+            self.assertIs(svc.get_catalog_index(), first)
+            self.assertEqual(self.mysql.fetch_all.call_count, 1)
+
+            self.version = {"catalog": {"version": 2}}
+            second = svc.get_catalog_index()
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second.version, 2)
+        self.assertEqual(self.mysql.fetch_all.call_count, 2)
+
+    def test_failed_refresh_keeps_serving_previous_index(self):
+        svc = self.svc
+        with patch.dict("os.environ", {"CATALOG_INDEX_RECHECK_SECONDS": "0"}):
+            first = svc.get_catalog_index()
+            self.version = {"catalog": {"version": 2}}
+            self.mysql.fetch_all.side_effect = RuntimeError("db down")
+            with self.assertLogs(svc.logger, level="WARNING"):
+                self.assertIs(svc.get_catalog_index(), first)
+
+    def test_index_is_read_only(self):
+        index = self.svc.get_catalog_index()
+        with self.assertRaises(TypeError):
+            index.by_id[99] = {}
+        with self.assertRaises(Exception):
+            index.version = 5
+
+    def test_mutating_a_returned_product_does_not_change_the_next_lookup(self):
+        svc = self.svc
+
+        product = svc.get_catalog_product(20)
+        product["name"] = "Changed"
+        product["variations"].append({"id": 999})
+        svc.find_catalog_product_by_sku("BPC-10")["tags"].clear()
+        svc.get_catalog_products_by_tag("recovery")[0]["name"] = "Changed"
+        svc.get_all_catalog_products(light=True)[1]["categories"].clear()
+
+        self.assertEqual(svc.get_catalog_product(20)["name"], "BPC")
+        self.assertEqual(svc.get_catalog_product_variations(20), [{"id": 201}])
+        self.assertEqual(len(svc.find_catalog_product_by_sku("BPC-10")["tags"]), 1)
+        self.assertEqual(svc.get_catalog_products_by_tag("recovery")[0]["name"], "NAD")
+        self.assertEqual(len(svc.get_all_catalog_products(light=True)[1]["categories"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
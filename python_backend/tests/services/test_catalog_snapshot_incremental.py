@@ -0,0 +1,88 @@
+import hashlib
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+class TestCatalogSnapshotIncremental(unittest.TestCase):
+    def _run(self, svc, *, state, existing_hashes, products, mode="auto"):
+        saved = []
+        upserts = []
+        fetch_calls = []
+
+        def fake_fetch_all_products(*, modified_after=None):
+            fetch_calls.append(modified_after)
+            return products, False
+
+        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), \
+            patch.object(svc.woo_commerce, "is_configured", return_value=True), \
+            patch.object(svc, "_try_acquire_lock", return_value=True), \
+            patch.object(svc, "_release_lock"), \
+            patch.object(svc, "_load_sync_state", return_value=dict(state)), \
+            patch.object(svc, "_save_sync_state", side_effect=saved.append), \
+            patch.object(svc, "_existing_snapshot_hashes", return_value=existing_hashes), \
+            patch.object(svc, "_fetch_all_products", side_effect=fake_fetch_all_products), \
+            patch.object(svc, "_fetch_categories", return_value=[]), \
+            patch.object(svc, "_prune_missing_products", return_value={"ok": True, "prunedProducts": 0}) as prune, \
+            patch.object(svc.product_document_repository, "upsert_payload", side_effect=lambda **kw: upserts.append(kw)), \
+            patch.object(svc.resource_version_service, "bump_safe") as bump:
+            result = svc.sync_catalog_snapshots(include_variations=False, mode=mode)
+        return result, saved, upserts, fetch_calls, prune, bump
+
+    def test_recent_full_sync_runs_incrementally_and_skips_unchanged_rows(self):
+        try:
+            from python_backend.services import catalog_snapshot_service as svc
+        except ModuleNotFoundError as exc:
+            self.skipTest(f"python deps not installed: {exc}")
+
+        now = datetime.now(timezone.utc)
+        watermark = now - timedelta(minutes=30)
+        unchanged = {"id": 1, "name": "Same", "type": "simple", "date_modified_gmt": "2026-01-01T00:00:00"}
+        changed = {"id": 2, "name": "New", "type": "simple", "date_modified_gmt": "2026-01-02T00:00:00"}
+        unchanged_hash = hashlib.sha256(
+            svc._compact_json(svc._product_light_snapshot(unchanged, category_by_id={}))
+        ).hexdigest()
+        categories_hash = hashlib.sha256(svc._compact_json({"categories": []})).hexdigest()
+
+        result, saved, upserts, fetch_calls, prune, bump = self._run(
+            svc,
+            state={"watermark": watermark.isoformat(), "lastFullSyncAt": (now - timedelta(hours=1)).isoformat()},
+            existing_hashes={
+                (1, svc.KIND_CATALOG_PRODUCT_LIGHT): unchanged_hash,
+                (0, svc.KIND_CATALOG_CATEGORIES): categories_hash,
+            },
+            products=[unchanged, changed],
+        )
+
+        self.assertEqual(result["mode"], "incremental")
+        self.assertEqual(fetch_calls, [watermark - svc._MODIFIED_AFTER_OVERLAP])
+        self.assertEqual([(call["woo_product_id"], call["kind"]) for call in upserts], [(2, svc.KIND_CATALOG_PRODUCT_LIGHT)])
+        self.assertEqual((result["writtenRows"], result["unchangedRows"]), (1, 2))
+        prune.assert_not_called()
+        bump.assert_called_once()
+        self.assertGreater(datetime.fromisoformat(saved[0]["watermark"]), watermark)
+        self.assertEqual(saved[0]["lastFullSyncAt"], (now - timedelta(hours=1)).isoformat())
+
+    def test_missing_watermark_forces_a_full_sync_with_pruning(self):
+        try:
+            from python_backend.services import catalog_snapshot_service as svc
+        except ModuleNotFoundError as exc:
+            self.skipTest(f"python deps not installed: {exc}")
+
+        result, saved, upserts, fetch_calls, prune, bump = self._run(
+            svc,
+            state={},
+            existing_hashes={},
+            products=[{"id": 7, "name": "P", "type": "simple"}],
+            mode="incremental",
+        )
+
+        self.assertEqual(result["mode"], "full")
+        self.assertEqual(fetch_calls, [None])
+        prune.assert_called_once_with({7}, fetch_hit_limit=False)
+        self.assertEqual(saved[0]["watermark"], saved[0]["lastFullSyncAt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
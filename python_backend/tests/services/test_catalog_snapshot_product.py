@@ -5,6 +5,18 @@ from unittest.mock import patch
 
 
 class TestCatalogSnapshotProduct(unittest.TestCase):
+    def _load(self, svc, rows):
+        svc.invalidate_catalog_index()
+        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
+            svc, "mysql_client"
+        ) as mock_mysql_client, patch.object(
+            svc.resource_version_service, "get_versions", return_value={"catalog": {"version": 1}}
+        ):
+            mock_mysql_client.fetch_all.return_value = rows
+            index = svc.get_catalog_index()
+        self.addCleanup(svc.invalidate_catalog_index)
+        return index, mock_mysql_client
+
     def test_product_detail_uses_full_snapshot_when_available(self):
         try:
             from python_backend.services import catalog_snapshot_service as svc
@@ -12,16 +24,20 @@ class TestCatalogSnapshotProduct(unittest.TestCase):
             self.skipTest(f"python deps not installed: {exc}")
 
         full_snapshot = {"id": 1512, "name": "Full Product", "variations": [{"id": 88}]}
-
-        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
-            svc, "mysql_client"
-        ) as mock_mysql_client:
-            mock_mysql_client.fetch_one.return_value = {"data": json.dumps(full_snapshot)}
-
+        light_snapshot = {"id": 1512, "name": "Light Product"}
+
+        _, mock_mysql_client = self._load(
+            svc,
+            [
+                {"woo_product_id": 1512, "kind": svc.KIND_CATALOG_PRODUCT_FULL, "data": json.dumps(full_snapshot)},
+                {"woo_product_id": 1512, "kind": svc.KIND_CATALOG_PRODUCT_LIGHT, "data": json.dumps(light_snapshot)},
+            ],
+        )
+        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})):
             result = svc.get_catalog_product(1512)
 
         self.assertEqual(result, full_snapshot)
-        query, params = mock_mysql_client.fetch_one.call_args.args
+        query, params = mock_mysql_client.fetch_all.call_args.args
         self.assertIn("ORDER BY CASE", query)
         self.assertEqual(params["kind_full"], svc.KIND_CATALOG_PRODUCT_FULL)
         self.assertEqual(params["kind_light"], svc.KIND_CATALOG_PRODUCT_LIGHT)
@@ -34,11 +50,11 @@ class TestCatalogSnapshotProduct(unittest.TestCase):
 
         light_snapshot = {"id": 1512, "name": "Light Product", "type": "simple"}
 
-        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
-            svc, "mysql_client"
-        ) as mock_mysql_client:
-            mock_mysql_client.fetch_one.return_value = {"data": json.dumps(light_snapshot)}
-
+        self._load(
+            svc,
+            [{"woo_product_id": 1512, "kind": svc.KIND_CATALOG_PRODUCT_LIGHT, "data": json.dumps(light_snapshot)}],
+        )
+        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})):
             result = svc.get_catalog_product(1512)
 
         self.assertEqual(result, light_snapshot)
@@ -49,11 +65,8 @@ class TestCatalogSnapshotProduct(unittest.TestCase):
         except ModuleNotFoundError as exc:
             self.skipTest(f"python deps not installed: {exc}")
 
-        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
-            svc, "mysql_client"
-        ) as mock_mysql_client:
-            mock_mysql_client.fetch_one.return_value = None
-
+        self._load(svc, [])
+        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})):
             with self.assertRaises(RuntimeError) as ctx:
                 svc.get_catalog_product(1512)
 
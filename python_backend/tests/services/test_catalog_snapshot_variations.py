@@ -5,6 +5,24 @@ from unittest.mock import patch
 
 
 class TestCatalogSnapshotVariations(unittest.TestCase):
+    def _variations(self, svc, data, **kwargs):
+        svc.invalidate_catalog_index()
+        self.addCleanup(svc.invalidate_catalog_index)
+        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
+            svc, "mysql_client"
+        ) as mock_mysql_client, patch.object(
+            svc.resource_version_service, "get_versions", return_value={"catalog": {"version": 1}}
+        ), patch.object(svc.woo_commerce, "fetch_catalog_fresh") as mock_fresh, patch.object(
+            svc.woo_commerce, "fetch_catalog_proxy"
+        ) as mock_proxy:
+            mock_mysql_client.fetch_all.return_value = [
+                {"woo_product_id": 55, "kind": svc.KIND_CATALOG_PRODUCT_FULL, "data": data}
+            ]
+            result = svc.get_catalog_product_variations(55, **kwargs)
+        mock_fresh.assert_not_called()
+        mock_proxy.assert_not_called()
+        return result
+
     def test_variations_prefer_sql_snapshot_when_priced(self):
         try:
             from python_backend.services import catalog_snapshot_service as svc
@@ -18,15 +36,9 @@ class TestCatalogSnapshotVariations(unittest.TestCase):
             ]
         }
 
-        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
-            svc, "mysql_client"
-        ) as mock_mysql_client, patch.object(svc.woo_commerce, "fetch_catalog_proxy") as mock_proxy:
-            mock_mysql_client.fetch_one.return_value = {"data": json.dumps(snapshot).encode("utf-8")}
-
-            result = svc.get_catalog_product_variations(55)
+        result = self._variations(svc, json.dumps(snapshot).encode("utf-8"))
 
         self.assertEqual(result, snapshot["variations"])
-        mock_proxy.assert_not_called()
 
     def test_variations_use_sql_snapshot_even_when_force_requested(self):
         try:
@@ -41,17 +53,9 @@ class TestCatalogSnapshotVariations(unittest.TestCase):
             ]
         }
 
-        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
-            svc, "mysql_client"
-        ) as mock_mysql_client, patch.object(
-            svc.woo_commerce, "fetch_catalog_proxy"
-        ) as mock_proxy:
-            mock_mysql_client.fetch_one.return_value = {"data": json.dumps(snapshot)}
-
-            result = svc.get_catalog_product_variations(55, force=True)
+        result = self._variations(svc, json.dumps(snapshot), force=True)
 
         self.assertEqual(result, snapshot["variations"])
-        mock_proxy.assert_not_called()
 
     def test_variations_decode_string_snapshot_payload(self):
         try:
@@ -61,18 +65,9 @@ class TestCatalogSnapshotVariations(unittest.TestCase):
 
         snapshot = {"variations": [{"id": 101, "price": "99.00"}]}
 
-        with patch.object(svc, "get_config", return_value=SimpleNamespace(mysql={"enabled": True})), patch.object(
-            svc, "mysql_client"
-        ) as mock_mysql_client, patch.object(svc.woo_commerce, "fetch_catalog_fresh") as mock_fresh, patch.object(
-            svc.woo_commerce, "fetch_catalog_proxy"
-        ) as mock_proxy:
-            mock_mysql_client.fetch_one.return_value = {"data": json.dumps(snapshot)}
-
-            result = svc.get_catalog_product_variations(55)
+        result = self._variations(svc, json.dumps(snapshot))
 
         self.assertEqual(result, snapshot["variations"])
-        mock_fresh.assert_not_called()
-        mock_proxy.assert_not_called()
 
 
 if __name__ == "__main__":
@@ -50,6 +50,21 @@ class EmailCampaignServiceTests(unittest.TestCase):
     def setUp(self) -> None:
         email_campaign_service.clear_manifest_cache()
         email_campaign_service._BOUNCE_LAST_POLL_MONOTONIC = 0.0
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        # JSON-mode repository writes go to a scratch DATA_DIR, never server-data/.
+        config_patch = patch.object(
+            email_campaign_service.email_campaign_repository,
+            "get_config",
+            return_value=types.SimpleNamespace(data_dir=Path(tmpdir.name), frontend_base_url="http://localhost:3000"),
+        )
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
+        # create_campaign starts the background send loop, which would outlive the patch above.
+        for name in ("ensure_email_campaign_worker_started", "kick_due_campaign_processing"):
+            worker_patch = patch.object(email_campaign_service, name)
+            worker_patch.start()
+            self.addCleanup(worker_patch.stop)
 
     def test_manifest_loads_delegate_links_announcement_first(self) -> None:
         payload = email_campaign_service.list_templates()
@@ -697,8 +712,8 @@ class EmailCampaignServiceTests(unittest.TestCase):
         updates: list[tuple[str, str]] = []
         campaign_updates: list[tuple[str, str]] = []
 
-        def update_recipient(recipient_id, status, **_kwargs):
-            updates.append((recipient_id, status))
+        def update_recipients(batch):
+            updates.extend((update["id"], update["status"]) for update in batch)
 
         def update_campaign(campaign_id, status, **_kwargs):
             campaign_updates.append((campaign_id, status))
@@ -730,11 +745,11 @@ class EmailCampaignServiceTests(unittest.TestCase):
                     },
                 }
             ],
-        ), patch.object(email_campaign_service.email_campaign_repository, "is_unsubscribed", return_value=False), \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status", side_effect=update_recipient), \
+        ), patch.object(email_campaign_service.email_campaign_repository, "list_unsubscribed_emails", return_value=set()), \
+            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_statuses", side_effect=update_recipients), \
             patch.object(email_campaign_service.email_campaign_repository, "update_campaign_status", side_effect=update_campaign), \
             patch.object(email_campaign_service.email_campaign_repository, "count_recipients_by_status", return_value={"pending": 0, "sent": 1}), \
-            patch.object(email_campaign_service.email_campaign_repository, "log_event"), \
+            patch.object(email_campaign_service.email_campaign_repository, "log_events"), \
             patch.object(email_campaign_service.email_service, "send_campaign_email") as send_email:
             result = email_campaign_service.process_pending_campaign_emails(limit=1, throttle_seconds=0)
 
@@ -746,6 +761,83 @@ class EmailCampaignServiceTests(unittest.TestCase):
         self.assertEqual(send_email.call_args.kwargs["cc"], ["cc@example.com"])
         self.assertEqual(send_email.call_args.kwargs["bcc"], ["bcc@example.com"])
 
+    def test_worker_killed_mid_batch_does_not_resend_delivered_recipients(self) -> None:
+        class _WorkerKilled(BaseException):
+            pass
+
+        repo = email_campaign_service.email_campaign_repository
+        statuses = {"emr_1": "pending", "emr_2": "pending"}
+        emails = {"emr_1": "one@example.com", "emr_2": "two@example.com"}
+        timeline: list[tuple[str, str]] = []
+        kill_on = {"two@example.com"}
+
+        def claim_due(limit=25):
+            due = [recipient_id for recipient_id, status in statuses.items() if status == "pending"][:limit]
+            for recipient_id in due:
+                statuses[recipient_id] = "processing"
+            return [
+                {
+                    "recipient_id": recipient_id,
+                    "campaign_id": "emc_1",
+                    "recipient_email": emails[recipient_id],
+                    "recipient_variables_json": {},
+                    "template_id": "delegate_links_announcement",
+                    "subject": "Hello",
+                    "campaign_status": "sending",
+                    "campaign_variables_json": {},
+                }
+                for recipient_id in due
+            ]
+
+        def expire_claims():
+            # The claim of a recipient left "processing" by the killed worker expires.
+            for recipient_id, status in statuses.items():
+                if status == "processing":
+                    statuses[recipient_id] = "pending"
+
+        def update_recipients(batch):
+            for update in batch:
+                statuses[update["id"]] = update["status"]
+                timeline.append(("status", f"{update['id']}:{update['status']}"))
+
+        def send(recipient_email, *_args, **_kwargs):
+            timeline.append(("attempt", recipient_email))
+            if recipient_email in kill_on:
+                kill_on.discard(recipient_email)
+                raise _WorkerKilled()
+            timeline.append(("send", recipient_email))
+
+        with patch.object(email_campaign_service, "poll_bounce_mailbox", return_value={"ok": True, "processed": 0}), \
+            patch.object(email_campaign_service, "_requeue_stale_processing_recipients", side_effect=expire_claims), \
+            patch.object(repo, "list_recipients_by_status", return_value=[]), \
+            patch.object(repo, "list_due_pending_recipients", side_effect=claim_due), \
+            patch.object(repo, "list_unsubscribed_emails", return_value=set()), \
+            patch.object(repo, "update_recipient_statuses", side_effect=update_recipients), \
+            patch.object(repo, "update_campaign_status"), \
+            patch.object(repo, "get_campaign", return_value={"id": "emc_1", "status": "sending"}), \
+            patch.object(repo, "count_recipients_by_status", return_value={"pending": 0, "sent": 2}), \
+            patch.object(repo, "log_events"), \
+            patch.object(email_campaign_service.email_service, "send_campaign_email", side_effect=send):
+            with self.assertRaises(_WorkerKilled):
+                email_campaign_service.process_pending_campaign_emails(limit=2, throttle_seconds=0)
+            # The first recipient's status landed before the next send began.
+            self.assertEqual(
+                timeline,
+                [
+                    ("attempt", "one@example.com"),
+                    ("send", "one@example.com"),
+                    ("status", "emr_1:sent"),
+                    ("attempt", "two@example.com"),
+                ],
+            )
+
+            result = email_campaign_service.process_pending_campaign_emails(limit=2, throttle_seconds=0)
+
+        sends = [value for kind, value in timeline if kind == "send"]
+        self.assertEqual(sends, ["one@example.com", "two@example.com"])
+        self.assertEqual(result["sent"], 1)
+        self.assertEqual(statuses, {"emr_1": "sent", "emr_2": "sent"})
+
     def test_worker_polls_bounces_during_send_and_after_finish(self) -> None:
         poll_forces: list[bool] = []
 
@@ -811,14 +903,13 @@ class EmailCampaignServiceTests(unittest.TestCase):
                     "campaign_variables_json": {},
                 }
             ],
-        ), patch.object(email_campaign_service.email_campaign_repository, "is_unsubscribed", return_value=False), \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status"), \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status_by_campaign_and_email", return_value=True), \
+        ), patch.object(email_campaign_service.email_campaign_repository, "list_unsubscribed_emails", return_value=set()), \
+            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_statuses"), \
             patch.object(email_campaign_service.email_campaign_repository, "update_campaign_status"), \
             patch.object(
                 email_campaign_service.email_campaign_repository,
-                "get_recipient_by_campaign_and_email",
-                return_value={"recipient_email": "doctor@example.com", "status": "sent_pending_bounce_check"},
+                "get_recipients_by_ids",
+                return_value={"emr_1": {"id": "emr_1", "recipient_email": "doctor@example.com", "status": "sent_pending_bounce_check"}},
             ), \
             patch.object(email_campaign_service.email_campaign_repository, "get_campaign", return_value={"id": "emc_1", "status": "sending", "recipient_count": 1}), \
             patch.object(
@@ -829,7 +920,7 @@ class EmailCampaignServiceTests(unittest.TestCase):
                     {"pending": 0, "sent": 1},
                 ],
             ), \
-            patch.object(email_campaign_service.email_campaign_repository, "log_event"), \
+            patch.object(email_campaign_service.email_campaign_repository, "log_events"), \
             patch.object(email_campaign_service.email_service, "send_campaign_email"), \
             patch.object(email_campaign_service, "_bounce_confirmation_delay_seconds", return_value=0), \
             patch.object(email_campaign_service, "_notify_email_campaigns_changed") as notify_changed:
@@ -892,14 +983,13 @@ class EmailCampaignServiceTests(unittest.TestCase):
                     "campaign_variables_json": {},
                 }
             ],
-        ), patch.object(email_campaign_service.email_campaign_repository, "is_unsubscribed", return_value=False), \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status"), \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status_by_campaign_and_email") as update_by_email, \
+        ), patch.object(email_campaign_service.email_campaign_repository, "list_unsubscribed_emails", return_value=set()), \
+            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_statuses") as update_recipients, \
             patch.object(email_campaign_service.email_campaign_repository, "update_campaign_status"), \
             patch.object(
                 email_campaign_service.email_campaign_repository,
-                "get_recipient_by_campaign_and_email",
-                return_value={"recipient_email": "bad@example.com", "status": "failed"},
+                "get_recipients_by_ids",
+                return_value={"emr_1": {"id": "emr_1", "recipient_email": "bad@example.com", "status": "failed"}},
             ), \
             patch.object(email_campaign_service.email_campaign_repository, "get_campaign", return_value={"id": "emc_1", "status": "sending", "recipient_count": 1}), \
             patch.object(
@@ -910,7 +1000,7 @@ class EmailCampaignServiceTests(unittest.TestCase):
                     {"pending": 0, "failed": 1},
                 ],
             ), \
-            patch.object(email_campaign_service.email_campaign_repository, "log_event"), \
+            patch.object(email_campaign_service.email_campaign_repository, "log_events"), \
             patch.object(email_campaign_service.email_service, "send_campaign_email"), \
             patch.object(email_campaign_service, "_notify_email_campaigns_changed"):
             result = email_campaign_service.process_pending_campaign_emails(limit=1, throttle_seconds=0)
@@ -918,7 +1008,8 @@ class EmailCampaignServiceTests(unittest.TestCase):
         self.assertTrue(result["finalBouncePollForced"])
         self.assertEqual(result["bouncesProcessed"], 1)
         self.assertEqual(result["sent"], 0)
-        update_by_email.assert_not_called()
+        written = [update["status"] for call in update_recipients.call_args_list for update in call.args[0]]
+        self.assertEqual(written, ["sent_pending_bounce_check"])
 
     def test_worker_keeps_recipient_checking_until_confirmation_delay_passes(self) -> None:
         with patch.object(
@@ -959,27 +1050,29 @@ class EmailCampaignServiceTests(unittest.TestCase):
                     "campaign_variables_json": {},
                 }
             ],
-        ), patch.object(email_campaign_service.email_campaign_repository, "is_unsubscribed", return_value=False), \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status") as update_recipient, \
-            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_status_by_campaign_and_email") as update_by_email, \
+        ), patch.object(email_campaign_service.email_campaign_repository, "list_unsubscribed_emails", return_value=set()), \
+            patch.object(email_campaign_service.email_campaign_repository, "update_recipient_statuses") as update_recipients, \
             patch.object(email_campaign_service.email_campaign_repository, "update_campaign_status"), \
             patch.object(
                 email_campaign_service.email_campaign_repository,
-                "get_recipient_by_campaign_and_email",
-                return_value={"recipient_email": "doctor@example.com", "status": "sent_pending_bounce_check", "sent_at": email_campaign_service._now_iso()},
+                "get_recipients_by_ids",
+                return_value={"emr_1": {"id": "emr_1", "recipient_email": "doctor@example.com", "status": "sent_pending_bounce_check", "sent_at": email_campaign_service._now_iso()}},
             ), \
             patch.object(email_campaign_service.email_campaign_repository, "get_campaign", return_value={"id": "emc_1", "status": "sending", "recipient_count": 1}), \
             patch.object(email_campaign_service.email_campaign_repository, "count_recipients_by_status", return_value={"sent_pending_bounce_check": 1}), \
-            patch.object(email_campaign_service.email_campaign_repository, "log_event"), \
+            patch.object(email_campaign_service.email_campaign_repository, "log_events"), \
             patch.object(email_campaign_service.email_service, "send_campaign_email"), \
             patch.object(email_campaign_service, "_bounce_confirmation_delay_seconds", return_value=90), \
             patch.object(email_campaign_service, "_notify_email_campaigns_changed"):
             result = email_campaign_service.process_pending_campaign_emails(limit=1, throttle_seconds=0)
 
         self.assertEqual(result["sent"], 0)
-        update_recipient.assert_called()
-        self.assertEqual(update_recipient.call_args.args[:2], ("emr_1", "sent_pending_bounce_check"))
-        update_by_email.assert_not_called()
+        written = [
+            (update["id"], update["status"])
+            for call in update_recipients.call_args_list
+            for update in call.args[0]
+        ]
+        self.assertEqual(written, [("emr_1", "sent_pending_bounce_check")])
 
     def test_sent_campaign_list_promotes_due_scheduled_campaigns(self) -> None:
         campaign = {
@@ -423,6 +423,7 @@ class EmailServiceTests(unittest.TestCase):
 
         events = []
         messages = []
+        self.addCleanup(email_service.close_smtp_pool)
 
         class FakeSMTP:
             def __init__(self, host, port, timeout):
@@ -511,6 +512,140 @@ class EmailServiceTests(unittest.TestCase):
         content_ids = [part["Content-ID"] for part in messages[0].walk() if part["Content-ID"]]
         self.assertEqual(content_ids, ["<trufusion-logo>", "<trufusion-leaf>"])
 
+    def test_smtp_sessions_are_pooled_and_stale_sessions_reconnect(self):
+        from python_backend.services import email_service
+
+        connections = []
+
+        class FakeSMTP:
+            def __init__(self, host, port, timeout):
+                self.sent = []
+                self.drop_next = False
+                connections.append(self)
+
+            def ehlo(self):
+                pass
+
+            def starttls(self):
+                pass
+
+            def login(self, user, password):
+                pass
+
+            def noop(self):
+                return (250, b"OK")
+
+            def mail(self, sender, options=()):
+                if self.drop_next:
+                    raise email_service.smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+                return (250, b"OK")
+
+            def send_message(self, msg, from_addr=None, to_addrs=None):
+                self.mail(from_addr)
+                self.sent.append(msg["To"])
+
+            def quit(self):
+                pass
+
+        settings = {
+            "from": "TrufusionLabs <support@trufusionlabs.com>",
+            "timeout": 15,
+            "smtp": {
+                "host": "smtp.gmail.com",
+                "user": "support@trufusionlabs.com",
+                "pass": "secret",
+                "port": 587,
+                "ssl": False,
+                "starttls": True,
+                "auth": True,
+            },
+        }
+        self.addCleanup(email_service.close_smtp_pool)
+
+        with patch.object(email_service, "_load_inline_email_images", return_value=()), patch.object(
+            email_service.smtplib,
+            "SMTP",
+            FakeSMTP,
+        ):
+            email_service._send_via_smtp("a@example.com", "One", "<p>1</p>", settings)
+            email_service._send_via_smtp("b@example.com", "Two", "<p>2</p>", settings)
+            self.assertEqual(len(connections), 1)
+            self.assertEqual(connections[0].sent, ["a@example.com", "b@example.com"])
+
+            connections[0].drop_next = True
+            email_service._send_via_smtp("c@example.com", "Three", "<p>3</p>", settings)
+
+        self.assertEqual(len(connections), 2)
+        self.assertEqual(connections[1].sent, ["c@example.com"])
+
+    def test_smtp_send_is_not_retried_once_mail_from_was_accepted(self):
+        from python_backend.services import email_service
+
+        connections = []
+
+        class FakeSMTP:
+            def __init__(self, host, port, timeout):
+                self.sent = []
+                self.mail_reply = (250, b"OK")
+                self.data_timeout = False
+                connections.append(self)
+
+            def ehlo(self):
+                pass
+
+            def starttls(self):
+                pass
+
+            def login(self, user, password):
+                pass
+
+            def mail(self, sender, options=()):
+                return self.mail_reply
+
+            def send_message(self, msg, from_addr=None, to_addrs=None):
+                code, resp = self.mail(from_addr)
+                if code != 250:
+                    raise email_service.smtplib.SMTPSenderRefused(code, resp, from_addr)
+                if self.data_timeout:
+                    raise TimeoutError("timed out")
+                self.sent.append(msg["To"])
+
+            def quit(self):
+                pass
+
+        settings = {
+            "from": "TrufusionLabs <support@trufusionlabs.com>",
+            "timeout": 15,
+            "smtp": {
+                "host": "smtp.gmail.com",
+                "user": "support@trufusionlabs.com",
+                "pass": "secret",
+                "port": 587,
+                "ssl": False,
+                "starttls": True,
+                "auth": True,
+            },
+        }
+        self.addCleanup(email_service.close_smtp_pool)
+
+        with patch.object(email_service, "_load_inline_email_images", return_value=()), patch.object(
+            email_service.smtplib,
+            "SMTP",
+            FakeSMTP,
+        ):
+            email_service._send_via_smtp("a@example.com", "One", "<p>1</p>", settings)
+            connections[0].mail_reply = (421, b"Service not available")
+            email_service._send_via_smtp("b@example.com", "Two", "<p>2</p>", settings)
+            self.assertEqual(len(connections), 2)
+            self.assertEqual(connections[1].sent, ["b@example.com"])
+
+            connections[1].data_timeout = True
+            with self.assertRaises(TimeoutError):
+                email_service._send_via_smtp("c@example.com", "Three", "<p>3</p>", settings)
+
+        self.assertEqual(len(connections), 2)
+        self.assertNotIn("mail", connections[1].__dict__)
+
     def test_email_verification_refuses_legacy_peppro_smtp_user(self):
         from python_backend.services import email_service
 
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 
 class TestPresenceService(unittest.TestCase):
@@ -194,5 +194,116 @@ class TestPresenceService(unittest.TestCase):
         )
 
 
+class TestSharedPresenceBackend(unittest.TestCase):
+    def setUp(self):
+        try:
+            from python_backend.services import presence_service
+        except ModuleNotFoundError as exc:
+            self.skipTest(f"python deps not installed: {exc}")
+        import tempfile
+
+        self.presence_service = presence_service
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db_path = f"{self._tmp.name}/presence.sqlite3"
+        env = patch.dict(
+            "os.environ",
+            {"USER_PRESENCE_BACKEND": "sqlite", "USER_PRESENCE_SHARED_PATH": self.db_path},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(self._forget_worker_state)
+
+    def _forget_worker_state(self):
+        # Simulates a different worker: drop the local mirror and connection.
+        with self.presence_service._LOCK:
+            self.presence_service._PRESENCE.clear()
+            self.presence_service._SHARED_CONNECTION = None
+            self.presence_service._SHARED_KEY = None
+            self.presence_service._SHARED_SEEN = -1
+
+    def test_pings_are_visible_to_other_workers_with_one_revision_sequence(self):
+        presence_service = self.presence_service
+        with patch.object(presence_service.time, "time", return_value=1000.0):
+            presence_service.record_ping("u-shared", kind="interaction")
+        revision = presence_service.current_revision()
+
+        self._forget_worker_state()
+
+        self.assertEqual(presence_service.current_revision(), revision)
+        self.assertEqual(presence_service.snapshot()["u-shared"]["lastInteractionAt"], 1000.0)
+        self.assertTrue(presence_service.clear_user("u-shared"))
+        self._forget_worker_state()
+        self.assertNotIn("u-shared", presence_service.snapshot())
+        self.assertEqual(presence_service.current_revision(), revision + 1)
+
+    def test_waiter_sees_a_change_committed_by_another_worker(self):
+        import sqlite3
+
+        presence_service = self.presence_service
+        revision = presence_service.current_revision()
+        other = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            other.execute("UPDATE presence_meta SET revision = revision + 1 WHERE id = 1")
+            other.execute(
+                "INSERT INTO presence (user_id, entry, heartbeat_at, revision) VALUES ('u-remote', ?, 1000.0, ?)",
+                ('{"lastHeartbeatAt": 1000.0}', revision + 1),
+            )
+        finally:
+            other.close()
+
+        with patch.object(presence_service, "_ensure_listener"):
+            next_revision = presence_service.wait_for_change(revision, timeout_s=5.0)
+
+        self.assertEqual(next_revision, revision + 1)
+        self.assertIn("u-remote", presence_service.snapshot())
+
+    def test_mirror_applies_only_rows_written_since_its_last_revision(self):
+        import sqlite3
+
+        presence_service = self.presence_service
+        with patch.object(presence_service.time, "time", return_value=1000.0):
+            presence_service.record_ping("u-kept", kind="heartbeat")
+            presence_service.record_ping("u-left", kind="heartbeat")
+        revision = presence_service.current_revision()
+
+        other = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            # Another worker removes one user and rewrites the kept row's stored
+            # entry at an old revision, which an incremental reader must skip.
+            other.execute("UPDATE presence SET entry = ? WHERE user_id = 'u-kept'", ('{"stale": true}',))
+            other.execute("UPDATE presence_meta SET revision = revision + 1 WHERE id = 1")
+            other.execute(
+                "UPDATE presence SET entry = 'null', revision = ? WHERE user_id = 'u-left'",
+                (revision + 1,),
+            )
+        finally:
+            other.close()
+
+        current = presence_service.snapshot()
+
+        self.assertNotIn("u-left", current)
+        self.assertEqual(current["u-kept"]["lastHeartbeatAt"], 1000.0)
+        self.assertEqual(presence_service.current_revision(), revision + 1)
+
+    def test_listener_is_retried_after_a_failed_bind(self):
+        presence_service = self.presence_service
+        with patch.object(presence_service, "_LISTENER_PID", None), patch.object(
+            presence_service.worker_signals, "open_receiver", side_effect=OSError("no space")
+        ) as open_receiver, patch.object(presence_service.threading, "Thread") as thread:
+            with self.assertLogs(presence_service.logger, level="WARNING"):
+                presence_service._ensure_listener()
+            self.assertIsNone(presence_service._LISTENER_PID)
+
+            receiver = MagicMock()
+            open_receiver.side_effect = None
+            open_receiver.return_value = (receiver, "path")
+            presence_service._ensure_listener()
+
+            self.assertEqual(presence_service._LISTENER_PID, presence_service.os.getpid())
+            self.assertEqual(open_receiver.call_count, 2)
+            thread.return_value.start.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
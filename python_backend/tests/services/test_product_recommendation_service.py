@@ -1,5 +1,6 @@
 import unittest
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import patch
 
 
@@ -7,8 +8,8 @@ class ProductRecommendationServiceTests(unittest.TestCase):
     def _patch_catalog(self, svc, products):
         return patch.object(
             svc.catalog_snapshot_service,
-            "get_catalog_products",
-            side_effect=[products, []],
+            "get_catalog_index",
+            return_value=SimpleNamespace(light_products=tuple(products)),
         )
 
     def test_repeat_purchase_and_cart_intent_rank_above_unrelated_products(self):
@@ -163,7 +163,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
             patch.object(svc, "_max_runtime_seconds", return_value=45), \
             patch.object(svc, "_throttle_ms", return_value=0), \
             patch.object(svc.ups_tracking, "fetch_tracking_status", return_value={"trackingStatus": "Out for Delivery"}), \
-            patch.object(svc.order_repository, "update_ups_tracking_status", return_value={"id": "ups-1"}) as update_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses", return_value={"ups-1": {"id": "ups-1"}}) as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
 
@@ -171,12 +171,16 @@ class TestUpsStatusSyncService(unittest.TestCase):
         self.assertEqual(result["processed"], 1)
         self.assertEqual(result["updated"], 1)
         update_status.assert_called_once_with(
-            "ups-1",
-            ups_tracking_status="out_for_delivery",
-            delivered_at=None,
-            estimated_arrival_date=None,
-            delivery_date_guaranteed=None,
-            expected_shipment_window=None,
+            [
+                {
+                    "orderId": "ups-1",
+                    "upsTrackingStatus": "out_for_delivery",
+                    "deliveredAt": None,
+                    "estimatedArrivalDate": None,
+                    "deliveryDateGuaranteed": None,
+                    "expectedShipmentWindow": None,
+                }
+            ]
         )
         notify_status.assert_called_once_with("ups-1", "out_for_delivery")
 
@@ -207,7 +211,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
                 "fetch_tracking_status",
                 return_value={"trackingStatus": "Delivered", "deliveredAt": "2026-04-02T10:15:00"},
             ), \
-            patch.object(svc.order_repository, "update_ups_tracking_status", return_value={"id": "ups-1"}) as update_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses", return_value={"ups-1": {"id": "ups-1"}}) as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
 
@@ -215,12 +219,16 @@ class TestUpsStatusSyncService(unittest.TestCase):
         self.assertEqual(result["processed"], 1)
         self.assertEqual(result["updated"], 1)
         update_status.assert_called_once_with(
-            "ups-1",
-            ups_tracking_status="delivered",
-            delivered_at="2026-04-02T10:15:00",
-            estimated_arrival_date=None,
-            delivery_date_guaranteed=None,
-            expected_shipment_window=None,
+            [
+                {
+                    "orderId": "ups-1",
+                    "upsTrackingStatus": "delivered",
+                    "deliveredAt": "2026-04-02T10:15:00",
+                    "estimatedArrivalDate": None,
+                    "deliveryDateGuaranteed": None,
+                    "expectedShipmentWindow": None,
+                }
+            ]
         )
         notify_status.assert_called_once_with("ups-1", "delivered")
 
@@ -256,8 +264,8 @@ class TestUpsStatusSyncService(unittest.TestCase):
             ), \
             patch.object(
                 svc.order_repository,
-                "update_ups_tracking_status",
-                return_value={"id": "ups-canceled"},
+                "update_ups_tracking_statuses",
+                return_value={"ups-canceled": {"id": "ups-canceled"}},
             ) as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
@@ -266,12 +274,16 @@ class TestUpsStatusSyncService(unittest.TestCase):
         self.assertEqual(result["processed"], 1)
         self.assertEqual(result["updated"], 1)
         update_status.assert_called_once_with(
-            "ups-canceled",
-            ups_tracking_status="exception",
-            delivered_at=None,
-            estimated_arrival_date=None,
-            delivery_date_guaranteed=None,
-            expected_shipment_window=None,
+            [
+                {
+                    "orderId": "ups-canceled",
+                    "upsTrackingStatus": "exception",
+                    "deliveredAt": None,
+                    "estimatedArrivalDate": None,
+                    "deliveryDateGuaranteed": None,
+                    "expectedShipmentWindow": None,
+                }
+            ]
         )
         notify_status.assert_not_called()
 
@@ -300,7 +312,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
             patch.object(svc, "_max_runtime_seconds", return_value=45), \
             patch.object(svc, "_throttle_ms", return_value=0), \
             patch.object(svc.ups_tracking, "fetch_tracking_status") as fetch_tracking_status, \
-            patch.object(svc.order_repository, "update_ups_tracking_status", return_value={"id": "ups-1"}) as update_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses", return_value={"ups-1": {"id": "ups-1"}}) as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
 
@@ -309,12 +321,16 @@ class TestUpsStatusSyncService(unittest.TestCase):
         self.assertEqual(result["updated"], 1)
         fetch_tracking_status.assert_not_called()
         update_status.assert_called_once_with(
-            "ups-1",
-            ups_tracking_status="delivered",
-            delivered_at="2026-04-02T10:15:00",
-            estimated_arrival_date=None,
-            delivery_date_guaranteed=None,
-            expected_shipment_window=None,
+            [
+                {
+                    "orderId": "ups-1",
+                    "upsTrackingStatus": "delivered",
+                    "deliveredAt": "2026-04-02T10:15:00",
+                    "estimatedArrivalDate": None,
+                    "deliveryDateGuaranteed": None,
+                    "expectedShipmentWindow": None,
+                }
+            ]
         )
         notify_status.assert_called_once_with("ups-1", "delivered")
 
@@ -341,7 +357,8 @@ class TestUpsStatusSyncService(unittest.TestCase):
             patch.object(svc, "_max_runtime_seconds", return_value=45), \
             patch.object(svc, "_throttle_ms", return_value=0), \
             patch.object(svc.ups_tracking, "fetch_tracking_status", return_value={"trackingStatus": "Unknown"}), \
-            patch.object(svc.order_repository, "update_ups_tracking_status") as update_status:
+            patch.object(svc.order_repository, "update_ups_tracking_statuses") as update_status, \
+            patch.object(svc, "_invalidate_order_report_caches") as drop_report_caches:
             result = svc.run_sync_once(ignore_cooldown=True)
 
         self.assertEqual(result["status"], "success")
@@ -349,6 +366,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
         self.assertEqual(result["updated"], 0)
         self.assertEqual(result["missing"], 1)
         update_status.assert_not_called()
+        drop_report_caches.assert_not_called()
 
     def test_run_sync_once_notifies_when_status_is_unchanged_but_email_missing(self):
         from python_backend.services import ups_status_sync_service as svc
@@ -375,7 +393,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
             patch.object(svc, "_max_runtime_seconds", return_value=45), \
             patch.object(svc, "_throttle_ms", return_value=0), \
             patch.object(svc.ups_tracking, "fetch_tracking_status", return_value={"trackingStatus": "Out for Delivery"}), \
-            patch.object(svc.order_repository, "update_ups_tracking_status") as update_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses") as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
 
@@ -410,7 +428,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
             patch.object(svc, "_max_runtime_seconds", return_value=45), \
             patch.object(svc, "_throttle_ms", return_value=0), \
             patch.object(svc.ups_tracking, "fetch_tracking_status", return_value={"trackingStatus": "In Transit"}), \
-            patch.object(svc.order_repository, "update_ups_tracking_status") as update_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses") as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
 
@@ -454,7 +472,7 @@ class TestUpsStatusSyncService(unittest.TestCase):
                     "expectedShipmentWindow": "Tuesday, April 7, 2026, between 2:00 PM - 6:00 PM",
                 },
             ), \
-            patch.object(svc.order_repository, "update_ups_tracking_status", return_value={"id": "ups-2"}) as update_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses", return_value={"ups-2": {"id": "ups-2"}}) as update_status, \
             patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
             result = svc.run_sync_once(ignore_cooldown=True)
 
@@ -462,15 +480,121 @@ class TestUpsStatusSyncService(unittest.TestCase):
         self.assertEqual(result["processed"], 1)
         self.assertEqual(result["updated"], 1)
         update_status.assert_called_once_with(
-            "ups-2",
-            ups_tracking_status="in_transit",
-            delivered_at=None,
-            estimated_arrival_date="2026-04-07T18:00:00",
-            delivery_date_guaranteed="2026-04-07T00:00:00",
-            expected_shipment_window="Tuesday, April 7, 2026, between 2:00 PM - 6:00 PM",
+            [
+                {
+                    "orderId": "ups-2",
+                    "upsTrackingStatus": "in_transit",
+                    "deliveredAt": None,
+                    "estimatedArrivalDate": "2026-04-07T18:00:00",
+                    "deliveryDateGuaranteed": "2026-04-07T00:00:00",
+                    "expectedShipmentWindow": "Tuesday, April 7, 2026, between 2:00 PM - 6:00 PM",
+                }
+            ]
         )
         notify_status.assert_called_once_with("ups-2", "in_transit")
 
+    def test_run_sync_once_fetches_shared_tracking_number_once_and_writes_in_one_batch(self):
+        from python_backend.services import ups_status_sync_service as svc
+
+        candidate_orders = [
+            {
+                "id": f"ups-{index}",
+                "trackingNumber": tracking,
+                "shippingCarrier": "ups",
+                "status": "processing",
+                "createdAt": "2026-04-01T12:00:00Z",
+            }
+            for index, tracking in enumerate(["1ZSHARED01", "1zshared01", "1ZOTHER002"])
+        ]
+
+        with patch.object(svc, "_enabled", return_value=True), \
+            patch.object(svc.ups_tracking, "is_configured", return_value=True), \
+            patch.object(svc, "_try_acquire_lease", return_value="lease-1"), \
+            patch.object(svc, "_release_lease"), \
+            patch.object(svc, "_get_last_run_at", return_value=None), \
+            patch.object(svc, "_set_last_run_at"), \
+            patch.object(svc, "_fetch_orders_for_sync", return_value=candidate_orders), \
+            patch.object(svc, "_max_runtime_seconds", return_value=45), \
+            patch.object(svc, "_throttle_ms", return_value=0), \
+            patch.object(svc, "_fetch_concurrency", return_value=4), \
+            patch.object(
+                svc.ups_tracking,
+                "fetch_tracking_status",
+                return_value={"trackingStatus": "In Transit"},
+            ) as fetch_tracking_status, \
+            patch.object(svc.order_repository, "update_ups_tracking_statuses", return_value={}) as update_status, \
+            patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status:
+            result = svc.run_sync_once(ignore_cooldown=True)
+
+        self.assertEqual(result["processed"], 3)
+        self.assertEqual(result["updated"], 3)
+        self.assertEqual(fetch_tracking_status.call_count, 2)
+        update_status.assert_called_once()
+        self.assertEqual(
+            [entry["orderId"] for entry in update_status.call_args.args[0]],
+            ["ups-0", "ups-1", "ups-2"],
+        )
+        self.assertEqual(notify_status.call_count, 3)
+
+    def test_run_sync_once_counts_write_failures_per_order(self):
+        from python_backend.services import ups_status_sync_service as svc
+
+        candidate_orders = [
+            {
+                "id": f"ups-{index}",
+                "trackingNumber": f"1ZORDER00{index}",
+                "shippingCarrier": "ups",
+                "status": "processing",
+                "createdAt": "2026-04-01T12:00:00Z",
+            }
+            for index in range(3)
+        ]
+
+        with patch.object(svc, "_enabled", return_value=True), \
+            patch.object(svc.ups_tracking, "is_configured", return_value=True), \
+            patch.object(svc, "_try_acquire_lease", return_value="lease-1"), \
+            patch.object(svc, "_release_lease"), \
+            patch.object(svc, "_get_last_run_at", return_value=None), \
+            patch.object(svc, "_set_last_run_at"), \
+            patch.object(svc, "_fetch_orders_for_sync", return_value=candidate_orders), \
+            patch.object(svc, "_max_runtime_seconds", return_value=45), \
+            patch.object(svc, "_throttle_ms", return_value=0), \
+            patch.object(svc, "_fetch_concurrency", return_value=4), \
+            patch.object(
+                svc.ups_tracking,
+                "fetch_tracking_status",
+                return_value={"trackingStatus": "In Transit"},
+            ), \
+            patch.object(
+                svc.order_repository,
+                "update_ups_tracking_statuses",
+                return_value={
+                    "ups-0": {"id": "ups-0"},
+                    "ups-1": RuntimeError("row locked"),
+                    "ups-2": {"id": "ups-2"},
+                },
+            ), \
+            patch.object(svc.shipping_notification_service, "notify_customer_order_shipping_status") as notify_status, \
+            patch.object(svc, "_invalidate_order_report_caches") as drop_report_caches:
+            result = svc.run_sync_once(ignore_cooldown=True)
+
+        self.assertEqual(result["updated"], 2)
+        self.assertEqual(result["failed"], 1)
+        drop_report_caches.assert_called_once_with()
+        self.assertEqual(
+            sorted(call.args[0] for call in notify_status.call_args_list),
+            ["ups-0", "ups-2"],
+        )
+
+    def test_fetch_tracking_batch_stops_starting_calls_after_deadline(self):
+        from python_backend.services import ups_status_sync_service as svc
+
+        with patch.object(svc.ups_tracking, "fetch_tracking_status") as fetch_tracking_status:
+            results = svc._fetch_tracking_batch(["1ZA", "1ZB"], deadline=0.0, throttle_ms=0)
+
+        self.assertEqual(results, {})
+        fetch_tracking_status.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -65,6 +65,7 @@ if HAS_FLASK:
     from python_backend.middleware import shadow_mode as shadow_mode_module
     from python_backend.repositories import sales_prospect_repository
     from python_backend.repositories import user_repository
+    from python_backend.services import email_campaign_service
     from python_backend.services import patient_links_sweep_service
     from python_backend.services import presence_sweep_service
     from python_backend.services import product_document_sync_service
@@ -95,6 +96,7 @@ class AppBootstrapModeTests(unittest.TestCase):
             patch.object(ups_status_sync_service, "start_ups_status_sync", side_effect=lambda: order.append("ups")), \
             patch.object(presence_sweep_service, "start_presence_sweep", side_effect=lambda: order.append("presence")), \
             patch.object(patient_links_sweep_service, "start_patient_links_sweep", side_effect=lambda: order.append("patient")), \
+            patch.object(email_campaign_service, "start_email_campaign_worker", side_effect=lambda: order.append("email")), \
             patch.object(request_logging_module, "init_request_logging"), \
             patch.object(rate_limit_module, "init_rate_limit"), \
             patch.object(shadow_mode_module, "init_shadow_mode"), \
@@ -127,6 +129,7 @@ class AppBootstrapModeTests(unittest.TestCase):
             patch.object(ups_status_sync_service, "start_ups_status_sync", side_effect=lambda: order.append("ups")), \
             patch.object(presence_sweep_service, "start_presence_sweep", side_effect=lambda: order.append("presence")), \
             patch.object(patient_links_sweep_service, "start_patient_links_sweep", side_effect=lambda: order.append("patient")), \
+            patch.object(email_campaign_service, "start_email_campaign_worker", side_effect=lambda: order.append("email")), \
             patch.object(request_logging_module, "init_request_logging"), \
             patch.object(rate_limit_module, "init_rate_limit"), \
             patch.object(shadow_mode_module, "init_shadow_mode"), \
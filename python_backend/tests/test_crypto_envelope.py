@@ -13,6 +13,15 @@ if "requests" not in sys.modules:
         def __init__(self, *_args, **_kwargs):
             pass
 
+    class RequestException(Exception):
+        pass
+
+    class Timeout(RequestException):
+        pass
+
+    class HTTPError(RequestException):
+        pass
+
     def _blocked(*_args, **_kwargs):
         raise RuntimeError("requests used during unit test")
 
@@ -21,6 +30,9 @@ if "requests" not in sys.modules:
     requests.put = _blocked
     requests.patch = _blocked
     requests.delete = _blocked
+    requests.RequestException = RequestException
+    requests.Timeout = Timeout
+    requests.HTTPError = HTTPError
     requests_auth.HTTPBasicAuth = HTTPBasicAuth
     sys.modules["requests"] = requests
     sys.modules["requests.auth"] = requests_auth
@@ -48,9 +60,11 @@ class CryptoEnvelopeTests(unittest.TestCase):
     def setUp(self) -> None:
         self._original_get_config = crypto_envelope.get_config
         crypto_envelope.get_config = lambda: _config_for_key("test-master-key")
+        crypto_envelope.clear_data_key_cache()
 
     def tearDown(self) -> None:
         crypto_envelope.get_config = self._original_get_config
+        crypto_envelope.clear_data_key_cache()
 
     def test_encrypt_text_round_trip(self) -> None:
         ciphertext = crypto_envelope.encrypt_text(
@@ -91,6 +105,46 @@ class CryptoEnvelopeTests(unittest.TestCase):
                 aad={"table": "patient_links", "record_ref": "abc", "field": "patient_id"},
             )
 
+    def test_wrong_key_is_rejected_after_data_key_was_cached(self) -> None:
+        aad = {"table": "patient_links", "record_ref": "abc", "field": "patient_id"}
+        ciphertext = crypto_envelope.encrypt_text("patient-123", aad=aad)
+        self.assertEqual(crypto_envelope.decrypt_text(ciphertext, aad=aad), "patient-123")
+
+        crypto_envelope.get_config = lambda: _config_for_key("different-master-key")
+
+        with self.assertRaises(Exception):
+            crypto_envelope.decrypt_text(ciphertext, aad=aad)
+
+    def test_repeat_decrypt_reuses_unwrapped_data_key(self) -> None:
+        aad = {"table": "orders", "record_ref": "1", "field": "payload"}
+        ciphertext = crypto_envelope.encrypt_text("{}", aad=aad)
+        crypto_envelope.decrypt_text(ciphertext, aad=aad)
+
+        original_aead = crypto_envelope._aead
+        crypto_envelope._aead = lambda _key: self.fail("data key should come from the cache")
+        try:
+            self.assertEqual(crypto_envelope.decrypt_text(ciphertext, aad=aad), "{}")
+        finally:
+            crypto_envelope._aead = original_aead
+
+    def test_decrypt_many_round_trips_and_tolerates_bad_rows(self) -> None:
+        aads = [{"table": "orders", "record_ref": str(idx), "field": "payload"} for idx in range(3)]
+        values = [crypto_envelope.encrypt_text(f"value-{idx}", aad=aad) for idx, aad in enumerate(aads)]
+        values.append("plain text")
+
+        self.assertEqual(
+            crypto_envelope.decrypt_many(values, aads=aads + [None]),
+            ["value-0", "value-1", "value-2", "plain text"],
+        )
+
+        swapped = [aads[1], aads[0], aads[2], None]
+        self.assertEqual(
+            crypto_envelope.decrypt_many(values, aads=swapped, ignore_errors=True),
+            [None, None, "value-2", "plain text"],
+        )
+        with self.assertRaises(Exception):
+            crypto_envelope.decrypt_many(values, aads=swapped)
+
     def test_blind_index_is_stable_for_normalized_email(self) -> None:
         first = crypto_envelope.compute_blind_index(
             "Doctor@Example.com ",
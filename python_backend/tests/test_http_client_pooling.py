@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from python_backend.utils import http_client
+
+
+def _response(status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    return response
+
+
+class HttpClientPoolingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        http_client.close_sessions()
+        http_client._METRICS.clear()
+
+    def tearDown(self) -> None:
+        http_client.close_sessions()
+        http_client._METRICS.clear()
+
+    def test_session_is_shared_per_host(self) -> None:
+        first = http_client.session_for("https://api.example.test/v1/a")
+        second = http_client.session_for("https://API.example.test/v1/b?x=1")
+        other = http_client.session_for("https://other.example.test/")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_pool_size_follows_caller_concurrency(self) -> None:
+        session = http_client.session_for("https://woo.example.test/", pool_maxsize=7)
+
+        adapter = session.get_adapter("https://woo.example.test/")
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    def test_request_reuses_pooled_session_and_records_metrics(self) -> None:
+        with patch.object(requests.Session, "request", return_value=_response()) as send:
+            http_client.get("https://api.example.test/one")
+            http_client.post("https://api.example.test/two", json={})
+
+        self.assertEqual(send.call_count, 2)
+        metrics = http_client.get_metrics()["https://api.example.test"]
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["errors"], 0)
+        self.assertIsNotNone(metrics["avgMs"])
+
+    def test_failed_requests_count_as_errors(self) -> None:
+        with patch.object(requests.Session, "request", side_effect=requests.ConnectionError("down")):
+            with self.assertRaises(requests.ConnectionError):
+                http_client.get("https://api.example.test/")
+        with patch.object(requests.Session, "request", return_value=_response(502)):
+            http_client.get("https://api.example.test/")
+
+        metrics = http_client.get_metrics()["https://api.example.test"]
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["errors"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from python_backend.storage.json_store import JsonStore
+
+
+class JsonStoreDecodedCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _store(self, **kwargs) -> JsonStore:
+        store = JsonStore(
+            base_dir=Path(self._tmp.name),
+            file_name="orders.json",
+            default_factory=list,
+            encryption_secret="secret",
+            **kwargs,
+        )
+        store.init()
+        return store
+
+    def test_unchanged_file_is_decoded_once_and_reads_get_private_copies(self) -> None:
+        store = self._store()
+        store.write([{"id": "o1", "items": [{"sku": "a"}]}])
+
+        with patch.object(store, "_decrypt", wraps=store._decrypt) as decrypt:
+            first = store.read()
+            first[0]["items"].append({"sku": "mutated"})
+            second = store.read()
+
+        self.assertEqual(decrypt.call_count, 1)
+        self.assertEqual(second, [{"id": "o1", "items": [{"sku": "a"}]}])
+
+    def test_write_from_another_store_instance_invalidates(self) -> None:
+        store = self._store()
+        other = self._store()
+        store.write([{"id": "o1"}])
+        self.assertEqual(store.read(), [{"id": "o1"}])
+
+        other.write([{"id": "o1"}, {"id": "o2"}])
+
+        self.assertEqual([row["id"] for row in store.read()], ["o1", "o2"])
+        os.remove(store.file_path)
+        self.assertEqual(store.read(), [])
+
+    def test_shared_mode_returns_the_cached_object(self) -> None:
+        store = self._store(copy_on_read=False)
+        store.write([{"id": "o1"}])
+
+        self.assertIs(store.read(), store.read())
+
+
+class JsonStoreJournalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _store(self, file_name: str = "orders.json", default_factory=list, **kwargs) -> JsonStore:
+        store = JsonStore(
+            base_dir=Path(self._tmp.name),
+            file_name=file_name,
+            default_factory=default_factory,
+            encryption_secret="secret",
+            journal_enabled=True,
+            **kwargs,
+        )
+        store.init()
+        return store
+
+    def test_record_updates_append_to_the_journal_and_replay_on_read(self) -> None:
+        store = self._store()
+        store.write([{"id": "o1", "status": "new"}, {"id": "o2", "status": "new"}])
+        snapshot = store.file_path.read_text(encoding="utf-8")
+
+        store.write([{"id": "o1", "status": "paid"}, {"id": "o2", "status": "new"}, {"id": "o3"}])
+        store.write([{"id": "o1", "status": "paid"}, {"id": "o3"}])
+
+        self.assertEqual(store.file_path.read_text(encoding="utf-8"), snapshot)
+        self.assertEqual(len(store.journal_path.read_text(encoding="utf-8").splitlines()), 3)
+        self.assertNotIn("paid", store.journal_path.read_text(encoding="utf-8"))
+        fresh = self._store()
+        self.assertFalse(fresh.journal_path.exists())
+        self.assertEqual(fresh.read(), [{"id": "o1", "status": "paid"}, {"id": "o3"}])
+
+    def test_reorders_and_size_threshold_fall_back_to_a_snapshot(self) -> None:
+        store = self._store(journal_compact_bytes=200)
+        store.write([{"id": "o1"}, {"id": "o2"}])
+        store.write([{"id": "o2"}, {"id": "o1"}])
+        self.assertFalse(store.journal_path.exists())
+
+        store.write([{"id": "o2"}, {"id": "o1", "note": "x" * 300}])
+        self.assertFalse(store.journal_path.exists())
+        self.assertEqual(store.read(), [{"id": "o2"}, {"id": "o1", "note": "x" * 300}])
+
+    def test_dict_stores_journal_per_key_and_skip_torn_lines(self) -> None:
+        store = self._store("settings.json", default_factory=dict)
+        store.write({"shopEnabled": True, "betaServices": []})
+        store.write({"shopEnabled": False, "betaServices": []})
+        with open(store.journal_path, "a", encoding="utf-8") as handle:
+            handle.write('{"v": 1, "iv"')
+
+        store.invalidate_cache()
+        self.assertEqual(store.read(), {"shopEnabled": False, "betaServices": []})
+
+    def test_append_after_a_torn_tail_is_not_lost(self) -> None:
+        store = self._store()
+        store.write([{"id": "o1", "status": "new"}])
+        store.write([{"id": "o1", "status": "paid"}])
+        with open(store.journal_path, "a", encoding="utf-8") as handle:
+            handle.write('{"v": 1, "iv"')
+
+        store.invalidate_cache()
+        with self.assertLogs("python_backend.storage.json_store", level="WARNING"):
+            store.write([{"id": "o1", "status": "paid"}, {"id": "o2"}])
+
+        journal = store.journal_path.read_text(encoding="utf-8")
+        self.assertTrue(journal.endswith("\n"))
+        self.assertEqual([json.loads(line)["v"] for line in journal.splitlines()], [1, 1, 1])
+        store.invalidate_cache()
+        self.assertEqual(store.read(), [{"id": "o1", "status": "paid"}, {"id": "o2"}])
+
+    def test_corrupt_middle_journal_entry_raises(self) -> None:
+        store = self._store()
+        store.write([{"id": "o1", "status": "new"}])
+        store.write([{"id": "o1", "status": "paid"}])
+        journal = store.journal_path.read_text(encoding="utf-8")
+        store.journal_path.write_text("not json\n" + journal, encoding="utf-8")
+
+        store.invalidate_cache()
+        with self.assertRaises(ValueError):
+            store.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from python_backend.database import mysql_client
+
+
+class MysqlClientTransactionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connection = MagicMock()
+        self.cursor = self.connection.cursor.return_value
+        self.cursor.execute.return_value = 1
+        for patcher in (
+            patch.object(mysql_client, "is_enabled", return_value=True),
+            patch.object(mysql_client, "_acquire_connection", return_value=self.connection),
+            patch.object(mysql_client, "_release_connection"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_statements_in_a_transaction_share_one_connection_and_commit(self) -> None:
+        with mysql_client.transaction():
+            mysql_client.execute("UPDATE orders SET status = 'x' WHERE id = %(id)s", {"id": "o1"})
+            with mysql_client.transaction():
+                mysql_client.fetch_one("SELECT 1")
+            self.assertTrue(mysql_client.in_transaction())
+            self.connection.commit.assert_not_called()
+
+        self.assertFalse(mysql_client.in_transaction())
+        mysql_client._acquire_connection.assert_called_once()
+        self.connection.commit.assert_called_once()
+        mysql_client._release_connection.assert_called_once_with(self.connection)
+
+    def test_error_rolls_back_and_unpins(self) -> None:
+        with self.assertRaises(ValueError):
+            with mysql_client.transaction():
+                mysql_client.execute("DELETE FROM orders WHERE id = %(id)s", {"id": "o1"})
+                raise ValueError("boom")
+
+        self.connection.rollback.assert_called_once()
+        self.connection.commit.assert_not_called()
+        self.assertFalse(mysql_client.in_transaction())
+
+    def test_after_commit_callbacks_run_once_committed_and_are_dropped_on_rollback(self) -> None:
+        events = []
+        self.connection.commit.side_effect = lambda: events.append("commit")
+
+        with mysql_client.transaction():
+            mysql_client.after_commit(lambda: events.append("callback"))
+            self.assertEqual(events, [])
+
+        with self.assertRaises(ValueError):
+            with mysql_client.transaction():
+                mysql_client.after_commit(lambda: events.append("dropped"))
+                raise ValueError("boom")
+
+        mysql_client.after_commit(lambda: events.append("immediate"))
+        self.assertEqual(events, ["commit", "callback", "immediate"])
+
+    def test_failing_after_commit_callback_does_not_undo_the_commit(self) -> None:
+        def fail() -> None:
+            raise RuntimeError("lock wait timeout")
+
+        with self.assertLogs(mysql_client.logger, level="WARNING"):
+            with mysql_client.transaction():
+                mysql_client.after_commit(fail)
+
+        self.connection.commit.assert_called_once()
+        self.connection.rollback.assert_not_called()
+        self.assertFalse(mysql_client.in_transaction())
+
+    def test_bulk_upsert_writes_one_statement_per_chunk(self) -> None:
+        rows = ({"id": index, "name": f"n{index}", "qty": index} for index in range(5))
+
+        affected = mysql_client.bulk_upsert("stock", rows, update_columns=("qty",), chunk_size=2)
+
+        statements = [call.args for call in self.cursor.execute.call_args_list]
+        self.assertEqual(affected, 3)
+        self.assertEqual(len(statements), 3)
+        query, params = statements[0]
+        self.assertTrue(query.startswith("INSERT INTO `stock` (`id`, `name`, `qty`) VALUES (%(r0_0)s"))
+        self.assertTrue(query.endswith("ON DUPLICATE KEY UPDATE `qty` = VALUES(`qty`)"))
+        self.assertEqual(params["r1_1"], "n1")
+        self.connection.commit.assert_called_once()
+
+    def test_bulk_insert_rejects_unsafe_identifiers_and_skips_empty_input(self) -> None:
+        self.assertEqual(mysql_client.bulk_insert("stock", []), 0)
+        mysql_client._acquire_connection.assert_not_called()
+        with self.assertRaises(ValueError):
+            mysql_client.bulk_insert("stock; DROP TABLE users", [{"id": 1}])
+
+
+class MysqlClientStreamingTests(unittest.TestCase):
+    def test_iter_rows_streams_batches_on_a_dedicated_connection(self) -> None:
+        connection = MagicMock()
+        stream_cursor = connection.cursor.return_value
+        stream_cursor.fetchmany.side_effect = [[{"id": 1}, {"id": 2}], [{"id": 3}], []]
+        sscursor = object()
+
+        with patch.object(mysql_client, "_create_connection", return_value=connection), \
+            patch.object(mysql_client, "_acquire_connection") as acquire, \
+            patch.object(mysql_client.pymysql.cursors, "SSDictCursor", sscursor, create=True):
+            rows = list(mysql_client.iter_rows("SELECT id FROM orders", batch_size=2))
+
+        self.assertEqual(rows, [{"id": 1}, {"id": 2}, {"id": 3}])
+        acquire.assert_not_called()
+        connection.cursor.assert_called_once_with(sscursor)
+        stream_cursor.fetchmany.assert_called_with(2)
+        stream_cursor.close.assert_called_once()
+        connection.close.assert_called_once()
+
+    def test_abandoned_stream_drops_the_connection_without_draining(self) -> None:
+        connection = MagicMock()
+        stream_cursor = connection.cursor.return_value
+        stream_cursor.fetchmany.return_value = [{"id": 1}, {"id": 2}]
+
+        with patch.object(mysql_client, "_create_connection", return_value=connection), \
+            patch.object(mysql_client.pymysql.cursors, "SSDictCursor", object(), create=True):
+            rows = mysql_client.iter_rows("SELECT id FROM orders")
+            self.assertEqual(next(rows), {"id": 1})
+            rows.close()
+
+        stream_cursor.close.assert_not_called()
+        connection.close.assert_called_once()
+
+
+class MysqlClientPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._saved = (mysql_client._config, mysql_client._pool, mysql_client._pool_total, dict(mysql_client._pool_metrics))
+        mysql_client.configure(
+            SimpleNamespace(
+                mysql={
+                    "enabled": True,
+                    "connection_limit": 2,
+                    "pool_min": 2,
+                    "pool_validate_idle_seconds": 30,
+                    "pool_max_lifetime_seconds": 600,
+                    "pool_wait_seconds": 0.05,
+                }
+            )
+        )
+        self.clock = [1000.0]
+        patcher = patch.object(mysql_client.time, "monotonic", side_effect=lambda: self.clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        create = patch.object(mysql_client, "_create_connection", side_effect=lambda: MagicMock(open=True))
+        self.create = create.start()
+        self.addCleanup(create.stop)
+
+    def tearDown(self) -> None:
+        mysql_client._config, mysql_client._pool, mysql_client._pool_total, metrics = self._saved
+        mysql_client._pool_metrics.update(metrics)
+        mysql_client._connection_meta.clear()
+
+    def test_only_idle_connections_are_pinged_and_old_ones_recycled(self) -> None:
+        self.assertEqual(mysql_client.warm_up(), 2)
+        self.assertEqual(self.create.call_count, 2)
+
+        connection = mysql_client._acquire_connection()
+        connection.ping.assert_not_called()
+        mysql_client._release_connection(connection)
+
+        self.clock[0] += 45
+        connection = mysql_client._acquire_connection()
+        connection.ping.assert_called_once_with(reconnect=False)
+        mysql_client._release_connection(connection)
+
+        self.clock[0] += 600
+        recycled = mysql_client._acquire_connection()
+        self.assertIsNot(recycled, connection)
+        self.assertEqual(self.create.call_count, 3)
+        recycled.ping.assert_not_called()
+
+        metrics = mysql_client.get_pool_metrics()
+        self.assertGreaterEqual(metrics["recycled"], 1)
+        self.assertEqual(metrics["open"], 2)
+        self.assertEqual(metrics["inUse"], 1)
+
+    def test_saturated_pool_counts_exhaustion(self) -> None:
+        before = mysql_client.get_pool_metrics()["exhausted"]
+        held = [mysql_client._acquire_connection(), mysql_client._acquire_connection()]
+
+        with self.assertRaises(Exception):
+            mysql_client._acquire_connection()
+
+        self.assertEqual(mysql_client.get_pool_metrics()["exhausted"], before + 1)
+        for connection in held:
+            mysql_client._release_connection(connection)
+
+
+if __name__ == "__main__":
+    unittest.main()
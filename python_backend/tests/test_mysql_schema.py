@@ -5,7 +5,8 @@ import inspect
 import sys
 import types
 import unittest
-from unittest.mock import patch
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
 
 fake_pymysql = types.ModuleType("pymysql")
 fake_pymysql.connect = lambda *args, **kwargs: None
@@ -69,7 +70,7 @@ class MysqlSchemaTests(unittest.TestCase):
         self.assertIn("CREATE TABLE IF NOT EXISTS email_unsubscribes", schema_sql)
         self.assertIn("recipient_email VARCHAR(190) PRIMARY KEY", schema_sql)
 
-        schema_migrations = inspect.getsource(mysql_schema.ensure_schema)
+        schema_migrations = inspect.getsource(mysql_schema._apply_schema)
         self.assertIn("ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS scheduled_at DATETIME NULL", schema_migrations)
 
     def test_product_brochure_info_schema_exists(self) -> None:
@@ -187,6 +188,274 @@ class MysqlSchemaTests(unittest.TestCase):
 
         execute.assert_not_called()
 
+    def test_usage_tracking_events_table_is_append_only_and_indexed(self) -> None:
+        schema_sql = "\n".join(mysql_schema.CREATE_TABLE_STATEMENTS)
+
+        self.assertIn("CREATE TABLE IF NOT EXISTS usage_tracking_events", schema_sql)
+        self.assertIn("actor_key VARCHAR(255) NULL", schema_sql)
+        self.assertIn("KEY idx_usage_tracking_events_event_time (event, created_at)", schema_sql)
+        self.assertIn("KEY idx_usage_tracking_events_event_actor (event, actor_key)", schema_sql)
+
+    def test_usage_tracking_events_backfill_explodes_legacy_instances(self) -> None:
+        execute_calls = []
+
+        def fake_execute(query, params=None):
+            execute_calls.append((" ".join(str(query).split()), params))
+            return 1
+
+        legacy_rows = [
+            {
+                "event": "delegate_link_created",
+                "details_json": json.dumps(
+                    {
+                        "count": 2,
+                        "instances": [
+                            {"who": {"id": "u1"}, "when": "2026-03-17T02:00:00+00:00"},
+                            {"who": {"email": "Doc@Example.com"}, "when": "2026-03-17T03:00:00Z"},
+                        ],
+                    }
+                ),
+                "created_at": None,
+            },
+        ]
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value=None), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_all", return_value=legacy_rows), \
+            patch("python_backend.database.mysql_schema.mysql_client.execute", side_effect=fake_execute):
+            mysql_schema._backfill_usage_tracking_events_once(table_exists=lambda _table: True)
+
+        self.assertIn("INSERT IGNORE INTO settings", execute_calls[0][0])
+        self.assertIn("INSERT INTO usage_tracking_events", execute_calls[1][0])
+        insert_params = execute_calls[1][1]
+        self.assertEqual(insert_params["actor_key_0"], "id:u1")
+        self.assertEqual(insert_params["created_at_0"], "2026-03-17 02:00:00")
+        self.assertEqual(insert_params["actor_key_1"], "email:doc@example.com")
+        self.assertIn("UPDATE settings", execute_calls[-1][0])
+        marker = json.loads(execute_calls[-1][1]["value_json"])
+        self.assertEqual(marker["status"], "complete")
+        self.assertEqual(marker["insertedRows"], 2)
+
+    def test_usage_tracking_events_backfill_resumes_after_failing_midway(self) -> None:
+        settings: dict = {}
+        events: list = []
+        legacy_rows = [
+            {
+                "id": legacy_id,
+                "event": "login",
+                "details_json": json.dumps({"instances": [{"who": {"id": f"u{legacy_id}"}}]}),
+                "created_at": None,
+            }
+            for legacy_id in (1, 2, 3)
+        ]
+        fail_inserts = {"remaining": 1}
+
+        def fake_fetch_one(_query, params=None):
+            value = settings.get(params["key"])
+            return {"value_json": value} if value is not None else None
+
+        def fake_fetch_all(_query, params=None):
+            return [row for row in legacy_rows if row["id"] > params["after_id"]]
+
+        def fake_execute(query, params=None):
+            sql = " ".join(str(query).split())
+            if sql.startswith("INSERT IGNORE INTO settings"):
+                if params["key"] in settings:
+                    return 0
+                settings[params["key"]] = params["value_json"]
+                return 1
+            if sql.startswith("UPDATE settings"):
+                if "previous" in params and settings.get(params["key"]) != params["previous"]:
+                    return 0
+                settings[params["key"]] = params["value_json"]
+                return 1
+            if sql.startswith("INSERT INTO usage_tracking_events"):
+                if len(events) == 1 and fail_inserts["remaining"]:
+                    fail_inserts["remaining"] -= 1
+                    raise RuntimeError("lost connection")
+                events.append(params["actor_key_0"])
+                return 1
+            raise AssertionError(sql)
+
+        with patch.object(mysql_schema, "_USAGE_TRACKING_EVENTS_BACKFILL_CHUNK", 1), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_one", side_effect=fake_fetch_one), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_all", side_effect=fake_fetch_all), \
+            patch("python_backend.database.mysql_schema.mysql_client.execute", side_effect=fake_execute):
+            mysql_schema._backfill_usage_tracking_events_once(table_exists=lambda _table: True)
+            failed = json.loads(settings[mysql_schema._USAGE_TRACKING_EVENTS_BACKFILL_KEY])
+            mysql_schema._backfill_usage_tracking_events_once(table_exists=lambda _table: True)
+            mysql_schema._backfill_usage_tracking_events_once(table_exists=lambda _table: True)
+
+        self.assertEqual(failed["status"], "failed")
+        self.assertEqual(failed["lastLegacyId"], 1)
+        self.assertEqual(events, ["id:u1", "id:u2", "id:u3"])
+        marker = json.loads(settings[mysql_schema._USAGE_TRACKING_EVENTS_BACKFILL_KEY])
+        self.assertEqual(marker["status"], "complete")
+        self.assertEqual(marker["insertedRows"], 3)
+
+    def test_usage_tracking_events_backfill_skips_when_claim_lost(self) -> None:
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value=None), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_all") as fetch_all, \
+            patch("python_backend.database.mysql_schema.mysql_client.execute", return_value=0):
+            mysql_schema._backfill_usage_tracking_events_once(table_exists=lambda _table: True)
+
+        fetch_all.assert_not_called()
+
+    def test_ensure_schema_skips_full_pass_when_fingerprint_matches(self) -> None:
+        fingerprint = mysql_schema.schema_fingerprint()
+        with patch(
+            "python_backend.database.mysql_schema.mysql_client.fetch_one",
+            return_value={"fingerprint": fingerprint},
+        ) as fetch_one, \
+            patch("python_backend.database.mysql_schema.mysql_client.named_lock") as named_lock, \
+            patch("python_backend.database.mysql_schema._apply_schema") as apply_schema, \
+            patch("python_backend.database.mysql_schema._run_pending_backfills") as run_backfills:
+            mysql_schema.ensure_schema()
+
+        self.assertEqual(fetch_one.call_count, 1)
+        self.assertIn("FROM schema_version", fetch_one.call_args.args[0])
+        named_lock.assert_not_called()
+        apply_schema.assert_not_called()
+        run_backfills.assert_called_once_with()
+
+    def test_ensure_schema_resumes_abandoned_backfill_when_fingerprint_matches(self) -> None:
+        fingerprint = mysql_schema.schema_fingerprint()
+        key = mysql_schema._USAGE_TRACKING_EVENTS_BACKFILL_KEY
+        settings = {key: json.dumps({"status": "running", "lastLegacyId": 1, "insertedRows": 1})}
+        events: list = []
+        legacy_rows = [
+            {
+                "id": legacy_id,
+                "event": "login",
+                "details_json": json.dumps({"who": {"id": f"u{legacy_id}"}}),
+                "created_at": None,
+            }
+            for legacy_id in (1, 2)
+        ]
+
+        def fake_fetch_one(query, params=None):
+            if "FROM schema_version" in query:
+                return {"fingerprint": fingerprint}
+            return {"value_json": settings[key], "updated_at": datetime(2020, 1, 1)}
+
+        def fake_execute(query, params=None):
+            sql = " ".join(str(query).split())
+            if sql.startswith("UPDATE settings"):
+                if "previous" in params and settings.get(params["key"]) != params["previous"]:
+                    return 0
+                settings[params["key"]] = params["value_json"]
+                return 1
+            if sql.startswith("INSERT INTO usage_tracking_events"):
+                events.append(params["actor_key_0"])
+                return 1
+            raise AssertionError(sql)
+
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", side_effect=fake_fetch_one), \
+            patch(
+                "python_backend.database.mysql_schema.mysql_client.fetch_all",
+                side_effect=lambda _query, params=None: [r for r in legacy_rows if r["id"] > params["after_id"]],
+            ), \
+            patch("python_backend.database.mysql_schema.mysql_client.execute", side_effect=fake_execute), \
+            patch("python_backend.database.mysql_schema.schema_catalog.has_table", return_value=True), \
+            patch("python_backend.database.mysql_schema._apply_schema") as apply_schema:
+            mysql_schema.ensure_schema()
+
+        apply_schema.assert_not_called()
+        self.assertEqual(events, ["id:u2"])
+        marker = json.loads(settings[key])
+        self.assertEqual(marker["status"], "complete")
+        self.assertEqual(marker["insertedRows"], 2)
+
+    def test_pending_backfills_tolerate_an_unavailable_schema_catalog(self) -> None:
+        marker = {"value_json": json.dumps({"status": "failed", "lastLegacyId": 1}), "updated_at": None}
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value=marker), \
+            patch(
+                "python_backend.database.mysql_schema.schema_catalog.has_table",
+                side_effect=RuntimeError("MySQL schema catalog unavailable"),
+            ), \
+            patch("python_backend.database.mysql_schema.mysql_client.execute") as execute:
+            mysql_schema._run_pending_backfills()
+
+        execute.assert_not_called()
+
+    def test_usage_tracking_events_backfill_leaves_a_live_run_alone(self) -> None:
+        marker = {
+            "value_json": json.dumps({"status": "running", "lastLegacyId": 1}),
+            "updated_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        }
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value=marker), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_all") as fetch_all, \
+            patch("python_backend.database.mysql_schema.mysql_client.execute") as execute:
+            mysql_schema._backfill_usage_tracking_events_once(table_exists=lambda _table: True)
+
+        execute.assert_not_called()
+        fetch_all.assert_not_called()
+
+    def test_ensure_schema_runs_full_pass_under_lock_and_records_fingerprint(self) -> None:
+        execute_calls = []
+        lock = MagicMock()
+        lock.__enter__.return_value = True
+        lock.__exit__.return_value = False
+
+        def fake_execute(query, params=None):
+            execute_calls.append((query, params))
+            return 1
+
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value={"fingerprint": "stale"}), \
+            patch("python_backend.database.mysql_schema.mysql_client.named_lock", return_value=lock) as named_lock, \
+            patch("python_backend.database.mysql_schema.mysql_client.execute", side_effect=fake_execute), \
+            patch("python_backend.database.mysql_schema._apply_schema") as apply_schema, \
+            patch("python_backend.database.mysql_schema._run_pending_backfills"):
+            mysql_schema.ensure_schema()
+
+        named_lock.assert_called_once()
+        apply_schema.assert_called_once_with()
+        self.assertIn("INSERT INTO schema_version", execute_calls[-1][0])
+        self.assertEqual(execute_calls[-1][1]["fingerprint"], mysql_schema.schema_fingerprint())
+
+    def test_ensure_schema_does_not_record_fingerprint_after_a_failed_step(self) -> None:
+        lock = MagicMock()
+        lock.__enter__.return_value = True
+        lock.__exit__.return_value = False
+
+        with patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value={"fingerprint": "stale"}), \
+            patch("python_backend.database.mysql_schema.mysql_client.named_lock", return_value=lock), \
+            patch("python_backend.database.mysql_schema.mysql_client.execute") as execute, \
+            patch("python_backend.database.mysql_schema._apply_schema", return_value=False), \
+            patch("python_backend.database.mysql_schema._run_pending_backfills"):
+            mysql_schema.ensure_schema()
+
+        self.assertFalse(any("schema_version" in str(call.args[0]) for call in execute.call_args_list))
+
+    def test_apply_schema_reports_a_swallowed_step_failure(self) -> None:
+        def fake_execute(query, params=None):
+            if "ADD INDEX idx_patient_links_status" in str(query):
+                raise RuntimeError("lock wait timeout")
+            return 1
+
+        with patch("python_backend.database.mysql_schema.mysql_client.execute", side_effect=fake_execute), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_one", return_value={"cnt": 0}), \
+            patch("python_backend.database.mysql_schema.mysql_client.fetch_all", return_value=[]), \
+            patch.object(mysql_schema, "_backfill_order_woo_identifiers_once", return_value=True):
+            clean = mysql_schema._apply_schema()
+
+        self.assertFalse(clean)
+
+    def test_ensure_schema_skips_when_peer_finished_while_waiting_for_lock(self) -> None:
+        fingerprint = mysql_schema.schema_fingerprint()
+        lock = MagicMock()
+        lock.__enter__.return_value = True
+        lock.__exit__.return_value = False
+
+        with patch(
+            "python_backend.database.mysql_schema.mysql_client.fetch_one",
+            side_effect=[None, {"fingerprint": fingerprint}],
+        ), \
+            patch("python_backend.database.mysql_schema.mysql_client.named_lock", return_value=lock), \
+            patch("python_backend.database.mysql_schema._apply_schema") as apply_schema, \
+            patch("python_backend.database.mysql_schema._run_pending_backfills"):
+            mysql_schema.ensure_schema()
+
+        apply_schema.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
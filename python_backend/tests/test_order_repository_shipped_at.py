@@ -44,12 +44,13 @@ if "cryptography" not in sys.modules:
     sys.modules["cryptography.hazmat.primitives.ciphers"] = ciphers
     sys.modules["cryptography.hazmat.primitives.ciphers.aead"] = aead
 
+from python_backend.database import schema_catalog
 from python_backend.repositories import order_repository
 
 
 class TestOrderRepositoryShippedAt(unittest.TestCase):
     def setUp(self):
-        order_repository._ORDERS_COLUMNS_CACHE = None
+        schema_catalog.invalidate()
         self.encrypt_json_patcher = patch(
             "python_backend.repositories.order_repository.encrypt_json",
             side_effect=lambda value, aad=None: f"cipher:{aad['field']}" if value is not None else None,
@@ -58,7 +59,7 @@ class TestOrderRepositoryShippedAt(unittest.TestCase):
 
     def tearDown(self):
         self.encrypt_json_patcher.stop()
-        order_repository._ORDERS_COLUMNS_CACHE = None
+        schema_catalog.invalidate()
 
     def test_to_db_params_uses_explicit_shipstation_ship_date(self):
         params = order_repository._to_db_params(
@@ -318,12 +319,12 @@ class TestOrderRepositoryShippedAt(unittest.TestCase):
     @patch("python_backend.repositories.order_repository._using_mysql", return_value=True)
     def test_update_fallback_still_syncs_tracking_columns(self, _using_mysql, mock_execute, mock_fetch_all, _find_by_id):
         mock_fetch_all.return_value = [
-            {"COLUMN_NAME": "tracking_number"},
-            {"COLUMN_NAME": "ups_tracking_status"},
-            {"COLUMN_NAME": "delivery_date"},
-            {"COLUMN_NAME": "shipping_rate"},
-            {"COLUMN_NAME": "expected_shipment_window"},
-            {"COLUMN_NAME": "updated_at"},
+            {"kind": "column", "table_name": "orders", "object_name": "tracking_number"},
+            {"kind": "column", "table_name": "orders", "object_name": "ups_tracking_status"},
+            {"kind": "column", "table_name": "orders", "object_name": "delivery_date"},
+            {"kind": "column", "table_name": "orders", "object_name": "shipping_rate"},
+            {"kind": "column", "table_name": "orders", "object_name": "expected_shipment_window"},
+            {"kind": "column", "table_name": "orders", "object_name": "updated_at"},
         ]
         mock_execute.side_effect = [
             Exception("missing newer schema column"),
@@ -616,6 +617,82 @@ class TestOrderRepositoryShippedAt(unittest.TestCase):
             "Tuesday, April 7, 2026, between 2:00 PM - 6:00 PM",
         )
 
+    @patch("python_backend.repositories.order_repository._mark_sales_rollup_dirty")
+    @patch("python_backend.repositories.order_repository.update")
+    @patch("python_backend.repositories.order_repository.mysql_client.execute")
+    @patch("python_backend.repositories.order_repository._rows_to_orders")
+    @patch("python_backend.repositories.order_repository.mysql_client.fetch_all")
+    @patch("python_backend.repositories.order_repository._using_mysql", return_value=True)
+    def test_update_ups_tracking_statuses_reads_orders_once(
+        self,
+        _using_mysql,
+        mock_fetch_all,
+        mock_rows_to_orders,
+        mock_execute,
+        mock_update,
+        mock_mark_dirty,
+    ):
+        mock_rows_to_orders.return_value = [
+            {"id": "order-11", "shippingEstimate": {"carrierId": "ups"}},
+            {"id": "order-12", "shippingEstimate": {"carrierId": "ups"}},
+        ]
+
+        results = order_repository.update_ups_tracking_statuses(
+            [
+                {"orderId": "order-11", "upsTrackingStatus": "in_transit"},
+                {"orderId": "order-12", "upsTrackingStatus": "delivered", "deliveredAt": "2026-04-02T10:15:00"},
+                {"orderId": "order-missing", "upsTrackingStatus": "delivered"},
+            ]
+        )
+
+        mock_fetch_all.assert_called_once()
+        self.assertIn("WHERE id IN", mock_fetch_all.call_args.args[0])
+        mock_update.assert_not_called()
+        mock_execute.assert_called_once()
+        query, params = mock_execute.call_args.args
+        self.assertIn("ups_tracking_status = CASE id", query)
+        self.assertNotIn("items", query)
+        self.assertEqual([params["id_0"], params["id_1"]], ["order-11", "order-12"])
+        self.assertEqual(params["ups_tracking_status_1"], "delivered")
+        mock_mark_dirty.assert_called_once_with("order-11", "order-12")
+        self.assertEqual(results["order-11"]["upsTrackingStatus"], "in_transit")
+        self.assertEqual(results["order-12"]["upsDeliveredAt"], "2026-04-02T10:15:00")
+        self.assertIsNone(results["order-missing"])
+
+    @patch("python_backend.repositories.order_repository.update")
+    @patch("python_backend.repositories.order_repository.mysql_client.execute", side_effect=RuntimeError("batch"))
+    @patch("python_backend.repositories.order_repository._rows_to_orders")
+    @patch("python_backend.repositories.order_repository.mysql_client.fetch_all")
+    @patch("python_backend.repositories.order_repository._using_mysql", return_value=True)
+    def test_update_ups_tracking_statuses_reports_failures_per_order(
+        self,
+        _using_mysql,
+        _mock_fetch_all,
+        mock_rows_to_orders,
+        _mock_execute,
+        mock_update,
+    ):
+        mock_rows_to_orders.return_value = [{"id": "order-13"}, {"id": "order-14"}]
+        failure = RuntimeError("row locked")
+
+        def _update(order):
+            if order["id"] == "order-14":
+                raise failure
+            return order
+
+        mock_update.side_effect = _update
+
+        with self.assertLogs("python_backend.repositories.order_repository", level="WARNING"):
+            results = order_repository.update_ups_tracking_statuses(
+                [
+                    {"orderId": "order-13", "upsTrackingStatus": "in_transit"},
+                    {"orderId": "order-14", "upsTrackingStatus": "in_transit"},
+                ]
+            )
+
+        self.assertEqual(results["order-13"]["upsTrackingStatus"], "in_transit")
+        self.assertIs(results["order-14"], failure)
+
     @patch("python_backend.repositories.order_repository.mysql_client.fetch_one")
     @patch("python_backend.repositories.order_repository._using_mysql", return_value=True)
     def test_find_by_order_identifier_matches_hash_prefixed_woo_number(self, _using_mysql, mock_fetch_one):
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import contextlib
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+if "pymysql" not in sys.modules:
+    pymysql_stub = types.ModuleType("pymysql")
+    pymysql_stub.connect = lambda *args, **kwargs: None
+    pymysql_stub.connections = types.SimpleNamespace(Connection=object)
+    pymysql_stub.err = types.SimpleNamespace(Error=Exception, OperationalError=Exception, InterfaceError=Exception)
+    cursors_stub = types.ModuleType("pymysql.cursors")
+    cursors_stub.DictCursor = object
+    pymysql_stub.cursors = cursors_stub
+    sys.modules["pymysql"] = pymysql_stub
+    sys.modules["pymysql.cursors"] = cursors_stub
+
+if "python_backend.storage" not in sys.modules:
+    storage_stub = types.ModuleType("python_backend.storage")
+    storage_stub.order_store = None
+    sys.modules["python_backend.storage"] = storage_stub
+
+if "cryptography" not in sys.modules:
+    cryptography = types.ModuleType("cryptography")
+    hazmat = types.ModuleType("cryptography.hazmat")
+    primitives = types.ModuleType("cryptography.hazmat.primitives")
+    ciphers = types.ModuleType("cryptography.hazmat.primitives.ciphers")
+    aead = types.ModuleType("cryptography.hazmat.primitives.ciphers.aead")
+
+    class AESGCM:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def encrypt(self, _iv, data, _aad):
+            return data
+
+        def decrypt(self, _iv, data, _aad):
+            return data
+
+    aead.AESGCM = AESGCM
+    sys.modules["cryptography"] = cryptography
+    sys.modules["cryptography.hazmat"] = hazmat
+    sys.modules["cryptography.hazmat.primitives"] = primitives
+    sys.modules["cryptography.hazmat.primitives.ciphers"] = ciphers
+    sys.modules["cryptography.hazmat.primitives.ciphers.aead"] = aead
+
+from python_backend.repositories import order_repository
+
+
+class OrderWooIdentifierIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executed: list[tuple[str, dict]] = []
+        self.upserted: list[dict] = []
+        for patcher in (
+            patch.object(order_repository, "_using_mysql", return_value=True),
+            patch.object(order_repository.mysql_client, "transaction", side_effect=contextlib.nullcontext),
+            patch.object(
+                order_repository.mysql_client,
+                "execute",
+                side_effect=lambda query, params=None: self.executed.append((query, params or {})),
+            ),
+            patch.object(
+                order_repository.mysql_client,
+                "bulk_upsert",
+                side_effect=lambda table, rows, **_kwargs: self.upserted.extend(rows),
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_lookup_is_one_indexed_query_on_the_normalized_identifier(self) -> None:
+        with patch.object(order_repository.mysql_client, "fetch_one", return_value={"id": "o1"}) as fetch_one, \
+            patch.object(order_repository, "_row_to_order", side_effect=lambda row: {"id": row["id"]}), \
+            patch.object(order_repository, "iter_all") as iter_all:
+            found = order_repository.find_by_woo_identifier("#1492")
+
+        self.assertEqual(found, {"id": "o1"})
+        fetch_one.assert_called_once()
+        query, params = fetch_one.call_args.args
+        self.assertIn("FROM order_woo_identifiers", query)
+        self.assertEqual(params, {"identifier": "1492"})
+        iter_all.assert_not_called()
+
+    def test_writes_add_identifiers_and_woo_field_updates_replace_them(self) -> None:
+        order_repository._index_written_order(
+            {
+                "id": "o1",
+                "wooOrderId": None,
+                "integrationDetails": {"wooCommerce": {"payload": {"number": "#9001"}}},
+            }
+        )
+        order_repository._index_written_order({"id": "o2", "integrationDetails": {}})
+        self.assertEqual(self.upserted, [{"order_id": "o1", "source": "details", "identifier": "9001"}])
+        self.assertEqual(self.executed, [])
+
+        order_repository.update_woo_fields("o1", "1492", None, "wc_order_key")
+        self.assertEqual(self.upserted[-1], {"order_id": "o1", "source": "id", "identifier": "1492"})
+        query, params = self.executed[-1]
+        self.assertIn("DELETE FROM order_woo_identifiers", query)
+        self.assertEqual(params, {"order_id": "o1", "source_0": "number"})
+
+    def test_json_store_falls_back_to_a_scan(self) -> None:
+        orders = [
+            {"id": "o1", "wooOrderId": "1490"},
+            {"id": "o2", "integrations": '{"woocommerce": {"response": {"number": "WC-1492"}}}'},
+        ]
+        with patch.object(order_repository, "_using_mysql", return_value=False), \
+            patch.object(order_repository, "iter_all", return_value=iter(orders)):
+            self.assertEqual(order_repository.find_by_woo_identifier("1492")["id"], "o2")
+
+    def test_index_miss_does_not_scan_orders(self) -> None:
+        with patch.object(order_repository.mysql_client, "fetch_one", return_value=None), \
+            patch.object(order_repository, "iter_all") as iter_all:
+            found = order_repository.find_by_woo_identifier("1700000000001")
+
+        self.assertIsNone(found)
+        iter_all.assert_not_called()
+
+    def test_failed_index_write_is_logged(self) -> None:
+        with patch.object(order_repository.mysql_client, "bulk_upsert", side_effect=RuntimeError("no table")), \
+            self.assertLogs(order_repository.logger, level="WARNING"):
+            order_repository._index_written_order({"id": "o1", "wooOrderId": "1490"})
+
+
+class OrderInsertTransactionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events: list[str] = []
+        self.connection = MagicMock()
+        self.connection.commit.side_effect = lambda: self.events.append("commit")
+        self.connection.rollback.side_effect = lambda: self.events.append("rollback")
+        for patcher in (
+            patch.object(order_repository, "_using_mysql", return_value=True),
+            patch.object(order_repository, "_to_db_params", side_effect=lambda order: {"id": order["id"]}),
+            patch.object(order_repository, "find_by_id", side_effect=lambda order_id: {"id": order_id}),
+            patch.object(order_repository.mysql_client, "is_enabled", return_value=True),
+            patch.object(order_repository.mysql_client, "_acquire_connection", return_value=self.connection),
+            patch.object(order_repository.mysql_client, "_release_connection"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _failing(self, name: str):
+        def fail(*_args, **_kwargs):
+            self.events.append(name)
+            raise RuntimeError("Deadlock found when trying to get lock")
+
+        return fail
+
+    def test_failed_index_and_rollup_writes_run_after_the_order_commits(self) -> None:
+        order = {"id": "o1", "wooOrderId": "1492"}
+        with patch.object(order_repository.mysql_client, "bulk_upsert", side_effect=self._failing("index")), \
+            patch.object(
+                order_repository.sales_rep_rollup_repository, "mark_orders_dirty", side_effect=self._failing("rollup")
+            ):
+            with order_repository.mysql_client.transaction():
+                saved = order_repository.insert(order)
+                self.assertEqual(self.events, [])
+
+        self.assertEqual(saved, {"id": "o1"})
+        self.assertEqual(self.events[0], "commit")
+        self.assertIn("index", self.events)
+        self.assertIn("rollup", self.events)
+        self.assertNotIn("rollback", self.events[: self.events.index("index")])
+
+    def test_failed_order_write_rolls_back_without_side_writes(self) -> None:
+        self.connection.cursor.return_value.execute.side_effect = RuntimeError("Lock wait timeout exceeded")
+        with patch.object(order_repository.mysql_client, "bulk_upsert") as bulk_upsert, \
+            patch.object(order_repository.sales_rep_rollup_repository, "mark_orders_dirty") as mark_dirty:
+            with self.assertRaises(RuntimeError):
+                with order_repository.mysql_client.transaction():
+                    order_repository.insert({"id": "o1", "wooOrderId": "1492"})
+
+        self.assertEqual(self.events, ["rollback"])
+        bulk_upsert.assert_not_called()
+        mark_dirty.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
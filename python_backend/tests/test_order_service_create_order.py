@@ -759,7 +759,7 @@ class CreateOrderTests(unittest.TestCase):
 
         with patch.object(
             service.user_repository,
-            "get_all",
+            "find_lookup_by_ids",
             return_value=[
                 {
                     "id": "admin-1",
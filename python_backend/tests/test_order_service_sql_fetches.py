@@ -1,7 +1,7 @@
 import sys
 import types
 import unittest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from unittest.mock import patch
 
 
@@ -273,8 +273,20 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_by_sales_rep_ids",
             return_value=[doctor],
+        ) as lookup_assigned, patch.object(
+            service.user_repository,
+            "find_lookup_by_ids",
+            return_value=[],
+        ), patch.object(
+            service.user_repository,
+            "find_lookup_by_emails",
+            return_value=[],
+        ), patch.object(
+            service.user_repository,
+            "get_all",
+            side_effect=AssertionError("get_all should not be used"),
         ), patch.object(
             service.sales_rep_repository,
             "get_all",
@@ -310,6 +322,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
         ) as mock_fetch:
             result = service.get_orders_for_sales_rep("rep-1")
 
+        lookup_assigned.assert_called_once_with({"rep-1"})
         mock_fetch.assert_not_called()
         mock_enrich.assert_not_called()
         self.assertEqual(len(result), 1)
@@ -346,8 +359,20 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_by_sales_rep_ids",
             return_value=[doctor],
+        ) as lookup_assigned, patch.object(
+            service.user_repository,
+            "find_lookup_by_ids",
+            return_value=[],
+        ), patch.object(
+            service.user_repository,
+            "find_lookup_by_emails",
+            return_value=[],
+        ), patch.object(
+            service.user_repository,
+            "get_all",
+            side_effect=AssertionError("get_all should not be used"),
         ), patch.object(
             service.sales_rep_repository,
             "get_all",
@@ -432,7 +457,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(service, "datetime", FixedDateTime), patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[doctor, rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -532,7 +557,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(service, "datetime", FixedDateTime), patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[doctor, rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -571,6 +596,169 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
         self.assertEqual(result["yearProjection"]["revenueToDate"], 260.0)
         self.assertEqual(result["yearPerformanceSeries"][-1]["cumulativeRevenue"], 260.0)
 
+    def test_get_sales_by_rep_reads_daily_rollup_when_available(self):
+        service = self.order_service
+
+        class FixedDateTime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                current = cls(2026, 4, 16, 12, 0, 0, tzinfo=timezone.utc)
+                return current.astimezone(tz) if tz else current.replace(tzinfo=None)
+
+        doctor = {
+            "id": "doctor-1",
+            "name": "Doctor One",
+            "email": "doctor@example.com",
+            "role": "doctor",
+            "salesRepId": "rep-1",
+        }
+        rep_user = {
+            "id": "rep-user-1",
+            "name": "Rep One",
+            "email": "rep@example.com",
+            "role": "sales_rep",
+            "salesRepId": "rep-1",
+        }
+        rep_record = {"id": "rep-1", "name": "Rep One", "email": "rep@example.com", "salesCode": "R1"}
+        daily_rows = [
+            {
+                "salesRepId": "rep-1",
+                "day": date(2026, 4, 10),
+                "orderCount": 1,
+                "revenue": 100.0,
+                "wholesaleRevenue": 100.0,
+                "retailRevenue": 0.0,
+            },
+            {
+                "salesRepId": "__house__",
+                "day": date(2026, 4, 12),
+                "orderCount": 2,
+                "revenue": 40.0,
+                "wholesaleRevenue": 0.0,
+                "retailRevenue": 40.0,
+            },
+            {
+                "salesRepId": "rep-1",
+                "day": date(2026, 3, 2),
+                "orderCount": 1,
+                "revenue": 60.0,
+                "wholesaleRevenue": 60.0,
+                "retailRevenue": 0.0,
+            },
+        ]
+
+        with patch.object(service, "datetime", FixedDateTime), patch.object(
+            service.user_repository,
+            "list_lookup_users",
+            return_value=[doctor, rep_user],
+        ), patch.object(
+            service.sales_rep_repository,
+            "get_all",
+            return_value=[rep_record],
+        ), patch.object(
+            service.referral_service,
+            "backfill_lead_types_for_doctors",
+            return_value=[doctor],
+        ), patch.object(
+            service.sales_prospect_repository,
+            "get_all",
+            return_value=[],
+        ), patch.object(
+            service,
+            "_load_contact_form_emails_from_mysql",
+            return_value=set(),
+        ), patch.object(
+            service,
+            "_sales_rep_rollup_enabled",
+            return_value=True,
+        ), patch.object(
+            service,
+            "_prepare_sales_rep_rollup",
+            side_effect=lambda _tz: service._build_sales_attribution_context(),
+        ), patch.object(
+            service.sales_rep_rollup_repository,
+            "list_daily",
+            return_value=daily_rows,
+        ) as list_daily_mock, patch.object(
+            service.order_repository,
+            "list_for_commission",
+            side_effect=AssertionError("rollup reads should not scan orders"),
+        ), patch.object(
+            service.sales_rep_repository,
+            "update_revenue_summary",
+            return_value=None,
+        ):
+            result = service.get_sales_by_rep(period_start="2026-04-01", period_end="2026-04-15")
+
+        list_daily_mock.assert_called_once_with(date(2026, 1, 1), date(2026, 4, 16))
+        self.assertEqual(result["totals"]["totalOrders"], 3)
+        self.assertEqual(result["totals"]["totalRevenue"], 140.0)
+        self.assertEqual(result["totals"]["retailRevenue"], 40.0)
+        rep_row = next(row for row in result["orders"] if row["salesRepId"] == "rep-1")
+        self.assertEqual(rep_row["salesRepUserId"], "rep-user-1")
+        self.assertEqual(rep_row["totalRevenue"], 100.0)
+        house_row = next(row for row in result["orders"] if row["salesRepId"] == "__house__")
+        self.assertEqual(house_row["totalOrders"], 2)
+        self.assertEqual(result["performanceSeries"][-1]["cumulativeRevenue"], 140.0)
+        self.assertEqual(result["yearProjection"]["orderCount"], 4)
+        self.assertEqual(result["yearProjection"]["revenueToDate"], 200.0)
+
+    def test_sales_rep_rollup_contribution_matches_report_attribution(self):
+        service = self.order_service
+        doctor = {
+            "id": "doctor-1",
+            "name": "Doctor One",
+            "email": "doctor@example.com",
+            "role": "doctor",
+            "salesRepId": "rep-1",
+        }
+        rep_record = {"id": "rep-1", "name": "Rep One", "email": "rep@example.com", "salesCode": "R1"}
+
+        with patch.object(service.user_repository, "list_lookup_users", return_value=[doctor]), patch.object(
+            service.sales_rep_repository,
+            "get_all",
+            return_value=[rep_record],
+        ), patch.object(
+            service.referral_service,
+            "backfill_lead_types_for_doctors",
+            return_value=[doctor],
+        ), patch.object(
+            service.sales_prospect_repository,
+            "get_all",
+            return_value=[],
+        ), patch.object(
+            service,
+            "_load_contact_form_emails_from_mysql",
+            return_value=set(),
+        ):
+            ctx = service._build_sales_attribution_context()
+
+        report_tz = service._get_report_timezone()
+        paid = service._sales_rep_rollup_contribution(
+            {
+                "id": "order-1",
+                "userId": "doctor-1",
+                "status": "processing",
+                "pricingMode": "retail",
+                "items": [{"name": "Peptide", "quantity": 2, "price": 25.0}],
+                "total": 60.0,
+                "createdAt": "2026-04-12T03:00:00+00:00",
+            },
+            ctx,
+            report_tz,
+        )
+        refunded = service._sales_rep_rollup_contribution(
+            {"id": "order-2", "userId": "doctor-1", "status": "refunded", "createdAt": "2026-04-12T03:00:00+00:00"},
+            ctx,
+            report_tz,
+        )
+
+        self.assertEqual(paid["salesRepId"], "rep-1")
+        self.assertEqual(paid["revenue"], 50.0)
+        self.assertEqual(paid["pricingMode"], "retail")
+        self.assertEqual(paid["day"], datetime(2026, 4, 12, 3, tzinfo=timezone.utc).astimezone(report_tz).date())
+        self.assertIsNone(refunded)
+
     def test_get_sales_by_rep_collapses_sales_rep_user_id_and_alias(self):
         service = self.order_service
 
@@ -608,7 +796,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(service, "datetime", FixedDateTime), patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -695,7 +883,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -786,7 +974,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(service, "datetime", FixedDateTime), patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[doctor, rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -867,7 +1055,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[doctor, rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -949,7 +1137,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[doctor, rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -1009,7 +1197,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(service, "datetime", FixedDateTime), patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[],
         ), patch.object(
             service.sales_rep_repository,
@@ -1088,7 +1276,7 @@ class OrderServiceSqlFetchTests(unittest.TestCase):
 
         with patch.object(service, "datetime", FixedDateTime), patch.object(
             service.user_repository,
-            "get_all",
+            "list_lookup_users",
             return_value=[rep_user],
         ), patch.object(
             service.sales_rep_repository,
@@ -372,7 +372,10 @@ class OrderServiceUpsStatusRegressionTests(unittest.TestCase):
         original_find_identifier = service.order_repository.find_by_order_identifier
         original_update_ups_status = service.order_repository.update_ups_tracking_status
         original_fetch_tracking_status = service.ups_tracking.fetch_tracking_status
+        original_invalidate_reports = service.invalidate_order_report_caches
         try:
+            report_invalidations = []
+            service.invalidate_order_report_caches = lambda: report_invalidations.append(True)
             local_order = {
                 "id": "local-ups-canceled",
                 "wooOrderNumber": "#2099",
@@ -423,6 +426,7 @@ class OrderServiceUpsStatusRegressionTests(unittest.TestCase):
             refreshed = service._refresh_authoritative_ups_status_for_order_view(order, local_order=local_order)
 
             self.assertEqual(persisted, [("local-ups-canceled", "exception", None)])
+            self.assertEqual(report_invalidations, [True])
             self.assertEqual(order["upsTrackingStatus"], "exception")
             self.assertEqual(order["shippingEstimate"]["status"], "exception")
             self.assertEqual(refreshed["upsTrackingStatus"], "exception")
@@ -431,6 +435,7 @@ class OrderServiceUpsStatusRegressionTests(unittest.TestCase):
             service.order_repository.find_by_order_identifier = original_find_identifier
             service.order_repository.update_ups_tracking_status = original_update_ups_status
             service.ups_tracking.fetch_tracking_status = original_fetch_tracking_status
+            service.invalidate_order_report_caches = original_invalidate_reports
 
     def test_refresh_ups_status_does_not_overwrite_known_status_with_unknown(self):
         service = self.order_service
@@ -726,6 +731,35 @@ class OrderServiceUpsStatusRegressionTests(unittest.TestCase):
             service.order_repository.update_ups_tracking_status = original_update_ups_status
             service.ups_tracking.fetch_tracking_status = original_fetch_tracking_status
 
+    def test_update_order_fields_drops_the_sales_report_caches(self):
+        service = self.order_service
+        original_find_by_id = service.order_repository.find_by_id
+        original_update = service.order_repository.update
+        original_invalidate = service.shared_cache.invalidate
+        try:
+            invalidated = []
+            service.order_repository.find_by_id = lambda value: {"id": "local-77", "status": "processing"}
+            service.order_repository.update = lambda value: value
+            service.shared_cache.invalidate = lambda namespace, key=None: invalidated.append(namespace)
+            with service._sales_rep_orders_cache_lock:
+                service._sales_rep_orders_cache["rep-1"] = {"orders": []}
+
+            service.update_order_fields(order_id="77", actor={"id": "admin-1", "role": "admin"}, status="shipped")
+
+            self.assertNotIn("rep-1", service._sales_rep_orders_cache)
+            self.assertEqual(
+                set(invalidated),
+                {
+                    service.shared_cache.NAMESPACE_SALES_REP_ORDERS,
+                    service.shared_cache.NAMESPACE_SALES_BY_REP_SUMMARY,
+                    service.shared_cache.NAMESPACE_ADMIN_PRODUCTS_COMMISSION,
+                },
+            )
+        finally:
+            service.order_repository.find_by_id = original_find_by_id
+            service.order_repository.update = original_update
+            service.shared_cache.invalidate = original_invalidate
+
 
 if __name__ == "__main__":
     unittest.main()
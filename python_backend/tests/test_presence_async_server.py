@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import unittest
+
+from flask import Flask, Response, request
+
+from python_backend.presence_async import RECHECK_ENVIRON_KEY, PresenceLongPollServer
+
+
+class _Revisions:
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.revision = 0
+
+    def current_revision(self) -> int:
+        with self.condition:
+            return self.revision
+
+    def wait_for_change(self, since_revision: int, *, timeout_s: float) -> int:
+        with self.condition:
+            if self.revision == since_revision:
+                self.condition.wait(timeout=timeout_s)
+            return self.revision
+
+    def bump(self) -> None:
+        with self.condition:
+            self.revision += 1
+            self.condition.notify_all()
+
+
+def _build_app(state: dict) -> Flask:
+    app = Flask(__name__)
+
+    @app.get("/api/settings/live-users/longpoll")
+    def live_users_longpoll():
+        state["calls"] += 1
+        if request.environ.get(RECHECK_ENVIRON_KEY):
+            state["rechecks"] += 1
+        if request.headers.get("Authorization") != "Bearer ok":
+            return {"error": "UNAUTHORIZED"}, 401
+        etag = f"v{state['version']}"
+        if request.args.get("etag") == etag:
+            raise AssertionError("the view must never be asked to block")
+        return {"etag": etag, "users": state["version"]}
+
+    @app.post("/api/settings/presence")
+    def presence():
+        return Response(b'{"ok": true}', mimetype="application/json")
+
+    @app.get("/api/events")
+    def events():
+        def generate():
+            yield ": connected\n\n"
+            # Blocks its relay thread like resource_version_service.wait_for_change.
+            state["release"].wait(5)
+
+        return Response(generate(), mimetype="text/event-stream")
+
+    return app
+
+
+async def _request(port: int, target: str, *, method: str = "GET", body: bytes = b"") -> tuple[int, bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            f"{method} {target} HTTP/1.1\r\nHost: test\r\nAuthorization: Bearer ok\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), payload
+
+
+async def _open_stream(port: int, target: str) -> tuple[int, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: test\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), writer
+
+
+class PresenceAsyncServerTests(unittest.TestCase):
+    def _run(self, scenario) -> None:
+        async def main() -> None:
+            self.state = {"version": 1, "calls": 0, "rechecks": 0, "release": threading.Event()}
+            self.revisions = _Revisions()
+            server = PresenceLongPollServer(
+                _build_app(self.state),
+                threads=2,
+                stream_threads=3,
+                recheck_seconds=0.0,
+                revision_source=self.revisions,
+            )
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                await scenario(server, port)
+            finally:
+                self.state["release"].set()
+                await server.stop()
+
+        asyncio.run(main())
+
+    def test_parked_polls_share_one_recheck_and_wake_on_change(self) -> None:
+        async def scenario(server, port):
+            stale = await _request(port, "/api/settings/live-users/longpoll?etag=v0")
+            self.assertEqual(stale[0], 200)
+
+            polls = [
+                asyncio.ensure_future(_request(port, "/api/settings/live-users/longpoll?etag=v1&timeoutMs=5000"))
+                for _ in range(50)
+            ]
+            while server.parked < 50:
+                await asyncio.sleep(0.01)
+            self.state["version"] = 2
+            self.revisions.bump()
+            results = await asyncio.gather(*polls)
+
+            self.assertTrue(all(status == 200 and b'"v2"' in body for status, body in results))
+            self.assertEqual(self.state["rechecks"], 1)
+            self.assertEqual(server.parked, 0)
+
+        self._run(scenario)
+
+    def test_unchanged_poll_times_out_with_204_and_other_routes_pass_through(self) -> None:
+        async def scenario(server, port):
+            status, _ = await _request(port, "/api/settings/live-users/longpoll?etag=v1&timeoutMs=1000")
+            self.assertEqual(status, 204)
+            status, body = await _request(port, "/api/settings/presence", method="POST", body=b"{}")
+            self.assertEqual((status, body), (200, b'{"ok": true}'))
+
+        self._run(scenario)
+
+    def test_pings_answer_while_more_event_streams_than_threads_are_open(self) -> None:
+        async def scenario(server, port):
+            opened = [await _open_stream(port, "/api/events") for _ in range(3)]
+            self.assertEqual([status for status, _ in opened], [200, 200, 200])
+            self.assertEqual(server.streams, 3)
+
+            refused, refused_writer = await _open_stream(port, "/api/events")
+            self.assertEqual(refused, 503)
+            refused_writer.close()
+
+            for _ in range(4):
+                status, body = await asyncio.wait_for(
+                    _request(port, "/api/settings/presence", method="POST", body=b"{}"),
+                    timeout=2.0,
+                )
+                self.assertEqual((status, body), (200, b'{"ok": true}'))
+
+            self.state["release"].set()
+            for _, writer in opened:
+                writer.close()
+            while server.streams:
+                await asyncio.sleep(0.01)
+
+        self._run(scenario)
+
+
+if __name__ == "__main__":
+    unittest.main()
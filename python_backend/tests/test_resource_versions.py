@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import sys
 import types
 import unittest
@@ -70,6 +71,56 @@ class ResourceVersionServiceTests(unittest.TestCase):
         self.assertEqual(execute.call_args.args[1]["resource_name"], "orders")
 
 
+class ResourceVersionWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        resource_version_service._WATCH_VERSIONS.clear()
+
+    def tearDown(self) -> None:
+        resource_version_service._WATCH_VERSIONS.clear()
+
+    def test_local_bump_wakes_waiters_without_querying(self) -> None:
+        config = types.SimpleNamespace(mysql={"enabled": False})
+        revision, _snapshot = resource_version_service.watched_versions(["orders"])
+
+        with patch.object(resource_version_service, "get_config", return_value=config):
+            resource_version_service.bump("orders")
+        next_revision, rows = resource_version_service.wait_for_change(revision, ["orders"], timeout_s=1.0)
+
+        self.assertGreater(next_revision, revision)
+        self.assertEqual(rows["orders"]["version"], 1)
+
+    def test_publish_ignores_stale_versions(self) -> None:
+        resource_version_service._publish_versions({"orders": {"resource": "orders", "version": 5}})
+        revision, _snapshot = resource_version_service.watched_versions(["orders"])
+
+        changed = resource_version_service._publish_versions({"orders": {"resource": "orders", "version": 4}})
+        next_revision, rows = resource_version_service.wait_for_change(revision, ["orders"], timeout_s=0)
+
+        self.assertFalse(changed)
+        self.assertEqual(next_revision, revision)
+        self.assertEqual(rows["orders"]["version"], 5)
+
+    def test_broadcast_reaches_other_worker_sockets(self) -> None:
+        import socket
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            peer_path = f"{tmp}/rv-999999-peer.sock"
+            peer = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            peer.bind(peer_path)
+            peer.settimeout(1.0)
+            try:
+                with patch.dict("os.environ", {"RESOURCE_VERSION_SIGNAL_DIR": tmp}):
+                    resource_version_service._broadcast_versions(
+                        {"orders": {"resource": "orders", "version": 9, "updatedAt": "2026-05-22T00:00:00Z"}}
+                    )
+                message = json.loads(peer.recv(8192).decode("utf-8"))
+            finally:
+                peer.close()
+
+        self.assertEqual(message["rows"]["orders"]["version"], 9)
+
+
 class ResourceVersionRouteTests(unittest.TestCase):
     def _auth_patches(self):
         now = datetime.now(timezone.utc).isoformat()
@@ -121,7 +172,18 @@ class ResourceVersionRouteTests(unittest.TestCase):
             events,
             "_HEARTBEAT_SECONDS",
             0,
-        ), patch.object(events.resource_version_service, "get_versions", side_effect=[initial, changed]):
+        ), patch.object(events.resource_version_service, "subscribe", return_value=3), patch.object(
+            events.resource_version_service,
+            "unsubscribe",
+        ) as unsubscribe, patch.object(
+            events.resource_version_service,
+            "watched_versions",
+            return_value=(3, initial),
+        ), patch.object(
+            events.resource_version_service,
+            "wait_for_change",
+            return_value=(4, changed),
+        ) as wait_for_change, patch.object(events.resource_version_service, "get_versions") as get_versions:
             try:
                 client.set_cookie(MEDIA_AUTH_COOKIE_NAME, "test-token", path="/api")
             except TypeError:
@@ -138,6 +200,9 @@ class ResourceVersionRouteTests(unittest.TestCase):
         self.assertIn("event: orders.changed", chunks[2])
         self.assertIn('"resource":"orders"', chunks[2])
         self.assertIn('"version":2', chunks[2])
+        get_versions.assert_not_called()
+        self.assertEqual(wait_for_change.call_args.args, (3, ["orders"]))
+        unsubscribe.assert_called_once_with()
 
 
 class ResourceVersionMutationBumpTests(unittest.TestCase):
@@ -2,6 +2,7 @@ import sys
 import types
 import unittest
 import json
+from contextlib import ExitStack
 from unittest.mock import patch
 
 
@@ -134,6 +135,25 @@ def _install_test_stubs() -> None:
         sys.modules["requests.auth"] = requests_auth
 
 
+def _patch_user_lookups(service, users):
+    def _matching(key_fn, values):
+        wanted = {str(value).strip().lower() for value in values or []}
+        return [user for user in users if str(key_fn(user) or "").strip().lower() in wanted]
+
+    def _by_sales_rep_ids(ids, *, roles=None):
+        matched = _matching(lambda user: user.get("salesRepId"), ids)
+        if roles:
+            matched = [user for user in matched if user.get("role") in roles]
+        return matched
+
+    stack = ExitStack()
+    repo = service.user_repository
+    stack.enter_context(patch.object(repo, "find_lookup_by_ids", side_effect=lambda ids: _matching(lambda u: u.get("id"), ids)))
+    stack.enter_context(patch.object(repo, "find_lookup_by_emails", side_effect=lambda emails: _matching(lambda u: u.get("email"), emails)))
+    stack.enter_context(patch.object(repo, "list_lookup_by_sales_rep_ids", side_effect=_by_sales_rep_ids))
+    return stack
+
+
 class SalesRepOrderDetailTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -461,7 +481,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
         original_update_items = service.order_repository.update_items
         original_find_email = service.user_repository.find_by_email
         original_find_user_by_id = service.user_repository.find_by_id
-        original_mysql_fetch_one = service.mysql_client.fetch_one
+        original_get_catalog_index = service.catalog_snapshot_service.get_catalog_index
         original_fetch_catalog = service.woo_commerce.fetch_catalog
         original_find_product_by_sku = service.woo_commerce.find_product_by_sku
         try:
@@ -484,17 +504,8 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             }
             persisted = []
 
-            def fake_fetch_one(query, params=None):
-                if "FROM product_documents" in query:
-                    return {
-                        "data": json.dumps(
-                            {
-                                "id": 1511,
-                                "images": [{"src": "https://img.example/sql-1511.jpg"}],
-                            }
-                        )
-                    }
-                return None
+            snapshot = {"id": 1511, "images": [{"src": "https://img.example/sql-1511.jpg"}]}
+            catalog_index = types.SimpleNamespace(by_id={1511: snapshot}, by_sku={"sku-1511": snapshot})
 
             service.order_repository.find_by_order_identifier = lambda value: local_order if str(value) in {"1511", "9011"} else None
             service.order_repository.find_by_id = lambda value: local_order if str(value) == "local-1511" else None
@@ -512,7 +523,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
                 if str(value) == "doctor-1"
                 else None
             )
-            service.mysql_client.fetch_one = fake_fetch_one
+            service.catalog_snapshot_service.get_catalog_index = lambda: catalog_index
             service.woo_commerce.fetch_catalog = lambda *_args, **_kwargs: self.fail("Woo fallback should not run when SQL snapshot has an image")
             service.woo_commerce.find_product_by_sku = lambda *_args, **_kwargs: self.fail("SKU fallback should not run when SQL snapshot has an image")
 
@@ -528,7 +539,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             service.order_repository.update_items = original_update_items
             service.user_repository.find_by_email = original_find_email
             service.user_repository.find_by_id = original_find_user_by_id
-            service.mysql_client.fetch_one = original_mysql_fetch_one
+            service.catalog_snapshot_service.get_catalog_index = original_get_catalog_index
             service.woo_commerce.fetch_catalog = original_fetch_catalog
             service.woo_commerce.find_product_by_sku = original_find_product_by_sku
 
@@ -539,7 +550,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
         original_update_items = service.order_repository.update_items
         original_find_email = service.user_repository.find_by_email
         original_find_user_by_id = service.user_repository.find_by_id
-        original_mysql_fetch_one = service.mysql_client.fetch_one
+        original_get_catalog_index = service.catalog_snapshot_service.get_catalog_index
         original_fetch_catalog = service.woo_commerce.fetch_catalog
         original_find_product_by_sku = service.woo_commerce.find_product_by_sku
         try:
@@ -579,7 +590,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
                 if str(value) == "doctor-1"
                 else None
             )
-            service.mysql_client.fetch_one = lambda *_args, **_kwargs: None
+            service.catalog_snapshot_service.get_catalog_index = lambda: types.SimpleNamespace(by_id={}, by_sku={})
 
             def fake_fetch_catalog(endpoint, params=None):
                 del params
@@ -604,7 +615,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             service.order_repository.update_items = original_update_items
             service.user_repository.find_by_email = original_find_email
             service.user_repository.find_by_id = original_find_user_by_id
-            service.mysql_client.fetch_one = original_mysql_fetch_one
+            service.catalog_snapshot_service.get_catalog_index = original_get_catalog_index
             service.woo_commerce.fetch_catalog = original_fetch_catalog
             service.woo_commerce.find_product_by_sku = original_find_product_by_sku
 
@@ -741,7 +752,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             "email": "rep@example.com",
         }
 
-        with patch.object(service.user_repository, "list_sales_modal_lookup_users", return_value=[actor, target]), \
+        with _patch_user_lookups(service, [actor, target]), \
             patch.object(service.sales_rep_repository, "get_all", return_value=[rep_record]), \
             patch.object(service.order_repository, "list_user_overlay_fields", return_value=[]), \
             patch.object(service.order_repository, "find_sales_tracking_by_user_ids", return_value=[]):
@@ -776,7 +787,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             "allowedRetail": False,
         }
 
-        with patch.object(service.user_repository, "list_sales_modal_lookup_users", return_value=[actor, target]), \
+        with _patch_user_lookups(service, [actor, target]), \
             patch.object(service.sales_rep_repository, "get_all", return_value=[rep_record]):
             result = service.get_sales_modal_detail(actor=actor, target_user_id="admin-1")
 
@@ -807,7 +818,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             "phone": "317-555-0101",
         }
 
-        with patch.object(service.user_repository, "list_sales_modal_lookup_users", return_value=[actor, target]), \
+        with _patch_user_lookups(service, [actor, target]), \
             patch.object(service.sales_rep_repository, "get_all", return_value=[actor_rep_record]):
             result = service.get_sales_modal_detail(actor=actor, target_user_id="admin-1")
 
@@ -815,7 +826,7 @@ class SalesRepOrderDetailTests(unittest.TestCase):
         self.assertEqual(result["user"]["phone"], "317-555-0199")
         self.assertEqual(result["user"]["email"], "admin@example.com")
 
-    def test_modal_detail_uses_lightweight_user_lookup_projection(self):
+    def test_modal_detail_uses_targeted_user_lookups(self):
         service = self.order_service
         actor = {
             "id": "admin-1",
@@ -835,14 +846,14 @@ class SalesRepOrderDetailTests(unittest.TestCase):
             "email": "rep@example.com",
         }
 
-        with patch.object(service.user_repository, "list_sales_modal_lookup_users", return_value=[actor, target]) as lookup_users, \
+        with _patch_user_lookups(service, [actor, target]), \
+            patch.object(service.user_repository, "list_sales_modal_lookup_users", side_effect=AssertionError("full user scan should not be used")), \
             patch.object(service.user_repository, "get_all", side_effect=AssertionError("get_all should not be used")), \
             patch.object(service.sales_rep_repository, "get_all", return_value=[rep_record]), \
             patch.object(service.order_repository, "list_user_overlay_fields", return_value=[]), \
             patch.object(service.order_repository, "find_sales_tracking_by_user_ids", return_value=[]):
             result = service.get_sales_modal_detail(actor=actor, target_user_id="doctor-1")
 
-        lookup_users.assert_called_once_with()
         self.assertEqual(result["user"]["id"], "doctor-1")
         self.assertEqual(result["ownerSalesRepId"], "rep-1")
         self.assertEqual(result["orders"], [])
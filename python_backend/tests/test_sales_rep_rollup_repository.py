@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+import types
+import unittest
+from contextlib import contextmanager
+from datetime import date, datetime
+from unittest.mock import patch
+
+if "pymysql" not in sys.modules:
+    pymysql_stub = types.ModuleType("pymysql")
+    pymysql_stub.connect = lambda *args, **kwargs: None
+    pymysql_stub.connections = types.SimpleNamespace(Connection=object)
+    pymysql_stub.err = types.SimpleNamespace(Error=Exception, OperationalError=Exception, InterfaceError=Exception)
+    cursors_stub = types.ModuleType("pymysql.cursors")
+    cursors_stub.DictCursor = object
+    pymysql_stub.cursors = cursors_stub
+    sys.modules["pymysql"] = pymysql_stub
+    sys.modules["pymysql.cursors"] = cursors_stub
+
+from python_backend.repositories import sales_rep_rollup_repository as repository
+
+
+class _RecordingCursor:
+    def __init__(self, ledger_rows=None) -> None:
+        self.ledger_rows = list(ledger_rows or [])
+        self.statements: list[tuple[str, object]] = []
+        self._pending: list = []
+
+    def execute(self, query, params=None):
+        self.statements.append((" ".join(query.split()), params))
+        self._pending = self.ledger_rows if "FOR UPDATE" in query else []
+        return len(self._pending)
+
+    def executemany(self, query, rows):
+        self.statements.append((" ".join(query.split()), list(rows)))
+        return len(rows)
+
+    def fetchall(self):
+        return self._pending
+
+    def rows_for(self, prefix: str) -> list:
+        rows: list = []
+        for query, params in self.statements:
+            if query.startswith(prefix) and isinstance(params, list):
+                rows.extend(params)
+        return rows
+
+
+def _cursor_factory(cur: _RecordingCursor):
+    @contextmanager
+    def _cursor():
+        yield cur
+
+    return _cursor
+
+
+class SalesRepRollupRepositoryTests(unittest.TestCase):
+    def test_apply_moves_daily_sums_by_the_contribution_difference(self) -> None:
+        cur = _RecordingCursor(
+            ledger_rows=[
+                {
+                    "order_id": "order-1",
+                    "rep_id": "rep-1",
+                    "day": date(2026, 4, 10),
+                    "revenue": 100.0,
+                    "pricing_mode": "wholesale",
+                }
+            ]
+        )
+        queued_at = datetime(2026, 4, 16, 12, 0, 0)
+
+        with patch.object(repository.mysql_client, "cursor", _cursor_factory(cur)):
+            applied = repository.apply_order_contributions(
+                {
+                    # Reassigned from rep-1 to rep-2 and switched to retail pricing.
+                    "order-1": {"salesRepId": "rep-2", "day": date(2026, 4, 10), "revenue": 80.0, "pricingMode": "retail"},
+                    # Refunded before it was ever counted.
+                    "order-2": None,
+                },
+                queued_at={"order-1": queued_at, "order-2": queued_at},
+            )
+
+        self.assertEqual(applied, 2)
+        daily = {
+            row["rep_id"]: row
+            for row in cur.rows_for("INSERT INTO sales_rep_daily_rollup")
+        }
+        self.assertEqual(daily["rep-1"]["order_count"], -1)
+        self.assertEqual(daily["rep-1"]["revenue"], -100.0)
+        self.assertEqual(daily["rep-1"]["wholesale_revenue"], -100.0)
+        self.assertEqual(daily["rep-2"]["order_count"], 1)
+        self.assertEqual(daily["rep-2"]["retail_revenue"], 80.0)
+        ledger = cur.rows_for("INSERT INTO sales_rep_order_rollup")
+        self.assertEqual([row["order_id"] for row in ledger], ["order-1"])
+        dequeued = cur.rows_for("DELETE FROM sales_rep_rollup_dirty")
+        self.assertEqual({row["order_id"] for row in dequeued}, {"order-1", "order-2"})
+
+    def test_replace_all_aggregates_orders_per_rep_and_day(self) -> None:
+        cur = _RecordingCursor()
+        started_at = datetime(2026, 4, 16, 12, 0, 0)
+
+        with patch.object(repository.mysql_client, "cursor", _cursor_factory(cur)):
+            count = repository.replace_all(
+                {
+                    "order-1": {"salesRepId": "rep-1", "day": date(2026, 4, 10), "revenue": 100.0, "pricingMode": "wholesale"},
+                    "order-2": {"salesRepId": "rep-1", "day": date(2026, 4, 10), "revenue": 25.5, "pricingMode": "retail"},
+                    "order-3": None,
+                },
+                started_at=started_at,
+            )
+
+        self.assertEqual(count, 2)
+        daily = cur.rows_for("INSERT INTO sales_rep_daily_rollup")
+        self.assertEqual(len(daily), 1)
+        self.assertEqual(daily[0]["order_count"], 2)
+        self.assertEqual(daily[0]["revenue"], 125.5)
+        self.assertEqual(daily[0]["retail_revenue"], 25.5)
+        self.assertEqual(
+            cur.statements[-1],
+            ("DELETE FROM sales_rep_rollup_dirty WHERE queued_at <= %(started_at)s", {"started_at": started_at}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
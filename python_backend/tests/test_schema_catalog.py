@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+fake_pymysql = types.ModuleType("pymysql")
+fake_pymysql.connect = lambda *args, **kwargs: None
+fake_pymysql.connections = types.SimpleNamespace(Connection=object)
+fake_pymysql.err = types.SimpleNamespace(OperationalError=Exception, InterfaceError=Exception)
+fake_pymysql_cursors = types.ModuleType("pymysql.cursors")
+fake_pymysql_cursors.DictCursor = object
+fake_pymysql.cursors = fake_pymysql_cursors
+sys.modules.setdefault("pymysql", fake_pymysql)
+sys.modules.setdefault("pymysql.cursors", fake_pymysql_cursors)
+
+from python_backend.database import schema_catalog
+
+
+_CATALOG_ROWS = [
+    {"kind": "column", "table_name": "orders", "object_name": "id"},
+    {"kind": "column", "table_name": "orders", "object_name": "tracking_number"},
+    {"kind": "column", "table_name": "Sales_Prospects", "object_name": "office_address_line1"},
+    {"kind": "index", "table_name": "orders", "object_name": "PRIMARY"},
+    {"kind": "index", "table_name": "orders", "object_name": "idx_orders_user"},
+]
+
+
+class SchemaCatalogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        schema_catalog.invalidate()
+
+    def tearDown(self) -> None:
+        schema_catalog.invalidate()
+
+    def test_lookups_share_one_information_schema_query(self) -> None:
+        with patch(
+            "python_backend.database.schema_catalog.mysql_client.fetch_all",
+            return_value=_CATALOG_ROWS,
+        ) as fetch_all:
+            self.assertEqual(schema_catalog.columns("orders"), frozenset({"id", "tracking_number"}))
+            self.assertTrue(schema_catalog.has_column("sales_prospects", "OFFICE_ADDRESS_LINE1"))
+            self.assertFalse(schema_catalog.has_column("orders", "delivery_date"))
+            self.assertTrue(schema_catalog.has_index("orders", "idx_orders_user"))
+            self.assertTrue(schema_catalog.has_table("orders"))
+            self.assertFalse(schema_catalog.has_table("missing_table"))
+
+        self.assertEqual(fetch_all.call_count, 1)
+        self.assertIn("information_schema.COLUMNS", fetch_all.call_args.args[0])
+        self.assertIn("information_schema.STATISTICS", fetch_all.call_args.args[0])
+
+    def test_invalidate_forces_reload(self) -> None:
+        with patch(
+            "python_backend.database.schema_catalog.mysql_client.fetch_all",
+            side_effect=[_CATALOG_ROWS, _CATALOG_ROWS + [{"kind": "column", "table_name": "orders", "object_name": "delivery_date"}]],
+        ) as fetch_all:
+            self.assertFalse(schema_catalog.has_column("orders", "delivery_date"))
+            schema_catalog.invalidate()
+            self.assertTrue(schema_catalog.has_column("orders", "delivery_date"))
+
+        self.assertEqual(fetch_all.call_count, 2)
+
+    def test_failed_load_is_cached_briefly_then_retried(self) -> None:
+        with patch(
+            "python_backend.database.schema_catalog.mysql_client.fetch_all",
+            side_effect=[RuntimeError("mysql down"), _CATALOG_ROWS],
+        ) as fetch_all, patch("python_backend.database.schema_catalog.time.monotonic", return_value=100.0) as clock:
+            with self.assertRaises(RuntimeError):
+                schema_catalog.columns("orders")
+            with self.assertRaises(RuntimeError):
+                schema_catalog.has_table("orders")
+            self.assertEqual(fetch_all.call_count, 1)
+
+            clock.return_value = 100.0 + schema_catalog._failure_ttl_seconds()
+            self.assertIn("id", schema_catalog.columns("orders"))
+
+        self.assertEqual(fetch_all.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
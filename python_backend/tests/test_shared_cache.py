@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import patch
+
+if "pymysql" not in sys.modules:
+    pymysql_stub = types.ModuleType("pymysql")
+    pymysql_stub.connect = lambda *args, **kwargs: None
+    pymysql_stub.connections = types.SimpleNamespace(Connection=object)
+    pymysql_stub.err = types.SimpleNamespace(Error=Exception, OperationalError=Exception, InterfaceError=Exception)
+    cursors_stub = types.ModuleType("pymysql.cursors")
+    cursors_stub.DictCursor = object
+    pymysql_stub.cursors = cursors_stub
+    sys.modules["pymysql"] = pymysql_stub
+    sys.modules["pymysql.cursors"] = cursors_stub
+
+from python_backend.services import shared_cache
+
+
+class SharedCacheDiskBackendTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._env = patch.dict(
+            os.environ,
+            {
+                "SHARED_CACHE_BACKEND": "disk",
+                "SHARED_CACHE_DIR": self._tmp.name,
+                "SHARED_CACHE_LOCK_WAIT_SECONDS": "1",
+            },
+        )
+        self._env.start()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def test_put_get_expire_and_invalidate(self) -> None:
+        shared_cache.put("reports", "2026-04-01::2026-04-30", {"rows": [1, 2]}, ttl_seconds=60)
+        shared_cache.put("reports", "other", {"rows": []}, ttl_seconds=60)
+
+        self.assertEqual(shared_cache.get("reports", "2026-04-01::2026-04-30"), {"rows": [1, 2]})
+        with patch.object(shared_cache, "_now_ms", return_value=shared_cache._now_ms() + 61_000):
+            self.assertIsNone(shared_cache.get("reports", "2026-04-01::2026-04-30"))
+
+        shared_cache.invalidate("reports", "other")
+        self.assertIsNone(shared_cache.get("reports", "other"))
+        self.assertIsNotNone(shared_cache.get("reports", "2026-04-01::2026-04-30"))
+        shared_cache.invalidate("reports")
+        self.assertIsNone(shared_cache.get("reports", "2026-04-01::2026-04-30"))
+
+    def test_second_flight_reuses_the_first_workers_result(self) -> None:
+        first = shared_cache.begin("reports", "period", ttl_seconds=60)
+        try:
+            self.assertIsNone(first.value)
+            first.publish({"total": 5})
+        finally:
+            first.release()
+
+        second = shared_cache.begin("reports", "period", ttl_seconds=60)
+        try:
+            self.assertEqual(second.value, {"total": 5})
+        finally:
+            second.release()
+
+        forced = shared_cache.begin("reports", "period", ttl_seconds=60, force=True)
+        try:
+            self.assertIsNone(forced.value)
+        finally:
+            forced.release()
+
+    def test_disabled_backend_is_a_no_op(self) -> None:
+        with patch.dict(os.environ, {"SHARED_CACHE_BACKEND": "off"}):
+            shared_cache.put("reports", "key", {"a": 1}, ttl_seconds=60)
+            self.assertIsNone(shared_cache.get("reports", "key"))
+            flight = shared_cache.begin("reports", "key", ttl_seconds=60)
+            flight.release()
+            self.assertIsNone(flight.value)
+
+
+class SharedCacheMysqlSweepTests(unittest.TestCase):
+    def test_puts_sweep_expired_rows_only_once_per_interval(self) -> None:
+        shared_cache._last_sweep_ms.clear()
+        self.addCleanup(shared_cache._last_sweep_ms.clear)
+        with patch.object(shared_cache, "_backend", return_value="mysql"), \
+            patch.dict(os.environ, {"SHARED_CACHE_SWEEP_SECONDS": "300"}), \
+            patch.object(shared_cache.mysql_client, "execute") as execute:
+            for index in range(5):
+                shared_cache.put("reports", f"key-{index}", {"n": index}, ttl_seconds=60)
+            sweeps = [call for call in execute.call_args_list if call.args[0].startswith("DELETE")]
+            self.assertEqual(len(sweeps), 1)
+
+            with patch.object(shared_cache, "_now_ms", return_value=shared_cache._now_ms() + 301_000):
+                shared_cache.put("reports", "later", {"n": 6}, ttl_seconds=60)
+            sweeps = [call for call in execute.call_args_list if call.args[0].startswith("DELETE")]
+            self.assertEqual(len(sweeps), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -230,6 +230,30 @@ class ShipStationStatusSyncServiceTests(unittest.TestCase):
         self.assertTrue(persisted)
         self.assertEqual(persisted[-1]["status"], "Pick up")
 
+    def test_run_sync_once_drops_order_report_caches_once_after_local_writes(self):
+        woo_orders = [
+            {"id": 9601, "number": "1601", "status": "processing"},
+            {"id": 9602, "number": "1602", "status": "processing"},
+        ]
+        svc = self.service
+
+        with patch.object(svc, "_enabled", return_value=True), \
+            patch.object(svc.woo_commerce, "is_configured", return_value=True), \
+            patch.object(svc.ship_station, "is_configured", return_value=True), \
+            patch.object(svc, "_try_acquire_lease", return_value="lease-1"), \
+            patch.object(svc, "_release_lease"), \
+            patch.object(svc, "_set_last_run_at"), \
+            patch.object(svc, "_fetch_orders_for_sync", return_value=woo_orders), \
+            patch.object(svc, "_throttle_ms", return_value=0), \
+            patch.object(svc.ship_station, "fetch_order_status", return_value={"status": "awaiting_shipment"}), \
+            patch.object(svc.woo_commerce, "apply_shipstation_shipment_update", return_value={"changed": False}), \
+            patch.object(svc, "_persist_local_order_shipping_update", return_value=True), \
+            patch.object(svc, "_invalidate_order_report_caches") as drop_report_caches:
+            result = svc.run_sync_once(ignore_cooldown=True)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["processed"], 2)
+        drop_report_caches.assert_called_once_with()
 
 if __name__ == "__main__":
     unittest.main()
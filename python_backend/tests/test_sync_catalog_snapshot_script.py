@@ -22,8 +22,9 @@ def _load_sync_catalog_snapshot_module():
 
     fake_service = types.ModuleType("python_backend.services.catalog_snapshot_service")
 
-    def fake_sync_catalog_snapshots(*, include_variations: bool = True):
+    def fake_sync_catalog_snapshots(*, include_variations: bool = True, mode: str = "auto"):
         calls["include_variations"] = include_variations
+        calls["mode"] = mode
         result = calls.get("result")
         if isinstance(result, dict):
             return result
@@ -82,6 +83,7 @@ class SyncCatalogSnapshotScriptTests(unittest.TestCase):
         self.assertEqual(exit_code, 0)
         self.assertTrue(calls.get("bootstrapped"))
         self.assertEqual(calls.get("include_variations"), True)
+        self.assertEqual(calls.get("mode"), "auto")
         self.assertEqual(json.loads(stdout.getvalue()), {"ok": True, "products": 12})
 
     def test_main_honors_skip_variations_flag(self):
@@ -101,6 +103,20 @@ class SyncCatalogSnapshotScriptTests(unittest.TestCase):
         self.assertEqual(calls.get("include_variations"), False)
         self.assertEqual(json.loads(stdout.getvalue())["variableProducts"], 0)
 
+    def test_main_passes_full_mode_flag(self):
+        module, calls = _load_sync_catalog_snapshot_module()
+
+        argv = sys.argv[:]
+        try:
+            sys.argv = ["sync_catalog_snapshot.py", "--full"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                exit_code = module.main()
+        finally:
+            sys.argv = argv
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(calls.get("mode"), "full")
+
     def test_main_returns_zero_for_skipped_result(self):
         module, calls = _load_sync_catalog_snapshot_module()
         calls["result"] = {"ok": False, "skipped": True, "reason": "lock_busy"}
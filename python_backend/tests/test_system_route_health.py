@@ -263,7 +263,8 @@ class SystemRouteHealthTests(unittest.TestCase):
         payload = response.get_json()
         self.assertEqual(payload["status"], "ok")
         self.assertEqual(payload["build"], "test-build")
-        self.assertEqual(payload["mysql"], {"enabled": True})
+        self.assertTrue(payload["mysql"]["enabled"])
+        self.assertIn("checkouts", payload["mysql"]["pool"])
 
     def test_health_route_returns_payload_for_valid_password_header(self) -> None:
         app = Flask(__name__)
@@ -328,7 +329,8 @@ class SystemRouteHealthTests(unittest.TestCase):
         payload = response.get_json()
         self.assertEqual(payload["status"], "ok")
         self.assertEqual(payload["build"], "test-build")
-        self.assertEqual(payload["mysql"], {"enabled": True})
+        self.assertTrue(payload["mysql"]["enabled"])
+        self.assertIn("checkouts", payload["mysql"]["pool"])
 
     def test_health_route_marks_degraded_when_requests_are_slow(self) -> None:
         app = Flask(__name__)
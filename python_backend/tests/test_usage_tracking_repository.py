@@ -19,76 +19,16 @@ from python_backend.repositories import usage_tracking_repository
 
 
 class UsageTrackingRepositoryTests(unittest.TestCase):
-    def setUp(self) -> None:
-        usage_tracking_repository._USAGE_TRACKING_COLUMNS_CACHE = None
-
-    def test_insert_event_uses_legacy_details_column_when_present(self):
-        with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
-            "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all",
-            side_effect=[
-                [{"COLUMN_NAME": "event"}, {"COLUMN_NAME": "details"}],
-                [],
-            ],
-        ), patch("python_backend.repositories.usage_tracking_repository.mysql_client.execute") as mock_execute:
-            tracked = usage_tracking_repository.insert_event("delegate_link_created", {"who": {"id": "u1"}}, strict=True)
-
-        self.assertTrue(tracked)
-        sql = mock_execute.call_args[0][0]
-        self.assertIn("INSERT INTO usage_tracking (event, `details`)", sql)
-
-    def test_insert_event_raises_for_incompatible_schema_in_strict_mode(self):
-        with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
-            "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all",
-            return_value=[{"COLUMN_NAME": "event"}],
-        ):
-            with self.assertRaises(RuntimeError) as ctx:
-                usage_tracking_repository.insert_event("delegate_link_created", {"who": {"id": "u1"}}, strict=True)
-
-        self.assertIn("usage_tracking table is missing the required columns", str(ctx.exception))
-
-    def test_insert_event_uses_plain_text_json_payload(self):
-        with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
-            "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all",
-            side_effect=[
-                [{"COLUMN_NAME": "id"}, {"COLUMN_NAME": "event"}, {"COLUMN_NAME": "details_json"}],
-                [],
-            ],
-        ), patch("python_backend.repositories.usage_tracking_repository.mysql_client.execute") as mock_execute:
-            tracked = usage_tracking_repository.insert_event("delegate_link_created", {"who": {"id": "u1"}}, strict=True)
-
-        self.assertTrue(tracked)
-        sql = mock_execute.call_args[0][0]
-        self.assertIn("VALUES (%(event)s, %(details_json)s)", sql)
-        self.assertNotIn("CAST(%(details_json)s AS JSON)", sql)
-
-    def test_insert_event_merges_instances_into_existing_event_row(self):
-        existing_payload = {
-            "count": 1,
-            "instances": [
-                {
-                    "who": {"id": "u1"},
-                    "when": "2026-03-17T02:00:00+00:00",
-                    "tab": "delegate_links",
-                }
-            ],
-        }
-        execute_calls = []
-
-        def fake_execute(sql, params):
-            execute_calls.append((sql, params))
-            return 1
-
+    def test_insert_event_appends_one_row_without_reading_history(self):
         with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
-            "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all",
-            side_effect=[
-                [{"COLUMN_NAME": "id"}, {"COLUMN_NAME": "event"}, {"COLUMN_NAME": "details_json"}],
-                [{"id": 1, "payload_value": json.dumps(existing_payload)}],
-            ],
-        ), patch("python_backend.repositories.usage_tracking_repository.mysql_client.execute", side_effect=fake_execute):
+            "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all"
+        ) as mock_fetch_all, patch(
+            "python_backend.repositories.usage_tracking_repository.mysql_client.execute", return_value=1
+        ) as mock_execute:
             tracked = usage_tracking_repository.insert_event(
                 "delegate_link_tab_clicked",
                 {
-                    "who": {"id": "u2"},
+                    "who": {"id": "u2", "name": "Dr. Two", "email": "Two@Example.com", "role": "doctor"},
                     "when": "2026-03-17T03:00:00+00:00",
                     "tab": "delegate_links",
                 },
@@ -96,35 +36,56 @@ class UsageTrackingRepositoryTests(unittest.TestCase):
             )
 
         self.assertTrue(tracked)
-        self.assertEqual(len(execute_calls), 1)
-        sql, params = execute_calls[0]
-        self.assertIn("UPDATE usage_tracking", sql)
+        mock_fetch_all.assert_not_called()
+        self.assertEqual(mock_execute.call_count, 1)
+        sql, params = mock_execute.call_args[0]
+        self.assertIn("INSERT INTO usage_tracking_events", sql)
+        self.assertNotIn("UPDATE", sql)
+        self.assertEqual(params["event"], "delegate_link_tab_clicked")
+        self.assertEqual(params["actor_key"], "id:u2")
+        self.assertEqual(params["actor_email"], "Two@Example.com")
+        self.assertEqual(params["created_at"], "2026-03-17 03:00:00")
         payload = json.loads(params["details_json"])
-        self.assertEqual(payload["count"], 2)
-        self.assertEqual(len(payload["instances"]), 2)
-        self.assertEqual(payload["instances"][0]["who"]["id"], "u1")
-        self.assertEqual(payload["instances"][1]["who"]["id"], "u2")
-        self.assertNotIn("who", payload)
-        self.assertNotIn("when", payload)
-        self.assertNotIn("tab", payload)
-
-    def test_get_event_counts_reads_counts_from_payload(self):
+        self.assertEqual(payload["tab"], "delegate_links")
+        self.assertNotIn("instances", payload)
+
+    def test_insert_event_uses_email_actor_key_without_user_id(self):
+        with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
+            "python_backend.repositories.usage_tracking_repository.mysql_client.execute", return_value=1
+        ) as mock_execute:
+            usage_tracking_repository.insert_event("bug_report_submitted", {"who": {"email": " Guest@Example.com "}})
+
+        params = mock_execute.call_args[0][1]
+        self.assertEqual(params["actor_key"], "email:guest@example.com")
+        self.assertIsNone(params["actor_user_id"])
+
+    def test_insert_event_raises_in_strict_mode_when_mysql_disabled(self):
+        with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=False):
+            with self.assertRaises(RuntimeError) as ctx:
+                usage_tracking_repository.insert_event("delegate_link_created", {"who": {"id": "u1"}}, strict=True)
+
+        self.assertEqual(getattr(ctx.exception, "status", None), 503)
+
+    def test_insert_event_swallows_write_errors_when_not_strict(self):
+        with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
+            "python_backend.repositories.usage_tracking_repository.mysql_client.execute",
+            side_effect=RuntimeError("boom"),
+        ):
+            tracked = usage_tracking_repository.insert_event("delegate_link_created", {"who": {"id": "u1"}})
+
+        self.assertFalse(tracked)
+
+    def test_get_event_counts_reads_grouped_counts(self):
         with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
             "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all",
             side_effect=[
-                [{"COLUMN_NAME": "id"}, {"COLUMN_NAME": "event"}, {"COLUMN_NAME": "details_json"}],
                 [
-                    {
-                        "event": "delegate_link_created",
-                        "payload_value": json.dumps({"count": 4, "instances": [{}, {}, {}, {}]}),
-                    },
-                    {
-                        "event": "delegate_order_placed",
-                        "payload_value": json.dumps({"instances": [{}, {}]}),
-                    },
+                    {"event": "delegate_link_created", "event_count": 4},
+                    {"event": "delegate_order_placed", "event_count": 2},
                 ],
+                [],
             ],
-        ):
+        ) as mock_fetch_all:
             counts = usage_tracking_repository.get_event_counts([
                 "delegate_link_created",
                 "delegate_proposal_reviewed",
@@ -139,81 +100,46 @@ class UsageTrackingRepositoryTests(unittest.TestCase):
                 "delegate_order_placed": 2,
             },
         )
+        count_sql = mock_fetch_all.call_args_list[0][0][0]
+        self.assertIn("GROUP BY event", count_sql)
+        self.assertNotIn("actor_key = %(actor_key)s", count_sql)
 
     def test_get_event_funnel_filters_counts_by_actor_and_lists_known_actors(self):
         with patch("python_backend.repositories.usage_tracking_repository._using_mysql", return_value=True), patch(
             "python_backend.repositories.usage_tracking_repository.mysql_client.fetch_all",
             side_effect=[
-                [{"COLUMN_NAME": "id"}, {"COLUMN_NAME": "event"}, {"COLUMN_NAME": "details_json"}],
+                [
+                    {"event": "delegate_link_created", "event_count": 2},
+                    {"event": "delegate_order_placed", "event_count": 1},
+                ],
                 [
                     {
-                        "event": "delegate_link_created",
-                        "payload_value": json.dumps(
-                            {
-                                "count": 3,
-                                "instances": [
-                                    {
-                                        "who": {
-                                            "id": "doctor-1",
-                                            "name": "Dr. Avery",
-                                            "email": "avery@example.com",
-                                            "role": "doctor",
-                                        },
-                                    },
-                                    {
-                                        "who": {
-                                            "id": "doctor-1",
-                                            "name": "Dr. Avery",
-                                            "email": "avery@example.com",
-                                            "role": "doctor",
-                                        },
-                                    },
-                                    {
-                                        "who": {
-                                            "id": "doctor-2",
-                                            "name": "Dr. Blake",
-                                            "email": "blake@example.com",
-                                            "role": "doctor",
-                                        },
-                                    },
-                                ],
-                            }
-                        ),
+                        "actor_key": "id:doctor-2",
+                        "actor_user_id": "doctor-2",
+                        "actor_name": "Dr. Blake",
+                        "actor_email": "blake@example.com",
+                        "actor_role": "doctor",
+                        "event_count": 2,
                     },
                     {
-                        "event": "delegate_order_placed",
-                        "payload_value": json.dumps(
-                            {
-                                "count": 2,
-                                "instances": [
-                                    {
-                                        "who": {
-                                            "id": "doctor-1",
-                                            "name": "Dr. Avery",
-                                            "email": "avery@example.com",
-                                            "role": "doctor",
-                                        },
-                                    },
-                                    {
-                                        "who": {
-                                            "id": "doctor-2",
-                                            "name": "Dr. Blake",
-                                            "email": "blake@example.com",
-                                            "role": "doctor",
-                                        },
-                                    },
-                                ],
-                            }
-                        ),
+                        "actor_key": "id:doctor-1",
+                        "actor_user_id": "doctor-1",
+                        "actor_name": "Dr. Avery",
+                        "actor_email": "avery@example.com",
+                        "actor_role": "doctor",
+                        "event_count": 3,
                     },
                 ],
             ],
-        ):
+        ) as mock_fetch_all:
             funnel = usage_tracking_repository.get_event_funnel(
                 ["delegate_link_created", "delegate_order_placed"],
                 actor_key="id:doctor-1",
             )
 
+        count_sql, count_params = mock_fetch_all.call_args_list[0][0]
+        self.assertIn("actor_key = %(actor_key)s", count_sql)
+        self.assertEqual(count_params["actor_key"], "id:doctor-1")
         self.assertEqual(
             funnel["counts"],
             {
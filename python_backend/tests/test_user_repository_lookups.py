@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+if "pymysql" not in sys.modules:
+    pymysql_stub = types.ModuleType("pymysql")
+    pymysql_stub.connect = lambda *args, **kwargs: None
+    pymysql_stub.connections = types.SimpleNamespace(Connection=object)
+    pymysql_stub.err = types.SimpleNamespace(Error=Exception, OperationalError=Exception, InterfaceError=Exception)
+    cursors_stub = types.ModuleType("pymysql.cursors")
+    cursors_stub.DictCursor = object
+    pymysql_stub.cursors = cursors_stub
+    sys.modules["pymysql"] = pymysql_stub
+    sys.modules["pymysql.cursors"] = cursors_stub
+
+from python_backend.repositories import user_repository
+
+
+class UserRepositoryLookupTests(unittest.TestCase):
+    def test_lookup_by_sales_rep_ids_reads_only_matching_rows_in_chunks(self) -> None:
+        queries: list[tuple[str, dict]] = []
+
+        def fake_fetch_all(query, params=None):
+            queries.append((query, params or {}))
+            return [
+                {"id": f"doctor-{value}", "role": "doctor" if value != "rep-0" else "sales_rep", "sales_rep_id": value}
+                for value in (params or {}).values()
+            ]
+
+        rep_ids = [f"rep-{index}" for index in range(user_repository._LOOKUP_CHUNK + 1)]
+        with patch.object(user_repository, "_using_mysql", return_value=True), \
+            patch.object(user_repository.mysql_client, "fetch_all", side_effect=fake_fetch_all):
+            users = user_repository.list_lookup_by_sales_rep_ids(rep_ids + ["rep-1", " "], roles=("doctor",))
+
+        self.assertEqual(len(queries), 2)
+        self.assertIn("WHERE sales_rep_id IN (", queries[0][0])
+        self.assertNotIn("password", queries[0][0])
+        self.assertEqual(len(queries[0][1]), user_repository._LOOKUP_CHUNK)
+        self.assertEqual(len(queries[1][1]), 1)
+        self.assertEqual(len(users), user_repository._LOOKUP_CHUNK)
+        self.assertNotIn("doctor-rep-0", {user["id"] for user in users})
+
+    def test_mark_offline_saves_the_json_store_once(self) -> None:
+        store = [
+            {"id": "u1", "isOnline": True},
+            {"id": "u2", "isOnline": True},
+            {"id": "u3", "isOnline": False},
+        ]
+        saved: list[list] = []
+        with patch.object(user_repository, "_using_mysql", return_value=False), \
+            patch.object(user_repository, "_load", return_value=store), \
+            patch.object(user_repository, "_save", side_effect=lambda users: saved.append(list(users))):
+            updated = user_repository.mark_offline(["u1", "u3", "missing"])
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(len(saved), 1)
+        self.assertEqual([user["isOnline"] for user in saved[0]], [False, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
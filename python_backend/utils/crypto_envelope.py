@@ -5,7 +5,10 @@ import hashlib
 import hmac
 import json
 import os
-from typing import Any, Callable, Dict, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
@@ -14,11 +17,28 @@ from ..services import get_config
 ENVELOPE_VERSION = 1
 ENVELOPE_ALGORITHM = "aes-256-gcm"
 
+# Unwrapped per-record data keys, keyed by the master key, the wrapping AAD and
+# the wrapped key itself. A rotated or wrong master key therefore never hits a
+# stale entry and still fails authentication on unwrap.
+_DATA_KEY_CACHE: "OrderedDict[Tuple[bytes, bytes, str, str], bytes]" = OrderedDict()
+_DATA_KEY_CACHE_LOCK = threading.Lock()
+
+
+def _data_key_cache_size() -> int:
+    raw = str(os.environ.get("DATA_KEY_CACHE_SIZE", "4096")).strip()
+    try:
+        value = int(raw)
+    except Exception:
+        value = 4096
+    # 0 disables the cache.
+    return max(0, min(value, 100_000))
+
 
 def _stable_json(value: Any) -> str:
     return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
+@lru_cache(maxsize=16)
 def _derive_key(secret: str) -> bytes:
     raw = str(secret or "").strip()
     if not raw:
@@ -63,9 +83,13 @@ def _canonical_aad(aad: Optional[Dict[str, Any]]) -> bytes:
     return _stable_json(aad).encode("utf-8")
 
 
-def _wrap_data_key(data_key: bytes) -> Dict[str, str]:
-    wrapper = AESGCM(_master_key())
-    iv = os.urandom(12)
+@lru_cache(maxsize=16)
+def _aead(key: bytes) -> AESGCM:
+    return AESGCM(key)
+
+
+def _wrap_context() -> Tuple[bytes, bytes]:
+    """Master key and wrapped-key AAD for the current config."""
     aad = _canonical_aad(
         {
             "purpose": "wrapped_data_key",
@@ -73,7 +97,18 @@ def _wrap_data_key(data_key: bytes) -> Dict[str, str]:
             "kms_key_id": _kms_key_id(),
         }
     )
-    wrapped = wrapper.encrypt(iv, data_key, aad)
+    return _master_key(), aad
+
+
+def clear_data_key_cache() -> None:
+    with _DATA_KEY_CACHE_LOCK:
+        _DATA_KEY_CACHE.clear()
+
+
+def _wrap_data_key(data_key: bytes) -> Dict[str, str]:
+    master_key, aad = _wrap_context()
+    iv = os.urandom(12)
+    wrapped = _aead(master_key).encrypt(iv, data_key, aad)
     return {
         "alg": ENVELOPE_ALGORITHM,
         "iv": base64.b64encode(iv).decode("ascii"),
@@ -81,20 +116,36 @@ def _wrap_data_key(data_key: bytes) -> Dict[str, str]:
     }
 
 
-def _unwrap_data_key(wrapped_data_key: Any) -> bytes:
+def _unwrap_data_key(
+    wrapped_data_key: Any,
+    *,
+    context: Optional[Tuple[bytes, bytes]] = None,
+) -> bytes:
     if not isinstance(wrapped_data_key, dict):
         raise ValueError("wrapped_data_key must be an object")
-    iv = base64.b64decode(str(wrapped_data_key.get("iv") or ""))
-    ciphertext = base64.b64decode(str(wrapped_data_key.get("ciphertext") or ""))
-    wrapper = AESGCM(_master_key())
-    aad = _canonical_aad(
-        {
-            "purpose": "wrapped_data_key",
-            "key_version": _key_version(),
-            "kms_key_id": _kms_key_id(),
-        }
+    master_key, aad = context or _wrap_context()
+    iv_text = str(wrapped_data_key.get("iv") or "")
+    ciphertext_text = str(wrapped_data_key.get("ciphertext") or "")
+    cache_key = (master_key, aad, iv_text, ciphertext_text)
+    cache_size = _data_key_cache_size()
+    if cache_size > 0:
+        with _DATA_KEY_CACHE_LOCK:
+            cached = _DATA_KEY_CACHE.get(cache_key)
+            if cached is not None:
+                _DATA_KEY_CACHE.move_to_end(cache_key)
+                return cached
+    data_key = _aead(master_key).decrypt(
+        base64.b64decode(iv_text),
+        base64.b64decode(ciphertext_text),
+        aad,
     )
-    return wrapper.decrypt(iv, ciphertext, aad)
+    if cache_size > 0:
+        with _DATA_KEY_CACHE_LOCK:
+            _DATA_KEY_CACHE[cache_key] = data_key
+            _DATA_KEY_CACHE.move_to_end(cache_key)
+            while len(_DATA_KEY_CACHE) > cache_size:
+                _DATA_KEY_CACHE.popitem(last=False)
+    return data_key
 
 
 def compute_blind_index(
@@ -148,6 +199,15 @@ def encrypt_text(
 
 
 def decrypt_text(value: Any, *, aad: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    return _decrypt_text(value, aad=aad)
+
+
+def _decrypt_text(
+    value: Any,
+    *,
+    aad: Optional[Dict[str, Any]] = None,
+    context: Optional[Tuple[bytes, bytes]] = None,
+) -> Optional[str]:
     if value is None:
         return None
     if isinstance(value, (bytes, bytearray)):
@@ -168,7 +228,7 @@ def decrypt_text(value: Any, *, aad: Optional[Dict[str, Any]] = None) -> Optiona
         return text
 
     if payload.get("version") == ENVELOPE_VERSION and payload.get("wrapped_data_key"):
-        data_key = _unwrap_data_key(payload.get("wrapped_data_key"))
+        data_key = _unwrap_data_key(payload.get("wrapped_data_key"), context=context)
         cipher = AESGCM(data_key)
         iv = base64.b64decode(str(payload.get("iv") or ""))
         ciphertext = base64.b64decode(str(payload.get("ciphertext") or ""))
@@ -176,8 +236,8 @@ def decrypt_text(value: Any, *, aad: Optional[Dict[str, Any]] = None) -> Optiona
         return plaintext.decode("utf-8")
 
     if "iv" in payload and "payload" in payload:
-        legacy_key = _master_key()
-        cipher = AESGCM(legacy_key)
+        legacy_key = context[0] if context else _master_key()
+        cipher = _aead(legacy_key)
         iv = base64.b64decode(payload["iv"])
         ciphertext = base64.b64decode(payload["payload"])
         plaintext = cipher.decrypt(iv, ciphertext, None)
@@ -186,6 +246,41 @@ def decrypt_text(value: Any, *, aad: Optional[Dict[str, Any]] = None) -> Optiona
     return text
 
 
+def decrypt_many(
+    values: Iterable[Any],
+    *,
+    aads: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ignore_errors: bool = False,
+) -> List[Optional[str]]:
+    """
+    Decrypt a whole result set, resolving the master key and wrapping AAD once.
+
+    `aads`, when given, is aligned with `values`. With `ignore_errors`, values
+    that fail to decrypt come back as None instead of raising, so callers can
+    fall back per row.
+    """
+    items = list(values)
+    context: Optional[Tuple[bytes, bytes]] = None
+    results: List[Optional[str]] = []
+    for index, value in enumerate(items):
+        aad = aads[index] if aads is not None and index < len(aads) else None
+        try:
+            if context is None and _looks_encrypted(value):
+                context = _wrap_context()
+            results.append(_decrypt_text(value, aad=aad, context=context))
+        except Exception:
+            if not ignore_errors:
+                raise
+            results.append(None)
+    return results
+
+
+def _looks_encrypted(value: Any) -> bool:
+    if isinstance(value, (bytes, bytearray)):
+        return b"wrapped_data_key" in value or b'"iv"' in value
+    return isinstance(value, str) and ("wrapped_data_key" in value or '"iv"' in value)
+
+
 def encrypt_json(
     value: Any,
     *,
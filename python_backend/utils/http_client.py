@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import os
 import threading
-from typing import Any, Optional, Tuple, Union
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import requests
 
@@ -28,6 +31,135 @@ _ACQUIRE_TIMEOUT_SECONDS = float(
 
 TimeoutArg = Union[None, float, int, Tuple[float, float]]
 
+# One keep-alive `requests.Session` per scheme://host, shared by every thread in
+# the process so repeated Woo/UPS/ShipStation calls reuse TLS connections.
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+_METRICS: Dict[str, Dict[str, float]] = {}
+_METRICS_LOCK = threading.Lock()
+
+
+def _pool_maxsize(default: int) -> int:
+    raw = str(os.environ.get("HTTP_POOL_MAXSIZE", "")).strip()
+    try:
+        value = int(raw) if raw else int(default)
+    except Exception:
+        value = int(default)
+    return max(1, min(value, 64))
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(str(url or ""))
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    return f"{scheme}://{host}:{port}" if port else f"{scheme}://{host}"
+
+
+def session_for(url: str, *, pool_maxsize: Optional[int] = None) -> requests.Session:
+    """
+    Return the shared pooled session for the host of `url`.
+
+    The first caller for a host decides its pool size; it defaults to
+    HTTP_CONCURRENCY (overridable with HTTP_POOL_MAXSIZE) since the semaphore
+    never lets more requests than that run at once.
+    """
+    key = _host_key(url)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is not None:
+            return session
+        from requests.adapters import HTTPAdapter
+
+        size = _pool_maxsize(pool_maxsize or _HTTP_CONCURRENCY)
+        session = requests.Session()
+        # API clients authenticate per request; never replay cookies a vendor
+        # sets on one call into the next caller's request.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, pool_block=False)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSIONS[key] = session
+        return session
+
+
+def close_sessions() -> None:
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+def _record(url: str, started: float, *, error: bool) -> None:
+    elapsed_ms = (time.monotonic() - started) * 1000.0
+    key = _host_key(url)
+    with _METRICS_LOCK:
+        entry = _METRICS.setdefault(
+            key,
+            {"requests": 0, "errors": 0, "totalMs": 0.0, "maxMs": 0.0},
+        )
+        entry["requests"] += 1
+        if error:
+            entry["errors"] += 1
+        entry["totalMs"] += elapsed_ms
+        entry["maxMs"] = max(entry["maxMs"], elapsed_ms)
+
+
+def _connections_opened(session: Optional[requests.Session]) -> Optional[int]:
+    if session is None:
+        return None
+    try:
+        total = 0
+        for adapter in session.adapters.values():
+            for pool in list(adapter.poolmanager.pools._container.values()):
+                total += int(getattr(pool, "num_connections", 0) or 0)
+        return total
+    except Exception:
+        return None
+
+
+def get_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-host request counts, latency and TLS connections opened by the shared sessions."""
+    with _METRICS_LOCK:
+        snapshot = {key: dict(value) for key, value in _METRICS.items()}
+    with _SESSIONS_LOCK:
+        sessions = dict(_SESSIONS)
+    result: Dict[str, Dict[str, Any]] = {}
+    for key in sorted(set(snapshot) | set(sessions)):
+        entry = snapshot.get(key) or {"requests": 0, "errors": 0, "totalMs": 0.0, "maxMs": 0.0}
+        count = int(entry["requests"])
+        result[key] = {
+            "requests": count,
+            "errors": int(entry["errors"]),
+            "avgMs": round(entry["totalMs"] / count, 2) if count else None,
+            "maxMs": round(entry["maxMs"], 2) if count else None,
+            "connectionsOpened": _connections_opened(sessions.get(key)),
+        }
+    return result
+
+
+def send(
+    session: requests.Session,
+    method: str,
+    url: str,
+    *,
+    timeout: TimeoutArg,
+    **kwargs: Any,
+) -> requests.Response:
+    """Issue a request on `session` and record per-host latency metrics."""
+    started = time.monotonic()
+    try:
+        response = session.request(method, url, timeout=timeout, **kwargs)
+    except Exception:
+        _record(url, started, error=True)
+        raise
+    _record(url, started, error=response.status_code >= 500)
+    return response
+
 
 def request_with_session(
     session: requests.Session, method: str, url: str, *, timeout: TimeoutArg = None, **kwargs: Any
@@ -43,7 +175,7 @@ def request_with_session(
     if not acquired:
         raise requests.Timeout("Outbound HTTP concurrency limit reached")
     try:
-        return session.request(method, url, timeout=effective_timeout, **kwargs)
+        return send(session, method, url, timeout=effective_timeout, **kwargs)
     finally:
         try:
             _http_semaphore.release()
@@ -56,6 +188,7 @@ def request(method: str, url: str, *, timeout: TimeoutArg = None, **kwargs: Any)
     Small wrapper around requests.request() that:
       - enforces sane default timeouts
       - limits concurrent outbound HTTP per-process
+      - reuses a pooled keep-alive session per host
     """
     effective_timeout: TimeoutArg = timeout
     if effective_timeout is None:
@@ -65,7 +198,7 @@ def request(method: str, url: str, *, timeout: TimeoutArg = None, **kwargs: Any)
     if not acquired:
         raise requests.Timeout("Outbound HTTP concurrency limit reached")
     try:
-        return requests.request(method, url, timeout=effective_timeout, **kwargs)
+        return send(session_for(url), method, url, timeout=effective_timeout, **kwargs)
     finally:
         try:
             _http_semaphore.release()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Cross-worker wake-ups over unix datagram sockets. Each listening worker binds
+# `<name>-<pid>-<random>.sock` in a shared directory; a sender fires one
+# datagram at every socket there except its own. Delivery is best effort, so
+# callers always keep a polling safety net.
+
+_SENDER_LOCK = threading.Lock()
+_SENDER: Optional[socket.socket] = None
+
+
+def supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def broadcast(directory: Path, name: str, payload: bytes) -> None:
+    """Send `payload` to every other worker listening under `name` in `directory`."""
+    global _SENDER
+    if not supported():
+        return
+    try:
+        targets = list(directory.glob(f"{name}-*.sock"))
+    except Exception:
+        return
+    own_prefix = f"{name}-{os.getpid()}-"
+    with _SENDER_LOCK:
+        if _SENDER is None:
+            try:
+                _SENDER = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                _SENDER.setblocking(False)
+            except Exception:
+                _SENDER = None
+                return
+        for target in targets:
+            if target.name.startswith(own_prefix):
+                continue
+            try:
+                _SENDER.sendto(payload, str(target))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Receiver is gone (worker exited without cleanup); drop the stale socket file.
+                try:
+                    target.unlink()
+                except Exception:
+                    pass
+            except OSError:
+                # Receiver is busy or its buffer is full; a wake-up is already pending there.
+                continue
+
+
+def open_receiver(directory: Path, name: str) -> Tuple[socket.socket, Path]:
+    """Bind this worker's receiving socket; raises OSError when it cannot."""
+    path = directory / f"{name}-{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+    directory.mkdir(parents=True, exist_ok=True)
+    receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        receiver.bind(str(path))
+    except Exception:
+        receiver.close()
+        raise
+    try:
+        os.chmod(path, 0o600)
+    except Exception:
+        pass
+    return receiver, path
+
+
+def close_receiver(receiver: Optional[socket.socket], path: Optional[Path]) -> None:
+    if receiver is not None:
+        try:
+            receiver.close()
+        except Exception:
+            pass
+    if path is not None:
+        try:
+            path.unlink()
+        except Exception:
+            pass
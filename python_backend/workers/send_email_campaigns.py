@@ -4,7 +4,7 @@ import argparse
 import time
 
 from ..logging_config import configure_logging
-from ..services import email_campaign_service
+from ..services import email_campaign_service, email_service
 from ..worker_bootstrap import bootstrap
 
 
@@ -13,7 +13,7 @@ def _parser() -> argparse.ArgumentParser:
     parser.add_argument("--once", action="store_true", help="Process one batch and exit")
     parser.add_argument("--limit", type=int, default=25, help="Maximum recipients to process per batch")
     parser.add_argument("--interval", type=float, default=30.0, help="Seconds to sleep between batches")
-    parser.add_argument("--throttle", type=float, default=0.25, help="Seconds to sleep between recipients")
+    parser.add_argument("--throttle", type=float, default=0.25, help="Minimum seconds between recipient sends")
     return parser
 
 
@@ -27,6 +27,7 @@ def main() -> int:
             throttle_seconds=max(0.0, min(float(args.throttle or 0.0), 10.0)),
         )
         if args.once:
+            email_service.close_smtp_pool()
             return 0
         time.sleep(max(5.0, float(args.interval or 30.0)))
 